@@ -3361,6 +3361,80 @@ Or specify a different well from the list above.`,
     }
   }
 
+  /**
+   * Call several petrophysicsCalculator tools for one well in a single Lambda invocation.
+   * The Lambda loads the well's LAS data once; results are returned in operation order,
+   * each shaped like a callMCPTool result.
+   */
+  private async callMCPToolBatch(wellName: string, operations: Array<{ tool: string; parameters?: any }>): Promise<any[]> {
+    const mcpCallId = Math.random().toString(36).substr(2, 9);
+    console.log('⚡ === DIRECT LAMBDA BATCH CALL START ===');
+    console.log('🆔 Call ID:', mcpCallId);
+    console.log('🛠️ Tools:', operations.map(op => op.tool).join(', '));
+    console.log('🏷️ Well:', wellName);
+
+    const failAll = (message: string, error: string) => operations.map(op => ({
+      success: false,
+      message,
+      toolName: op.tool,
+      parameters: op.parameters,
+      error
+    }));
+
+    try {
+      const lambdaFunctionName = process.env.PETROPHYSICS_CALCULATOR_FUNCTION_NAME;
+
+      if (!lambdaFunctionName) {
+        console.warn('⚠️ Petrophysics Calculator Lambda not deployed yet');
+        return failAll('Petrophysics calculations are currently unavailable. The calculation service is being deployed.', 'SERVICE_UNAVAILABLE');
+      }
+
+      const { LambdaClient, InvokeCommand } = await import('@aws-sdk/client-lambda');
+
+      const client = new LambdaClient({ region: process.env.AWS_REGION || 'us-east-1' });
+
+      const payload = {
+        operations: operations.map(op => ({ tool: op.tool, parameters: op.parameters || {} })),
+        parameters: { well_name: wellName }
+      };
+
+      console.log('📤 Invoking Lambda with batch payload:', JSON.stringify(payload));
+
+      const command = new InvokeCommand({
+        FunctionName: lambdaFunctionName,
+        Payload: JSON.stringify(payload)
+      });
+
+      const response = await client.send(command);
+      const responsePayload = response.Payload ? JSON.parse(new TextDecoder().decode(response.Payload)) : {};
+
+      if (!Array.isArray(responsePayload?.results)) {
+        console.error('❌ Batch response without results:', JSON.stringify(responsePayload).substring(0, 500));
+        return failAll(responsePayload?.message || responsePayload?.error || 'Batch call failed', responsePayload?.error || 'BATCH_FAILED');
+      }
+
+      const results = responsePayload.results.map((result: any) => ({
+        ...result,
+        success: result.success === undefined ? true : result.success,
+        artifacts: Array.isArray(result.artifacts) ? result.artifacts : []
+      }));
+
+      console.log('✅ Batch results:', results.map((r: any) => `${r.tool}:${r.success ? 'ok' : 'failed'}`).join(', '));
+      console.log('⚡ === DIRECT LAMBDA BATCH CALL END (SUCCESS) ===');
+
+      return results;
+
+    } catch (error) {
+      console.error('❌ === DIRECT LAMBDA BATCH CALL ERROR ===');
+      console.error('🆔 Call ID:', mcpCallId);
+      console.error('💥 Error:', error);
+      console.error('⚡ === DIRECT LAMBDA BATCH CALL END (EXCEPTION) ===');
+
+      const message = error instanceof Error ? error.message : 'Unknown error';
+      return failAll(`Error calling Lambda batch for ${wellName}: ${message}`, message);
+    }
+  }
+
   /**
    * Get all available tools with better error handling
    */
@@ -3486,59 +3560,24 @@ Formation evaluation includes: porosity, shale volume, water saturation, permeab
         qualityMetrics: {}
       };
 
-      // Step 1: Data Quality Assessment - REAL MCP CALL
-      workflow.steps.push('Data Quality Assessment');
-      try {
-        const qualityResult = await this.callMCPTool('assess_well_data_quality', { well_name: wellName });
-        workflow.results.dataQuality = qualityResult;
-        workflow.methodology.dataQuality = qualityResult.methodology || {};
-      } catch (error) {
-        console.error('Data quality assessment failed:', error);
-        workflow.results.dataQuality = { error: 'Assessment failed' };
-      }
-
-      // Step 2: Porosity Calculations - REAL MCP CALL
-      workflow.steps.push('Porosity Calculations');
-      try {
-        const porosityResult = await this.callMCPTool('calculate_porosity', { 
-          well_name: wellName, 
-          method: 'effective' 
-        });
-        workflow.results.porosity = porosityResult;
-        workflow.methodology.porosity = porosityResult.methodology || {};
-      } catch (error) {
-        console.error('Porosity calculation failed:', error);
-        workflow.results.porosity = { error: 'Calculation failed' };
-      }
-
-      // Step 3: Shale Volume Calculations - REAL MCP CALL
-      workflow.steps.push('Shale Volume Calculations');
-      try {
-        const shaleResult = await this.callMCPTool('calculate_shale_volume', { 
-          well_name: wellName, 
-          method: 'larionov_tertiary' 
-        });
-        workflow.results.shaleVolume = shaleResult;
-        workflow.methodology.shaleVolume = shaleResult.methodology || {};
-      } catch (error) {
-        console.error('Shale volume calculation failed:', error);
-        workflow.results.shaleVolume = { error: 'Calculation failed' };
-      }
-
-      // Step 4: Water Saturation Calculations - REAL MCP CALL
-      workflow.steps.push('Water Saturation Calculations');
-      try {
-        const saturationResult = await this.callMCPTool('calculate_saturation', { 
-          well_name: wellName, 
-          method: 'archie',
-          porosity_method: 'effective'
-        });
-        workflow.results.saturation = saturationResult;
-        workflow.methodology.saturation = saturationResult.methodology || {};
-      } catch (error) {
-        console.error('Saturation calculation failed:', error);
-        workflow.results.saturation = { error: 'Calculation failed' };
-      }
+      // Steps 1-4: Data quality, porosity, shale volume and saturation - REAL MCP CALLS,
+      // batched into one Lambda invocation that loads the well once
+      workflow.steps.push('Data Quality Assessment', 'Porosity Calculations', 'Shale Volume Calculations', 'Water Saturation Calculations');
+      const [qualityResult, porosityResult, shaleResult, saturationResult] = await this.callMCPToolBatch(wellName, [
+        { tool: 'assess_well_data_quality' },
+        { tool: 'calculate_porosity', parameters: { method: 'effective' } },
+        { tool: 'calculate_shale_volume', parameters: { method: 'larionov_tertiary' } },
+        { tool: 'calculate_saturation', parameters: { method: 'archie', porosity_method: 'effective' } }
+      ]);
+
+      workflow.results.dataQuality = qualityResult;
+      workflow.methodology.dataQuality = qualityResult.methodology || {};
+      workflow.results.porosity = porosityResult;
+      workflow.methodology.porosity = porosityResult.methodology || {};
+      workflow.results.shaleVolume = shaleResult;
+      workflow.methodology.shaleVolume = shaleResult.methodology || {};
+      workflow.results.saturation = saturationResult;
+      workflow.methodology.saturation = saturationResult.methodology || {};
 
       // Step 5: Permeability Estimation - NOT AVAILABLE IN MCP YET
       workflow.steps.push('Permeability Estimation');
@@ -4065,17 +4104,14 @@ Please check the well names and try again.`
     const methods = ['density', 'neutron', 'effective', 'total'];
     const results: any = {};
     
-    for (const method of methods) {
-      try {
-        results[method] = await this.callMCPTool('calculate_porosity', {
-          well_name: wellData.wellName,
-          method
-        });
-      } catch (error) {
-        console.error(`Porosity calculation failed for method ${method}:`, error);
-        results[method] = { error: 'Calculation failed' };
-      }
-    }
+    // One Lambda invocation for all methods; the well is loaded once
+    const methodResults = await this.callMCPToolBatch(
+      wellData.wellName,
+      methods.map(method => ({ tool: 'calculate_porosity', parameters: { method } }))
+    );
+    methods.forEach((method, i) => {
+      results[method] = methodResults[i];
+    });
     
     return results;
   }
@@ -4084,17 +4120,14 @@ Please check the well names and try again.`
     const methods = ['larionov_tertiary', 'larionov_pre_tertiary', 'linear', 'clavier'];
     const results: any = {};
     
-    for (const method of methods) {
-      try {
-        results[method] = await this.callMCPTool('calculate_shale_volume', {
-          well_name: wellData.wellName,
-          method
-        });
-      } catch (error) {
-        console.error(`Shale volume calculation failed for method ${method}:`, error);
-        results[method] = { error: 'Calculation failed' };
-      }
-    }
+    // One Lambda invocation for all methods; the well is loaded once
+    const methodResults = await this.callMCPToolBatch(
+      wellData.wellName,
+      methods.map(method => ({ tool: 'calculate_shale_volume', parameters: { method } }))
+    );
+    methods.forEach((method, i) => {
+      results[method] = methodResults[i];
+    });
     
     return results;
   }
@@ -4313,13 +4346,10 @@ Traceability: Complete for all calculations`;
   private async analyzeWellForCorrelation(wellData: WellLogData): Promise<any> {
     try {
       // Get well info and quality assessment
-      const wellInfo = await this.callMCPTool('get_well_info', { 
-        well_name: wellData.wellName 
-      });
-      
-      const quality = await this.callMCPTool('assess_well_data_quality', { 
-        well_name: wellData.wellName 
-      });
+      const [wellInfo, quality] = await this.callMCPToolBatch(wellData.wellName, [
+        { tool: 'get_well_info' },
+        { tool: 'assess_well_data_quality' }
+      ]);
       
       return {
         wellName: wellData.wellName,
@@ -0,0 +1,186 @@
+"""
+Single-pass, mergeable curve statistics.
+
+StreamingStats keeps count, mean, second and third central moments and
+min/max. Each chunk of values (a depth window, a well) is reduced with
+numpy in one pass and combined with the parallel form of Welford's update
+(Chan et al.; Pebay for the third moment), so results from chunks or
+wells merge without revisiting the data.
+
+Quantiles are exact order statistics via np.partition (linear time, no
+full sort). For inputs that are too long to hold, or that arrive from
+several wells, QuantileSketch is a mergeable KLL sketch with a bounded
+rank error.
+"""
+import math
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+class StreamingStats:
+    """Count, mean, variance, skewness, min and max, updatable and mergeable."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def of(cls, values) -> 'StreamingStats':
+        return cls().update(values)
+
+    def update(self, values) -> 'StreamingStats':
+        """Add a chunk of values (NaN is skipped)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        chunk = StreamingStats()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        deviations = values - chunk.mean
+        squares = deviations * deviations
+        chunk.m2 = float(squares.sum())
+        chunk.m3 = float((squares * deviations).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other: 'StreamingStats') -> 'StreamingStats':
+        """Combine another accumulator into this one (in place)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.m3 = other.count, other.mean, other.m2, other.m3
+            self.min, self.max = other.min, other.max
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        self.m3 = (self.m3 + other.m3
+                   + delta ** 3 * na * nb * (na - nb) / (n * n)
+                   + 3.0 * delta * (na * other.m2 - nb * self.m2) / n)
+        self.m2 = self.m2 + other.m2 + delta * delta * na * nb / n
+        self.mean = self.mean + delta * nb / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def skewness(self) -> float:
+        """Fisher-Pearson skewness (0 for constant data)."""
+        if self.count == 0 or self.m2 <= 0:
+            return 0.0
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std_dev': self.std_dev,
+            'variance': self.variance,
+            'skewness': self.skewness,
+            'min': self.min,
+            'max': self.max,
+        }
+
+
+def order_statistics(values, ranks: Sequence[int]):
+    """The values at the given ranks of the sorted data, without a full sort."""
+    values = np.asarray(values, dtype=np.float64)
+    ranks = list(ranks)
+    return [float(v) for v in np.partition(values, ranks)[ranks]]
+
+
+def median(values) -> float:
+    """Median (mean of the two middle values for an even count)."""
+    n = len(values)
+    if n % 2:
+        return order_statistics(values, [n // 2])[0]
+    low, high = order_statistics(values, [n // 2 - 1, n // 2])
+    return (low + high) / 2
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL quantile sketch.
+
+    Items are kept in levels of compactors; an item at level h stands for
+    2**h input values. A full level is sorted and every other item (random
+    offset) is promoted, so memory stays O(k) for any input length. The
+    rank error is about 1.7 / k (under 1% for the default k).
+    """
+
+    def __init__(self, k: int = 256, seed: Optional[int] = 0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values) -> 'QuantileSketch':
+        """Add values (NaN is skipped)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Combine another sketch into this one (in place)."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                # An odd item out stays at this level
+                keep = items[:1] if len(items) % 2 else items[:0]
+                items = items[len(keep):]
+                promoted = items[int(self._rng.integers(2))::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, qs: Sequence[float]):
+        """Approximate values at quantiles qs (0..1)."""
+        if self.count == 0:
+            return [None for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_), 2.0 ** level) for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        total = cumulative[-1]
+        return [float(items[min(len(items) - 1, int(np.searchsorted(cumulative, q * total, side='left')))])
+                for q in qs]
@@ -0,0 +1,61 @@
+"""
+Depth-range selection for the petrophysics tools.
+
+A DepthIndex checks once whether a well's depth curve is increasing.
+When it is, a [depth_start, depth_end] query is resolved to slice bounds
+with a binary search (np.searchsorted) and curves are returned as
+zero-copy views. Depth curves that are not increasing (or contain null
+depths) fall back to a boolean mask over all samples.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class DepthIndex:
+    """Resolves depth ranges of one well to sample indices."""
+
+    def __init__(self, depths):
+        self.depths = np.asarray(depths, dtype=float)
+        self.monotonic = bool(len(self.depths) < 2 or np.all(np.diff(self.depths) >= 0))
+
+    def bounds(self, depth_start: Optional[float] = None, depth_end: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """
+        Slice bounds of the samples with depth_start <= depth <= depth_end.
+
+        Either limit may be None. Returns None when the depth curve is not
+        increasing, in which case select() filters with a mask.
+        """
+        if not self.monotonic:
+            return None
+        start = 0 if depth_start is None else int(np.searchsorted(self.depths, depth_start, side='left'))
+        end = len(self.depths) if depth_end is None else int(np.searchsorted(self.depths, depth_end, side='right'))
+        return start, max(start, end)
+
+    def select(self, values, depth_start: Optional[float] = None, depth_end: Optional[float] = None):
+        """
+        Samples of a curve within the depth range.
+
+        Returns a view of the curve when the depth curve is increasing,
+        otherwise a filtered copy.
+        """
+        values = np.asarray(values)
+        if depth_start is None and depth_end is None:
+            return values
+        bounds = self.bounds(depth_start, depth_end)
+        if bounds is not None:
+            return values[bounds[0]:bounds[1]]
+        mask = np.ones(len(self.depths), dtype=bool)
+        if depth_start is not None:
+            mask &= self.depths >= depth_start
+        if depth_end is not None:
+            mask &= self.depths <= depth_end
+        return values[mask]
+
+
+def get_depth_index(las_data: Dict[str, Any], depth_curve: str = 'DEPT') -> DepthIndex:
+    """The DepthIndex of a parsed well, built on first use and kept with the well."""
+    index = las_data.get('depth_index')
+    if index is None:
+        index = las_data['depth_index'] = DepthIndex(las_data['data'][depth_curve])
+    return index
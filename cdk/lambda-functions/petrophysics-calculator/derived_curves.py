@@ -0,0 +1,350 @@
+"""
+Persisted derived curves (porosity, shale volume, water saturation).
+
+A derived curve is computed from one LAS object with one method and one
+set of parameters, and stored in a sibling prefix of the source log (so
+listings of the LAS prefix only see LAS files):
+
+    global/well-data-derived/WELL-001.las/porosity_density-<hash>.drv
+
+<hash> is a digest of the parameters' canonical JSON, so a later request
+with the same method and parameters reads the stored curve instead of
+recomputing it. The layout follows the columnar sidecar:
+
+    8 bytes   magic b"LASDRV1\\n"
+    8 bytes   little-endian uint64 header length
+    header    JSON: source key and ETag, method, parameters, kernel
+              version, column names and lengths, and any scalar results
+    columns   one little-endian float64 block per column, NaN preserved
+
+A stored curve is used only while its source ETag matches the LAS object
+and its kernel version matches KERNEL_VERSION; otherwise it is recomputed
+and overwritten. An S3 round trip only pays off for results that are slow
+to compute, so results computed faster than DERIVED_CURVES_MIN_COMPUTE_SECONDS
+are not stored, and methods measured that fast skip the S3 read as well.
+The MCP server's calculators take 0.1-2 s on 100k-1M sample logs and store
+their results; the petrophysics Lambda's vectorized kernels take
+milliseconds, so it keeps derived curves in memory only (persist=False).
+
+Writes run on a background thread, which suits long-lived processes such as
+the MCP server; short-lived callers must flush() before they exit. Writes
+are best effort, so a read-only bucket only loses the saving.
+
+Environment:
+    DERIVED_CURVES_PERSIST: "0" keeps derived curves in memory only
+    DERIVED_CURVE_CACHE_MAX_BYTES: memory budget for results (default 64 MB)
+    DERIVED_CURVES_MIN_COMPUTE_SECONDS: compute time below which results
+        are not stored in S3 (default 0.05)
+"""
+import os
+import json
+import time
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from las_reader import companion_key
+
+DERIVED_STORE = "derived"
+FILE_EXTENSION = ".drv"
+MAGIC = b"LASDRV1\n"
+FORMAT_VERSION = 1
+DTYPE = np.dtype('<f8')
+# Bump when a calculation's results change, so stored curves are recomputed
+KERNEL_VERSION = 2
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MIN_COMPUTE_SECONDS = 0.05
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _canonical(value):
+    """Parameters with numbers as floats, so 2 and 2.0 hash alike."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def parameter_hash(parameters: Dict[str, Any]) -> str:
+    """Short digest of the canonical JSON of a parameter set."""
+    text = json.dumps(_canonical(parameters), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def derived_key(las_key: str, method: str, parameters: Dict[str, Any]) -> str:
+    """S3 key (or path) of a derived curve of a LAS file."""
+    return f"{companion_key(las_key, DERIVED_STORE)}/{method}-{parameter_hash(parameters)}{FILE_EXTENSION}"
+
+
+def encode_derived(result: Dict[str, Any], source_key: str, source_etag: Optional[str],
+                   method: str, parameters: Dict[str, Any]) -> bytes:
+    """
+    Serialize a derived result.
+
+    Args:
+        result: Curves (arrays or lists of numbers) and scalar results
+            (anything else JSON-serializable) by name
+        source_key: Key of the LAS object the result was computed from
+        source_etag: ETag of that object, used by readers to detect staleness
+    """
+    columns = {name: np.asarray(value, dtype=DTYPE) for name, value in result.items()
+               if isinstance(value, (list, np.ndarray))}
+    header = {
+        'version': FORMAT_VERSION,
+        'kernel_version': KERNEL_VERSION,
+        'source_key': source_key,
+        'source_etag': source_etag,
+        'method': method,
+        'parameters': _canonical(parameters),
+        'columns': [[name, len(values)] for name, values in columns.items()],
+        'metadata': {name: value for name, value in result.items() if name not in columns},
+        'dtype': DTYPE.str,
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    parts = [MAGIC, struct.pack('<Q', len(header_bytes)), header_bytes]
+    parts.extend(np.ascontiguousarray(values).tobytes() for values in columns.values())
+    return b"".join(parts)
+
+
+def decode_derived(raw: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Read a derived result.
+
+    Returns:
+        (header, result) where the curves of result are read-only float64 arrays
+
+    Raises:
+        ValueError: If the bytes are not a derived curve of a supported version
+    """
+    if raw[:len(MAGIC)] != MAGIC or len(raw) < len(MAGIC) + 8:
+        raise ValueError("Not a derived curve")
+    (length,) = struct.unpack('<Q', raw[len(MAGIC):len(MAGIC) + 8])
+    start = len(MAGIC) + 8
+    header = json.loads(raw[start:start + length])
+    if header.get('version') != FORMAT_VERSION or header.get('dtype') != DTYPE.str:
+        raise ValueError(f"Unsupported derived curve version {header.get('version')}")
+    result = dict(header['metadata'])
+    offset = start + length
+    for name, count in header['columns']:
+        result[name] = np.frombuffer(raw, dtype=DTYPE, count=count, offset=offset)
+        offset += count * DTYPE.itemsize
+    return header, result
+
+
+def _freeze(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Curves are shared between requests: make them read-only."""
+    for name, value in result.items():
+        if isinstance(value, (list, np.ndarray)):
+            result[name] = np.array(value, dtype=DTYPE)
+            result[name].setflags(write=False)
+    return result
+
+
+def _result_bytes(result: Dict[str, Any]) -> int:
+    return sum(value.nbytes for value in result.values() if isinstance(value, np.ndarray))
+
+
+class DerivedCurveStore:
+    """
+    Derived curves keyed by well, method and parameter hash.
+
+    fetch() answers from memory, then from the stored object in S3 when it
+    was computed from the current version of the LAS file, and otherwise
+    computes the result. Results that took at least min_compute_seconds are
+    stored in the background; methods whose last computation was faster
+    skip S3 altogether. The memory tier is an LRU bounded by curve bytes.
+    Thread-safe.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, persist: Optional[bool] = None,
+                 min_compute_seconds: Optional[float] = None):
+        """
+        Create the store.
+
+        Args:
+            max_bytes: Memory budget for results. If None, uses
+                DERIVED_CURVE_CACHE_MAX_BYTES
+            persist: Read and write derived objects in S3. If None, uses
+                DERIVED_CURVES_PERSIST
+            min_compute_seconds: Compute time below which results are not
+                stored. If None, uses DERIVED_CURVES_MIN_COMPUTE_SECONDS
+        """
+        self.max_bytes = int(max_bytes if max_bytes is not None
+                             else _env_number('DERIVED_CURVE_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES))
+        self.persist = persist if persist is not None else os.environ.get('DERIVED_CURVES_PERSIST', '1') != '0'
+        self.min_compute_seconds = (min_compute_seconds if min_compute_seconds is not None
+                                    else _env_number('DERIVED_CURVES_MIN_COMPUTE_SECONDS', DEFAULT_MIN_COMPUTE_SECONDS))
+
+        self._entries = OrderedDict()  # (bucket, derived key) -> {etag, result, nbytes}
+        self._bytes = 0
+        self._compute_seconds = {}  # method -> duration of its last computation
+        self._pending = set()  # futures of S3 writes
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="derived-writer")
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.stored_hits = 0
+        self.stale = 0
+        self.computed = 0
+        self.unstored = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def fetch(
+        self,
+        client,
+        bucket: str,
+        las_key: str,
+        source_etag: Optional[str],
+        method: str,
+        parameters: Dict[str, Any],
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Get a derived result, computing it (and storing it, if slow) when needed.
+
+        Args:
+            source_etag: ETag of the LAS object the well was loaded from;
+                without it nothing is reused or stored
+            method: Calculation name, part of the key (e.g. "porosity_density")
+            parameters: Everything the result depends on besides the log
+            compute: Returns the result: curves (arrays or lists) and
+                JSON-serializable scalar results by name
+
+        Returns:
+            The result with curves as read-only float64 arrays
+        """
+        if not source_etag:
+            return _freeze(compute())
+        key = derived_key(las_key, method, parameters)
+        cache_key = (bucket, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and entry['etag'] == source_etag:
+                self._entries.move_to_end(cache_key)
+                self.memory_hits += 1
+                return entry['result']
+            last_seconds = self._compute_seconds.get(method)
+
+        worth_storing = self.persist and (last_seconds is None or last_seconds >= self.min_compute_seconds)
+        result = self._read(client, bucket, key, source_etag, method, parameters) if worth_storing else None
+        if result is not None:
+            self.stored_hits += 1
+        else:
+            start = time.perf_counter()
+            result = _freeze(compute())
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self._compute_seconds[method] = seconds
+                self.computed += 1
+            if self.persist and seconds >= self.min_compute_seconds:
+                self._write_later(client, bucket, key, las_key, source_etag, method, parameters, result)
+            elif self.persist:
+                self.unstored += 1
+
+        self._remember(cache_key, source_etag, result)
+        return result
+
+    def _remember(self, cache_key: Tuple[str, str], source_etag: str, result: Dict[str, Any]):
+        nbytes = _result_bytes(result)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous:
+                self._bytes -= previous['nbytes']
+            self._entries[cache_key] = {'etag': source_etag, 'result': result, 'nbytes': nbytes}
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted['nbytes']
+                self.evictions += 1
+
+    def _read(self, client, bucket: str, key: str, source_etag: str, method: str,
+              parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The stored result if it was computed from this source version with the current kernels."""
+        if not self.persist:
+            return None
+        try:
+            raw = client.get_object(Bucket=bucket, Key=key)['Body'].read()
+            header, result = decode_derived(raw)
+        except Exception as e:
+            print(f"No stored derived curve {key}: {type(e).__name__}")
+            return None
+        if (header.get('source_etag') != source_etag or header.get('kernel_version') != KERNEL_VERSION
+                or header.get('method') != method or header.get('parameters') != _canonical(parameters)):
+            self.stale += 1
+            return None
+        return result
+
+    def _write_later(self, *args):
+        """Store a result on the writer thread, off the request path."""
+        future = self._writer.submit(self._write, *args)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._written)
+
+    def _written(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _write(self, client, bucket: str, key: str, las_key: str, source_etag: str, method: str,
+               parameters: Dict[str, Any], result: Dict[str, Any]):
+        try:
+            client.put_object(
+                Bucket=bucket, Key=key,
+                Body=encode_derived(result, las_key, source_etag, method, parameters),
+                ContentType='application/octet-stream'
+            )
+            with self._lock:
+                self.writes += 1
+        except Exception as e:
+            print(f"Derived curve not stored ({key}): {type(e).__name__}: {e}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for the S3 writes started so far."""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending, timeout)
+
+    def clear(self):
+        """Empty the memory tier (stored objects are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with entry count, bytes used and hit, recompute,
+            write and eviction counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'memory_hits': self.memory_hits,
+                'stored_hits': self.stored_hits,
+                'stale': self.stale,
+                'computed': self.computed,
+                'unstored': self.unstored,
+                'writes': self.writes,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,117 @@
+"""
+Shape-preserving downsampling of well log curves for plotting.
+
+Both methods choose one set of sample indices shared by all requested
+curves, so every curve stays aligned with the depth column, and both keep
+the first and last samples.
+
+    lttb     Largest-Triangle-Three-Buckets. One sample per bucket, the one
+             forming the largest triangle with the previously chosen
+             sample and the next bucket's average. Curves are scaled to
+             their own range and their triangle areas summed, so a spike
+             in any curve is kept.
+    minmax   The minimum and maximum sample of every curve in each bucket.
+             This guarantees every bucket's extremes survive, at the cost
+             of fewer buckets for the same max_points.
+
+Null samples (NaN) count as mid-range values in LTTB areas and are
+ignored by minmax, where a bucket that is entirely null keeps its first
+sample so the gap remains visible.
+"""
+from typing import Sequence
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+MIN_POINTS = 3
+
+
+def _normalized(curves: Sequence[np.ndarray]) -> np.ndarray:
+    """Curves as columns scaled to [0, 1]; nulls become the neutral 0.5."""
+    columns = []
+    for values in curves:
+        values = np.asarray(values, dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        if len(finite):
+            low, high = finite.min(), finite.max()
+            scaled = (values - low) / (high - low) if high > low else np.zeros_like(values)
+        else:
+            scaled = np.zeros_like(values)
+        columns.append(np.where(np.isfinite(scaled), scaled, 0.5))
+    return np.column_stack(columns)
+
+
+def lttb_indices(x, curves: Sequence[np.ndarray], max_points: int) -> np.ndarray:
+    """Indices chosen by Largest-Triangle-Three-Buckets over one or more curves."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    y = _normalized(curves)
+    # Depth is scaled too, so it weighs like the curves in the triangle areas
+    span = x[-1] - x[0]
+    x = (x - x[0]) / span if span else np.zeros(n)
+
+    every = (n - 2) / (max_points - 2)
+    chosen = np.empty(max_points, dtype=np.int64)
+    chosen[0] = a = 0
+    for i in range(max_points - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean(axis=0)
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end, None]) * (avg_y - y[a])
+        ).sum(axis=1)
+        a = start + int(np.argmax(areas))
+        chosen[i + 1] = a
+    chosen[-1] = n - 1
+    return chosen
+
+
+def minmax_indices(curves: Sequence[np.ndarray], max_points: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum in every curve."""
+    n = len(curves[0])
+    if n <= max_points:
+        return np.arange(n)
+    buckets = (max_points - 2) // (2 * len(curves))
+    if buckets < 1:
+        # Too few points for a min and max of every curve: evenly spaced samples
+        return np.unique(np.linspace(0, n - 1, max_points).astype(np.int64))
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    chosen = [0, n - 1]
+    arrays = [np.asarray(values, dtype=np.float64) for values in curves]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        for values in arrays:
+            window = values[start:end]
+            if np.isnan(window).all():
+                chosen.append(start)
+                continue
+            chosen.append(start + int(np.nanargmin(window)))
+            chosen.append(start + int(np.nanargmax(window)))
+    return np.unique(chosen)
+
+
+def validate_downsampling(max_points: int, method: str):
+    """
+    Raises:
+        ValueError: For an unknown method or max_points below 3
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}' (use {' or '.join(DOWNSAMPLE_METHODS)})")
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+
+
+def downsample_indices(x, curves: Sequence[np.ndarray], max_points: int, method: str = 'lttb') -> np.ndarray:
+    """Sorted sample indices to keep so that at most max_points remain (see validate_downsampling)."""
+    validate_downsampling(max_points, method)
+    if method == 'minmax':
+        return minmax_indices(curves, max_points)
+    return lttb_indices(x, curves, max_points)
@@ -6,104 +6,47 @@ Uses AWS Bedrock AgentCore/Strands to perform petrophysical calculations
 import json
 import boto3
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from las_reader import parse_las, is_null, as_list, to_json_list
+from las_cache import WellCache
+from las_sidecar import load_current_sidecar
+from depth_index import get_depth_index
+from petro_kernels import density_porosity, shale_volume, archie_saturation, to_optional_list, as_curve, null_mask
+from curve_stats import StreamingStats, QuantileSketch, order_statistics, median
+from downsample import downsample_indices, validate_downsampling
+from derived_curves import DerivedCurveStore
+
 # Initialize S3 client
 s3_client = boto3.client('s3')
 S3_BUCKET = os.environ.get('STORAGE_BUCKET', 'amplify-digitalassistant--workshopstoragebucketd9b-mx1aevbdpmqy')
 
+# Parsed wells reused across invocations of a warm container
+well_cache = WellCache()
+# Computed porosity / shale volume / saturation curves, kept for the warm container.
+# The vectorized kernels recompute a curve faster than S3 returns a stored one,
+# so nothing is persisted.
+derived_store = DerivedCurveStore(persist=False)
+
 def parse_las_file(content: str) -> Dict[str, Any]:
-    """Simple LAS file parser"""
-    lines = content.splitlines()
-    well_info = {}
-    curves = {}
-    data = {}
-    section = None
-    curve_names = []
-    
-    for line in lines:
-        line = line.strip()
-        if line.startswith('~'):
-            section = line[1:].split()[0].upper()
-            continue
-            
-        if section == 'WELL':
-            if '.' in line and ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    key = parts[0].split('.')[0].strip()
-                    value = parts[1].strip()
-                    well_info[key] = value
-        
-        elif section == 'CURVE':
-            if '.' in line and ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    curve_name = parts[0].split('.')[0].strip()
-                    curve_names.append(curve_name)
-        
-        elif section == 'ASCII':
-            if line and not line.startswith('#'):
-                try:
-                    values = [float(x) for x in line.split()]
-                    if len(values) == len(curve_names):
-                        for i, name in enumerate(curve_names):
-                            if name not in data:
-                                data[name] = []
-                            data[name].append(values[i])
-                except ValueError:
-                    continue
-    
-    return {'well_info': well_info, 'curves': curve_names, 'data': data}
+    """Parse a LAS file into curve arrays (see las_reader.parse_las)"""
+    return parse_las(content)
 
 def calculate_porosity_density(rhob_data: List[float], matrix_density: float = 2.65, fluid_density: float = 1.0) -> List[float]:
-    """Calculate porosity using density method"""
-    porosity = []
-    for rhob in rhob_data:
-        if rhob != -999.25 and rhob != -9999:  # Filter null values
-            phi = (matrix_density - rhob) / (matrix_density - fluid_density)
-            phi = max(0.0, min(1.0, phi))  # Clamp between 0 and 1
-            porosity.append(phi)
-        else:
-            porosity.append(None)
-    return porosity
+    """Calculate porosity using density method (None for null samples)"""
+    return to_optional_list(density_porosity(rhob_data, matrix_density, fluid_density))
 
 def calculate_shale_volume(gr_data: List[float], gr_clean: float = 25, gr_shale: float = 150, method: str = 'linear') -> List[float]:
-    """Calculate shale volume using various methods"""
-    vsh = []
-    for gr in gr_data:
-        if gr != -999.25 and gr != -9999:
-            # Calculate gamma ray index
-            igr = (gr - gr_clean) / (gr_shale - gr_clean)
-            igr = max(0.0, min(1.0, igr))
-            
-            if method == 'linear':
-                vsh_value = igr
-            elif method == 'larionov_tertiary':
-                vsh_value = 0.083 * (2 ** (3.7 * igr) - 1)
-            elif method == 'larionov_pre_tertiary':
-                vsh_value = 0.33 * (2 ** (2 * igr) - 1)
-            elif method == 'clavier':
-                vsh_value = 1.7 - (3.38 - (igr + 0.7) ** 2) ** 0.5
-            else:
-                vsh_value = igr
-            
-            vsh.append(max(0.0, min(1.0, vsh_value)))
-        else:
-            vsh.append(None)
-    return vsh
+    """Calculate shale volume using various methods (None for null samples)"""
+    return to_optional_list(shale_volume(gr_data, gr_clean, gr_shale, method))
 
 def calculate_water_saturation(porosity: List[float], rt_data: List[float], rw: float = 0.1, a: float = 1.0, m: float = 2.0, n: float = 2.0) -> List[float]:
-    """Calculate water saturation using Archie's equation"""
-    sw = []
-    for phi, rt in zip(porosity, rt_data):
-        if phi and phi > 0 and rt and rt != -999.25 and rt != -9999:
-            # Archie's equation: Sw = ((a * Rw) / (phi^m * Rt))^(1/n)
-            sw_value = ((a * rw) / (phi ** m * rt)) ** (1 / n)
-            sw.append(max(0.0, min(1.0, sw_value)))
-        else:
-            sw.append(None)
-    return sw
+    """Calculate water saturation using Archie's equation (None where undefined)"""
+    return to_optional_list(archie_saturation(porosity, rt_data, rw, a, m, n))
 
 def calculate_data_completeness_impl(curve_data: List[float]) -> Dict[str, Any]:
     """
@@ -118,7 +61,7 @@ def calculate_data_completeness_impl(curve_data: List[float]) -> Dict[str, Any]:
         }
     """
     total_points = len(curve_data)
-    null_points = sum(1 for v in curve_data if v == -999.25 or v == -9999)
+    null_points = int(null_mask(as_curve(curve_data)).sum())
     valid_points = total_points - null_points
     completeness_percentage = valid_points / total_points if total_points > 0 else 0.0
     
@@ -150,11 +93,12 @@ def assess_curve_quality_impl(curve_name: str, curve_data: List[float], depths:
     data_completeness = completeness_metrics["completeness_percentage"]
     
     # Filter valid data
-    valid_data = [v for v in curve_data if v != -999.25 and v != -9999]
+    values = as_curve(curve_data)
+    valid_data = values[~null_mask(values)]
     
     validation_notes = []
     
-    if not valid_data:
+    if not len(valid_data):
         return {
             "curve_name": curve_name,
             "quality_flag": "poor",
@@ -166,24 +110,21 @@ def assess_curve_quality_impl(curve_name: str, curve_data: List[float], depths:
             "statistics": {}
         }
     
-    # Calculate statistics
-    mean_val = sum(valid_data) / len(valid_data)
-    variance = sum((x - mean_val) ** 2 for x in valid_data) / len(valid_data)
-    std_dev = variance ** 0.5
-    min_val = min(valid_data)
-    max_val = max(valid_data)
+    # Calculate statistics (one pass)
+    stats = StreamingStats.of(valid_data)
+    mean_val = stats.mean
+    std_dev = stats.std_dev
+    min_val = stats.min
+    max_val = stats.max
     
-    # Detect outliers using IQR method
-    sorted_data = sorted(valid_data)
-    q1_idx = len(sorted_data) // 4
-    q3_idx = 3 * len(sorted_data) // 4
-    q1 = sorted_data[q1_idx]
-    q3 = sorted_data[q3_idx]
+    # Detect outliers using IQR method (quartiles by partial partition)
+    count = len(valid_data)
+    q1, q3 = order_statistics(valid_data, [count // 4, 3 * count // 4])
     iqr = q3 - q1
     lower_bound = q1 - 1.5 * iqr
     upper_bound = q3 + 1.5 * iqr
-    outliers = [v for v in valid_data if v < lower_bound or v > upper_bound]
-    outlier_percentage = len(outliers) / len(valid_data) if valid_data else 0.0
+    outlier_count = int(np.count_nonzero((valid_data < lower_bound) | (valid_data > upper_bound)))
+    outlier_percentage = outlier_count / count
     
     # Calculate noise level (coefficient of variation)
     noise_level = std_dev / abs(mean_val) if mean_val != 0 else 0.0
@@ -209,7 +150,7 @@ def assess_curve_quality_impl(curve_name: str, curve_data: List[float], depths:
         validation_notes.append("Curve quality is within acceptable ranges")
     
     # Environmental corrections info
-    env_corrections = validate_environmental_corrections_impl(curve_name, valid_data)
+    env_corrections = validate_environmental_corrections_impl(curve_name, valid_data.tolist())
     
     return {
         "curve_name": curve_name,
@@ -224,7 +165,7 @@ def assess_curve_quality_impl(curve_name: str, curve_data: List[float], depths:
             "min": min_val,
             "max": max_val,
             "std_dev": std_dev,
-            "count": len(valid_data)
+            "count": count
         }
     }
 
@@ -313,783 +254,1039 @@ def validate_environmental_corrections_impl(curve_name: str, curve_data: List[fl
         "recommendations": recommendations
     }
 
-def handler(event, context):
+WELL_DATA_PREFIX = "global/well-data/"
+
+# Upper bound on the operations of one batch event
+MAX_BATCH_OPERATIONS = 25
+# Multi-well mode: wells per invocation and concurrent well loads
+MAX_FAN_OUT_WELLS = int(os.environ.get('MAX_FAN_OUT_WELLS', 500))
+FAN_OUT_CONCURRENCY = int(os.environ.get('FAN_OUT_CONCURRENCY', 8))
+# Time kept back from the Lambda deadline to return the summary table
+FAN_OUT_RESERVE_SECONDS = 3.0
+
+def list_well_catalog(page_size: Optional[int] = None, start_after: Optional[str] = None):
     """
-    Lambda handler for petrophysics calculations
+    Wells under the well-data prefix, following list_objects_v2 pagination
     
-    Expected event format:
-    {
-        "tool": "calculate_porosity" | "calculate_shale_volume" | "calculate_saturation",
-        "parameters": {
-            "well_name": "WELL-001",
-            "method": "density" | "neutron" | "linear" | "archie",
-            ...other parameters
-        }
-    }
+    Args:
+        page_size: Maximum number of wells to return (all if None)
+        start_after: next_token of the previous page (an S3 key)
+    
+    Returns:
+        ([{"name", "key", "size", "etag"}], next_token or None)
     """
-    print(f"Petrophysics Calculator invoked: {json.dumps(event)}")
+    kwargs = {'Bucket': S3_BUCKET, 'Prefix': WELL_DATA_PREFIX}
+    if start_after:
+        kwargs['StartAfter'] = start_after
+    wells = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(**kwargs):
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            if not key.endswith('.las'):
+                continue
+            if page_size is not None and len(wells) >= page_size:
+                return wells, wells[-1]['key']
+            wells.append({
+                'name': key.replace(WELL_DATA_PREFIX, '').replace('.las', ''),
+                'key': key,
+                'size': obj.get('Size'),
+                'etag': obj.get('ETag')
+            })
+    return wells, None
+
+def list_wells_response(parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Response of the list_wells tool
     
+    Without page_size every well is returned. With page_size, pass the
+    returned next_token back to get the following page.
+    """
+    parameters = parameters or {}
     try:
-        tool = event.get('tool')
-        parameters = event.get('parameters', {})
-        well_name = parameters.get('well_name', parameters.get('wellName'))
-        
-        # list_wells doesn't require well_name
-        if tool == 'list_wells':
-            try:
-                prefix = "global/well-data/"
-                response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix=prefix)
-                
-                wells = []
-                if 'Contents' in response:
-                    for obj in response['Contents']:
-                        key = obj['Key']
-                        if key.endswith('.las'):
-                            well_name_from_key = key.replace(prefix, '').replace('.las', '')
-                            wells.append(well_name_from_key)
-                
-                return {
-                    'success': True,
-                    'message': f"Found {len(wells)} wells in S3",
-                    'artifacts': [{
-                        'messageContentType': 'well_list',
-                        'analysisType': 'data_retrieval',
-                        'results': {
-                            'wells': wells,
-                            'count': len(wells)
-                        }
-                    }]
-                }
-            except Exception as e:
-                error_type = type(e).__name__
-                return {
-                    'success': False,
-                    'error': f"Failed to list wells from S3",
-                    'message': f"Unable to access S3 bucket to list wells due to {error_type}: {str(e)}",
-                    'suggestion': f"Check S3 bucket permissions and verify the Lambda has ListBucket access to s3://{S3_BUCKET}/global/well-data/",
-                    's3_location': f"s3://{S3_BUCKET}/global/well-data/"
-                }
-        
-        # All other tools require well_name
-        if not well_name:
-            return {
-                'success': False,
-                'error': 'well_name is required'
-            }
-        
-        # Fetch LAS file from S3
-        las_key = f"global/well-data/{well_name}.las"
-        print(f"Fetching LAS file: s3://{S3_BUCKET}/{las_key}")
-        
-        try:
-            response = s3_client.get_object(Bucket=S3_BUCKET, Key=las_key)
-            las_content = response['Body'].read().decode('utf-8')
-        except s3_client.exceptions.NoSuchKey:
-            return {
-                'success': False,
-                'error': f"Well '{well_name}' not found in S3",
-                'message': f"The well '{well_name}' does not exist in the data storage.",
-                'suggestion': f"Available wells can be listed using the list_wells tool. Verify the well name is correct.",
-                's3_location': f"s3://{S3_BUCKET}/{las_key}"
-            }
-        except Exception as e:
-            error_type = type(e).__name__
-            return {
-                'success': False,
-                'error': f"Failed to access S3 bucket",
-                'message': f"Unable to fetch LAS file from S3 due to {error_type}: {str(e)}",
-                'suggestion': "Check S3 bucket permissions and verify the Lambda has read access to the bucket.",
-                's3_location': f"s3://{S3_BUCKET}/{las_key}"
-            }
-        
-        # Parse LAS file
-        try:
-            las_data = parse_las_file(las_content)
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f"Failed to parse LAS file for well '{well_name}'",
-                'message': f"The LAS file could not be parsed: {str(e)}",
-                'suggestion': "Verify the LAS file format is valid and follows standard LAS 2.0 specification.",
-                's3_location': f"s3://{S3_BUCKET}/{las_key}"
-            }
+        page_size = parameters.get('page_size')
+        catalog, next_token = list_well_catalog(
+            int(page_size) if page_size else None,
+            parameters.get('next_token')
+        )
+        wells = [well['name'] for well in catalog]
         
-        # Perform calculation based on tool
-        if tool == 'calculate_porosity':
-            method = parameters.get('method', 'density')
-            
-            if method == 'density':
-                if 'RHOB' not in las_data['data']:
-                    return {
-                        'success': False,
-                        'error': f"Required curve 'RHOB' not found in well '{well_name}'",
-                        'message': f"The RHOB (bulk density) curve is required for density porosity calculation but is missing from well '{well_name}'.",
-                        'available_curves': las_data['curves'],
-                        'suggestion': "Verify the LAS file contains RHOB curve data. Available curves are listed above."
-                    }
-                
-                matrix_density = parameters.get('matrix_density', 2.65)
-                fluid_density = parameters.get('fluid_density', 1.0)
-                
-                porosity = calculate_porosity_density(
-                    las_data['data']['RHOB'],
-                    matrix_density,
-                    fluid_density
-                )
-                
-                # Filter out None values for statistics
-                valid_porosity = [p for p in porosity if p is not None]
-                
-                mean_porosity = sum(valid_porosity) / len(valid_porosity) if valid_porosity else 0
-                
-                return {
-                    'success': True,
-                    'message': f"Calculated porosity for {well_name} using {method} method. Mean porosity: {mean_porosity:.3f}" if valid_porosity else "No valid data",
-                    'artifacts': [{
-                        'messageContentType': 'comprehensive_porosity_analysis',
-                        'analysisType': 'single_well',
-                        'wellName': well_name,
-                        'results': {
-                            'method': method,
-                            'curveData': {
-                                'porosity': porosity[:100]  # Limit to first 100 points
-                            },
-                            'statistics': {
-                                'mean': mean_porosity,
-                                'min': min(valid_porosity) if valid_porosity else 0,
-                                'max': max(valid_porosity) if valid_porosity else 0,
-                                'count': len(valid_porosity),
-                                'std_dev': 0  # Calculate if needed
-                            },
-                            'dataQuality': {
-                                'completeness': len(valid_porosity) / len(porosity) if porosity else 0,
-                                'validPoints': len(valid_porosity),
-                                'totalPoints': len(porosity)
-                            }
-                        }
-                    }]
+        return {
+            'success': True,
+            'message': f"Found {len(wells)} wells in S3" + (" (more available)" if next_token else ""),
+            'artifacts': [{
+                'messageContentType': 'well_list',
+                'analysisType': 'data_retrieval',
+                'results': {
+                    'wells': wells,
+                    'count': len(wells),
+                    'next_token': next_token
                 }
+            }]
+        }
+    except Exception as e:
+        error_type = type(e).__name__
+        return {
+            'success': False,
+            'error': f"Failed to list wells from S3",
+            'message': f"Unable to access S3 bucket to list wells due to {error_type}: {str(e)}",
+            'suggestion': f"Check S3 bucket permissions and verify the Lambda has ListBucket access to s3://{S3_BUCKET}/{WELL_DATA_PREFIX}",
+            's3_location': f"s3://{S3_BUCKET}/{WELL_DATA_PREFIX}"
+        }
+
+def load_well(well_name: str, sidecar_options: Optional[Dict[str, Any]] = None):
+    """
+    Load a well's parsed LAS data (warm cache, current sidecar or text parse)
+    
+    Args:
+        sidecar_options: curves / depth_range to read selectively from a sidecar
+    
+    Returns:
+        (las_data, None) on success, or (None, error response)
+    """
+    las_key = f"{WELL_DATA_PREFIX}{well_name}.las"
+    print(f"Fetching LAS file: s3://{S3_BUCKET}/{las_key}")
+
+    def load_sidecar():
+        return load_current_sidecar(s3_client, S3_BUCKET, las_key, **(sidecar_options or {}))
+
+    try:
+        las_data, response = well_cache.fetch(s3_client, S3_BUCKET, las_key, load_sidecar)
+        las_content = response['Body'].read().decode('utf-8') if response else None
+    except s3_client.exceptions.NoSuchKey:
+        return None, {
+            'success': False,
+            'error': f"Well '{well_name}' not found in S3",
+            'message': f"The well '{well_name}' does not exist in the data storage.",
+            'suggestion': f"Available wells can be listed using the list_wells tool. Verify the well name is correct.",
+            's3_location': f"s3://{S3_BUCKET}/{las_key}"
+        }
+    except Exception as e:
+        error_type = type(e).__name__
+        return None, {
+            'success': False,
+            'error': f"Failed to access S3 bucket",
+            'message': f"Unable to fetch LAS file from S3 due to {error_type}: {str(e)}",
+            'suggestion': "Check S3 bucket permissions and verify the Lambda has read access to the bucket.",
+            's3_location': f"s3://{S3_BUCKET}/{las_key}"
+        }
+    
+    # Parse LAS file (unless the warm cache already holds it)
+    try:
+        if las_data is None:
+            las_data = well_cache.put(S3_BUCKET, las_key, response.get('ETag'), parse_las_file(las_content))
+        else:
+            print(f"Using cached LAS data for {las_key}")
+    except Exception as e:
+        return None, {
+            'success': False,
+            'error': f"Failed to parse LAS file for well '{well_name}'",
+            'message': f"The LAS file could not be parsed: {str(e)}",
+            'suggestion': "Verify the LAS file format is valid and follows standard LAS 2.0 specification.",
+            's3_location': f"s3://{S3_BUCKET}/{las_key}"
+        }
+    return las_data, None
+
+def derived_curve(well_name: str, las_data: Dict[str, Any], method: str, parameters: Dict[str, Any], compute):
+    """
+    A computed curve, reused from the derived-curve store while the well's LAS object is unchanged
+    
+    Args:
+        method: Calculation name (part of the stored key)
+        parameters: Every parameter the curve depends on
+        compute: Returns the curve as an array
+    """
+    result = derived_store.fetch(
+        s3_client, S3_BUCKET, f"{WELL_DATA_PREFIX}{well_name}.las", las_data.get('source_etag'),
+        method, parameters, lambda: {'values': compute()}
+    )
+    return result['values']
+
+def run_tool(tool: str, parameters: Dict[str, Any], well_name: str, las_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one well tool on loaded LAS data"""
+    if tool == 'calculate_porosity':
+        method = parameters.get('method', 'density')
         
-        elif tool == 'calculate_shale_volume':
-            if 'GR' not in las_data['data']:
+        if method == 'density':
+            if 'RHOB' not in las_data['data']:
                 return {
                     'success': False,
-                    'error': f"Required curve 'GR' not found in well '{well_name}'",
-                    'message': f"The GR (gamma ray) curve is required for shale volume calculation but is missing from well '{well_name}'.",
+                    'error': f"Required curve 'RHOB' not found in well '{well_name}'",
+                    'message': f"The RHOB (bulk density) curve is required for density porosity calculation but is missing from well '{well_name}'.",
                     'available_curves': las_data['curves'],
-                    'suggestion': "Verify the LAS file contains GR curve data. Available curves are listed above."
+                    'suggestion': "Verify the LAS file contains RHOB curve data. Available curves are listed above."
                 }
             
-            method = parameters.get('method', 'linear')
-            gr_clean = parameters.get('gr_clean', 25)
-            gr_shale = parameters.get('gr_shale', 150)
+            matrix_density = parameters.get('matrix_density', 2.65)
+            fluid_density = parameters.get('fluid_density', 1.0)
             
-            vsh = calculate_shale_volume(
-                las_data['data']['GR'],
-                gr_clean,
-                gr_shale,
-                method
+            porosity = derived_curve(
+                well_name, las_data, 'porosity_density',
+                {'matrix_density': matrix_density, 'fluid_density': fluid_density},
+                lambda: density_porosity(las_data['data']['RHOB'], matrix_density, fluid_density)
             )
             
-            valid_vsh = [v for v in vsh if v is not None]
-            mean_vsh = sum(valid_vsh) / len(valid_vsh) if valid_vsh else 0
+            # Filter out undefined samples for statistics
+            valid_porosity = porosity[~np.isnan(porosity)].tolist()
+            
+            mean_porosity = sum(valid_porosity) / len(valid_porosity) if valid_porosity else 0
             
             return {
                 'success': True,
-                'message': f"Calculated shale volume for {well_name} using {method} method. Mean Vsh: {mean_vsh:.3f}" if valid_vsh else "No valid data",
+                'message': f"Calculated porosity for {well_name} using {method} method. Mean porosity: {mean_porosity:.3f}" if valid_porosity else "No valid data",
                 'artifacts': [{
-                    'messageContentType': 'shale_volume_analysis',
+                    'messageContentType': 'comprehensive_porosity_analysis',
                     'analysisType': 'single_well',
                     'wellName': well_name,
                     'results': {
                         'method': method,
                         'curveData': {
-                            'shale_volume': vsh[:100]
+                            'porosity': to_optional_list(porosity[:100])  # Limit to first 100 points
                         },
                         'statistics': {
-                            'mean': mean_vsh,
-                            'min': min(valid_vsh) if valid_vsh else 0,
-                            'max': max(valid_vsh) if valid_vsh else 0,
-                            'count': len(valid_vsh),
-                            'std_dev': 0
+                            'mean': mean_porosity,
+                            'min': min(valid_porosity) if valid_porosity else 0,
+                            'max': max(valid_porosity) if valid_porosity else 0,
+                            'count': len(valid_porosity),
+                            'std_dev': 0  # Calculate if needed
                         },
                         'dataQuality': {
-                            'completeness': len(valid_vsh) / len(vsh) if vsh else 0,
-                            'validPoints': len(valid_vsh),
-                            'totalPoints': len(vsh)
+                            'completeness': len(valid_porosity) / len(porosity) if len(porosity) else 0,
+                            'validPoints': len(valid_porosity),
+                            'totalPoints': len(porosity)
                         }
                     }
                 }]
             }
+    
+    elif tool == 'calculate_shale_volume':
+        if 'GR' not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"Required curve 'GR' not found in well '{well_name}'",
+                'message': f"The GR (gamma ray) curve is required for shale volume calculation but is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "Verify the LAS file contains GR curve data. Available curves are listed above."
+            }
         
-        elif tool == 'calculate_saturation':
-            # Need porosity and resistivity
-            missing_curves = []
-            if 'RHOB' not in las_data['data']:
-                missing_curves.append('RHOB (bulk density)')
-            if 'RT' not in las_data['data']:
-                missing_curves.append('RT (resistivity)')
-            
-            if missing_curves:
-                return {
-                    'success': False,
-                    'error': f"Required curves missing from well '{well_name}': {', '.join(missing_curves)}",
-                    'message': f"Water saturation calculation requires RHOB and RT curves, but the following are missing: {', '.join(missing_curves)}",
-                    'available_curves': las_data['curves'],
-                    'suggestion': "Verify the LAS file contains both RHOB and RT curve data. Available curves are listed above."
+        method = parameters.get('method', 'linear')
+        gr_clean = parameters.get('gr_clean', 25)
+        gr_shale = parameters.get('gr_shale', 150)
+        
+        vsh = derived_curve(
+            well_name, las_data, f"shale_volume_{method}",
+            {'gr_clean': gr_clean, 'gr_shale': gr_shale},
+            lambda: shale_volume(las_data['data']['GR'], gr_clean, gr_shale, method)
+        )
+        
+        valid_vsh = vsh[~np.isnan(vsh)].tolist()
+        mean_vsh = sum(valid_vsh) / len(valid_vsh) if valid_vsh else 0
+        
+        return {
+            'success': True,
+            'message': f"Calculated shale volume for {well_name} using {method} method. Mean Vsh: {mean_vsh:.3f}" if valid_vsh else "No valid data",
+            'artifacts': [{
+                'messageContentType': 'shale_volume_analysis',
+                'analysisType': 'single_well',
+                'wellName': well_name,
+                'results': {
+                    'method': method,
+                    'curveData': {
+                        'shale_volume': to_optional_list(vsh[:100])
+                    },
+                    'statistics': {
+                        'mean': mean_vsh,
+                        'min': min(valid_vsh) if valid_vsh else 0,
+                        'max': max(valid_vsh) if valid_vsh else 0,
+                        'count': len(valid_vsh),
+                        'std_dev': 0
+                    },
+                    'dataQuality': {
+                        'completeness': len(valid_vsh) / len(vsh) if len(vsh) else 0,
+                        'validPoints': len(valid_vsh),
+                        'totalPoints': len(vsh)
+                    }
                 }
-            
-            # First calculate porosity
-            porosity = calculate_porosity_density(las_data['data']['RHOB'])
-            
-            # Then calculate saturation
-            rw = parameters.get('rw', 0.1)
-            a = parameters.get('a', 1.0)
-            m = parameters.get('m', 2.0)
-            n = parameters.get('n', 2.0)
-            
-            sw = calculate_water_saturation(porosity, las_data['data']['RT'], rw, a, m, n)
-            
-            valid_sw = [s for s in sw if s is not None]
-            mean_sw = sum(valid_sw) / len(valid_sw) if valid_sw else 0
-            
+            }]
+        }
+    
+    elif tool == 'calculate_saturation':
+        # Need porosity and resistivity
+        missing_curves = []
+        if 'RHOB' not in las_data['data']:
+            missing_curves.append('RHOB (bulk density)')
+        if 'RT' not in las_data['data']:
+            missing_curves.append('RT (resistivity)')
+        
+        if missing_curves:
             return {
-                'success': True,
-                'message': f"Calculated water saturation for {well_name} using Archie's equation. Mean Sw: {mean_sw:.3f}" if valid_sw else "No valid data",
-                'artifacts': [{
-                    'messageContentType': 'water_saturation_analysis',
-                    'analysisType': 'single_well',
-                    'wellName': well_name,
-                    'results': {
-                        'method': 'archie',
-                        'curveData': {
-                            'water_saturation': sw[:100]
-                        },
-                        'statistics': {
-                            'mean': mean_sw,
-                            'min': min(valid_sw) if valid_sw else 0,
-                            'max': max(valid_sw) if valid_sw else 0,
-                            'count': len(valid_sw),
-                            'std_dev': 0
-                        },
-                        'dataQuality': {
-                            'completeness': len(valid_sw) / len(sw) if sw else 0,
-                            'validPoints': len(valid_sw),
-                            'totalPoints': len(sw)
-                        }
+                'success': False,
+                'error': f"Required curves missing from well '{well_name}': {', '.join(missing_curves)}",
+                'message': f"Water saturation calculation requires RHOB and RT curves, but the following are missing: {', '.join(missing_curves)}",
+                'available_curves': las_data['curves'],
+                'suggestion': "Verify the LAS file contains both RHOB and RT curve data. Available curves are listed above."
+            }
+        
+        # First calculate porosity
+        porosity = derived_curve(
+            well_name, las_data, 'porosity_density',
+            {'matrix_density': 2.65, 'fluid_density': 1.0},
+            lambda: density_porosity(las_data['data']['RHOB'])
+        )
+        
+        # Then calculate saturation
+        rw = parameters.get('rw', 0.1)
+        a = parameters.get('a', 1.0)
+        m = parameters.get('m', 2.0)
+        n = parameters.get('n', 2.0)
+        
+        sw = derived_curve(
+            well_name, las_data, 'water_saturation_archie',
+            {'porosity': 'porosity_density', 'matrix_density': 2.65, 'fluid_density': 1.0,
+             'rw': rw, 'a': a, 'm': m, 'n': n},
+            lambda: archie_saturation(porosity, las_data['data']['RT'], rw, a, m, n)
+        )
+        
+        valid_sw = sw[~np.isnan(sw)].tolist()
+        mean_sw = sum(valid_sw) / len(valid_sw) if valid_sw else 0
+        
+        return {
+            'success': True,
+            'message': f"Calculated water saturation for {well_name} using Archie's equation. Mean Sw: {mean_sw:.3f}" if valid_sw else "No valid data",
+            'artifacts': [{
+                'messageContentType': 'water_saturation_analysis',
+                'analysisType': 'single_well',
+                'wellName': well_name,
+                'results': {
+                    'method': 'archie',
+                    'curveData': {
+                        'water_saturation': to_optional_list(sw[:100])
+                    },
+                    'statistics': {
+                        'mean': mean_sw,
+                        'min': min(valid_sw) if valid_sw else 0,
+                        'max': max(valid_sw) if valid_sw else 0,
+                        'count': len(valid_sw),
+                        'std_dev': 0
+                    },
+                    'dataQuality': {
+                        'completeness': len(valid_sw) / len(sw) if len(sw) else 0,
+                        'validPoints': len(valid_sw),
+                        'totalPoints': len(sw)
                     }
-                }]
+                }
+            }]
+        }
+    
+    elif tool == 'get_well_info':
+        # Return well header information and available curves
+        return {
+            'success': True,
+            'message': f"Retrieved well information for {well_name}",
+            'artifacts': [{
+                'messageContentType': 'well_info',
+                'analysisType': 'data_retrieval',
+                'wellName': well_name,
+                'results': {
+                    'well_info': las_data['well_info'],
+                    'curves': las_data['curves'],
+                    'curve_count': len(las_data['curves'])
+                }
+            }]
+        }
+    
+    elif tool == 'get_curve_data':
+        # Return curve data for specified depth range
+        curve_names = parameters.get('curves', parameters.get('curve_names', []))
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        if not curve_names:
+            return {
+                'success': False,
+                'error': 'curves parameter is required (list of curve names)'
             }
         
-        elif tool == 'get_well_info':
-            # Return well header information and available curves
+        # Check if curves exist
+        missing_curves = [c for c in curve_names if c not in las_data['data']]
+        if missing_curves:
             return {
-                'success': True,
-                'message': f"Retrieved well information for {well_name}",
-                'artifacts': [{
-                    'messageContentType': 'well_info',
-                    'analysisType': 'data_retrieval',
-                    'wellName': well_name,
-                    'results': {
-                        'well_info': las_data['well_info'],
-                        'curves': las_data['curves'],
-                        'curve_count': len(las_data['curves'])
-                    }
-                }]
+                'success': False,
+                'error': f"Required curves not found in well '{well_name}': {', '.join(missing_curves)}",
+                'message': f"The following curves are missing from well '{well_name}': {', '.join(missing_curves)}",
+                'available_curves': las_data['curves'],
+                'suggestion': f"Verify the LAS file contains the requested curves. Available curves: {', '.join(las_data['curves'])}"
             }
         
-        elif tool == 'get_curve_data':
-            # Return curve data for specified depth range
-            curve_names = parameters.get('curves', parameters.get('curve_names', []))
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            if not curve_names:
-                return {
-                    'success': False,
-                    'error': 'curves parameter is required (list of curve names)'
-                }
-            
-            # Check if curves exist
-            missing_curves = [c for c in curve_names if c not in las_data['data']]
-            if missing_curves:
+        # Get depth data
+        if 'DEPT' not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"DEPT curve not found in well '{well_name}'",
+                'message': f"The DEPT (depth) curve is required but is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "DEPT curve is essential for depth-based operations. Verify the LAS file contains depth data."
+            }
+        
+        max_points = parameters.get('max_points')
+        downsample_method = parameters.get('downsample_method', 'lttb')
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+                validate_downsampling(max_points, downsample_method)
+            except (TypeError, ValueError) as e:
                 return {
                     'success': False,
-                    'error': f"Required curves not found in well '{well_name}': {', '.join(missing_curves)}",
-                    'message': f"The following curves are missing from well '{well_name}': {', '.join(missing_curves)}",
-                    'available_curves': las_data['curves'],
-                    'suggestion': f"Verify the LAS file contains the requested curves. Available curves: {', '.join(las_data['curves'])}"
+                    'error': f"Invalid downsampling parameters: {str(e)}"
                 }
-            
-            # Get depth data
+        
+        # Depth range as a slice of the samples (binary search on DEPT)
+        depth_index = get_depth_index(las_data)
+        depths = depth_index.select(las_data['data']['DEPT'], depth_start, depth_end)
+        selected = {curve_name: depth_index.select(las_data['data'][curve_name], depth_start, depth_end)
+                    for curve_name in curve_names}
+        total_points = len(depths)
+        
+        # Optional shape-preserving downsampling, one index set for all curves
+        if max_points is not None and total_points > max_points:
+            keep = downsample_indices(depths, [selected[c] for c in curve_names], max_points, downsample_method)
+            depths = depths[keep]
+            selected = {curve_name: values[keep] for curve_name, values in selected.items()}
+        
+        # Extract curve data (nulls reported as the file's null value)
+        null_value = las_data['null_value']
+        curve_data = {}
+        for curve_name in curve_names:
+            curve_data[curve_name] = to_json_list(selected[curve_name], null_value)
+        
+        curve_data['DEPT'] = to_json_list(depths, null_value)
+        
+        results = {
+            'curves': curve_data,
+            'depth_range': {
+                'start': curve_data['DEPT'][0] if curve_data['DEPT'] else None,
+                'end': curve_data['DEPT'][-1] if curve_data['DEPT'] else None
+            },
+            'point_count': len(curve_data['DEPT'])
+        }
+        if max_points is not None:
+            results['total_points'] = total_points
+            results['decimation_ratio'] = total_points / len(depths) if len(depths) else 1.0
+            results['downsampling'] = {
+                'method': downsample_method if total_points > max_points else 'none',
+                'max_points': max_points
+            }
+        
+        return {
+            'success': True,
+            'message': f"Retrieved {len(curve_names)} curves for {well_name}",
+            'artifacts': [{
+                'messageContentType': 'curve_data',
+                'analysisType': 'data_retrieval',
+                'wellName': well_name,
+                'results': results
+            }]
+        }
+    
+    elif tool == 'calculate_statistics':
+        # Calculate statistics for a specific curve
+        curve_name = parameters.get('curve', parameters.get('curve_name'))
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        if not curve_name:
+            return {
+                'success': False,
+                'error': 'curve parameter is required'
+            }
+        
+        if curve_name not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"Curve '{curve_name}' not found in well '{well_name}'",
+                'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
+            }
+        
+        # Get curve data
+        curve_data = las_data['data'][curve_name]
+        
+        # Filter by depth range if specified
+        if depth_start is not None or depth_end is not None:
             if 'DEPT' not in las_data['data']:
                 return {
                     'success': False,
                     'error': f"DEPT curve not found in well '{well_name}'",
-                    'message': f"The DEPT (depth) curve is required but is missing from well '{well_name}'.",
+                    'message': f"Depth filtering requires DEPT curve, but it is missing from well '{well_name}'.",
                     'available_curves': las_data['curves'],
-                    'suggestion': "DEPT curve is essential for depth-based operations. Verify the LAS file contains depth data."
+                    'suggestion': "Cannot filter by depth range without DEPT curve. Remove depth_start/depth_end parameters or use a well with DEPT data."
                 }
             
-            depths = las_data['data']['DEPT']
-            
-            # Filter by depth range if specified
-            start_idx = 0
-            end_idx = len(depths)
-            
-            if depth_start is not None:
-                for i, d in enumerate(depths):
-                    if d >= depth_start:
-                        start_idx = i
-                        break
-            
-            if depth_end is not None:
-                for i, d in enumerate(depths):
-                    if d > depth_end:
-                        end_idx = i
-                        break
-            
-            # Extract curve data
-            curve_data = {}
-            for curve_name in curve_names:
-                curve_data[curve_name] = las_data['data'][curve_name][start_idx:end_idx]
-            
-            curve_data['DEPT'] = depths[start_idx:end_idx]
-            
+            curve_data = get_depth_index(las_data).select(curve_data, depth_start, depth_end)
+        
+        # Filter out null values
+        values = as_curve(curve_data)
+        valid_data = values[~null_mask(values)]
+        
+        if not len(valid_data):
             return {
-                'success': True,
-                'message': f"Retrieved {len(curve_names)} curves for {well_name}",
-                'artifacts': [{
-                    'messageContentType': 'curve_data',
-                    'analysisType': 'data_retrieval',
-                    'wellName': well_name,
-                    'results': {
-                        'curves': curve_data,
-                        'depth_range': {
-                            'start': curve_data['DEPT'][0] if curve_data['DEPT'] else None,
-                            'end': curve_data['DEPT'][-1] if curve_data['DEPT'] else None
-                        },
-                        'point_count': len(curve_data['DEPT'])
-                    }
-                }]
+                'success': False,
+                'error': f"No valid data points found for curve '{curve_name}' in well '{well_name}'",
+                'message': f"All data points in curve '{curve_name}' are null values (no valid measurements).",
+                'suggestion': f"The curve exists but contains only null values. Check data quality or try a different depth range."
             }
         
-        elif tool == 'calculate_statistics':
-            # Calculate statistics for a specific curve
-            curve_name = parameters.get('curve', parameters.get('curve_name'))
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            if not curve_name:
-                return {
-                    'success': False,
-                    'error': 'curve parameter is required'
-                }
-            
-            if curve_name not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"Curve '{curve_name}' not found in well '{well_name}'",
-                    'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
-                }
-            
-            # Get curve data
-            curve_data = las_data['data'][curve_name]
-            
-            # Filter by depth range if specified
-            if depth_start is not None or depth_end is not None:
-                if 'DEPT' not in las_data['data']:
-                    return {
-                        'success': False,
-                        'error': f"DEPT curve not found in well '{well_name}'",
-                        'message': f"Depth filtering requires DEPT curve, but it is missing from well '{well_name}'.",
-                        'available_curves': las_data['curves'],
-                        'suggestion': "Cannot filter by depth range without DEPT curve. Remove depth_start/depth_end parameters or use a well with DEPT data."
+        # Calculate statistics in one pass; the median by partial partition
+        stats = StreamingStats.of(valid_data)
+        
+        return {
+            'success': True,
+            'message': f"Calculated statistics for {curve_name} in {well_name}",
+            'artifacts': [{
+                'messageContentType': 'curve_statistics',
+                'analysisType': 'data_retrieval',
+                'wellName': well_name,
+                'results': {
+                    'curve_name': curve_name,
+                    'statistics': {
+                        'mean': stats.mean,
+                        'median': median(valid_data),
+                        'min': stats.min,
+                        'max': stats.max,
+                        'std_dev': stats.std_dev,
+                        'skewness': stats.skewness,
+                        'count': stats.count,
+                        'total_points': len(curve_data),
+                        'completeness': stats.count / len(curve_data) if len(curve_data) else 0
                     }
-                
-                depths = las_data['data']['DEPT']
-                filtered_data = []
-                
-                for i, d in enumerate(depths):
-                    if (depth_start is None or d >= depth_start) and (depth_end is None or d <= depth_end):
-                        filtered_data.append(curve_data[i])
-                
-                curve_data = filtered_data
-            
-            # Filter out null values
-            valid_data = [v for v in curve_data if v != -999.25 and v != -9999]
-            
-            if not valid_data:
-                return {
-                    'success': False,
-                    'error': f"No valid data points found for curve '{curve_name}' in well '{well_name}'",
-                    'message': f"All data points in curve '{curve_name}' are null values (no valid measurements).",
-                    'suggestion': f"The curve exists but contains only null values. Check data quality or try a different depth range."
                 }
-            
-            # Calculate statistics
-            mean_val = sum(valid_data) / len(valid_data)
-            sorted_data = sorted(valid_data)
-            median_val = sorted_data[len(sorted_data) // 2] if len(sorted_data) % 2 == 1 else (sorted_data[len(sorted_data) // 2 - 1] + sorted_data[len(sorted_data) // 2]) / 2
-            
-            # Calculate standard deviation
-            variance = sum((x - mean_val) ** 2 for x in valid_data) / len(valid_data)
-            std_dev = variance ** 0.5
-            
+            }]
+        }
+    
+    elif tool == 'assess_well_data_quality':
+        # Assess quality of all curves in the well
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        # Get depth data
+        if 'DEPT' not in las_data['data']:
             return {
-                'success': True,
-                'message': f"Calculated statistics for {curve_name} in {well_name}",
-                'artifacts': [{
-                    'messageContentType': 'curve_statistics',
-                    'analysisType': 'data_retrieval',
-                    'wellName': well_name,
-                    'results': {
-                        'curve_name': curve_name,
-                        'statistics': {
-                            'mean': mean_val,
-                            'median': median_val,
-                            'min': min(valid_data),
-                            'max': max(valid_data),
-                            'std_dev': std_dev,
-                            'count': len(valid_data),
-                            'total_points': len(curve_data),
-                            'completeness': len(valid_data) / len(curve_data) if curve_data else 0
-                        }
-                    }
-                }]
+                'success': False,
+                'error': f"DEPT curve not found in well '{well_name}'",
+                'message': f"Data quality assessment requires DEPT curve, but it is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "DEPT curve is essential for quality assessment. Verify the LAS file contains depth data."
             }
         
-        elif tool == 'assess_well_data_quality':
-            # Assess quality of all curves in the well
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            # Get depth data
-            if 'DEPT' not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"DEPT curve not found in well '{well_name}'",
-                    'message': f"Data quality assessment requires DEPT curve, but it is missing from well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': "DEPT curve is essential for quality assessment. Verify the LAS file contains depth data."
-                }
+        depths = las_data['data']['DEPT']
+        
+        # Depth range as a slice of the samples (binary search on DEPT)
+        depth_index = get_depth_index(las_data)
+        
+        # Assess quality for each curve
+        curve_assessments = []
+        total_completeness = 0
+        total_outliers = 0
+        total_noise = 0
+        curve_count = 0
+        
+        for curve_name in las_data['curves']:
+            # Skip DEPT curve itself
+            if curve_name == 'DEPT':
+                continue
             
-            depths = las_data['data']['DEPT']
-            
-            # Filter depth range if specified
-            start_idx = 0
-            end_idx = len(depths)
-            
-            if depth_start is not None:
-                for i, d in enumerate(depths):
-                    if d >= depth_start:
-                        start_idx = i
-                        break
-            
-            if depth_end is not None:
-                for i, d in enumerate(depths):
-                    if d > depth_end:
-                        end_idx = i
-                        break
-            
-            # Assess quality for each curve
-            curve_assessments = []
-            total_completeness = 0
-            total_outliers = 0
-            total_noise = 0
-            curve_count = 0
-            
-            for curve_name in las_data['curves']:
-                # Skip DEPT curve itself
-                if curve_name == 'DEPT':
-                    continue
-                
-                # Get curve data for the specified depth range
-                curve_data = las_data['data'][curve_name][start_idx:end_idx]
-                depth_subset = depths[start_idx:end_idx]
-                
-                # Assess curve quality
-                assessment = assess_curve_quality_impl(curve_name, curve_data, depth_subset)
-                curve_assessments.append(assessment)
-                
-                # Accumulate for overall summary
-                total_completeness += assessment['data_completeness']
-                total_outliers += assessment['outlier_percentage']
-                total_noise += assessment['noise_level']
-                curve_count += 1
-            
-            # Calculate overall quality summary
-            if curve_count > 0:
-                avg_completeness = total_completeness / curve_count
-                avg_outliers = total_outliers / curve_count
-                avg_noise = total_noise / curve_count
-                
-                # Determine overall quality
-                if avg_completeness > 0.9 and avg_outliers < 0.05 and avg_noise < 0.1:
-                    overall_quality = "excellent"
-                elif avg_completeness > 0.8 and avg_outliers < 0.1 and avg_noise < 0.2:
-                    overall_quality = "good"
-                elif avg_completeness > 0.6 and avg_outliers < 0.2:
-                    overall_quality = "fair"
-                else:
-                    overall_quality = "poor"
+            # Get curve data for the specified depth range
+            curve_data = depth_index.select(las_data['data'][curve_name], depth_start, depth_end)
+            depth_subset = depth_index.select(depths, depth_start, depth_end)
+            
+            # Assess curve quality
+            assessment = assess_curve_quality_impl(curve_name, curve_data, depth_subset)
+            curve_assessments.append(assessment)
+            
+            # Accumulate for overall summary
+            total_completeness += assessment['data_completeness']
+            total_outliers += assessment['outlier_percentage']
+            total_noise += assessment['noise_level']
+            curve_count += 1
+        
+        # Calculate overall quality summary
+        if curve_count > 0:
+            avg_completeness = total_completeness / curve_count
+            avg_outliers = total_outliers / curve_count
+            avg_noise = total_noise / curve_count
+            
+            # Determine overall quality
+            if avg_completeness > 0.9 and avg_outliers < 0.05 and avg_noise < 0.1:
+                overall_quality = "excellent"
+            elif avg_completeness > 0.8 and avg_outliers < 0.1 and avg_noise < 0.2:
+                overall_quality = "good"
+            elif avg_completeness > 0.6 and avg_outliers < 0.2:
+                overall_quality = "fair"
             else:
-                avg_completeness = 0
-                avg_outliers = 0
-                avg_noise = 0
                 overall_quality = "poor"
-            
-            # Build concise quality message (1-2 sentences max)
-            # Detailed data is in the artifact for CloudscapeDataQualityDisplay
-            message = f"Assessed data quality for {well_name}: {overall_quality} quality across {curve_count} curves."
-            
+        else:
+            avg_completeness = 0
+            avg_outliers = 0
+            avg_noise = 0
+            overall_quality = "poor"
+        
+        # Build concise quality message (1-2 sentences max)
+        # Detailed data is in the artifact for CloudscapeDataQualityDisplay
+        message = f"Assessed data quality for {well_name}: {overall_quality} quality across {curve_count} curves."
+        
+        return {
+            'success': True,
+            'message': message,
+            'artifacts': [{
+                'messageContentType': 'well_data_quality',
+                'analysisType': 'single_well',
+                'wellName': well_name,
+                'results': {
+                    'well_name': well_name,
+                    'overall_quality': overall_quality,
+                    'summary': {
+                        'average_completeness': avg_completeness,
+                        'average_outliers': avg_outliers,
+                        'average_noise': avg_noise,
+                        'total_curves': curve_count
+                    },
+                    'curves': curve_assessments
+                }
+            }]
+        }
+    
+    elif tool == 'assess_curve_quality':
+        # Assess quality of a specific curve
+        curve_name = parameters.get('curve_name', parameters.get('curve'))
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        if not curve_name:
             return {
-                'success': True,
-                'message': message,
-                'artifacts': [{
-                    'messageContentType': 'well_data_quality',
-                    'analysisType': 'single_well',
-                    'wellName': well_name,
-                    'results': {
-                        'well_name': well_name,
-                        'overall_quality': overall_quality,
-                        'summary': {
-                            'average_completeness': avg_completeness,
-                            'average_outliers': avg_outliers,
-                            'average_noise': avg_noise,
-                            'total_curves': curve_count
-                        },
-                        'curves': curve_assessments
-                    }
-                }]
+                'success': False,
+                'error': 'curve_name parameter is required'
             }
         
-        elif tool == 'assess_curve_quality':
-            # Assess quality of a specific curve
-            curve_name = parameters.get('curve_name', parameters.get('curve'))
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            if not curve_name:
-                return {
-                    'success': False,
-                    'error': 'curve_name parameter is required'
-                }
-            
-            # Check if curve exists
-            if curve_name not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"Curve '{curve_name}' not found in well '{well_name}'",
-                    'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
-                }
-            
-            # Get depth data
-            if 'DEPT' not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"DEPT curve not found in well '{well_name}'",
-                    'message': f"Curve quality assessment requires DEPT curve, but it is missing from well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': "DEPT curve is essential for quality assessment. Verify the LAS file contains depth data."
-                }
-            
-            depths = las_data['data']['DEPT']
-            curve_data = las_data['data'][curve_name]
-            
-            # Filter by depth range if specified
-            start_idx = 0
-            end_idx = len(depths)
-            
-            if depth_start is not None:
-                for i, d in enumerate(depths):
-                    if d >= depth_start:
-                        start_idx = i
-                        break
-            
-            if depth_end is not None:
-                for i, d in enumerate(depths):
-                    if d > depth_end:
-                        end_idx = i
-                        break
-            
-            # Get curve data for the specified depth range
-            curve_data_subset = curve_data[start_idx:end_idx]
-            depth_subset = depths[start_idx:end_idx]
-            
-            # Assess curve quality using helper function
-            assessment = assess_curve_quality_impl(curve_name, curve_data_subset, depth_subset)
-            
+        # Check if curve exists
+        if curve_name not in las_data['data']:
             return {
-                'success': True,
-                'message': f"Assessed quality for curve {curve_name} in {well_name}. Quality: {assessment['quality_flag']}",
-                'artifacts': [{
-                    'messageContentType': 'curve_quality_assessment',
-                    'analysisType': 'single_curve',
-                    'wellName': well_name,
-                    'results': assessment
-                }]
+                'success': False,
+                'error': f"Curve '{curve_name}' not found in well '{well_name}'",
+                'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
             }
         
-        elif tool == 'calculate_data_completeness':
-            # Calculate detailed completeness metrics for a specific curve
-            curve_name = parameters.get('curve_name', parameters.get('curve'))
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            if not curve_name:
-                return {
-                    'success': False,
-                    'error': 'curve_name parameter is required'
-                }
-            
-            # Check if curve exists
-            if curve_name not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"Curve '{curve_name}' not found in well '{well_name}'",
-                    'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
-                }
-            
-            # Get depth data
-            if 'DEPT' not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"DEPT curve not found in well '{well_name}'",
-                    'message': f"Data completeness calculation requires DEPT curve, but it is missing from well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': "DEPT curve is essential for depth-based analysis. Verify the LAS file contains depth data."
-                }
-            
-            depths = las_data['data']['DEPT']
-            curve_data = las_data['data'][curve_name]
-            
-            # Filter by depth range if specified
-            start_idx = 0
-            end_idx = len(depths)
-            
-            if depth_start is not None:
-                for i, d in enumerate(depths):
-                    if d >= depth_start:
-                        start_idx = i
-                        break
-            
-            if depth_end is not None:
-                for i, d in enumerate(depths):
-                    if d > depth_end:
-                        end_idx = i
-                        break
-            
-            # Get curve data for the specified depth range
-            curve_data_subset = curve_data[start_idx:end_idx]
-            
-            # Calculate data completeness using helper function
-            completeness_metrics = calculate_data_completeness_impl(curve_data_subset)
-            
+        # Get depth data
+        if 'DEPT' not in las_data['data']:
             return {
-                'success': True,
-                'message': f"Calculated data completeness for curve {curve_name} in {well_name}. Completeness: {completeness_metrics['completeness_percentage']:.1%}",
-                'artifacts': [{
-                    'messageContentType': 'data_completeness',
-                    'analysisType': 'single_curve',
-                    'wellName': well_name,
-                    'results': {
-                        'curve_name': curve_name,
-                        'completeness_metrics': completeness_metrics
-                    }
-                }]
+                'success': False,
+                'error': f"DEPT curve not found in well '{well_name}'",
+                'message': f"Curve quality assessment requires DEPT curve, but it is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "DEPT curve is essential for quality assessment. Verify the LAS file contains depth data."
             }
         
-        elif tool == 'validate_environmental_corrections':
-            # Validate environmental corrections for a specific curve
-            curve_name = parameters.get('curve_name', parameters.get('curve'))
-            depth_start = parameters.get('depth_start')
-            depth_end = parameters.get('depth_end')
-            
-            if not curve_name:
-                return {
-                    'success': False,
-                    'error': 'curve_name parameter is required'
-                }
-            
-            # Check if curve exists
-            if curve_name not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"Curve '{curve_name}' not found in well '{well_name}'",
-                    'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
-                }
-            
-            # Get depth data
-            if 'DEPT' not in las_data['data']:
-                return {
-                    'success': False,
-                    'error': f"DEPT curve not found in well '{well_name}'",
-                    'message': f"Environmental corrections validation requires DEPT curve, but it is missing from well '{well_name}'.",
-                    'available_curves': las_data['curves'],
-                    'suggestion': "DEPT curve is essential for depth-based analysis. Verify the LAS file contains depth data."
-                }
-            
-            depths = las_data['data']['DEPT']
-            curve_data = las_data['data'][curve_name]
-            
-            # Filter by depth range if specified
-            start_idx = 0
-            end_idx = len(depths)
-            
-            if depth_start is not None:
-                for i, d in enumerate(depths):
-                    if d >= depth_start:
-                        start_idx = i
-                        break
-            
-            if depth_end is not None:
-                for i, d in enumerate(depths):
-                    if d > depth_end:
-                        end_idx = i
-                        break
-            
-            # Get curve data for the specified depth range
-            curve_data_subset = curve_data[start_idx:end_idx]
-            
-            # Filter out null values for validation
-            valid_data = [v for v in curve_data_subset if v != -999.25 and v != -9999]
-            
-            if not valid_data:
-                return {
-                    'success': False,
-                    'error': f"No valid data points found for curve '{curve_name}' in well '{well_name}'",
-                    'message': f"All data points in curve '{curve_name}' are null values (no valid measurements).",
-                    'suggestion': f"The curve exists but contains only null values. Check data quality or try a different depth range."
+        depths = las_data['data']['DEPT']
+        curve_data = las_data['data'][curve_name]
+        
+        # Depth range as a slice of the samples (binary search on DEPT)
+        depth_index = get_depth_index(las_data)
+        
+        # Get curve data for the specified depth range
+        curve_data_subset = depth_index.select(curve_data, depth_start, depth_end)
+        depth_subset = depth_index.select(depths, depth_start, depth_end)
+        
+        # Assess curve quality using helper function
+        assessment = assess_curve_quality_impl(curve_name, curve_data_subset, depth_subset)
+        
+        return {
+            'success': True,
+            'message': f"Assessed quality for curve {curve_name} in {well_name}. Quality: {assessment['quality_flag']}",
+            'artifacts': [{
+                'messageContentType': 'curve_quality_assessment',
+                'analysisType': 'single_curve',
+                'wellName': well_name,
+                'results': assessment
+            }]
+        }
+    
+    elif tool == 'calculate_data_completeness':
+        # Calculate detailed completeness metrics for a specific curve
+        curve_name = parameters.get('curve_name', parameters.get('curve'))
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        if not curve_name:
+            return {
+                'success': False,
+                'error': 'curve_name parameter is required'
+            }
+        
+        # Check if curve exists
+        if curve_name not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"Curve '{curve_name}' not found in well '{well_name}'",
+                'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
+            }
+        
+        # Get depth data
+        if 'DEPT' not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"DEPT curve not found in well '{well_name}'",
+                'message': f"Data completeness calculation requires DEPT curve, but it is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "DEPT curve is essential for depth-based analysis. Verify the LAS file contains depth data."
+            }
+        
+        curve_data = las_data['data'][curve_name]
+        
+        # Depth range as a slice of the samples (binary search on DEPT)
+        depth_index = get_depth_index(las_data)
+        
+        # Get curve data for the specified depth range
+        curve_data_subset = depth_index.select(curve_data, depth_start, depth_end)
+        
+        # Calculate data completeness using helper function
+        completeness_metrics = calculate_data_completeness_impl(curve_data_subset)
+        
+        return {
+            'success': True,
+            'message': f"Calculated data completeness for curve {curve_name} in {well_name}. Completeness: {completeness_metrics['completeness_percentage']:.1%}",
+            'artifacts': [{
+                'messageContentType': 'data_completeness',
+                'analysisType': 'single_curve',
+                'wellName': well_name,
+                'results': {
+                    'curve_name': curve_name,
+                    'completeness_metrics': completeness_metrics
                 }
-            
-            # Validate environmental corrections using helper function
-            validation_result = validate_environmental_corrections_impl(curve_name, valid_data)
-            
+            }]
+        }
+    
+    elif tool == 'validate_environmental_corrections':
+        # Validate environmental corrections for a specific curve
+        curve_name = parameters.get('curve_name', parameters.get('curve'))
+        depth_start = parameters.get('depth_start')
+        depth_end = parameters.get('depth_end')
+        
+        if not curve_name:
             return {
-                'success': True,
-                'message': f"Validated environmental corrections for curve {curve_name} in {well_name}. Status: {validation_result['validation_status']}",
-                'artifacts': [{
-                    'messageContentType': 'environmental_corrections_validation',
-                    'analysisType': 'single_curve',
-                    'wellName': well_name,
-                    'results': validation_result
-                }]
+                'success': False,
+                'error': 'curve_name parameter is required'
             }
         
-        else:
+        # Check if curve exists
+        if curve_name not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"Curve '{curve_name}' not found in well '{well_name}'",
+                'message': f"The curve '{curve_name}' does not exist in well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': f"Available curves in this well: {', '.join(las_data['curves'])}"
+            }
+        
+        # Get depth data
+        if 'DEPT' not in las_data['data']:
+            return {
+                'success': False,
+                'error': f"DEPT curve not found in well '{well_name}'",
+                'message': f"Environmental corrections validation requires DEPT curve, but it is missing from well '{well_name}'.",
+                'available_curves': las_data['curves'],
+                'suggestion': "DEPT curve is essential for depth-based analysis. Verify the LAS file contains depth data."
+            }
+        
+        curve_data = las_data['data'][curve_name]
+        
+        # Depth range as a slice of the samples (binary search on DEPT)
+        depth_index = get_depth_index(las_data)
+        
+        # Get curve data for the specified depth range
+        curve_data_subset = depth_index.select(curve_data, depth_start, depth_end)
+        
+        # Filter out null values for validation
+        valid_data = [v for v in as_list(curve_data_subset) if not is_null(v)]
+        
+        if not valid_data:
             return {
                 'success': False,
-                'error': f"Unknown tool: {tool}"
+                'error': f"No valid data points found for curve '{curve_name}' in well '{well_name}'",
+                'message': f"All data points in curve '{curve_name}' are null values (no valid measurements).",
+                'suggestion': f"The curve exists but contains only null values. Check data quality or try a different depth range."
             }
+        
+        # Validate environmental corrections using helper function
+        validation_result = validate_environmental_corrections_impl(curve_name, valid_data)
+        
+        return {
+            'success': True,
+            'message': f"Validated environmental corrections for curve {curve_name} in {well_name}. Status: {validation_result['validation_status']}",
+            'artifacts': [{
+                'messageContentType': 'environmental_corrections_validation',
+                'analysisType': 'single_curve',
+                'wellName': well_name,
+                'results': validation_result
+            }]
+        }
+    
+    else:
+        return {
+            'success': False,
+            'error': f"Unknown tool: {tool}"
+        }
+
+
+def handle_batch(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run several tools in one invocation
+    
+    Operations share the batch "parameters" (typically the well name); an
+    operation's own parameters override them. Each well is loaded once for
+    the whole batch, and every operation gets its own result or error.
+    """
+    operations = event.get('operations') or []
+    shared = event.get('parameters', {})
+    if not isinstance(operations, list) or not operations:
+        return {
+            'success': False,
+            'error': 'operations must be a non-empty list of {"tool": ..., "parameters": {...}}'
+        }
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return {
+            'success': False,
+            'error': f"Too many operations in batch: {len(operations)} (maximum {MAX_BATCH_OPERATIONS})"
+        }
+
+    wells = {}  # well name -> (las_data, error response)
+    results = []
+    for operation in operations:
+        tool = operation.get('tool')
+        parameters = {**shared, **operation.get('parameters', {})}
+        try:
+            if tool == 'list_wells':
+                result = list_wells_response(parameters)
+            else:
+                well_name = parameters.get('well_name', parameters.get('wellName'))
+                if not well_name:
+                    result = {'success': False, 'error': 'well_name is required'}
+                else:
+                    if well_name not in wells:
+                        wells[well_name] = load_well(well_name)
+                    las_data, error = wells[well_name]
+                    result = error or run_tool(tool, parameters, well_name, las_data)
+            if result is None:
+                result = {'success': False, 'error': f"{tool} is not available for these parameters"}
+        except Exception as e:
+            print(f"Error in batch operation {tool}: {str(e)}")
+            result = {
+                'success': False,
+                'error': f"Unexpected error in {tool}: {str(e)}"
+            }
+        results.append({'tool': tool, **result})
+
+    succeeded = sum(1 for r in results if r.get('success'))
+    return {
+        'success': succeeded == len(results),
+        'message': f"Completed {succeeded} of {len(results)} operations",
+        'results': results,
+        'artifacts': [artifact for r in results for artifact in r.get('artifacts', [])],
+        'wells_loaded': len(wells)
+    }
+
+def summarize_well_result(well_name: str, result: Dict[str, Any], seconds: float) -> Dict[str, Any]:
+    """One row of the multi-well summary table: scalar results and statistics of a tool response"""
+    row = {'well_name': well_name, 'success': bool(result.get('success')), 'seconds': round(seconds, 3)}
+    if not row['success']:
+        row['error'] = result.get('error', 'Unknown error')
+        return row
+    artifacts = result.get('artifacts') or [{}]
+    results = artifacts[0].get('results', {})
+    for key, value in results.items():
+        if isinstance(value, (str, int, float, bool)) and key != 'well_name':
+            row[key] = value
+    statistics = results.get('statistics')
+    if isinstance(statistics, dict):
+        row.update({k: v for k, v in statistics.items() if isinstance(v, (int, float))})
+    return row
+
+def curve_accumulators(las_data: Dict[str, Any], parameters: Dict[str, Any]):
+    """Mergeable statistics and quantile sketch of the curve a calculate_statistics call used"""
+    curve_name = parameters.get('curve', parameters.get('curve_name'))
+    values = get_depth_index(las_data).select(
+        las_data['data'][curve_name], parameters.get('depth_start'), parameters.get('depth_end')
+    ) if 'DEPT' in las_data['data'] else las_data['data'][curve_name]
+    values = as_curve(values)
+    values = values[~null_mask(values)]
+    return StreamingStats.of(values), QuantileSketch().update(values)
+
+def combined_statistics(stats: StreamingStats, sketch: QuantileSketch) -> Dict[str, Any]:
+    """Field-wide statistics merged from per-well accumulators (quantiles from the sketch)"""
+    p10, p50, p90 = sketch.quantiles([0.1, 0.5, 0.9])
+    return {**stats.to_dict(), 'p10': p10, 'p50': p50, 'p90': p90, 'quantiles': 'approximate'}
+
+def handle_multi_well(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """
+    Run one tool across many wells in one invocation
+    
+    Wells are loaded and evaluated on a bounded thread pool
+    (FAN_OUT_CONCURRENCY concurrent S3 reads). Wells still running near the
+    Lambda deadline are reported as timed out instead of failing the
+    whole invocation.
+    """
+    tool = event.get('tool')
+    parameters = event.get('parameters', {})
+    wells = event.get('wells')
+    if not tool or tool == 'list_wells':
+        return {'success': False, 'error': 'A per-well tool is required for multi-well mode'}
+
+    if wells in ('*', 'all'):
+        well_names = [well['name'] for well in list_well_catalog()[0]]
+    elif isinstance(wells, list) and all(isinstance(w, str) for w in wells):
+        well_names = list(dict.fromkeys(wells))
+    else:
+        return {'success': False, 'error': 'wells must be a list of well names or "all"'}
+    if len(well_names) > MAX_FAN_OUT_WELLS:
+        return {
+            'success': False,
+            'error': f"Too many wells: {len(well_names)} (maximum {MAX_FAN_OUT_WELLS})",
+            'suggestion': "Use list_wells with page_size and run each page separately."
+        }
+
+    concurrency = max(1, min(int(event.get('max_concurrency', FAN_OUT_CONCURRENCY)), FAN_OUT_CONCURRENCY))
+    timeout = None
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        timeout = max(0.0, context.get_remaining_time_in_millis() / 1000 - FAN_OUT_RESERVE_SECONDS)
+
+    def evaluate(well_name):
+        start = time.perf_counter()
+        las_data, error = load_well(well_name)
+        result = error or run_tool(tool, {**parameters, 'well_name': well_name}, well_name, las_data)
+        if result is None:
+            result = {'success': False, 'error': f"{tool} is not available for these parameters"}
+        accumulators = None
+        if tool == 'calculate_statistics' and result.get('success'):
+            accumulators = curve_accumulators(las_data, parameters)
+        return result, time.perf_counter() - start, accumulators
+
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    futures = [executor.submit(evaluate, name) for name in well_names]
+    _, pending = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    rows = []
+    combined_stats, combined_sketch = StreamingStats(), QuantileSketch()
+    for well_name, future in zip(well_names, futures):
+        if future in pending:
+            rows.append({'well_name': well_name, 'success': False, 'error': 'Timed out before the invocation deadline'})
+            continue
+        try:
+            result, seconds, accumulators = future.result()
+            rows.append(summarize_well_result(well_name, result, seconds))
+            if accumulators:
+                combined_stats.merge(accumulators[0])
+                combined_sketch.merge(accumulators[1])
+        except Exception as e:
+            rows.append({'well_name': well_name, 'success': False, 'error': f"Unexpected error: {str(e)}"})
+
+    succeeded = sum(1 for row in rows if row['success'])
+    elapsed = time.perf_counter() - start
+    return {
+        'success': succeeded > 0,
+        'message': f"Ran {tool} on {len(rows)} wells: {succeeded} succeeded, {len(rows) - succeeded} failed ({elapsed:.1f}s)",
+        'artifacts': [{
+            'messageContentType': 'multi_well_summary',
+            'analysisType': 'multi_well',
+            'results': {
+                'tool': tool,
+                'parameters': parameters,
+                'well_count': len(rows),
+                'succeeded': succeeded,
+                'failed': len(rows) - succeeded,
+                'max_concurrency': concurrency,
+                'seconds': round(elapsed, 3),
+                'summary': rows,
+                **({'combined': combined_statistics(combined_stats, combined_sketch)} if combined_stats.count else {})
+            }
+        }]
+    }
+
+def handler(event, context):
+    """
+    Lambda handler for petrophysics calculations
+    
+    Expected event format:
+    {
+        "tool": "calculate_porosity" | "calculate_shale_volume" | "calculate_saturation",
+        "parameters": {
+            "well_name": "WELL-001",
+            "method": "density" | "neutron" | "linear" | "archie",
+            ...other parameters
+        }
+    }
+    
+    Batch format (one invocation, the well is loaded once):
+    {
+        "operations": [
+            {"tool": "calculate_porosity", "parameters": {"method": "density"}},
+            {"tool": "calculate_shale_volume", "parameters": {"method": "clavier"}}
+        ],
+        "parameters": {"well_name": "WELL-001"}
+    }
+    Returns {"success", "message", "results": [per-operation response with
+    "tool"], "artifacts": [all artifacts in operation order]}.
+    
+    Multi-well format (one tool across wells, a summary row per well):
+    {
+        "tool": "calculate_porosity",
+        "parameters": {"method": "density"},
+        "wells": ["WELL-001", "WELL-002"] | "all",
+        "max_concurrency": 8
+    }
+    """
+    print(f"Petrophysics Calculator invoked: {json.dumps(event)}")
+    
+    try:
+        if 'operations' in event:
+            return handle_batch(event)
+        if 'wells' in event:
+            return handle_multi_well(event, context)
+
+        tool = event.get('tool')
+        parameters = event.get('parameters', {})
+        well_name = parameters.get('well_name', parameters.get('wellName'))
+        
+        # list_wells doesn't require well_name
+        if tool == 'list_wells':
+            return list_wells_response(parameters)
+        
+        # All other tools require well_name
+        if not well_name:
+            return {
+                'success': False,
+                'error': 'well_name is required'
+            }
+        
+        # A current columnar sidecar replaces the text parse; curve extraction
+        # reads only the requested curves and depth range from it
+        sidecar_options = {}
+        if tool == 'get_curve_data':
+            sidecar_options = {
+                'curves': parameters.get('curves', parameters.get('curve_names')) or None,
+                'depth_range': (parameters.get('depth_start'), parameters.get('depth_end'))
+            }
+
+        las_data, error = load_well(well_name, sidecar_options)
+        if error:
+            return error
+        
+        # Perform calculation based on tool
+        return run_tool(tool, parameters, well_name, las_data)
     
     except Exception as e:
         print(f"Error in petrophysics calculator: {str(e)}")
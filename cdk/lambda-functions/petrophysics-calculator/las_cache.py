@@ -0,0 +1,294 @@
+"""
+Warm-container cache of parsed LAS files for the petrophysics calculator.
+
+Parsed wells (see las_reader.parse_las) are kept at module level, so later
+invocations served by the same warm container reuse them. Entries are
+keyed by bucket/key and tagged with the S3 ETag. A cached entry is
+revalidated with a conditional GET (IfNoneMatch), which returns no body
+while the object is unchanged. The memory tier is an LRU bounded by array
+bytes. Evicted wells can optionally be spilled to /tmp as .npz files,
+which are also bounded in size.
+
+Environment:
+    LAS_CACHE_MAX_BYTES: memory budget for parsed arrays (default 128 MB, 0 disables)
+    LAS_CACHE_REVALIDATE_SECONDS: serve entries this recent without an S3 call (default 5)
+    LAS_CACHE_TMP_DIR: spill directory (default /tmp/las-cache)
+    LAS_CACHE_TMP_MAX_BYTES: spill budget (default 256 MB, 0 disables spilling)
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_TMP_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_REVALIDATE_SECONDS = 5.0
+DEFAULT_TMP_DIR = "/tmp/las-cache"
+
+# Header fields stored next to the array in a spill file
+_HEADER_FIELDS = ('well_info', 'curves', 'units', 'null_value', 'wrapped')
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _not_modified(error: Exception) -> bool:
+    """Whether a boto3 error is the 304 answer to a conditional GET."""
+    response = getattr(error, 'response', None) or {}
+    code = str(response.get('Error', {}).get('Code', ''))
+    status = response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    return code in ('304', 'NotModified') or status == 304
+
+
+def _freeze(las_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Make the shared arrays read-only so one invocation cannot alter another's data."""
+    las_data['array'].setflags(write=False)
+    for column in las_data['data'].values():
+        column.setflags(write=False)
+    return las_data
+
+
+class WellCache:
+    """
+    Byte-bounded LRU of parsed LAS files, keyed by (bucket, key) and ETag.
+
+    fetch() answers from memory or /tmp when the object is unchanged, and
+    otherwise (after trying a columnar sidecar) returns the S3 response for
+    the caller to parse; put() stores the parsed result. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        revalidate_seconds: Optional[float] = None,
+        tmp_dir: Optional[str] = None,
+        tmp_max_bytes: Optional[int] = None
+    ):
+        """
+        Create the cache.
+
+        Args:
+            max_bytes: Memory budget. If None, uses LAS_CACHE_MAX_BYTES
+            revalidate_seconds: Age below which entries are served without
+                revalidation. If None, uses LAS_CACHE_REVALIDATE_SECONDS
+            tmp_dir: Spill directory. If None, uses LAS_CACHE_TMP_DIR
+            tmp_max_bytes: Spill budget. If None, uses LAS_CACHE_TMP_MAX_BYTES
+        """
+        self.max_bytes = int(max_bytes if max_bytes is not None
+                             else _env_number('LAS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.revalidate_seconds = (revalidate_seconds if revalidate_seconds is not None
+                                   else _env_number('LAS_CACHE_REVALIDATE_SECONDS', DEFAULT_REVALIDATE_SECONDS))
+        self.tmp_dir = tmp_dir or os.environ.get('LAS_CACHE_TMP_DIR', DEFAULT_TMP_DIR)
+        self.tmp_max_bytes = int(tmp_max_bytes if tmp_max_bytes is not None
+                                 else _env_number('LAS_CACHE_TMP_MAX_BYTES', DEFAULT_TMP_MAX_BYTES))
+
+        self._entries = OrderedDict()  # (bucket, key) -> {etag, las_data, nbytes, checked_at}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.sidecar_loads = 0
+
+    def fetch(self, client, bucket: str, key: str, load_sidecar=None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Get a parsed well, or the S3 response to parse.
+
+        Args:
+            load_sidecar: Optional callable returning (ETag, parsed LAS) from a
+                current columnar sidecar, or None; tried before downloading
+                the LAS text on a cold miss
+
+        Returns:
+            (las_data, None) when the cached copy is current, otherwise
+            (None, get_object response). S3 errors (e.g. NoSuchKey) propagate.
+        """
+        cache_key = (bucket, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and time.monotonic() - entry['checked_at'] < self.revalidate_seconds:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry['las_data'], None
+
+        spilled = None
+        if entry is None:
+            spilled = self._read_spill(bucket, key)
+            etag = spilled['etag'] if spilled else None
+        else:
+            etag = entry['etag']
+
+        if etag is None:
+            loaded = load_sidecar() if load_sidecar else None
+            if loaded:
+                self.sidecar_loads += 1
+                return self.put(bucket, key, *loaded), None
+            self.misses += 1
+            return None, client.get_object(Bucket=bucket, Key=key)
+
+        try:
+            response = client.get_object(Bucket=bucket, Key=key, IfNoneMatch=etag)
+        except Exception as e:
+            if not _not_modified(e):
+                raise
+            if entry is not None:
+                with self._lock:
+                    entry['checked_at'] = time.monotonic()
+                    if cache_key in self._entries:
+                        self._entries.move_to_end(cache_key)
+                self.revalidations += 1
+                return entry['las_data'], None
+            self.spill_hits += 1
+            return self.put(bucket, key, etag, spilled['las_data']), None
+
+        # Changed since it was cached
+        self.misses += 1
+        self._drop(cache_key)
+        return None, response
+
+    def put(self, bucket: str, key: str, etag: Optional[str], las_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a parsed well under its ETag and return it (read-only).
+
+        The ETag is recorded in las_data['source_etag']. Objects without an
+        ETag, partial sidecar reads, and wells larger than the memory budget
+        are not cached in memory.
+        """
+        if etag:
+            las_data['source_etag'] = etag
+        if not etag or self.max_bytes <= 0 or las_data.get('partial'):
+            return las_data
+        nbytes = las_data['array'].nbytes
+        if nbytes > self.max_bytes:
+            return las_data
+
+        _freeze(las_data)
+        cache_key = (bucket, key)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous:
+                self._bytes -= previous['nbytes']
+            self._entries[cache_key] = {
+                'etag': etag,
+                'las_data': las_data,
+                'nbytes': nbytes,
+                'checked_at': time.monotonic()
+            }
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= old['nbytes']
+                evicted.append((old_key, old))
+
+        for (old_bucket, old_key), old in evicted:
+            self._write_spill(old_bucket, old_key, old['etag'], old['las_data'])
+        return las_data
+
+    def _drop(self, cache_key: Tuple[str, str]):
+        with self._lock:
+            entry = self._entries.pop(cache_key, None)
+            if entry:
+                self._bytes -= entry['nbytes']
+        self._remove_spill(*cache_key)
+
+    def _spill_path(self, bucket: str, key: str) -> str:
+        digest = hashlib.sha1(f"{bucket}/{key}".encode('utf-8')).hexdigest()
+        return os.path.join(self.tmp_dir, f"{digest}.npz")
+
+    def _write_spill(self, bucket: str, key: str, etag: str, las_data: Dict[str, Any]):
+        """Write a well to /tmp, then trim the spill directory to its budget."""
+        if self.tmp_max_bytes <= 0 or las_data['array'].nbytes > self.tmp_max_bytes:
+            return
+        try:
+            os.makedirs(self.tmp_dir, exist_ok=True)
+            path = self._spill_path(bucket, key)
+            header = {field: las_data[field] for field in _HEADER_FIELDS}
+            header['etag'] = etag
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, array=np.ascontiguousarray(las_data['array']),
+                         header=np.array(json.dumps(header)))
+            os.replace(tmp_path, path)
+            self._trim_spill()
+        except OSError as e:
+            print(f"LAS cache spill skipped: {e}")
+
+    def _read_spill(self, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+        if self.tmp_max_bytes <= 0:
+            return None
+        path = self._spill_path(bucket, key)
+        try:
+            with np.load(path, allow_pickle=False) as spill:
+                header = json.loads(str(spill['header']))
+                array = np.asfortranarray(spill['array'])
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        las_data = {field: header[field] for field in _HEADER_FIELDS}
+        las_data['array'] = array
+        las_data['data'] = {name: array[:, i] for i, name in enumerate(las_data['curves'])}
+        return {'etag': header['etag'], 'las_data': las_data}
+
+    def _remove_spill(self, bucket: str, key: str):
+        try:
+            os.remove(self._spill_path(bucket, key))
+        except OSError:
+            pass
+
+    def _trim_spill(self):
+        """Remove least recently used spill files until the directory fits its budget."""
+        files = []
+        for name in os.listdir(self.tmp_dir):
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.tmp_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.tmp_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Empty the memory tier (spill files are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, bytes used, budget and hit counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'spill_hits': self.spill_hits,
+                'sidecar_loads': self.sidecar_loads,
+                'misses': self.misses
+            }
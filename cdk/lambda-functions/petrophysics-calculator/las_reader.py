@@ -0,0 +1,172 @@
+"""
+Vectorized LAS reader for the petrophysics calculator.
+
+Header sections are scanned line by line; the ~A (ASCII) section is read
+in one numpy call into a 2-D float array. Null values (the file's NULL
+entry plus the common -999.25 / -9999 sentinels) become NaN, and each
+curve is exposed as a column view of that array, so downstream
+calculations work on arrays instead of per-curve Python lists.
+"""
+import io
+import posixpath
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Sentinels treated as missing data even when the header declares another NULL
+NULL_VALUES = (-999.25, -9999.0)
+
+
+def is_null(value: Optional[float]) -> bool:
+    """Whether a single value is missing (None, NaN or a null sentinel)."""
+    return value is None or value != value or value in NULL_VALUES
+
+
+def as_list(values) -> List[float]:
+    """Plain Python list of a curve (numpy arrays are converted in C)."""
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def to_json_list(values, null_value: float = NULL_VALUES[0]) -> List[float]:
+    """Curve values for a JSON response, with NaN written back as the null value."""
+    if isinstance(values, np.ndarray):
+        return np.where(np.isnan(values), null_value, values).tolist()
+    return list(values)
+
+
+def companion_prefix(las_prefix: str, store: str) -> str:
+    """Prefix of the files of one store built from the LAS files under las_prefix."""
+    directory = las_prefix.rstrip('/')
+    return f"{directory}-{store}/" if directory else f"{store}/"
+
+
+def companion_key(las_key: str, store: str) -> str:
+    """
+    Key (or path) of a file built from a LAS file, in a sibling prefix per store:
+    "global/well-data/W.las" -> "global/well-data-<store>/W.las". Listings of the
+    LAS prefix (the catalog Lambdas read one page of it) then only see LAS files.
+    """
+    directory, name = posixpath.split(las_key)
+    return companion_prefix(directory, store) + name
+
+
+def parse_las(content: str) -> Dict[str, Any]:
+    """
+    Parse LAS 2.0 text.
+
+    Returns:
+        {
+            "well_info": {mnemonic: value},
+            "curves": [curve names in file order],
+            "units": {curve name: unit},
+            "null_value": float,
+            "wrapped": bool,
+            "array": 2-D float64 array, shape (samples, curves), NaN for nulls,
+            "data": {curve name: 1-D column view of array}
+        }
+    """
+    well_info = {}
+    curve_names = []
+    units = {}
+    null_value = NULL_VALUES[0]
+    wrapped = False
+    section = None
+    data_text = ""
+
+    position = 0
+    length = len(content)
+    while position < length:
+        end = content.find('\n', position)
+        if end < 0:
+            end = length
+        line = content[position:end].strip()
+        position = end + 1
+
+        if not line or line.startswith('#'):
+            continue
+
+        if line.startswith('~'):
+            section = line[1:2].upper()
+            if section == 'A':
+                data_text = content[position:]
+                break
+            continue
+
+        if '.' not in line or ':' not in line:
+            continue
+        head, _, description = line.partition(':')
+        mnemonic, _, rest = head.partition('.')
+        mnemonic = mnemonic.strip()
+        unit, _, value = rest.partition(' ')
+        value = value.strip()
+
+        if section == 'V' and mnemonic.upper() == 'WRAP':
+            wrapped = value.upper().startswith('YES')
+        elif section == 'W':
+            # Header values are reported as the text after ':' (as before)
+            well_info[mnemonic] = description.strip()
+            if mnemonic.upper() == 'NULL':
+                try:
+                    null_value = float(value)
+                except ValueError:
+                    pass
+        elif section == 'C':
+            curve_names.append(mnemonic)
+            units[mnemonic] = unit.strip()
+
+    array = read_ascii(data_text, len(curve_names), wrapped)
+    nulls = set(NULL_VALUES) | {null_value}
+    array[np.isin(array, list(nulls))] = np.nan
+
+    return {
+        'well_info': well_info,
+        'curves': curve_names,
+        'units': units,
+        'null_value': null_value,
+        'wrapped': wrapped,
+        'array': array,
+        'data': {name: array[:, i] for i, name in enumerate(curve_names)}
+    }
+
+
+def read_ascii(data_text: str, column_count: int, wrapped: bool) -> np.ndarray:
+    """
+    Read the ~A section into a Fortran-ordered (samples, curves) array.
+
+    Unwrapped data is read row by row with np.loadtxt. Wrapped data (one
+    depth step spread over several lines) is read as a token stream and
+    reshaped; an incomplete final record is dropped. If the block has
+    malformed rows, rows with the wrong value count or non-numeric values
+    are skipped.
+    """
+    if column_count == 0 or not data_text.strip():
+        return np.empty((0, column_count), order='F')
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            if wrapped:
+                if '#' in data_text:
+                    data_text = "\n".join(line for line in data_text.splitlines() if not line.lstrip().startswith('#'))
+                values = np.array(data_text.split(), dtype=float)
+                rows = values.size // column_count
+                return np.asfortranarray(values[:rows * column_count].reshape(rows, column_count))
+            table = np.loadtxt(io.StringIO(data_text), dtype=float, ndmin=2, comments='#')
+        if table.shape[1] == column_count:
+            return np.asfortranarray(table)
+    except (ValueError, UserWarning):
+        pass
+
+    rows = []
+    for line in data_text.splitlines():
+        values = line.split()
+        if len(values) != column_count or values[0].startswith('#'):
+            continue
+        try:
+            rows.append([float(v) for v in values])
+        except ValueError:
+            continue
+    if not rows:
+        return np.empty((0, column_count), order='F')
+    return np.asfortranarray(np.array(rows, dtype=float))
@@ -0,0 +1,296 @@
+"""
+Columnar binary sidecar for LAS files.
+
+A sidecar stores a parsed LAS file in a sibling prefix of the original
+("global/well-data/WELL-001.las" -> "global/well-data-sidecars/WELL-001.las.col")
+so readers can skip the text parse. The layout is:
+
+    8 bytes   magic b"LASCOL1\\n"
+    8 bytes   little-endian uint64 header length
+    header    JSON: source key and ETag, well info, curves, units, null
+              value, row count, each column's offset from the data start
+              and a sparse depth index
+    padding   up to a 64-byte boundary
+    columns   one contiguous little-endian float64 block per curve, nulls as NaN
+
+Because every column sits at a known offset, readers fetch the header
+and then only the byte ranges of the requested curves (and, for a depth
+range, only the rows in that range) with HTTP Range requests or local
+file reads. A sidecar is only used while its recorded source ETag matches
+the LAS object; the converter is scripts/convert-las-sidecars.py.
+"""
+import json
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from depth_index import DepthIndex
+from las_reader import companion_key, companion_prefix
+
+SIDECAR_STORE = "sidecars"
+SIDECAR_SUFFIX = ".col"
+MAGIC = b"LASCOL1\n"
+FORMAT_VERSION = 1
+DTYPE = np.dtype('<f8')
+
+# Bytes requested for the first header read; larger headers take a second read
+HEADER_PROBE_BYTES = 16 * 1024
+# Entries of the sparse depth index stored in the header
+DEPTH_INDEX_SIZE = 256
+_ALIGNMENT = 64
+
+
+def sidecar_key(las_key: str) -> str:
+    """S3 key (or path) of the sidecar for a LAS file."""
+    return companion_key(las_key, SIDECAR_STORE) + SIDECAR_SUFFIX
+
+
+def sidecar_prefix(las_prefix: str) -> str:
+    """Prefix of the sidecars of the LAS files under las_prefix."""
+    return companion_prefix(las_prefix, SIDECAR_STORE)
+
+
+def encode_sidecar(las_data: Dict[str, Any], source_key: str, source_etag: Optional[str],
+                   depth_curve: str = 'DEPT') -> bytes:
+    """
+    Serialize a parsed LAS file (las_reader.parse_las output) to sidecar bytes.
+
+    Args:
+        las_data: Parsed LAS with 'curves', 'units', 'well_info', 'null_value',
+            'wrapped' and the 2-D 'array'
+        source_key: Key of the LAS object the sidecar was built from
+        source_etag: ETag of that object, used by readers to detect staleness
+        depth_curve: Curve indexed for depth-range reads when it is increasing
+    """
+    array = np.asarray(las_data['array'], dtype=DTYPE)
+    rows, column_count = array.shape
+    header = {
+        'version': FORMAT_VERSION,
+        'source_key': source_key,
+        'source_etag': source_etag,
+        'well_info': las_data['well_info'],
+        'curves': las_data['curves'],
+        'units': las_data['units'],
+        'null_value': las_data['null_value'],
+        'wrapped': las_data.get('wrapped', False),
+        'rows': rows,
+        'dtype': DTYPE.str,
+    }
+    if depth_curve in las_data['curves'] and rows:
+        depths = array[:, las_data['curves'].index(depth_curve)]
+        if rows == 1 or np.all(np.diff(depths) >= 0):
+            # Every stride-th depth: locates any depth to within one stride of rows
+            stride = -(-rows // DEPTH_INDEX_SIZE)
+            header['depth_index'] = {'curve': depth_curve, 'stride': stride, 'values': depths[::stride].tolist()}
+    # Column offsets are relative to the aligned end of the header
+    column_bytes = rows * DTYPE.itemsize
+    header['columns'] = {name: i * column_bytes for i, name in enumerate(las_data['curves'])}
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    data_offset = _data_offset(len(header_bytes))
+
+    parts = [MAGIC, struct.pack('<Q', len(header_bytes)), header_bytes,
+             b"\0" * (data_offset - len(MAGIC) - 8 - len(header_bytes))]
+    for i in range(column_count):
+        parts.append(np.ascontiguousarray(array[:, i]).tobytes())
+    return b"".join(parts)
+
+
+def _data_offset(header_length: int) -> int:
+    """Start of the column blocks: after magic, length and header, 64-byte aligned."""
+    position = len(MAGIC) + 8 + header_length
+    return (position + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class FileSource:
+    """Byte ranges of a local sidecar file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.requests = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        self.requests += 1
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+class S3RangeSource:
+    """Byte ranges of a sidecar object in S3, fetched with Range requests."""
+
+    def __init__(self, client, bucket: str, key: str):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.requests = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        self.requests += 1
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={offset}-{offset + length - 1}"
+        )
+        return response['Body'].read()
+
+
+def read_header(source) -> Dict[str, Any]:
+    """
+    Read and validate a sidecar header.
+
+    Raises:
+        ValueError: If the bytes are not a sidecar of a supported version
+    """
+    probe = source.read(0, HEADER_PROBE_BYTES)
+    if probe[:len(MAGIC)] != MAGIC or len(probe) < len(MAGIC) + 8:
+        raise ValueError("Not a LAS column sidecar")
+    (length,) = struct.unpack('<Q', probe[len(MAGIC):len(MAGIC) + 8])
+    start = len(MAGIC) + 8
+    header_bytes = probe[start:start + length]
+    if len(header_bytes) < length:
+        header_bytes = source.read(start, length)
+    header = json.loads(header_bytes)
+    if header.get('version') != FORMAT_VERSION or header.get('dtype') != DTYPE.str:
+        raise ValueError(f"Unsupported sidecar version {header.get('version')}")
+    header['data_offset'] = _data_offset(length)
+    return header
+
+
+def read_sidecar(
+    source,
+    header: Optional[Dict[str, Any]] = None,
+    curves: Optional[Sequence[str]] = None,
+    depth_range: Optional[Tuple[Optional[float], Optional[float]]] = None,
+    depth_curve: str = 'DEPT'
+) -> Dict[str, Any]:
+    """
+    Read curves from a sidecar in the shape of las_reader.parse_las output.
+
+    Args:
+        source: FileSource or S3RangeSource
+        header: Header from read_header (read if not given)
+        curves: Curves to read (all if None); the depth curve is always read
+        depth_range: (start, end) depths to keep, either may be None
+
+    Returns:
+        Parsed-LAS dictionary. 'curves' lists every curve in the file,
+        'data' holds the loaded ones, and 'partial' is True when only some
+        curves or rows were read.
+    """
+    if header is None:
+        header = read_header(source)
+    names = header['curves']
+    rows = header['rows']
+    wanted = list(names) if curves is None else [c for c in names if c in set(curves) | {depth_curve}]
+
+    start, end = 0, rows
+    if depth_range is not None and depth_curve in names and rows:
+        index = header.get('depth_index')
+        if index and index['curve'] == depth_curve:
+            depth_start, depth_end = depth_range
+            if depth_start is not None:
+                start = _locate_depth(source, header, depth_start, 'left')
+            if depth_end is not None:
+                end = max(start, _locate_depth(source, header, depth_end, 'right'))
+        else:
+            bounds = DepthIndex(_read_column(source, header, depth_curve, 0, rows)).bounds(*depth_range)
+            if bounds is not None:
+                start, end = bounds
+
+    array = np.empty((end - start, len(wanted)), dtype=DTYPE, order='F')
+    for first, count in _coalesce(header, wanted):
+        array[:, first:first + count] = _read_block(source, header, wanted[first:first + count], start, end)
+
+    return {
+        'well_info': header['well_info'],
+        'curves': list(names),
+        'units': header['units'],
+        'null_value': header['null_value'],
+        'wrapped': header.get('wrapped', False),
+        'array': array,
+        'data': {name: array[:, i] for i, name in enumerate(wanted)},
+        'partial': len(wanted) < len(names) or (end - start) < rows,
+        'source_etag': header.get('source_etag')
+    }
+
+
+def _locate_depth(source, header: Dict[str, Any], depth: float, side: str) -> int:
+    """
+    searchsorted(depths, depth, side) using the sparse depth index.
+
+    The index narrows the answer to one stride of rows, and only that
+    stretch of the depth column is read.
+    """
+    index = header['depth_index']
+    stride = index['stride']
+    k = int(np.searchsorted(np.asarray(index['values']), depth, side=side))
+    low = max(0, (k - 1) * stride)
+    high = min(header['rows'], k * stride + 1)
+    chunk = _read_column(source, header, index['curve'], low, high)
+    return low + int(np.searchsorted(chunk, depth, side=side))
+
+
+def _coalesce(header: Dict[str, Any], wanted: List[str]):
+    """Group wanted curves into runs of adjacent columns: (index in wanted, run length)."""
+    runs = []
+    order = header['curves']
+    for i, name in enumerate(wanted):
+        if runs and order.index(name) == order.index(wanted[i - 1]) + 1:
+            runs[-1][1] += 1
+        else:
+            runs.append([i, 1])
+    return runs
+
+
+def _read_column(source, header: Dict[str, Any], name: str, start: int, end: int) -> np.ndarray:
+    return _read_block(source, header, [name], start, end)[:, 0]
+
+
+def _read_block(source, header: Dict[str, Any], run: List[str], start: int, end: int) -> np.ndarray:
+    """Rows [start, end) of a run of adjacent columns, as (rows, len(run))."""
+    rows = header['rows']
+    count = end - start
+    if count <= 0:
+        return np.empty((0, len(run)), dtype=DTYPE)
+    first = header['data_offset'] + header['columns'][run[0]]
+    if count == rows:
+        # Whole columns are contiguous: one read for the run
+        raw = source.read(first, rows * DTYPE.itemsize * len(run))
+        return np.frombuffer(raw, dtype=DTYPE).reshape(len(run), rows).T
+    block = np.empty((count, len(run)), dtype=DTYPE)
+    for i, name in enumerate(run):
+        offset = header['data_offset'] + header['columns'][name] + start * DTYPE.itemsize
+        block[:, i] = np.frombuffer(source.read(offset, count * DTYPE.itemsize), dtype=DTYPE)
+    return block
+
+
+def load_current_sidecar(
+    client,
+    bucket: str,
+    las_key: str,
+    source_etag: Optional[str] = None,
+    curves: Optional[Sequence[str]] = None,
+    depth_range: Optional[Tuple[Optional[float], Optional[float]]] = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Read the sidecar of a LAS object if it is current.
+
+    Args:
+        source_etag: ETag of the LAS object if already known (e.g. from a
+            listing); otherwise fetched with head_object
+
+    Returns:
+        (source ETag, parsed-LAS dictionary), or None when there is no
+        sidecar, it was built from a different version of the LAS file, or
+        it cannot be read
+    """
+    try:
+        if source_etag is None:
+            source_etag = client.head_object(Bucket=bucket, Key=las_key)['ETag']
+        source = S3RangeSource(client, bucket, sidecar_key(las_key))
+        header = read_header(source)
+        if header.get('source_etag') != source_etag:
+            return None
+        return source_etag, read_sidecar(source, header, curves=curves, depth_range=depth_range)
+    except Exception as e:
+        print(f"No current sidecar for {las_key}: {type(e).__name__}")
+        return None
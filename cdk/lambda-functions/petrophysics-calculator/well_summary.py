@@ -0,0 +1,145 @@
+"""
+Per-well summary index.
+
+A summary is a small JSON object stored in a sibling prefix of the LAS file
+("global/well-data/WELL-001.las" -> "global/well-data-summaries/WELL-001.las.summary.json",
+so listings of the LAS prefix only see LAS files) with what catalog and
+overview queries need: well header, curve mnemonics and units, depth
+range and step, and per-curve sample counts, null fraction, min, max,
+mean and p10/p50/p90. Readers answer those queries from it without
+downloading or parsing the samples.
+
+Summaries are built at ingest (scripts/convert-las-sidecars.py) or when
+a reader first loads the well, and record the ETag of the LAS object they
+were built from; a summary whose ETag does not match the object is stale
+and ignored.
+"""
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from curve_stats import StreamingStats, order_statistics
+from las_reader import companion_key, companion_prefix
+
+SUMMARY_STORE = "summaries"
+SUMMARY_SUFFIX = ".summary.json"
+FORMAT_VERSION = 1
+PERCENTILES = (10, 50, 90)
+
+
+def summary_key(las_key: str) -> str:
+    """S3 key (or path) of the summary of a LAS file."""
+    return companion_key(las_key, SUMMARY_STORE) + SUMMARY_SUFFIX
+
+
+def summary_prefix(las_prefix: str) -> str:
+    """Prefix of the summaries of the LAS files under las_prefix."""
+    return companion_prefix(las_prefix, SUMMARY_STORE)
+
+
+def _finite(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+def build_summary(las_data: Dict[str, Any], source_key: Optional[str], source_etag: Optional[str],
+                  depth_curve: str = 'DEPT') -> Dict[str, Any]:
+    """
+    Summarize a parsed LAS file.
+
+    Args:
+        las_data: Parsed LAS with 'well_info', 'curves', 'units', 'null_value'
+            and the 2-D 'array' (nulls as NaN), as returned by las_reader.parse_las
+        source_key: Key of the LAS object the summary is built from
+        source_etag: ETag of that object, used by readers to detect staleness
+        depth_curve: Curve reported as the depth range and step
+
+    Returns:
+        JSON-serializable summary (statistics are None for all-null curves)
+    """
+    array = np.asarray(las_data['array'], dtype=np.float64)
+    rows = array.shape[0]
+    statistics = {}
+    for i, name in enumerate(las_data['curves']):
+        values = array[:, i]
+        valid = values[~np.isnan(values)]
+        entry = {'count': int(len(valid)), 'null_fraction': (rows - len(valid)) / rows if rows else 1.0,
+                 'min': None, 'max': None, 'mean': None}
+        entry.update({f'p{p}': None for p in PERCENTILES})
+        if len(valid):
+            stats = StreamingStats.of(valid)
+            entry.update(min=_finite(stats.min), max=_finite(stats.max), mean=_finite(stats.mean))
+            ranks = [int(round(p / 100 * (len(valid) - 1))) for p in PERCENTILES]
+            entry.update({f'p{p}': value for p, value in zip(PERCENTILES, order_statistics(valid, ranks))})
+        statistics[name] = entry
+
+    depth = {'curve': None, 'start': None, 'stop': None, 'step': None}
+    if depth_curve in las_data['curves'] and rows:
+        depths = array[:, las_data['curves'].index(depth_curve)]
+        depths = depths[~np.isnan(depths)]
+        if len(depths):
+            steps = np.diff(depths)
+            depth = {'curve': depth_curve, 'start': float(depths[0]), 'stop': float(depths[-1]),
+                     'step': float(np.median(steps)) if len(steps) else None}
+
+    return {
+        'version': FORMAT_VERSION,
+        'source_key': source_key,
+        'source_etag': source_etag,
+        'well_info': dict(las_data['well_info']),
+        'curves': list(las_data['curves']),
+        'units': {name: las_data['units'].get(name, '') for name in las_data['curves']},
+        'null_value': _finite(las_data['null_value']),
+        'samples': rows,
+        'depth': depth,
+        'statistics': statistics,
+    }
+
+
+def encode_summary(summary: Dict[str, Any]) -> bytes:
+    return json.dumps(summary, sort_keys=True).encode('utf-8')
+
+
+def decode_summary(raw: bytes) -> Dict[str, Any]:
+    """
+    Read a summary.
+
+    Raises:
+        ValueError: If the bytes are not a summary of a supported version
+    """
+    try:
+        summary = json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Not a well summary: {e}")
+    if not isinstance(summary, dict) or summary.get('version') != FORMAT_VERSION:
+        raise ValueError("Unsupported well summary version")
+    return summary
+
+
+def read_summary(client, bucket: str, las_key: str, source_etag: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    The stored summary of a LAS object if it was built from source_etag.
+
+    Returns:
+        The summary, or None when it is missing, unreadable or stale
+    """
+    try:
+        raw = client.get_object(Bucket=bucket, Key=summary_key(las_key))['Body'].read()
+        summary = decode_summary(raw)
+    except Exception as e:
+        print(f"No stored summary for {las_key}: {type(e).__name__}")
+        return None
+    if not source_etag or summary.get('source_etag') != source_etag:
+        return None
+    return summary
+
+
+def write_summary(client, bucket: str, las_key: str, summary: Dict[str, Any]) -> bool:
+    """Store a summary under summary_key of its LAS object (best effort). Returns whether it was written."""
+    try:
+        client.put_object(Bucket=bucket, Key=summary_key(las_key), Body=encode_summary(summary),
+                          ContentType='application/json')
+        return True
+    except Exception as e:
+        print(f"Summary not stored ({las_key}): {type(e).__name__}: {e}")
+        return False
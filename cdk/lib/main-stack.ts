@@ -797,11 +797,22 @@ export class MainStack extends cdk.Stack {
       functionName: `${id}-petrophysics-calculator`,
       runtime: lambda.Runtime.PYTHON_3_12,
       handler: 'handler.handler',
-      code: lambda.Code.fromAsset(path.join(__dirname, '../lambda-functions/petrophysics-calculator')),
+      // Bundle requirements.txt (numpy) with the handler modules
+      code: lambda.Code.fromAsset(path.join(__dirname, '../lambda-functions/petrophysics-calculator'), {
+        bundling: {
+          image: lambda.Runtime.PYTHON_3_12.bundlingImage,
+          command: [
+            'bash', '-c',
+            'pip install -r requirements.txt -t /asset-output && cp -au . /asset-output',
+          ],
+        },
+      }),
       timeout: cdk.Duration.seconds(60),
       memorySize: 512,
       environment: {
         STORAGE_BUCKET: storageBucket.bucketName,
+        // Concurrent well loads in multi-well mode (boto3 keeps 10 pooled connections)
+        FAN_OUT_CONCURRENCY: '8',
       },
       description: 'Petrophysics calculator using Python for LAS file analysis',
     });
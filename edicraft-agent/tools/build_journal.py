@@ -0,0 +1,265 @@
+"""
+Resumable build journal for collection visualizations.
+
+A collection build records, per well, which stages have completed
+(fetched, computed, placed, labelled) and how many RCON commands of the
+wellbore have been applied. The journal is written to disk as the build
+progresses, so when the agent, the RCON server or the network fails part
+way through, re-running the same build skips finished wells, reuses
+computed geometry and resumes a half-built wellbore from its command
+watermark. A journal is deleted once every well is complete.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "edicraft", "journals")
+
+# Per-well stages, in order
+STAGES = ("fetched", "computed", "placed", "labelled")
+
+# Commands applied between persisted watermark updates
+DEFAULT_COMMAND_BATCH = 25
+
+
+def build_key(collection_id: str, layout: Dict[str, Any], wells: List[Dict[str, Any]]) -> str:
+    """
+    Identity of a collection build.
+
+    Grid positions depend on the layout and the order of the well list, so a
+    journal is only resumed for the same collection, layout and wells.
+    """
+    identity = {
+        "collection_id": collection_id,
+        "layout": layout,
+        "wells": [[w['well_name'], w['s3_key'], w.get('etag')] for w in wells]
+    }
+    return hashlib.sha1(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class BuildJournal:
+    """
+    Persistent per-well progress of one collection build.
+
+    The journal document lives in "<collection>-<key>.json"; computed
+    geometry is kept in a sibling directory with one file per well until
+    the well is placed. Writes are atomic (temp file + rename) and
+    thread-safe, so the fetch, geometry and build stages can all record
+    progress.
+    """
+
+    def __init__(
+        self,
+        collection_id: str,
+        key: str,
+        journal_dir: Optional[str] = None,
+        command_batch: int = DEFAULT_COMMAND_BATCH
+    ):
+        """
+        Open (or start) the journal for a build.
+
+        Args:
+            collection_id: Collection being built
+            key: Build identity from build_key()
+            journal_dir: Journal directory. If None, uses EDICRAFT_BUILD_JOURNAL_DIR
+                env var or ~/.cache/edicraft/journals
+            command_batch: Persist the command watermark every this many commands
+        """
+        self.journal_dir = journal_dir or os.getenv('EDICRAFT_BUILD_JOURNAL_DIR', DEFAULT_JOURNAL_DIR)
+        os.makedirs(self.journal_dir, exist_ok=True)
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in collection_id)
+        self.path = os.path.join(self.journal_dir, f"{safe_id}-{key[:16]}.json")
+        self.geometry_dir = self.path[:-len(".json")] + ".geometry"
+        self.command_batch = max(1, command_batch)
+        self._lock = threading.Lock()
+
+        self.resumed = False
+        self._doc = None
+        try:
+            with open(self.path, 'r') as f:
+                doc = json.load(f)
+            if doc.get("key") == key:
+                self._doc = doc
+                self.resumed = True
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build journal {self.path}: {e}")
+
+        if self._doc is None:
+            self._doc = {
+                "collection_id": collection_id,
+                "key": key,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "wells": {}
+            }
+
+    def _entry(self, s3_key: str) -> Dict[str, Any]:
+        return self._doc["wells"].setdefault(s3_key, {"stages": [], "command_watermark": 0})
+
+    def _geometry_path(self, s3_key: str) -> str:
+        return os.path.join(self.geometry_dir, hashlib.sha1(s3_key.encode('utf-8')).hexdigest() + ".json")
+
+    def _save(self):
+        self._doc["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._doc, f)
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, s3_key: str, stage: str) -> bool:
+        """Whether a well has completed a stage."""
+        with self._lock:
+            entry = self._doc["wells"].get(s3_key)
+            return bool(entry) and stage in entry["stages"]
+
+    def mark(self, s3_key: str, stage: str):
+        """Record that a well completed a stage and persist the journal."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown build stage: {stage}")
+        with self._lock:
+            entry = self._entry(s3_key)
+            if stage not in entry["stages"]:
+                entry["stages"].append(stage)
+            if stage == "placed":
+                self._discard_geometry(s3_key)
+            self._save()
+
+    def command_watermark(self, s3_key: str) -> int:
+        """Number of wellbore RCON commands already applied for a well."""
+        with self._lock:
+            entry = self._doc["wells"].get(s3_key)
+            return entry["command_watermark"] if entry else 0
+
+    def record_commands(self, s3_key: str, watermark: int, force: bool = False):
+        """
+        Advance a well's command watermark.
+
+        The journal is written when a full batch of commands has been applied
+        since the last write (or when force is set), so a crash replays at
+        most one batch of idempotent setblock commands.
+        """
+        with self._lock:
+            entry = self._entry(s3_key)
+            persisted = entry.setdefault("persisted_watermark", entry["command_watermark"])
+            entry["command_watermark"] = watermark
+            if force or watermark - persisted >= self.command_batch:
+                entry["persisted_watermark"] = watermark
+                self._save()
+
+    def save_geometry(self, s3_key: str, minecraft_coords: str):
+        """Keep a well's computed Minecraft coordinates and mark it computed."""
+        os.makedirs(self.geometry_dir, exist_ok=True)
+        path = self._geometry_path(s3_key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(minecraft_coords)
+        os.replace(tmp_path, path)
+        self.mark(s3_key, "computed")
+
+    def load_geometry(self, s3_key: str) -> Optional[str]:
+        """Computed Minecraft coordinates for a well, or None if not available."""
+        if not self.is_done(s3_key, "computed"):
+            return None
+        try:
+            with open(self._geometry_path(s3_key), 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _discard_geometry(self, s3_key: str):
+        try:
+            os.remove(self._geometry_path(s3_key))
+        except FileNotFoundError:
+            pass
+
+    def is_complete(self, s3_keys: List[str]) -> bool:
+        """Whether every listed well is placed and labelled."""
+        return all(self.is_done(key, "placed") and self.is_done(key, "labelled") for key in s3_keys)
+
+    def discard(self):
+        """Delete the journal and any kept geometry."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            _remove_geometry_dir(self.geometry_dir)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get journal progress.
+
+        Returns:
+            Dictionary with path, whether it was resumed, and the number of
+            wells that completed each stage
+        """
+        with self._lock:
+            wells = self._doc["wells"].values()
+            return {
+                "path": self.path,
+                "resumed": self.resumed,
+                "wells": len(self._doc["wells"]),
+                **{stage: sum(1 for entry in wells if stage in entry["stages"]) for stage in STAGES}
+            }
+
+
+def open_build_journal(collection_id: str, key: str) -> Optional[BuildJournal]:
+    """
+    Open the journal for a build from environment settings.
+
+    Returns None when disabled with EDICRAFT_BUILD_JOURNAL=false or when the
+    journal directory cannot be created.
+    """
+    if os.getenv('EDICRAFT_BUILD_JOURNAL', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    try:
+        return BuildJournal(collection_id, key)
+    except OSError as e:
+        logger.warning(f"Build journal disabled: {e}")
+        return None
+
+
+def clear_build_journals(journal_dir: Optional[str] = None) -> int:
+    """
+    Delete every build journal, e.g. after the Minecraft world was cleared.
+
+    Returns:
+        Number of journals removed
+    """
+    journal_dir = journal_dir or os.getenv('EDICRAFT_BUILD_JOURNAL_DIR', DEFAULT_JOURNAL_DIR)
+    if not os.path.isdir(journal_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(journal_dir):
+        path = os.path.join(journal_dir, name)
+        if name.endswith(".json"):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        elif name.endswith(".geometry"):
+            _remove_geometry_dir(path)
+    return removed
+
+
+def _remove_geometry_dir(path: str):
+    if not os.path.isdir(path):
+        return
+    for name in os.listdir(path):
+        try:
+            os.remove(os.path.join(path, name))
+        except FileNotFoundError:
+            pass
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
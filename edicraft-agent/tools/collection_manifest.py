@@ -0,0 +1,144 @@
+"""
+Collection manifest helpers.
+
+A manifest is a small JSON object stored next to a collection's trajectory
+files. It lists every well with its key, size, ETag, file format, surface
+location and trajectory bounding box, so opening a collection, planning the
+grid layout and filtering wells by area need one object read instead of a
+prefix walk plus a fetch per well. The manifest is checked against a
+listing when it is older than a TTL (generated_at records the last check),
+on an explicit refresh, or after one of its wells failed to fetch, and is
+updated incrementally: only wells whose listing entry (key or ETag) changed
+are fetched again.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+MANIFEST_FILE_NAME = "_collection_manifest.json"
+MANIFEST_VERSION = 1
+# Age after which a manifest is checked against the prefix listing
+DEFAULT_MANIFEST_TTL_SECONDS = 300
+
+
+def manifest_key(collection_prefix: str) -> str:
+    """S3 key of the manifest for a collection prefix (ending with '/')."""
+    return f"{collection_prefix}{MANIFEST_FILE_NAME}"
+
+
+def summarize_trajectory(trajectory_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize a get_trajectory_data result for the manifest.
+
+    Surface location and bounding box are only known for coordinate-type
+    trajectories; survey data is relative to an unknown wellhead, so those
+    fields are None for surveys.
+    """
+    metadata = trajectory_result.get('metadata') or {}
+    summary = {
+        "file_format": metadata.get('file_format'),
+        "data_type": trajectory_result.get('data_type'),
+        "total_points": metadata.get('total_points'),
+        "surface_location": None,
+        "bbox": None
+    }
+
+    coordinates = trajectory_result.get('coordinates')
+    columns = trajectory_result.get('columns')
+    is_coordinates = trajectory_result.get('data_type') == "coordinates"
+    if trajectory_result.get('success') and is_coordinates and columns and len(columns.get('x', ())):
+        xs, ys, zs = columns['x'], columns['y'], columns['z']
+        summary["surface_location"] = {"x": float(xs[0]), "y": float(ys[0]), "z": float(zs[0])}
+        summary["bbox"] = {
+            "x_min": float(xs.min()), "x_max": float(xs.max()),
+            "y_min": float(ys.min()), "y_max": float(ys.max()),
+            "z_min": float(zs.min()), "z_max": float(zs.max())
+        }
+    elif trajectory_result.get('success') and coordinates:
+        xs = [float(c['x']) for c in coordinates]
+        ys = [float(c['y']) for c in coordinates]
+        zs = [float(c['z']) for c in coordinates]
+        first = coordinates[0]
+        summary["surface_location"] = {"x": float(first['x']), "y": float(first['y']), "z": float(first['z'])}
+        summary["bbox"] = {
+            "x_min": min(xs), "x_max": max(xs),
+            "y_min": min(ys), "y_max": max(ys),
+            "z_min": min(zs), "z_max": max(zs)
+        }
+
+    return summary
+
+
+def diff_listing(
+    manifest_wells: List[Dict[str, Any]],
+    listed_wells: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+    """
+    Compare a manifest against a fresh listing.
+
+    Returns:
+        (unchanged entries from the manifest, listed wells that are new or
+        changed, keys of manifest entries that no longer exist)
+    """
+    known = {well['s3_key']: well for well in manifest_wells}
+    unchanged = []
+    changed = []
+    for listed in listed_wells:
+        entry = known.get(listed['s3_key'])
+        if entry and entry.get('etag') and entry.get('etag') == listed.get('etag'):
+            unchanged.append(entry)
+        else:
+            changed.append(listed)
+    listed_keys = {well['s3_key'] for well in listed_wells}
+    removed = [key for key in known if key not in listed_keys]
+    return unchanged, changed, removed
+
+
+def new_manifest(collection_prefix: str, wells: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a manifest document from well entries."""
+    return {
+        "manifest_version": MANIFEST_VERSION,
+        "collection_prefix": collection_prefix,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "total_wells": len(wells),
+        "wells": sorted(wells, key=lambda w: (w['well_name'], w['s3_key']))
+    }
+
+
+def manifest_expired(manifest: Dict[str, Any], ttl_seconds: float) -> bool:
+    """Whether a manifest was last checked against the listing more than ttl_seconds ago."""
+    try:
+        generated_at = datetime.fromisoformat(manifest['generated_at'])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return (datetime.now(timezone.utc) - generated_at).total_seconds() >= ttl_seconds
+
+
+def parse_bounds(bounds: str) -> Optional[Dict[str, float]]:
+    """
+    Parse a "x_min,y_min,x_max,y_max" area string.
+
+    Returns:
+        Dict with x_min, y_min, x_max, y_max, or None if bounds is empty
+
+    Raises:
+        ValueError: If the string does not contain four numbers
+    """
+    if not bounds or not bounds.strip():
+        return None
+    values = [float(v) for v in bounds.replace(' ', '').split(',')]
+    if len(values) != 4:
+        raise ValueError("bounds must be 'x_min,y_min,x_max,y_max'")
+    x_min, y_min, x_max, y_max = values
+    return {
+        "x_min": min(x_min, x_max), "x_max": max(x_min, x_max),
+        "y_min": min(y_min, y_max), "y_max": max(y_min, y_max)
+    }
+
+
+def bbox_intersects(bbox: Optional[Dict[str, float]], area: Dict[str, float]) -> bool:
+    """Whether a trajectory bounding box overlaps an area in the X/Y plane."""
+    if not bbox:
+        return False
+    return (bbox['x_min'] <= area['x_max'] and bbox['x_max'] >= area['x_min'] and
+            bbox['y_min'] <= area['y_max'] and bbox['y_max'] >= area['y_min'])
@@ -0,0 +1,202 @@
+"""
+Staged build pipeline for collection visualization.
+
+Wells flow through three stages connected by bounded queues:
+
+1. fetch    - download and parse trajectory data from S3 (bounded parallelism)
+2. geometry - convert trajectories to Minecraft coordinates and offset them
+              to the well's grid position (worker pool)
+3. build    - place the wellbore and rig over RCON (shared, serialized stage)
+
+A slow stage fills the queue in front of it, which blocks the stage feeding
+it, so memory stays bounded and the Minecraft server only ever sees the
+build stage's command stream. Each stage records queue depth, busy time and
+throughput so slow stages are visible in the collection summary.
+"""
+
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+
+# Queue sentinel telling a stage worker to exit
+_STOP = object()
+
+
+class WellBuildError(Exception):
+    """A well failed in a pipeline stage; the message is the failure reason."""
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_time: float = 0.0
+    max_queue_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, elapsed: float, success: bool):
+        with self._lock:
+            self.busy_time += elapsed
+            if success:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+    def observe_queue(self, depth: int):
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def to_dict(self, wall_time: float) -> Dict[str, Any]:
+        """Convert to dictionary; throughput is wells per second of pipeline wall time."""
+        handled = self.processed + self.failed
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'failed': self.failed,
+            'max_queue_depth': self.max_queue_depth,
+            'busy_seconds': round(self.busy_time, 3),
+            'utilization': round(self.busy_time / (wall_time * self.workers), 3) if wall_time > 0 else 0.0,
+            'throughput_per_second': round(handled / wall_time, 3) if wall_time > 0 else 0.0
+        }
+
+
+class CollectionBuildPipeline:
+    """
+    Run collection wells through fetch, geometry and build stages concurrently.
+
+    Each stage function receives the job dict for one well and updates it in
+    place. Raising WellBuildError (or any exception) marks the well as failed
+    with that reason and skips its remaining stages.
+    """
+
+    STAGES = ("fetch", "geometry", "build")
+
+    def __init__(
+        self,
+        fetch: Callable[[Dict[str, Any]], None],
+        geometry: Callable[[Dict[str, Any]], None],
+        build: Callable[[Dict[str, Any]], None],
+        fetch_workers: int = 5,
+        geometry_workers: int = 4,
+        build_workers: int = 1,
+        queue_size: Optional[int] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            fetch: Stage function that loads trajectory data for a job
+            geometry: Stage function that computes Minecraft coordinates for a job
+            build: Stage function that builds a job in Minecraft
+            fetch_workers: Concurrent S3 fetches (default: 5)
+            geometry_workers: Geometry worker threads (default: 4)
+            build_workers: Concurrent RCON builds (default: 1, serialized)
+            queue_size: Capacity of each inter-stage queue (default: 2x that stage's workers)
+            on_complete: Optional callback invoked with each finished job (success or failure)
+        """
+        self._functions = {"fetch": fetch, "geometry": geometry, "build": build}
+        self._workers = {
+            "fetch": max(1, fetch_workers),
+            "geometry": max(1, geometry_workers),
+            "build": max(1, build_workers)
+        }
+        self._queues = {
+            name: queue.Queue(maxsize=queue_size or 2 * self._workers[name])
+            for name in self.STAGES
+        }
+        self.stats = {name: StageStats(name, self._workers[name]) for name in self.STAGES}
+        self._on_complete = on_complete
+        self._results: List[Dict[str, Any]] = []
+        self._results_lock = threading.Lock()
+        self.wall_time = 0.0
+
+    def _put(self, stage: str, item: Any):
+        """Enqueue an item for a stage, blocking while the stage is saturated."""
+        self._queues[stage].put(item)
+        if item is not _STOP:
+            self.stats[stage].observe_queue(self._queues[stage].qsize())
+
+    def _finish(self, job: Dict[str, Any]):
+        with self._results_lock:
+            self._results.append(job)
+        if self._on_complete:
+            try:
+                self._on_complete(job)
+            except Exception as e:
+                print(f"[COLLECTION_PIPELINE] Completion callback error: {str(e)}")
+
+    def _worker(self, stage: str, next_stage: Optional[str]):
+        """Process jobs from one stage's queue until a stop sentinel arrives."""
+        stage_queue = self._queues[stage]
+        function = self._functions[stage]
+        while True:
+            job = stage_queue.get()
+            if job is _STOP:
+                return
+
+            start = time.perf_counter()
+            try:
+                function(job)
+                success = True
+            except Exception as e:
+                job['error'] = str(e) if isinstance(e, WellBuildError) else f"Unexpected error: {str(e)}"
+                job['failed_stage'] = stage
+                success = False
+            self.stats[stage].record(time.perf_counter() - start, success)
+
+            if success and next_stage:
+                self._put(next_stage, job)
+            else:
+                self._finish(job)
+
+    def run(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Push jobs through all stages and wait for them to finish.
+
+        Args:
+            jobs: Job dicts, one per well; processed in submission order per stage
+
+        Returns:
+            Finished job dicts; failed jobs carry 'error' and 'failed_stage'
+        """
+        start = time.perf_counter()
+        threads = {}
+        for index, stage in enumerate(self.STAGES):
+            next_stage = self.STAGES[index + 1] if index + 1 < len(self.STAGES) else None
+            threads[stage] = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(stage, next_stage),
+                    name=f"collection-{stage}-{i}",
+                    daemon=True
+                )
+                for i in range(self._workers[stage])
+            ]
+            for thread in threads[stage]:
+                thread.start()
+
+        for job in jobs:
+            self._put(self.STAGES[0], job)
+
+        # Drain stage by stage: once a stage's workers exit, nothing more can
+        # reach the next stage, so it can be told to stop too
+        for stage in self.STAGES:
+            for _ in threads[stage]:
+                self._put(stage, _STOP)
+            for thread in threads[stage]:
+                thread.join()
+
+        self.wall_time = time.perf_counter() - start
+        return self._results
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-stage statistics for the last run."""
+        return [self.stats[name].to_dict(self.wall_time) for name in self.STAGES]
@@ -0,0 +1,223 @@
+"""
+Local binary cache for parsed OSDU horizon surfaces.
+
+Parsed horizons are stored as .npy arrays keyed by OSDU record id and version,
+so rebuilding a known horizon reads it from local disk instead of re-searching,
+re-downloading and re-parsing it. Arrays are memory-mapped on reuse and the
+cache directory is kept under a byte budget with least-recently-used eviction.
+Derived Minecraft heightmaps can be stored per transform configuration.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column layout of cached horizon point arrays
+HORIZON_COLUMNS = ("point_id", "line_number", "x", "y", "z")
+
+# Column layout of cached heightmaps: Minecraft position plus source point
+HEIGHTMAP_COLUMNS = ("mc_x", "mc_y", "mc_z", "original_x", "original_y", "original_z")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "edicraft", "horizons")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class HorizonCache:
+    """
+    Size-bounded on-disk cache of horizon point arrays and heightmaps.
+
+    Each horizon version is stored as one uncompressed .npy file (plain .npy
+    can be memory-mapped, compressed .npz cannot) with a small JSON sidecar
+    describing it. File modification times act as the LRU clock: every read
+    touches the file, and eviction removes the oldest files first until the
+    directory is back under max_bytes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the horizon cache.
+
+        Args:
+            cache_dir: Cache directory. If None, uses EDICRAFT_HORIZON_CACHE_DIR env var
+                or ~/.cache/edicraft/horizons
+            max_bytes: Byte budget for the cache directory. If None, uses
+                EDICRAFT_HORIZON_CACHE_MAX_BYTES env var or 512 MB
+        """
+        self.cache_dir = cache_dir or os.getenv('EDICRAFT_HORIZON_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = int(max_bytes or os.getenv('EDICRAFT_HORIZON_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _entry_name(record_id: str, version: Any) -> str:
+        """Stable file-name stem for a horizon record version."""
+        digest = hashlib.sha1(f"{record_id}:{version}".encode('utf-8')).hexdigest()
+        return f"horizon-{digest[:24]}"
+
+    @staticmethod
+    def _transform_key(transform: Dict[str, Any]) -> str:
+        """Stable short hash of a transform configuration."""
+        canonical = json.dumps(transform, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+    def _points_path(self, record_id: str, version: Any) -> str:
+        return os.path.join(self.cache_dir, self._entry_name(record_id, version) + ".npy")
+
+    def _meta_path(self, record_id: str, version: Any) -> str:
+        return os.path.join(self.cache_dir, self._entry_name(record_id, version) + ".json")
+
+    def _heightmap_path(self, record_id: str, version: Any, transform: Dict[str, Any]) -> str:
+        name = f"{self._entry_name(record_id, version)}.hm-{self._transform_key(transform)}.npy"
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self, path: str) -> Optional[np.ndarray]:
+        """Memory-map a cached array and mark it as recently used."""
+        try:
+            array = np.load(path, mmap_mode='r')
+            os.utime(path)
+            self._hits += 1
+            return array
+        except FileNotFoundError:
+            self._misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable horizon cache file {path}: {e}")
+            self._remove(path)
+            self._misses += 1
+            return None
+
+    def _store(self, path: str, array: np.ndarray):
+        """Write an array atomically, then enforce the byte budget."""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _remove(self, path: str):
+        """Delete a cached array and, for horizon points, its JSON sidecar."""
+        paths = [path]
+        if ".hm-" not in path:
+            paths.append(path[:-len(".npy")] + ".json")
+        for stale in paths:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+    def get_points(self, record_id: str, version: Any) -> Optional[np.ndarray]:
+        """
+        Get cached horizon points as a read-only memory-mapped (N, 5) array.
+
+        Returns None on a cache miss.
+        """
+        return self._load(self._points_path(record_id, version))
+
+    def put_points(self, record_id: str, version: Any, points: np.ndarray):
+        """Store parsed horizon points (columns as HORIZON_COLUMNS)."""
+        with self._lock:
+            self._store(self._points_path(record_id, version), np.asarray(points, dtype=np.float64))
+            with open(self._meta_path(record_id, version), 'w') as f:
+                json.dump({
+                    "record_id": record_id,
+                    "version": version,
+                    "columns": list(HORIZON_COLUMNS),
+                    "total_points": int(len(points))
+                }, f)
+        logger.info(f"Cached {len(points)} horizon points for {record_id} (version {version})")
+
+    def get_heightmap(self, record_id: str, version: Any, transform: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Get a cached Minecraft heightmap for a horizon and transform configuration.
+
+        Returns None on a cache miss.
+        """
+        return self._load(self._heightmap_path(record_id, version, transform))
+
+    def put_heightmap(self, record_id: str, version: Any, transform: Dict[str, Any], heightmap: np.ndarray):
+        """Store a derived heightmap (columns as HEIGHTMAP_COLUMNS)."""
+        with self._lock:
+            self._store(self._heightmap_path(record_id, version, transform), np.asarray(heightmap, dtype=np.float64))
+
+    def _evict(self):
+        """Remove least-recently-used arrays until the cache fits max_bytes."""
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+            logger.info(f"Evicted horizon cache file {os.path.basename(path)} ({size} bytes)")
+
+    def clear(self):
+        """Remove every cached horizon and heightmap."""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.startswith("horizon-"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except FileNotFoundError:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the horizon cache.
+
+        Returns:
+            Dictionary with entry counts, bytes on disk, budget and hit/miss counters
+        """
+        arrays = [name for name in os.listdir(self.cache_dir) if name.endswith(".npy")]
+        total_bytes = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in arrays)
+        return {
+            "cache_dir": self.cache_dir,
+            "horizons": sum(1 for name in arrays if ".hm-" not in name),
+            "heightmaps": sum(1 for name in arrays if ".hm-" in name),
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses
+        }
+
+
+_horizon_cache: Optional[HorizonCache] = None
+
+
+def get_horizon_cache() -> Optional[HorizonCache]:
+    """
+    Get the process-wide horizon cache.
+
+    Returns None when caching is disabled with EDICRAFT_HORIZON_CACHE=false or
+    the cache directory cannot be created.
+    """
+    global _horizon_cache
+    if os.getenv('EDICRAFT_HORIZON_CACHE', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    if _horizon_cache is None:
+        try:
+            _horizon_cache = HorizonCache()
+        except OSError as e:
+            logger.warning(f"Horizon cache disabled: {e}")
+            return None
+    return _horizon_cache
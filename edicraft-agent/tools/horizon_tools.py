@@ -71,6 +71,7 @@ def search_horizons_live() -> str:
                 datasets = record.get('data', {}).get('Datasets', [])
                 horizon_info = {
                     "id": record['id'],
+                    "version": record.get('version'),
                     "datasets": datasets,
                     "dataset_count": len(datasets)
                 }
@@ -107,51 +108,7 @@ def parse_horizon_file(file_content: str) -> str:
             logger.error(error_msg)
             return error_msg
         
-        lines = file_content.strip().split('\n')
-        logger.info(f"File has {len(lines)} lines")
-        
-        # Find where data starts (skip header comments)
-        data_start = 0
-        for i, line in enumerate(lines):
-            if not line.startswith('#') and ',' in line and len(line.split(',')) >= 5:
-                data_start = i
-                logger.info(f"Data starts at line {i}")
-                break
-        
-        if data_start == 0 and lines[0].startswith('#'):
-            logger.warning("No data section found after header comments")
-        
-        # Parse coordinate data
-        coordinates = []
-        parse_errors = 0
-        
-        for line_num, line in enumerate(lines[data_start:], start=data_start):
-            line = line.strip()
-            if line and ',' in line:
-                parts = line.split(',')
-                if len(parts) >= 5:
-                    try:
-                        point_id = float(parts[0])
-                        line_number = float(parts[1])
-                        x = float(parts[2])  # Easting
-                        y = float(parts[3])  # Northing
-                        z = float(parts[4])  # Elevation
-                        
-                        coordinates.append({
-                            "point_id": point_id,
-                            "line_number": line_number,
-                            "x": x,
-                            "y": y,
-                            "z": z
-                        })
-                    except ValueError as e:
-                        parse_errors += 1
-                        if parse_errors <= 5:  # Log first 5 errors
-                            logger.warning(f"Failed to parse line {line_num}: {line[:50]}... Error: {e}")
-                        continue
-        
-        if parse_errors > 0:
-            logger.warning(f"Total parse errors: {parse_errors} lines skipped")
+        coordinates = _parse_horizon_coordinates(file_content)
         
         if not coordinates:
             error_msg = "Error: No valid coordinate data found in horizon file"
@@ -160,41 +117,120 @@ def parse_horizon_file(file_content: str) -> str:
         
         logger.info(f"Successfully parsed {len(coordinates)} coordinate points")
         
-        # Calculate statistics
-        x_coords = [c["x"] for c in coordinates]
-        y_coords = [c["y"] for c in coordinates]
-        z_coords = [c["z"] for c in coordinates]
-        
-        bounds = {
-            "x_min": min(x_coords),
-            "x_max": max(x_coords),
-            "y_min": min(y_coords),
-            "y_max": max(y_coords),
-            "z_min": min(z_coords),
-            "z_max": max(z_coords)
-        }
-        
-        logger.info(f"Coordinate bounds: X[{bounds['x_min']:.2f}, {bounds['x_max']:.2f}], "
-                   f"Y[{bounds['y_min']:.2f}, {bounds['y_max']:.2f}], "
-                   f"Z[{bounds['z_min']:.2f}, {bounds['z_max']:.2f}]")
-        
-        result = {
-            "total_points": len(coordinates),
-            "coordinate_system": "UTM (from file header)",
-            "bounds": bounds,
-            "coordinates": coordinates[:1000] if len(coordinates) > 1000 else coordinates  # Limit for JSON size
-        }
-        
-        if len(coordinates) > 1000:
-            logger.info(f"Truncated coordinates to 1000 points for JSON size (total: {len(coordinates)})")
-        
-        return json.dumps(result, indent=2)
+        return json.dumps(_horizon_parse_result(coordinates), indent=2)
         
     except Exception as e:
         error_msg = f"Error parsing horizon file: {str(e)}"
         logger.error(error_msg, exc_info=True)
         return error_msg
 
+def _parse_horizon_coordinates(file_content: str) -> List[Dict[str, float]]:
+    """Extract point_id, line_number, x, y, z rows from horizon file content."""
+    lines = file_content.strip().split('\n')
+    logger.info(f"File has {len(lines)} lines")
+    
+    # Find where data starts (skip header comments)
+    data_start = 0
+    for i, line in enumerate(lines):
+        if not line.startswith('#') and ',' in line and len(line.split(',')) >= 5:
+            data_start = i
+            logger.info(f"Data starts at line {i}")
+            break
+    
+    if data_start == 0 and lines[0].startswith('#'):
+        logger.warning("No data section found after header comments")
+    
+    # Parse coordinate data
+    coordinates = []
+    parse_errors = 0
+    
+    for line_num, line in enumerate(lines[data_start:], start=data_start):
+        line = line.strip()
+        if line and ',' in line:
+            parts = line.split(',')
+            if len(parts) >= 5:
+                try:
+                    point_id = float(parts[0])
+                    line_number = float(parts[1])
+                    x = float(parts[2])  # Easting
+                    y = float(parts[3])  # Northing
+                    z = float(parts[4])  # Elevation
+                    
+                    coordinates.append({
+                        "point_id": point_id,
+                        "line_number": line_number,
+                        "x": x,
+                        "y": y,
+                        "z": z
+                    })
+                except ValueError as e:
+                    parse_errors += 1
+                    if parse_errors <= 5:  # Log first 5 errors
+                        logger.warning(f"Failed to parse line {line_num}: {line[:50]}... Error: {e}")
+                    continue
+    
+    if parse_errors > 0:
+        logger.warning(f"Total parse errors: {parse_errors} lines skipped")
+    
+    return coordinates
+
+def _horizon_parse_result(coordinates: List[Dict[str, float]]) -> Dict[str, Any]:
+    """Build the parse_horizon_file result (bounds plus at most 1000 points)."""
+    # Calculate statistics
+    x_coords = [c["x"] for c in coordinates]
+    y_coords = [c["y"] for c in coordinates]
+    z_coords = [c["z"] for c in coordinates]
+    
+    bounds = {
+        "x_min": min(x_coords),
+        "x_max": max(x_coords),
+        "y_min": min(y_coords),
+        "y_max": max(y_coords),
+        "z_min": min(z_coords),
+        "z_max": max(z_coords)
+    }
+    
+    logger.info(f"Coordinate bounds: X[{bounds['x_min']:.2f}, {bounds['x_max']:.2f}], "
+               f"Y[{bounds['y_min']:.2f}, {bounds['y_max']:.2f}], "
+               f"Z[{bounds['z_min']:.2f}, {bounds['z_max']:.2f}]")
+    
+    result = {
+        "total_points": len(coordinates),
+        "coordinate_system": "UTM (from file header)",
+        "bounds": bounds,
+        "coordinates": coordinates[:1000] if len(coordinates) > 1000 else coordinates  # Limit for JSON size
+    }
+    
+    if len(coordinates) > 1000:
+        logger.info(f"Truncated coordinates to 1000 points for JSON size (total: {len(coordinates)})")
+    
+    return result
+
+def parse_horizon_points(file_content: str):
+    """
+    Parse horizon file content into an (N, 5) float64 array.
+    
+    Columns follow HORIZON_COLUMNS in horizon_cache: point_id, line_number,
+    x (easting), y (northing), z (elevation). This is the form stored in the
+    local horizon cache.
+    """
+    import numpy as np
+    from .horizon_cache import HORIZON_COLUMNS
+    
+    coordinates = _parse_horizon_coordinates(file_content) if file_content and file_content.strip() else []
+    rows = [[coord[column] for column in HORIZON_COLUMNS] for coord in coordinates]
+    return np.array(rows, dtype=np.float64).reshape(-1, len(HORIZON_COLUMNS))
+
+def horizon_points_to_json(points) -> str:
+    """Format an (N, 5) horizon point array exactly like parse_horizon_file output."""
+    from .horizon_cache import HORIZON_COLUMNS
+    
+    if len(points) == 0:
+        return "Error: No valid coordinate data found in horizon file"
+    
+    coordinates = [dict(zip(HORIZON_COLUMNS, row)) for row in points.tolist()]
+    return json.dumps(_horizon_parse_result(coordinates), indent=2)
+
 @tool
 def convert_horizon_to_minecraft(horizon_coordinates_json: str, sample_rate: int = 10, base_x: int = 0, base_y: int = 100, base_z: int = 0) -> str:
     """
@@ -316,35 +352,7 @@ def convert_horizon_to_minecraft(horizon_coordinates_json: str, sample_rate: int
                 "original_z": orig_coord["z"]
             })
         
-        # Generate Minecraft commands - SIMPLEST APPROACH: Individual setblock commands
-        commands = []
-        commands.append(f"# Building horizon surface with {len(minecraft_coords)} points")
-        
-        blocks_placed = 0
-        for i, coord in enumerate(minecraft_coords):
-            x, y, z = coord["x"], coord["y"], coord["z"]
-            
-            # Validate coordinates
-            if not (-30000000 <= x <= 30000000 and 0 <= y <= 255 and -30000000 <= z <= 30000000):
-                logger.warning(f"Coordinate out of bounds: ({x}, {y}, {z})")
-                continue
-            
-            # Simple setblock command
-            commands.append(f"setblock {x} {y} {z} sandstone")
-            blocks_placed += 1
-            
-            # Markers every 20 points
-            if i % 20 == 0 and y < 255:
-                commands.append(f"setblock {x} {y+1} {z} glowstone")
-        
-        logger.info(f"Generated {len(commands)} commands to place {blocks_placed} blocks")
-        
-        result = {
-            "total_minecraft_points": len(minecraft_coords),
-            "blocks_to_place": blocks_placed,
-            "minecraft_coordinates": minecraft_coords,
-            "build_commands": commands
-        }
+        result = _horizon_build_result(minecraft_coords)
         
         return json.dumps(result, indent=2)
         
@@ -353,6 +361,60 @@ def convert_horizon_to_minecraft(horizon_coordinates_json: str, sample_rate: int
         logger.error(error_msg, exc_info=True)
         return error_msg
 
+def _horizon_build_result(minecraft_coords: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate setblock build commands for converted horizon points."""
+    # Generate Minecraft commands - SIMPLEST APPROACH: Individual setblock commands
+    commands = []
+    commands.append(f"# Building horizon surface with {len(minecraft_coords)} points")
+    
+    blocks_placed = 0
+    for i, coord in enumerate(minecraft_coords):
+        x, y, z = coord["x"], coord["y"], coord["z"]
+        
+        # Validate coordinates
+        if not (-30000000 <= x <= 30000000 and 0 <= y <= 255 and -30000000 <= z <= 30000000):
+            logger.warning(f"Coordinate out of bounds: ({x}, {y}, {z})")
+            continue
+        
+        # Simple setblock command
+        commands.append(f"setblock {x} {y} {z} sandstone")
+        blocks_placed += 1
+        
+        # Markers every 20 points
+        if i % 20 == 0 and y < 255:
+            commands.append(f"setblock {x} {y+1} {z} glowstone")
+    
+    logger.info(f"Generated {len(commands)} commands to place {blocks_placed} blocks")
+    
+    result = {
+        "total_minecraft_points": len(minecraft_coords),
+        "blocks_to_place": blocks_placed,
+        "minecraft_coordinates": minecraft_coords,
+        "build_commands": commands
+    }
+    
+    return result
+
+def horizon_heightmap_to_json(heightmap) -> str:
+    """
+    Format a cached heightmap like convert_horizon_to_minecraft output.
+    
+    The heightmap is an (N, 6) array of Minecraft x, y, z followed by the
+    original x, y, z of the source point (see horizon_cache.HEIGHTMAP_COLUMNS).
+    """
+    minecraft_coords = [
+        {
+            "x": int(mc_x),
+            "y": int(mc_y),
+            "z": int(mc_z),
+            "original_x": orig_x,
+            "original_y": orig_y,
+            "original_z": orig_z
+        }
+        for mc_x, mc_y, mc_z, orig_x, orig_y, orig_z in heightmap.tolist()
+    ]
+    return json.dumps(_horizon_build_result(minecraft_coords), indent=2)
+
 @tool
 def download_horizon_data(horizon_id: str) -> str:
     """
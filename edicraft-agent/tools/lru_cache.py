@@ -0,0 +1,177 @@
+"""
+Byte-bounded LRU cache for in-memory well data.
+
+Entries are sized once when they are inserted, so keeping the cache under
+its byte budget and reporting its size are O(1). Entries can expire after a
+TTL, and hit/miss/eviction counters are kept for monitoring. All operations
+are thread-safe.
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Approximate memory footprint of a parsed data structure in bytes.
+
+    Walks dicts, lists, tuples and sets and sums sys.getsizeof of every
+    object reached, counting shared objects once. numpy arrays report their
+    own data buffer through sys.getsizeof (views and memory maps do not).
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
+
+
+class ByteLRUCache:
+    """
+    Thread-safe LRU cache bounded by total entry size in bytes.
+
+    Least recently used entries are evicted when an insertion would exceed
+    max_bytes. Entries older than ttl_seconds (if set) are treated as misses
+    and dropped when next accessed.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Callable[[Any], int] = deep_sizeof
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Byte budget for all cached entries
+            ttl_seconds: Optional time-to-live per entry; None or 0 disables expiry
+            sizeof: Function measuring an entry's size, called once per insertion
+        """
+        self.max_bytes = int(max_bytes)
+        self.ttl_seconds = ttl_seconds or None
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, inserted_at)
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, inserted_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - inserted_at > self.ttl_seconds
+
+    def _drop(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it most recently used, or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._expired(entry[2], time.monotonic()):
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Insert or replace an entry, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Entry size in bytes; measured with the cache's sizeof if None
+
+        Returns:
+            False if the entry alone exceeds max_bytes and was not cached
+        """
+        size = self._sizeof(value) if size is None else int(size)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return False
+            while self._entries and self._total_bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+            self._entries[key] = (value, size, time.monotonic())
+            self._total_bytes += size
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value, or default if absent."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key][0]
+            self._drop(key)
+            return value
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def keys(self) -> List[Hashable]:
+        """Keys from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[2], time.monotonic())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, bytes used, budget, TTL and counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -1,12 +1,113 @@
 import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
 from rcon import Client
 
+
+class CommandRateLimiter:
+    """Token bucket limiting RCON commands per second across all threads."""
+
+    def __init__(self, commands_per_second: float, burst: Optional[int] = None):
+        self.rate = float(commands_per_second)
+        self.capacity = float(burst or max(1, int(commands_per_second)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a command may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _limiter_from_env() -> Optional[CommandRateLimiter]:
+    rate = float(os.getenv('MINECRAFT_RCON_MAX_COMMANDS_PER_SECOND', '0') or 0)
+    return CommandRateLimiter(rate) if rate > 0 else None
+
+
+_rate_limiter = _limiter_from_env()
+
+
+def set_rcon_rate_limit(commands_per_second: Optional[float]):
+    """Limit RCON commands per second for this process (None or 0 disables the limit)."""
+    global _rate_limiter
+    _rate_limiter = CommandRateLimiter(commands_per_second) if commands_per_second else None
+
+
+class CommandCheckpoint:
+    """
+    Command counter for resuming a build part-way through.
+
+    While active on a thread (see rcon_checkpoint), every execute_rcon_command
+    call on that thread is numbered. Commands numbered below skip_until were
+    applied by an earlier run and are not sent again. The watermark counts
+    the commands applied without a gap; after the first RCON error the
+    remaining commands are not sent, so a later run resumes from there.
+    """
+
+    def __init__(self, skip_until: int = 0, on_progress: Optional[Callable[[int], None]] = None):
+        self.skip_until = skip_until
+        self.on_progress = on_progress
+        self.issued = 0
+        self.watermark = skip_until
+        self.error: Optional[str] = None
+
+
+_checkpoint_local = threading.local()
+
+
+@contextmanager
+def rcon_checkpoint(skip_until: int = 0, on_progress: Optional[Callable[[int], None]] = None):
+    """Number, skip and track RCON commands sent by the current thread."""
+    checkpoint = CommandCheckpoint(skip_until, on_progress)
+    previous = getattr(_checkpoint_local, 'checkpoint', None)
+    _checkpoint_local.checkpoint = checkpoint
+    try:
+        yield checkpoint
+    finally:
+        _checkpoint_local.checkpoint = previous
+
+
 def execute_rcon_command(command: str) -> str:
     """Execute a command on the Minecraft server via RCON."""
+    checkpoint = getattr(_checkpoint_local, 'checkpoint', None)
+    if checkpoint is not None:
+        index = checkpoint.issued
+        checkpoint.issued += 1
+        if index < checkpoint.skip_until:
+            return f"Command skipped (already applied): {command}"
+        if checkpoint.error is not None:
+            return f"RCON Error: not sent after earlier failure ({checkpoint.error})"
+
+    response = _send_rcon_command(command)
+
+    if checkpoint is not None:
+        if response.startswith("RCON Error"):
+            checkpoint.error = response[len("RCON Error: "):]
+        else:
+            checkpoint.watermark = checkpoint.issued
+            if checkpoint.on_progress:
+                checkpoint.on_progress(checkpoint.watermark)
+    return response
+
+
+def _send_rcon_command(command: str) -> str:
     host = os.getenv('MINECRAFT_HOST', 'localhost')
     port = int(os.getenv('MINECRAFT_RCON_PORT', '25575'))
     password = os.getenv('MINECRAFT_RCON_PASSWORD', '')
-    
+
+    limiter = _rate_limiter
+    if limiter:
+        limiter.acquire()
+
     try:
         with Client(host, port, passwd=password) as client:
             response = client.run(command)
@@ -432,7 +432,9 @@ Would you like to try one of these options?"""
         wells_built: int,
         wells_failed: int,
         total_wells: int,
-        failed_wells: Optional[List[str]] = None
+        failed_wells: Optional[List[str]] = None,
+        pipeline_stats: Optional[List[Dict[str, Any]]] = None,
+        resumed_wells: int = 0
     ) -> str:
         """
         Generate collection visualization summary response.
@@ -443,6 +445,8 @@ Would you like to try one of these options?"""
             wells_failed: Number of wells that failed
             total_wells: Total number of wells in collection
             failed_wells: Optional list of failed well names
+            pipeline_stats: Optional per-stage build pipeline statistics
+            resumed_wells: Wells already built by an interrupted earlier run
         
         Returns:
             Cloudscape-formatted collection summary
@@ -457,6 +461,23 @@ Would you like to try one of these options?"""
 {failed_list}
 """
         
+        pipeline_section = ""
+        if pipeline_stats:
+            stage_lines = "\n".join([
+                f"  - {s['stage']}: {s['processed']} ok, {s['failed']} failed, "
+                f"{s['throughput_per_second']} wells/s, max queue {s['max_queue_depth']}, "
+                f"{int(s['utilization'] * 100)}% busy ({s['workers']} workers)"
+                for s in pipeline_stats
+            ])
+            pipeline_section = f"""
+**Pipeline Stages:**
+{stage_lines}
+"""
+        
+        resumed_line = ""
+        if resumed_wells:
+            resumed_line = f"- **Resumed:** {resumed_wells} wells already built by an earlier run\n"
+        
         return f"""{CloudscapeResponseBuilder.SUCCESS_ICON} **Collection Visualization Complete**
 
 **Collection:** {collection_name}
@@ -466,7 +487,7 @@ Would you like to try one of these options?"""
 - **Successfully Built:** {wells_built}
 - **Failed:** {wells_failed}
 - **Success Rate:** {success_rate}%
-{failed_section}
+{resumed_line}{failed_section}{pipeline_section}
 {CloudscapeResponseBuilder.TIP_ICON} **Tip:** All wellbores are now visible in Minecraft! You can explore the collection in 3D."""
     
     @staticmethod
@@ -7,11 +7,37 @@ supporting collection-based visualization workflows.
 
 import os
 import json
-import csv
-import io
+import time
+import threading
 import boto3
-from typing import Dict, List, Any, Optional, Tuple
-from botocore.exceptions import ClientError, NoCredentialsError
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from botocore.exceptions import (
+    ClientError, NoCredentialsError, EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError
+)
+
+from .lru_cache import ByteLRUCache
+from .s3_disk_cache import S3ObjectDiskCache, create_s3_disk_cache
+from .trajectory_parsers import (
+    COORDINATE_FIELDS, SURVEY_FIELDS, load_json, points_to_columns,
+    csv_headers, parse_csv_columns, parse_las_columns, valid_rows
+)
+from .collection_manifest import (
+    DEFAULT_MANIFEST_TTL_SECONDS, MANIFEST_VERSION, manifest_key, summarize_trajectory, diff_listing,
+    new_manifest, manifest_expired
+)
+
+# Default memory budget for cached trajectory data
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Accepted CSV headers for survey columns (lowercased)
+CSV_SURVEY_HEADERS = {
+    "tvd": ("tvd",),
+    "azimuth": ("azimuth",),
+    "inclination": ("inclination",),
+    "measured_depth": ("measured_depth", "measureddepth")
+}
 
 
 class S3WellDataAccess:
@@ -25,12 +51,34 @@ class S3WellDataAccess:
     - Cache data to reduce S3 API calls
     """
     
-    def __init__(self, bucket_name: Optional[str] = None):
+    def __init__(
+        self,
+        bucket_name: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        endpoint_url: Optional[str] = None,
+        disk_cache_dir: Optional[str] = None,
+        manifest_ttl_seconds: Optional[float] = None,
+        disk_cache: bool = True
+    ):
         """
         Initialize S3 data access client.
         
         Args:
             bucket_name: S3 bucket name. If None, uses RENEWABLE_S3_BUCKET env var
+            cache_max_bytes: Memory budget for cached trajectories. If None, uses
+                EDICRAFT_S3_CACHE_MAX_BYTES env var or 256 MB
+            cache_ttl_seconds: Lifetime of cached trajectories. If None, uses
+                EDICRAFT_S3_CACHE_TTL_SECONDS env var (0 or unset = no expiry)
+            endpoint_url: Optional S3-compatible endpoint (e.g. a local S3 stand-in).
+                If None, uses EDICRAFT_S3_ENDPOINT_URL env var or AWS S3
+            disk_cache_dir: Directory for the persistent object cache. If None, uses
+                the S3ObjectDiskCache defaults (EDICRAFT_S3_DISK_CACHE=false disables it)
+            manifest_ttl_seconds: Age after which a collection manifest is checked
+                against the prefix listing. If None, uses
+                EDICRAFT_COLLECTION_MANIFEST_TTL_SECONDS env var or 300 (0 = every listing)
+            disk_cache: Set False to keep trajectories in memory only, regardless of
+                EDICRAFT_S3_DISK_CACHE
         """
         self.bucket_name = bucket_name or os.getenv('RENEWABLE_S3_BUCKET', '')
         
@@ -41,13 +89,33 @@ class S3WellDataAccess:
         
         # Initialize S3 client
         try:
-            self.s3_client = boto3.client('s3')
+            self.s3_client = boto3.client(
+                's3',
+                endpoint_url=endpoint_url or os.getenv('EDICRAFT_S3_ENDPOINT_URL') or None
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to initialize S3 client: {str(e)}")
         
-        # Initialize data cache
-        self._trajectory_cache: Dict[str, Dict[str, Any]] = {}
+        # Initialize data cache (byte-bounded LRU, sized once at insertion)
+        self._trajectory_cache = ByteLRUCache(
+            max_bytes=cache_max_bytes or int(os.getenv('EDICRAFT_S3_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES)),
+            ttl_seconds=cache_ttl_seconds or float(os.getenv('EDICRAFT_S3_CACHE_TTL_SECONDS', '0') or 0)
+        )
         self._cache_enabled = True
+        self.manifest_ttl_seconds = (
+            manifest_ttl_seconds if manifest_ttl_seconds is not None
+            else float(os.getenv('EDICRAFT_COLLECTION_MANIFEST_TTL_SECONDS', DEFAULT_MANIFEST_TTL_SECONDS))
+        )
+        
+        # Persistent disk tier under the memory cache (ETag-revalidated)
+        if not disk_cache:
+            self._disk_cache = None
+        elif disk_cache_dir:
+            self._disk_cache = S3ObjectDiskCache(cache_dir=disk_cache_dir)
+        else:
+            self._disk_cache = create_s3_disk_cache()
+        self._disk_stats = {"downloads": 0, "revalidated": 0, "stale_served": 0}
+        self._disk_stats_lock = threading.Lock()
     
     def enable_cache(self, enabled: bool = True):
         """Enable or disable data caching."""
@@ -68,7 +136,65 @@ class S3WellDataAccess:
     def _add_to_cache(self, s3_key: str, data: Dict[str, Any]):
         """Add trajectory data to cache."""
         if self._cache_enabled:
-            self._trajectory_cache[s3_key] = data
+            if not self._trajectory_cache.put(s3_key, data):
+                print(f"[S3_DATA_ACCESS] Not caching {s3_key}: larger than cache budget")
+    
+    def _count_disk(self, counter: str):
+        with self._disk_stats_lock:
+            self._disk_stats[counter] += 1
+    
+    def _get_object_bytes(self, s3_key: str) -> bytes:
+        """
+        Get an object's bytes, using the disk cache when it is still current.
+        
+        A cached copy is revalidated with a conditional GET (If-None-Match on
+        its ETag), so an unchanged object costs one request and no transfer.
+        If S3 cannot be reached the cached copy is served as-is.
+        
+        Raises:
+            ClientError, NoCredentialsError and connection errors from boto3 when
+            there is no usable cached copy
+        """
+        cached = self._disk_cache.get(self.bucket_name, s3_key) if self._disk_cache else None
+        
+        request = {"Bucket": self.bucket_name, "Key": s3_key}
+        if cached and cached[1].get('etag'):
+            request["IfNoneMatch"] = cached[1]['etag']
+        
+        try:
+            response = self.s3_client.get_object(**request)
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            if cached and error_code in ('304', 'NotModified'):
+                self._count_disk("revalidated")
+                return cached[0]
+            if error_code == 'NoSuchKey' and self._disk_cache:
+                self._disk_cache.remove(self.bucket_name, s3_key)
+            raise
+        except (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError) as e:
+            if cached:
+                print(f"[S3_DATA_ACCESS] S3 unreachable, serving cached copy of {s3_key}: {str(e)}")
+                self._count_disk("stale_served")
+                return cached[0]
+            raise
+        
+        body = response['Body'].read()
+        self._count_disk("downloads")
+        
+        if self._disk_cache:
+            last_modified = response.get('LastModified')
+            try:
+                self._disk_cache.put(
+                    self.bucket_name,
+                    s3_key,
+                    body,
+                    etag=response.get('ETag'),
+                    last_modified=last_modified.isoformat() if hasattr(last_modified, 'isoformat') else last_modified
+                )
+            except OSError as e:
+                print(f"[S3_DATA_ACCESS] Could not write disk cache for {s3_key}: {str(e)}")
+        
+        return body
 
     
     def get_trajectory_data(self, s3_key: str) -> Dict[str, Any]:
@@ -85,8 +211,12 @@ class S3WellDataAccess:
             Dictionary with:
                 - success: Boolean indicating if data was fetched successfully
                 - data_type: "coordinates" | "survey" | "unknown"
-                - coordinates: List of coordinate dicts (if coordinate format)
-                - survey_data: List of survey point dicts (if survey format)
+                - columns: Dict of field name -> float64 numpy array of the
+                  points, when every value is numeric
+                - coordinates: List of coordinate dicts (coordinate format
+                  without columns only)
+                - survey_data: List of survey point dicts (survey format
+                  without columns only)
                 - metadata: Additional information about the data
                 - error: Error message if failed, None otherwise
         
@@ -94,11 +224,9 @@ class S3WellDataAccess:
             {
                 "success": True,
                 "data_type": "coordinates",
-                "coordinates": [
-                    {"x": 1.0, "y": 2.0, "z": 3.0},
-                    {"x": 1.1, "y": 2.1, "z": 3.1}
-                ],
+                "coordinates": None,
                 "survey_data": None,
+                "columns": {"x": array([1.0, 1.1]), "y": array([2.0, 2.1]), "z": array([3.0, 3.1])},
                 "metadata": {
                     "s3_key": "wells/well-007/trajectory.json",
                     "total_points": 107,
@@ -115,13 +243,8 @@ class S3WellDataAccess:
             return cached_data
         
         try:
-            # Fetch file from S3
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            file_content = response['Body'].read().decode('utf-8')
+            # Fetch file from S3 (or the revalidated disk cache)
+            file_content = self._get_object_bytes(s3_key).decode('utf-8')
             file_size = len(file_content)
             
             # Determine file format from extension
@@ -133,7 +256,7 @@ class S3WellDataAccess:
             elif file_format == 'csv':
                 result = self._parse_csv_trajectory(file_content, s3_key)
             elif file_format == 'las':
-                result = self.parse_las_file(s3_key)
+                result = self.parse_las_file(s3_key, content=file_content)
             else:
                 result = {
                     "success": False,
@@ -226,10 +349,43 @@ class S3WellDataAccess:
         
         return 'unknown'
     
+    def _is_columnar(self, data: Any, fields: Tuple[str, ...]) -> bool:
+        """Whether JSON trajectory data is a dict of equal-length value lists."""
+        return (
+            isinstance(data, dict)
+            and all(isinstance(data.get(k), list) for k in fields)
+            and len({len(data[k]) for k in fields}) == 1
+        )
+    
+    def _json_point_columns(
+        self,
+        points: List[Any],
+        fields: Tuple[str, ...]
+    ) -> Tuple[Optional[Dict[str, np.ndarray]], Optional[int]]:
+        """
+        Convert JSON point dicts to column arrays in one pass.
+        
+        Returns:
+            (columns, None) on success; (None, index) for the first point
+            missing a field; (None, None) when every point has the fields
+            but some values are not numeric (passed through unchanged)
+        """
+        try:
+            return points_to_columns(points, fields), None
+        except ValueError:
+            return None, None
+        except (KeyError, TypeError, IndexError):
+            pass
+        for i, point in enumerate(points):
+            if not isinstance(point, dict) or not all(k in point for k in fields):
+                return None, i
+        return None, None
+    
     def _parse_json_trajectory(self, content: str, s3_key: str) -> Dict[str, Any]:
         """Parse JSON trajectory file."""
         try:
-            data = json.loads(content)
+            data = load_json(content)
+            columns = None
             
             # Check for coordinates format
             if isinstance(data, list):
@@ -279,50 +435,66 @@ class S3WellDataAccess:
                     "error": "JSON must be an array or object with trajectory data."
                 }
             
+            # Columnar layout: {"coordinates": {"x": [...], "y": [...], "z": [...]}}
+            if data_type == "coordinates" and self._is_columnar(coordinates, COORDINATE_FIELDS):
+                columns = {k: np.asarray(coordinates[k], dtype=float) for k in COORDINATE_FIELDS}
+            elif data_type == "survey" and self._is_columnar(survey_data, SURVEY_FIELDS):
+                has_md = self._is_columnar(survey_data, SURVEY_FIELDS + ("measured_depth",))
+                fields = SURVEY_FIELDS + (("measured_depth",) if has_md else ())
+                columns = {k: np.asarray(survey_data[k], dtype=float) for k in fields}
+            
             # Validate data structure
-            if data_type == "coordinates" and coordinates:
+            elif data_type == "coordinates" and coordinates:
                 # Ensure all coordinates have x, y, z
-                for i, coord in enumerate(coordinates):
-                    if not isinstance(coord, dict) or not all(k in coord for k in ["x", "y", "z"]):
-                        return {
-                            "success": False,
-                            "data_type": "coordinates",
-                            "coordinates": None,
-                            "survey_data": None,
-                            "metadata": {
-                                "s3_key": s3_key,
-                                "file_format": "json",
-                                "total_points": len(coordinates),
-                                "cached": False
-                            },
-                            "error": f"Coordinate at index {i} missing required fields (x, y, z)"
-                        }
+                columns, bad_index = self._json_point_columns(coordinates, COORDINATE_FIELDS)
+                if bad_index is not None:
+                    return {
+                        "success": False,
+                        "data_type": "coordinates",
+                        "coordinates": None,
+                        "survey_data": None,
+                        "metadata": {
+                            "s3_key": s3_key,
+                            "file_format": "json",
+                            "total_points": len(coordinates),
+                            "cached": False
+                        },
+                        "error": f"Coordinate at index {bad_index} missing required fields (x, y, z)"
+                    }
             
             elif data_type == "survey" and survey_data:
-                # Ensure all survey points have required fields
-                for i, point in enumerate(survey_data):
-                    if not isinstance(point, dict) or not all(k in point for k in ["tvd", "azimuth", "inclination"]):
-                        return {
-                            "success": False,
-                            "data_type": "survey",
-                            "coordinates": None,
-                            "survey_data": None,
-                            "metadata": {
-                                "s3_key": s3_key,
-                                "file_format": "json",
-                                "total_points": len(survey_data),
-                                "cached": False
-                            },
-                            "error": f"Survey point at index {i} missing required fields (tvd, azimuth, inclination)"
-                        }
+                # Ensure all survey points have required fields; keep measured depth when every point has it
+                columns, bad_index = self._json_point_columns(survey_data, SURVEY_FIELDS + ("measured_depth",))
+                if columns is None:
+                    columns, bad_index = self._json_point_columns(survey_data, SURVEY_FIELDS)
+                if bad_index is not None:
+                    return {
+                        "success": False,
+                        "data_type": "survey",
+                        "coordinates": None,
+                        "survey_data": None,
+                        "metadata": {
+                            "s3_key": s3_key,
+                            "file_format": "json",
+                            "total_points": len(survey_data),
+                            "cached": False
+                        },
+                        "error": f"Survey point at index {bad_index} missing required fields (tvd, azimuth, inclination)"
+                    }
             
-            total_points = len(coordinates) if coordinates else len(survey_data) if survey_data else 0
+            if columns is not None:
+                # Points are built from the columns by the callers that need them
+                total_points = len(next(iter(columns.values())))
+                coordinates = survey_data = None
+            else:
+                total_points = len(coordinates) if coordinates else len(survey_data) if survey_data else 0
             
             return {
                 "success": True,
                 "data_type": data_type,
                 "coordinates": coordinates,
                 "survey_data": survey_data,
+                "columns": columns,
                 "metadata": {
                     "s3_key": s3_key,
                     "file_format": "json",
@@ -349,10 +521,8 @@ class S3WellDataAccess:
     def _parse_csv_trajectory(self, content: str, s3_key: str) -> Dict[str, Any]:
         """Parse CSV trajectory file."""
         try:
-            reader = csv.DictReader(io.StringIO(content))
-            rows = list(reader)
-            
-            if not rows:
+            body = content.split('\n', 1)[1] if '\n' in content else ''
+            if not body.strip():
                 return {
                     "success": False,
                     "data_type": "unknown",
@@ -367,41 +537,36 @@ class S3WellDataAccess:
                 }
             
             # Detect format from headers
-            headers = set(k.lower() for k in rows[0].keys())
+            headers = set(csv_headers(content))
             
             # Check for coordinate format (x, y, z)
             if all(h in headers for h in ['x', 'y', 'z']):
-                coordinates = []
-                for i, row in enumerate(rows):
-                    try:
-                        coordinates.append({
-                            "x": float(row.get('x', row.get('X', 0))),
-                            "y": float(row.get('y', row.get('Y', 0))),
-                            "z": float(row.get('z', row.get('Z', 0)))
-                        })
-                    except (ValueError, TypeError) as e:
-                        return {
-                            "success": False,
-                            "data_type": "coordinates",
-                            "coordinates": None,
-                            "survey_data": None,
-                            "metadata": {
-                                "s3_key": s3_key,
-                                "file_format": "csv",
-                                "cached": False
-                            },
-                            "error": f"Invalid coordinate values at row {i}: {str(e)}"
-                        }
+                try:
+                    columns = parse_csv_columns(content, {k: (k,) for k in COORDINATE_FIELDS})
+                except ValueError as e:
+                    return {
+                        "success": False,
+                        "data_type": "coordinates",
+                        "coordinates": None,
+                        "survey_data": None,
+                        "metadata": {
+                            "s3_key": s3_key,
+                            "file_format": "csv",
+                            "cached": False
+                        },
+                        "error": f"Invalid coordinate values: {str(e)}"
+                    }
                 
                 return {
                     "success": True,
                     "data_type": "coordinates",
-                    "coordinates": coordinates,
+                    "coordinates": None,
                     "survey_data": None,
+                    "columns": columns,
                     "metadata": {
                         "s3_key": s3_key,
                         "file_format": "csv",
-                        "total_points": len(coordinates),
+                        "total_points": len(columns["x"]),
                         "cached": False
                     },
                     "error": None
@@ -409,38 +574,34 @@ class S3WellDataAccess:
             
             # Check for survey format (tvd, azimuth, inclination)
             elif all(h in headers for h in ['tvd', 'azimuth', 'inclination']):
-                survey_data = []
-                for i, row in enumerate(rows):
-                    try:
-                        survey_data.append({
-                            "tvd": float(row.get('tvd', row.get('TVD', 0))),
-                            "azimuth": float(row.get('azimuth', row.get('Azimuth', 0))),
-                            "inclination": float(row.get('inclination', row.get('Inclination', 0))),
-                            "measured_depth": float(row.get('measured_depth', row.get('MeasuredDepth', 0)))
-                        })
-                    except (ValueError, TypeError) as e:
-                        return {
-                            "success": False,
-                            "data_type": "survey",
-                            "coordinates": None,
-                            "survey_data": None,
-                            "metadata": {
-                                "s3_key": s3_key,
-                                "file_format": "csv",
-                                "cached": False
-                            },
-                            "error": f"Invalid survey values at row {i}: {str(e)}"
-                        }
+                try:
+                    columns = parse_csv_columns(content, CSV_SURVEY_HEADERS)
+                except ValueError as e:
+                    return {
+                        "success": False,
+                        "data_type": "survey",
+                        "coordinates": None,
+                        "survey_data": None,
+                        "metadata": {
+                            "s3_key": s3_key,
+                            "file_format": "csv",
+                            "cached": False
+                        },
+                        "error": f"Invalid survey values: {str(e)}"
+                    }
+                if "measured_depth" not in columns:
+                    columns["measured_depth"] = np.zeros(len(columns["tvd"]))
                 
                 return {
                     "success": True,
                     "data_type": "survey",
                     "coordinates": None,
-                    "survey_data": survey_data,
+                    "survey_data": None,
+                    "columns": columns,
                     "metadata": {
                         "s3_key": s3_key,
                         "file_format": "csv",
-                        "total_points": len(survey_data),
+                        "total_points": len(columns["tvd"]),
                         "cached": False
                     },
                     "error": None
@@ -476,7 +637,7 @@ class S3WellDataAccess:
             }
 
     
-    def parse_las_file(self, s3_key: str) -> Dict[str, Any]:
+    def parse_las_file(self, s3_key: str, content: Optional[str] = None) -> Dict[str, Any]:
         """
         Parse LAS file format from S3 and extract trajectory data.
         
@@ -485,6 +646,7 @@ class S3WellDataAccess:
         
         Args:
             s3_key: S3 object key for the LAS file
+            content: Optional file content already fetched by the caller
         
         Returns:
             Dictionary with parsed trajectory data in standardized format
@@ -497,64 +659,16 @@ class S3WellDataAccess:
             ~ASCII Log Data (actual data values)
         """
         try:
-            # Fetch LAS file from S3
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            content = response['Body'].read().decode('utf-8', errors='ignore')
-            lines = content.split('\n')
+            # Fetch LAS file from S3 unless the caller already has its content
+            if content is None:
+                content = self._get_object_bytes(s3_key).decode('utf-8', errors='ignore')
+            las = parse_las_columns(content)
+            curve_names = las['curve_names']
+            curve_units = las['curve_units']
+            well_info = las['well_info']
+            data = las['data']
             
-            # Parse LAS sections
-            current_section = None
-            curve_names = []
-            curve_units = []
-            data_lines = []
-            well_info = {}
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Detect section headers
-                if line.startswith('~'):
-                    section_name = line[1:].split()[0].upper()
-                    current_section = section_name
-                    continue
-                
-                # Parse based on current section
-                if current_section == 'WELL':
-                    # Extract well information
-                    if '.' in line and ':' in line:
-                        parts = line.split('.')
-                        if len(parts) >= 2:
-                            mnemonic = parts[0].strip()
-                            rest = parts[1].split(':')
-                            if len(rest) >= 2:
-                                value = rest[0].strip()
-                                well_info[mnemonic] = value
-                
-                elif current_section == 'CURVE' or current_section == 'CURVES':
-                    # Extract curve names and units
-                    if '.' in line:
-                        parts = line.split('.')
-                        if len(parts) >= 2:
-                            mnemonic = parts[0].strip()
-                            rest = parts[1].split()
-                            unit = rest[0] if rest else ''
-                            curve_names.append(mnemonic)
-                            curve_units.append(unit)
-                
-                elif current_section == 'A' or current_section == 'ASCII':
-                    # Data section - collect data lines
-                    if not line.startswith('~'):
-                        data_lines.append(line)
-            
-            if not curve_names or not data_lines:
+            if not curve_names or not las['has_data']:
                 return {
                     "success": False,
                     "data_type": "unknown",
@@ -568,22 +682,7 @@ class S3WellDataAccess:
                     "error": "No curve data found in LAS file"
                 }
             
-            # Parse data lines
-            parsed_data = []
-            for line in data_lines:
-                values = line.split()
-                if len(values) == len(curve_names):
-                    try:
-                        row = {
-                            curve_names[i]: float(values[i]) 
-                            for i in range(len(curve_names))
-                        }
-                        parsed_data.append(row)
-                    except ValueError:
-                        # Skip lines with non-numeric values
-                        continue
-            
-            if not parsed_data:
+            if data.shape[0] == 0:
                 return {
                     "success": False,
                     "data_type": "unknown",
@@ -608,32 +707,22 @@ class S3WellDataAccess:
             z_idx = self._find_curve_index(curve_names_lower, ['z', 'tvd', 'depth', 'md'])
             
             if x_idx is not None and y_idx is not None and z_idx is not None:
-                # Extract coordinates
-                coordinates = []
-                for row in parsed_data:
-                    x_val = row.get(curve_names[x_idx])
-                    y_val = row.get(curve_names[y_idx])
-                    z_val = row.get(curve_names[z_idx])
-                    
-                    if x_val is not None and y_val is not None and z_val is not None:
-                        # Filter out null values (common in LAS: -999.25, -9999)
-                        if x_val > -999 and y_val > -999 and z_val > -999:
-                            coordinates.append({
-                                "x": float(x_val),
-                                "y": float(y_val),
-                                "z": float(z_val)
-                            })
+                # Filter out null values (common in LAS: -999.25, -9999)
+                x, y, z = data[:, x_idx], data[:, y_idx], data[:, z_idx]
+                mask = valid_rows(x, y, z)
+                columns = {"x": x[mask], "y": y[mask], "z": z[mask]}
                 
-                if coordinates:
+                if mask.any():
                     return {
                         "success": True,
                         "data_type": "coordinates",
-                        "coordinates": coordinates,
+                        "coordinates": None,
                         "survey_data": None,
+                        "columns": columns,
                         "metadata": {
                             "s3_key": s3_key,
                             "file_format": "las",
-                            "total_points": len(coordinates),
+                            "total_points": int(mask.sum()),
                             "curve_names": curve_names,
                             "well_info": well_info,
                             "cached": False
@@ -648,34 +737,28 @@ class S3WellDataAccess:
             md_idx = self._find_curve_index(curve_names_lower, ['md', 'measured_depth', 'dept', 'depth'])
             
             if tvd_idx is not None and azim_idx is not None and incl_idx is not None:
-                # Extract survey data
-                survey_data = []
-                for row in parsed_data:
-                    tvd_val = row.get(curve_names[tvd_idx])
-                    azim_val = row.get(curve_names[azim_idx])
-                    incl_val = row.get(curve_names[incl_idx])
-                    md_val = row.get(curve_names[md_idx]) if md_idx is not None else 0
-                    
-                    if tvd_val is not None and azim_val is not None and incl_val is not None:
-                        # Filter out null values
-                        if tvd_val > -999 and azim_val > -999 and incl_val > -999:
-                            survey_data.append({
-                                "tvd": float(tvd_val),
-                                "azimuth": float(azim_val),
-                                "inclination": float(incl_val),
-                                "measured_depth": float(md_val) if md_val is not None else 0
-                            })
+                # Filter out null values
+                tvd, azim, incl = data[:, tvd_idx], data[:, azim_idx], data[:, incl_idx]
+                mask = valid_rows(tvd, azim, incl)
+                md = data[:, md_idx] if md_idx is not None else np.zeros(len(data))
+                columns = {
+                    "tvd": tvd[mask],
+                    "azimuth": azim[mask],
+                    "inclination": incl[mask],
+                    "measured_depth": md[mask]
+                }
                 
-                if survey_data:
+                if mask.any():
                     return {
                         "success": True,
                         "data_type": "survey",
                         "coordinates": None,
-                        "survey_data": survey_data,
+                        "survey_data": None,
+                        "columns": columns,
                         "metadata": {
                             "s3_key": s3_key,
                             "file_format": "las",
-                            "total_points": len(survey_data),
+                            "total_points": int(mask.sum()),
                             "curve_names": curve_names,
                             "well_info": well_info,
                             "cached": False
@@ -695,7 +778,7 @@ class S3WellDataAccess:
                     "curve_names": curve_names,
                     "curve_units": curve_units,
                     "well_info": well_info,
-                    "total_rows": len(parsed_data),
+                    "total_rows": int(data.shape[0]),
                     "cached": False
                 },
                 "error": "No trajectory curves found in LAS file. Available curves: " + ", ".join(curve_names)
@@ -746,21 +829,85 @@ class S3WellDataAccess:
         return None
 
     
-    def list_collection_wells(self, collection_prefix: str) -> Dict[str, Any]:
+    def _list_collection_objects(self, collection_prefix: str) -> List[Dict[str, Any]]:
+        """
+        Walk a collection prefix and return one entry per trajectory file.
+        
+        Raises:
+            ClientError, NoCredentialsError from boto3
+        """
+        # List objects in S3 with the collection prefix
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=collection_prefix
+        )
+        
+        wells = []
+        trajectory_extensions = ['.json', '.csv', '.las']
+        
+        for page in pages:
+            if 'Contents' not in page:
+                continue
+            
+            for obj in page['Contents']:
+                s3_key = obj['Key']
+                
+                # Skip if not a trajectory file
+                if not any(s3_key.lower().endswith(ext) for ext in trajectory_extensions):
+                    continue
+                
+                # Skip directory markers and the collection manifest
+                if s3_key.endswith('/') or s3_key == manifest_key(collection_prefix):
+                    continue
+                
+                # Extract well name from path
+                # Expected format: collections/collection-123/well-001/trajectory.json
+                path_parts = s3_key.replace(collection_prefix, '').split('/')
+                well_name = path_parts[0] if path_parts else "unknown"
+                file_name = path_parts[-1] if len(path_parts) > 1 else s3_key.split('/')[-1]
+                
+                wells.append({
+                    "s3_key": s3_key,
+                    "well_name": well_name,
+                    "file_name": file_name,
+                    "file_size": obj.get('Size', 0),
+                    "last_modified": obj.get('LastModified').isoformat() if obj.get('LastModified') else None,
+                    "etag": obj.get('ETag')
+                })
+        
+        # Sort wells by name for consistent ordering
+        wells.sort(key=lambda w: w['well_name'])
+        return wells
+    
+    def list_collection_wells(
+        self,
+        collection_prefix: str,
+        use_manifest: bool = True,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         List all well files in collection prefix.
         
-        Scans S3 bucket for trajectory files under the specified collection prefix.
-        Returns S3 keys for all trajectory files found.
+        Reads the collection manifest when one exists (a single small object
+        read); otherwise scans S3 bucket for trajectory files under the
+        specified collection prefix. A manifest older than manifest_ttl_seconds,
+        or any manifest when refresh is True, is first brought up to date with
+        update_collection_manifest. Returns S3 keys for all trajectory files found.
         
         Args:
             collection_prefix: S3 prefix for the collection (e.g., "collections/collection-123/")
+            use_manifest: Use the collection manifest if available (default: True).
+                Set False to force a full prefix walk.
+            refresh: Check the manifest against the prefix listing regardless of its age
         
         Returns:
             Dictionary with:
                 - success: Boolean indicating if listing was successful
-                - wells: List of well file information dicts
+                - wells: List of well file information dicts (manifest entries also
+                  carry file_format, surface_location and bbox)
                 - total_wells: Count of wells found
+                - source: "manifest" or "listing"
                 - error: Error message if failed, None otherwise
         
         Example return format:
@@ -786,53 +933,25 @@ class S3WellDataAccess:
             if not collection_prefix.endswith('/'):
                 collection_prefix += '/'
             
-            # List objects in S3 with the collection prefix
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(
-                Bucket=self.bucket_name,
-                Prefix=collection_prefix
-            )
-            
-            wells = []
-            trajectory_extensions = ['.json', '.csv', '.las']
-            
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    s3_key = obj['Key']
-                    
-                    # Skip if not a trajectory file
-                    if not any(s3_key.lower().endswith(ext) for ext in trajectory_extensions):
-                        continue
-                    
-                    # Skip directory markers
-                    if s3_key.endswith('/'):
-                        continue
-                    
-                    # Extract well name from path
-                    # Expected format: collections/collection-123/well-001/trajectory.json
-                    path_parts = s3_key.replace(collection_prefix, '').split('/')
-                    well_name = path_parts[0] if path_parts else "unknown"
-                    file_name = path_parts[-1] if len(path_parts) > 1 else s3_key.split('/')[-1]
-                    
-                    wells.append({
-                        "s3_key": s3_key,
-                        "well_name": well_name,
-                        "file_name": file_name,
-                        "file_size": obj.get('Size', 0),
-                        "last_modified": obj.get('LastModified').isoformat() if obj.get('LastModified') else None
-                    })
-            
-            # Sort wells by name for consistent ordering
-            wells.sort(key=lambda w: w['well_name'])
+            manifest = self.load_collection_manifest(collection_prefix) if use_manifest else None
+            if manifest is not None and (refresh or manifest_expired(manifest, self.manifest_ttl_seconds)):
+                update = self.update_collection_manifest(collection_prefix, manifest=manifest)
+                if not update['success']:
+                    print(f"[S3_DATA_ACCESS] Collection manifest not refreshed: {update['error']}")
+                manifest = update['manifest']
+            if manifest is not None:
+                wells = manifest['wells']
+                source = "manifest"
+            else:
+                wells = self._list_collection_objects(collection_prefix)
+                source = "listing"
             
             return {
                 "success": True,
                 "wells": wells,
                 "total_wells": len(wells),
                 "collection_prefix": collection_prefix,
+                "source": source,
                 "error": None
             }
             
@@ -873,49 +992,220 @@ class S3WellDataAccess:
             }
 
     
+    def load_collection_manifest(self, collection_prefix: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the manifest for a collection.
+        
+        Args:
+            collection_prefix: S3 prefix for the collection
+        
+        Returns:
+            Manifest dict (see collection_manifest), or None if the collection has
+            no readable manifest
+        """
+        if not collection_prefix.endswith('/'):
+            collection_prefix += '/'
+        
+        try:
+            manifest = json.loads(self._get_object_bytes(manifest_key(collection_prefix)).decode('utf-8'))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                print(f"[S3_DATA_ACCESS] Could not read collection manifest: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"[S3_DATA_ACCESS] Ignoring unreadable collection manifest: {str(e)}")
+            return None
+        
+        if manifest.get('manifest_version') != MANIFEST_VERSION or not isinstance(manifest.get('wells'), list):
+            return None
+        return manifest
+    
+    def update_collection_manifest(
+        self,
+        collection_prefix: str,
+        max_concurrency: int = 8,
+        manifest: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create or incrementally update the manifest for a collection.
+        
+        Walks the prefix once and compares the listing with the existing
+        manifest by key and ETag. Only new or changed wells are fetched and
+        summarized (replaced wells are dropped from the trajectory cache
+        first); deleted wells are dropped. The manifest is written back when
+        something changed, or with a new generated_at once it has expired.
+        
+        Args:
+            collection_prefix: S3 prefix for the collection
+            max_concurrency: Maximum number of concurrent well fetches (default: 8)
+            manifest: The current manifest, if the caller already read it
+        
+        Returns:
+            Dictionary with:
+                - success: Boolean indicating if the manifest is up to date
+                - manifest: The current manifest
+                - added, updated, removed, unchanged: Well counts by change type
+                - errors: Wells that could not be summarized (kept without location)
+                - error: Error message if failed, None otherwise
+        """
+        if not collection_prefix.endswith('/'):
+            collection_prefix += '/'
+        
+        try:
+            listed = self._list_collection_objects(collection_prefix)
+            existing = manifest if manifest is not None else self.load_collection_manifest(collection_prefix)
+            unchanged, changed, removed = diff_listing(existing['wells'] if existing else [], listed)
+            known_keys = {well['s3_key'] for well in existing['wells']} if existing else set()
+            for well in changed:
+                if well['s3_key'] in known_keys:
+                    # Replaced since the manifest was written: drop the parsed copy
+                    self._trajectory_cache.pop(well['s3_key'])
+            
+            errors = []
+            
+            def summarize(well: Dict[str, Any]) -> Dict[str, Any]:
+                result = self.get_trajectory_data(well['s3_key'])
+                entry = {**well, **summarize_trajectory(result)}
+                if not result['success']:
+                    errors.append(f"{well['well_name']}: {result['error']}")
+                    entry['etag'] = None  # retried on the next update
+                return entry
+            
+            with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+                refreshed = list(executor.map(summarize, changed))
+            
+            expired = bool(existing) and self.manifest_ttl_seconds > 0 and \
+                manifest_expired(existing, self.manifest_ttl_seconds)
+            if existing and not changed and not removed and not expired:
+                manifest = existing
+            else:
+                manifest = new_manifest(collection_prefix, unchanged + refreshed)
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=manifest_key(collection_prefix),
+                    Body=json.dumps(manifest, separators=(',', ':')).encode('utf-8'),
+                    ContentType='application/json'
+                )
+            
+            return {
+                "success": True,
+                "manifest": manifest,
+                "added": sum(1 for well in changed if well['s3_key'] not in known_keys),
+                "updated": sum(1 for well in changed if well['s3_key'] in known_keys),
+                "removed": len(removed),
+                "unchanged": len(unchanged),
+                "errors": errors if errors else None,
+                "error": None
+            }
+        
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            return {
+                "success": False,
+                "manifest": None,
+                "error": f"S3 error ({error_code}) updating collection manifest: {str(e)}"
+            }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "manifest": None,
+                "error": f"Unexpected error updating collection manifest: {str(e)}"
+            }
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the current cache.
         
+        Sizes are recorded when entries are inserted, so this is O(1) in the
+        size of the cached data.
+        
         Returns:
             Dictionary with cache statistics:
                 - enabled: Whether caching is enabled
                 - total_entries: Number of cached trajectory files
-                - cache_keys: List of S3 keys in cache
-                - total_size_estimate: Estimated memory usage (rough estimate)
+                - cache_keys: List of S3 keys in cache (least recently used first)
+                - total_size_bytes / total_size_mb: Memory used by cached entries
+                - max_bytes: Cache memory budget
+                - ttl_seconds: Entry lifetime (None = no expiry)
+                - hits, misses, evictions, expirations, hit_rate: Cache counters
+                - disk_cache: Persistent disk tier statistics (see get_disk_cache_stats)
         """
-        import sys
-        
-        total_size = 0
-        for data in self._trajectory_cache.values():
-            # Rough estimate of memory usage
-            total_size += sys.getsizeof(str(data))
+        lru_stats = self._trajectory_cache.get_stats()
+        total_size = lru_stats['total_bytes']
         
         return {
             "enabled": self._cache_enabled,
-            "total_entries": len(self._trajectory_cache),
-            "cache_keys": list(self._trajectory_cache.keys()),
+            "total_entries": lru_stats['entries'],
+            "cache_keys": self._trajectory_cache.keys(),
+            "total_size_bytes": total_size,
+            "total_size_mb": round(total_size / (1024 * 1024), 2),
             "total_size_estimate_bytes": total_size,
-            "total_size_estimate_mb": round(total_size / (1024 * 1024), 2)
+            "total_size_estimate_mb": round(total_size / (1024 * 1024), 2),
+            "max_bytes": lru_stats['max_bytes'],
+            "ttl_seconds": lru_stats['ttl_seconds'],
+            "hits": lru_stats['hits'],
+            "misses": lru_stats['misses'],
+            "evictions": lru_stats['evictions'],
+            "expirations": lru_stats['expirations'],
+            "hit_rate": lru_stats['hit_rate'],
+            "disk_cache": self.get_disk_cache_stats()
         }
     
-    def preload_collection_cache(self, collection_prefix: str) -> Dict[str, Any]:
+    def get_disk_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the persistent disk tier.
+        
+        Returns:
+            Dictionary with enabled flag, disk usage and counters for full
+            downloads, ETag revalidations (no transfer) and stale copies served
+            while S3 was unreachable
+        """
+        with self._disk_stats_lock:
+            stats = {"enabled": self._disk_cache is not None, **self._disk_stats}
+        if self._disk_cache:
+            stats.update(self._disk_cache.get_stats())
+        return stats
+    
+    def preload_collection_cache(
+        self,
+        collection_prefix: str,
+        max_concurrency: int = 8,
+        build_order: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
         Preload all trajectory files from a collection into cache.
         
         This is useful for batch operations where multiple wells will be accessed.
-        Reduces S3 API calls by fetching all data upfront.
+        Trajectories are fetched in parallel, starting with the wells that will
+        be built first, so warming a collection takes about as long as its
+        slowest objects rather than the sum of all of them.
         
         Args:
             collection_prefix: S3 prefix for the collection
+            max_concurrency: Maximum number of concurrent S3 fetches (default: 8)
+            build_order: Optional well names or S3 keys in the order they will be
+                built; these are fetched first. Other wells follow in listing order.
+            progress_callback: Optional callable invoked after each well with a dict
+                containing completed, total, well_name, s3_key and status
+                ("cached", "loaded", "failed" or "skipped")
+            cancel_event: Optional threading.Event; once set, wells not yet started
+                are skipped and the preload returns early
         
         Returns:
             Dictionary with preload results:
                 - success: Boolean indicating if preload was successful
                 - loaded_count: Number of trajectories loaded into cache
                 - failed_count: Number of trajectories that failed to load
+                - skipped_count: Number of wells skipped after cancellation
+                - cancelled: Whether the preload was cancelled
+                - elapsed_seconds: Wall time of the preload
                 - errors: List of error messages for failed loads
         """
+        start_time = time.perf_counter()
+        
         # List all wells in collection
         list_result = self.list_collection_wells(collection_prefix)
         
@@ -928,33 +1218,77 @@ class S3WellDataAccess:
             }
         
         wells = list_result['wells']
-        loaded_count = 0
-        failed_count = 0
+        if build_order:
+            priority = {name: rank for rank, name in enumerate(build_order)}
+            wells = sorted(
+                wells,
+                key=lambda w: priority.get(w['well_name'], priority.get(w['s3_key'], len(priority)))
+            )
+        
+        counts = {"loaded": 0, "cached": 0, "failed": 0, "skipped": 0}
         errors = []
+        lock = threading.Lock()
         
-        # Load each trajectory into cache
-        for well in wells:
-            s3_key = well['s3_key']
+        def load_well(well: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+            """Fetch one well into the cache; returns (status, error)."""
+            if cancel_event is not None and cancel_event.is_set():
+                return "skipped", None
             
             # Skip if already in cache
-            if self._get_from_cache(s3_key):
-                loaded_count += 1
-                continue
+            if self._cache_enabled and well['s3_key'] in self._trajectory_cache:
+                return "cached", None
             
             # Fetch and cache trajectory data
-            result = self.get_trajectory_data(s3_key)
-            
+            result = self.get_trajectory_data(well['s3_key'])
             if result['success']:
-                loaded_count += 1
-            else:
-                failed_count += 1
-                errors.append(f"{well['well_name']}: {result['error']}")
+                return "loaded", None
+            return "failed", result['error']
+        
+        def record(well: Dict[str, Any], status: str, error: Optional[str]):
+            with lock:
+                counts[status] += 1
+                if error:
+                    errors.append(f"{well['well_name']}: {error}")
+                completed = sum(counts.values())
+            if progress_callback:
+                try:
+                    progress_callback({
+                        "completed": completed,
+                        "total": len(wells),
+                        "well_name": well['well_name'],
+                        "s3_key": well['s3_key'],
+                        "status": status
+                    })
+                except Exception as e:
+                    print(f"[S3_DATA_ACCESS] Preload progress callback error: {str(e)}")
+        
+        # The executor starts tasks in submission order, so wells built first
+        # are fetched first
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = {executor.submit(load_well, well): well for well in wells}
+            for future in as_completed(futures):
+                well = futures[future]
+                try:
+                    status, error = future.result()
+                except Exception as e:
+                    status, error = "failed", f"Unexpected error: {str(e)}"
+                record(well, status, error)
+        
+        # A listed well that cannot be fetched may have been removed since the
+        # manifest was last checked
+        if counts["failed"] and list_result.get('source') == "manifest":
+            manifest_result = self.update_collection_manifest(collection_prefix, max_concurrency=max_concurrency)
+            if not manifest_result['success']:
+                print(f"[S3_DATA_ACCESS] Collection manifest not refreshed: {manifest_result['error']}")
         
         return {
             "success": True,
-            "loaded_count": loaded_count,
-            "failed_count": failed_count,
+            "loaded_count": counts["loaded"] + counts["cached"],
+            "failed_count": counts["failed"],
+            "skipped_count": counts["skipped"],
+            "cancelled": cancel_event is not None and cancel_event.is_set(),
             "total_wells": len(wells),
+            "elapsed_seconds": round(time.perf_counter() - start_time, 3),
             "errors": errors if errors else None
         }
 
@@ -0,0 +1,178 @@
+"""
+Persistent local disk tier for S3 objects.
+
+Object bodies are stored on disk together with their ETag and LastModified,
+so a restarted agent can revalidate them with a conditional GET
+(If-None-Match) instead of downloading them again, and can still serve them
+when S3 is unreachable. The cache directory is kept under a byte budget with
+least-recently-used eviction.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "edicraft", "s3")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class S3ObjectDiskCache:
+    """
+    Size-bounded on-disk cache of S3 object bodies and their validators.
+
+    Each object is stored as "<hash>.bin" with a "<hash>.json" sidecar holding
+    bucket, key, ETag, LastModified and size. The body's modification time is
+    the LRU clock: reads touch it and eviction removes the oldest first.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the disk cache.
+
+        Args:
+            cache_dir: Cache directory. If None, uses EDICRAFT_S3_DISK_CACHE_DIR env var
+                or ~/.cache/edicraft/s3
+            max_bytes: Byte budget for cached bodies. If None, uses
+                EDICRAFT_S3_DISK_CACHE_MAX_BYTES env var or 1 GB
+        """
+        self.cache_dir = cache_dir or os.getenv('EDICRAFT_S3_DISK_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = int(max_bytes or os.getenv('EDICRAFT_S3_DISK_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _paths(self, bucket: str, key: str) -> Tuple[str, str]:
+        digest = hashlib.sha1(f"{bucket}/{key}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, digest)
+        return base + ".bin", base + ".json"
+
+    def get(self, bucket: str, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Get a cached object body and its metadata.
+
+        Returns:
+            (body, metadata) tuple, or None if the object is not cached
+        """
+        body_path, meta_path = self._paths(bucket, key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable S3 cache entry for {key}: {e}")
+            self.remove(bucket, key)
+            return None
+
+        if len(body) != meta.get('size'):
+            logger.warning(f"Discarding truncated S3 cache entry for {key}")
+            self.remove(bucket, key)
+            return None
+
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return body, meta
+
+    def put(self, bucket: str, key: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """Store an object body with its validators, then enforce the byte budget."""
+        body_path, meta_path = self._paths(bucket, key)
+        meta = {
+            "bucket": bucket,
+            "key": key,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(body)
+        }
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(body_path + suffix, 'wb') as f:
+                f.write(body)
+            with open(meta_path + suffix, 'w') as f:
+                json.dump(meta, f)
+            os.replace(body_path + suffix, body_path)
+            os.replace(meta_path + suffix, meta_path)
+            self._evict()
+
+    def remove(self, bucket: str, key: str):
+        """Delete a cached object if present."""
+        for path in self._paths(bucket, key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """Remove least-recently-used bodies until the cache fits max_bytes."""
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            for stale in (path, path[:-len(".bin")] + ".json"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            total_bytes -= size
+            logger.info(f"Evicted S3 cache file {os.path.basename(path)} ({size} bytes)")
+
+    def clear(self):
+        """Remove every cached object."""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith((".bin", ".json")):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except FileNotFoundError:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the disk cache.
+
+        Returns:
+            Dictionary with object count, bytes on disk and budget
+        """
+        bodies = [name for name in os.listdir(self.cache_dir) if name.endswith(".bin")]
+        return {
+            "cache_dir": self.cache_dir,
+            "objects": len(bodies),
+            "total_bytes": sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in bodies),
+            "max_bytes": self.max_bytes
+        }
+
+
+def create_s3_disk_cache() -> Optional[S3ObjectDiskCache]:
+    """
+    Create the disk cache from environment settings.
+
+    Returns None when disabled with EDICRAFT_S3_DISK_CACHE=false or when the
+    cache directory cannot be created.
+    """
+    if os.getenv('EDICRAFT_S3_DISK_CACHE', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    try:
+        return S3ObjectDiskCache()
+    except OSError as e:
+        logger.warning(f"S3 disk cache disabled: {e}")
+        return None
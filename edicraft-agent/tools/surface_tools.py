@@ -1,84 +1,170 @@
 import json
 import math
+import numpy as np
 from strands import tool
 
+# Interpolation modes supported by build_horizon_surface.
+# "bilinear" uses exactly 4 corner points; the others are scipy griddata
+# methods for scattered horizon picks (3+ points).
+SCATTERED_METHODS = ("linear", "nearest", "cubic")
+INTERPOLATION_METHODS = ("bilinear",) + SCATTERED_METHODS
+
 @tool
-def build_horizon_surface(corner_points: str, block_type: str = "sandstone") -> str:
+def build_horizon_surface(corner_points: str, block_type: str = "sandstone", method: str = "bilinear") -> str:
     """
     Build complete horizon surface from 4 corner points using bilinear interpolation.
-    
+
     Args:
         corner_points: JSON string with 4 corner coordinates: [{"x": 0, "y": 30, "z": 0}, ...]
         block_type: Minecraft block type. Available options: stone, cobblestone, granite, sandstone, packed_mud
-    
+        method: Interpolation method. "bilinear" (default) requires exactly 4 corner points.
+            "linear", "nearest" or "cubic" accept 3 or more scattered points and
+            interpolate them with scipy griddata.
+
     Returns:
         RCON commands to build the complete surface layer by layer
     """
     try:
         points = json.loads(corner_points)
-        if len(points) != 4:
+
+        if method not in INTERPOLATION_METHODS:
+            return f"Error: Unknown interpolation method '{method}'. Available: {', '.join(INTERPOLATION_METHODS)}"
+        if method == "bilinear" and len(points) != 4:
             return "Error: Exactly 4 corner points required"
-        
+        if method != "bilinear" and len(points) < 3:
+            return "Error: At least 3 points required for scattered interpolation"
+
         # Extract coordinates
         coords = [(p["x"], p["y"], p["z"]) for p in points]
-        
+
         # Find bounding box
         min_x = min(c[0] for c in coords)
         max_x = max(c[0] for c in coords)
         min_z = min(c[2] for c in coords)
         max_z = max(c[2] for c in coords)
-        
-        # Generate surface grid using bilinear interpolation
-        surface_points = []
-        
-        for x in range(min_x, max_x + 1):
-            for z in range(min_z, max_z + 1):
-                # Bilinear interpolation to find Y at this X,Z
-                y = interpolate_surface_height(x, z, coords)
-                surface_points.append((x, round(y), z))
-        
-        # Group points by Y level for fill commands
-        layers = {}
-        for x, y, z in surface_points:
-            if y not in layers:
-                layers[y] = []
-            layers[y].append((x, z))
-        
+
+        # Interpolate the whole grid at once; rows are X, columns are Z
+        xs = np.arange(min_x, max_x + 1)
+        zs = np.arange(min_z, max_z + 1)
+        if method == "bilinear":
+            heights = interpolate_surface_grid(xs, zs, coords)
+        else:
+            heights = interpolate_scattered_grid(xs, zs, coords, method)
+
+        # Quantize to block Y levels (round half to even, same as round())
+        y_levels = np.rint(heights).astype(np.int64)
+        total_blocks = y_levels.size
+
         # Generate RCON commands using fill for solid surfaces
         commands = []
-        commands.append(f"# Building horizon surface with {len(surface_points)} blocks using {block_type}")
-        
+        commands.append(f"# Building horizon surface with {total_blocks} blocks using {block_type}")
+
         # Clear area first
-        min_y = min(layers.keys())
-        max_y = max(layers.keys())
+        min_y = int(y_levels.min())
+        max_y = int(y_levels.max())
         commands.append(f"fill {min_x} {min_y} {min_z} {max_x} {max_y} {max_z} air")
-        
+
         # Build solid surfaces layer by layer using fill commands
-        for y in sorted(layers.keys()):
-            layer_points = layers[y]
-            
-            # Create rectangular fills for each Y level
-            x_coords = [p[0] for p in layer_points]
-            z_coords = [p[1] for p in layer_points]
-            
-            if len(layer_points) > 1:
-                # Use fill command for the entire layer
-                layer_min_x, layer_max_x = min(x_coords), max(x_coords)
-                layer_min_z, layer_max_z = min(z_coords), max(z_coords)
-                commands.append(f"fill {layer_min_x} {y} {layer_min_z} {layer_max_x} {y} {layer_max_z} {block_type}")
-            else:
-                # Single block
-                x, z = layer_points[0]
-                commands.append(f"setblock {x} {y} {z} {block_type}")
-        
+        commands.extend(generate_layer_commands(xs, zs, y_levels, block_type))
+
         # Add completion message
         commands.append("say Horizon surface completed!")
-        
+
         return "\n".join(commands)
-        
+
     except Exception as e:
         return f"Error building surface: {str(e)}"
 
+def generate_layer_commands(xs, zs, y_levels, block_type: str) -> list:
+    """
+    Generate one fill (or setblock) command per Y level of a quantized height grid.
+
+    Cells are grouped by Y with a single sort over the flattened grid, and each
+    layer's X/Z extent is reduced per group, so the cost is independent of how
+    many distinct levels the surface spans.
+    """
+    x_grid = np.broadcast_to(np.asarray(xs)[:, None], y_levels.shape).ravel()
+    z_grid = np.broadcast_to(np.asarray(zs)[None, :], y_levels.shape).ravel()
+    y_flat = y_levels.ravel()
+
+    levels, inverse, counts = np.unique(y_flat, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    x_sorted = x_grid[order]
+    z_sorted = z_grid[order]
+    layer_min_x = np.minimum.reduceat(x_sorted, starts)
+    layer_max_x = np.maximum.reduceat(x_sorted, starts)
+    layer_min_z = np.minimum.reduceat(z_sorted, starts)
+    layer_max_z = np.maximum.reduceat(z_sorted, starts)
+
+    commands = []
+    for y, count, x0, x1, z0, z1 in zip(levels.tolist(), counts.tolist(),
+                                         layer_min_x.tolist(), layer_max_x.tolist(),
+                                         layer_min_z.tolist(), layer_max_z.tolist()):
+        if count > 1:
+            # Use fill command for the entire layer
+            commands.append(f"fill {x0} {y} {z0} {x1} {y} {z1} {block_type}")
+        else:
+            # Single block
+            commands.append(f"setblock {x0} {y} {z0} {block_type}")
+    return commands
+
+def interpolate_surface_grid(xs, zs, corner_coords):
+    """
+    Bilinear interpolation of Y over a whole X,Z grid from 4 corner points.
+
+    Vectorized equivalent of interpolate_surface_height; returns an array of
+    shape (len(xs), len(zs)).
+    """
+    corners = sorted(corner_coords, key=lambda c: (c[0], c[2]))
+
+    x_min = min(c[0] for c in corners)
+    x_max = max(c[0] for c in corners)
+    z_min = min(c[2] for c in corners)
+    z_max = max(c[2] for c in corners)
+
+    bottom_left = next(c for c in corners if c[0] == x_min and c[2] == z_min)
+    bottom_right = next(c for c in corners if c[0] == x_max and c[2] == z_min)
+    top_left = next(c for c in corners if c[0] == x_min and c[2] == z_max)
+    top_right = next(c for c in corners if c[0] == x_max and c[2] == z_max)
+
+    shape = (len(xs), len(zs))
+    if x_max == x_min or z_max == z_min:
+        # Degenerate case - return average
+        return np.full(shape, sum(c[1] for c in corners) / 4)
+
+    u = ((np.asarray(xs, dtype=float) - x_min) / (x_max - x_min))[:, None]
+    v = ((np.asarray(zs, dtype=float) - z_min) / (z_max - z_min))[None, :]
+
+    return (bottom_left[1] * (1 - u) * (1 - v) +
+            bottom_right[1] * u * (1 - v) +
+            top_left[1] * (1 - u) * v +
+            top_right[1] * u * v)
+
+def interpolate_scattered_grid(xs, zs, points, method: str = "linear"):
+    """
+    Interpolate Y over an X,Z grid from scattered (x, y, z) points with scipy griddata.
+
+    Cells outside the convex hull of the input (NaN for "linear" and "cubic")
+    are filled with the nearest input value so the surface has no holes.
+    """
+    try:
+        from scipy.interpolate import griddata
+    except ImportError:
+        raise RuntimeError(f"scipy is required for '{method}' interpolation; use method='bilinear' or install scipy")
+
+    pts = np.asarray(points, dtype=float)
+    sample_xz = pts[:, [0, 2]]
+    sample_y = pts[:, 1]
+    grid_x, grid_z = np.meshgrid(np.asarray(xs, dtype=float), np.asarray(zs, dtype=float), indexing="ij")
+
+    heights = griddata(sample_xz, sample_y, (grid_x, grid_z), method=method)
+    holes = np.isnan(heights)
+    if holes.any():
+        heights[holes] = griddata(sample_xz, sample_y, (grid_x[holes], grid_z[holes]), method="nearest")
+    return heights
+
 def interpolate_surface_height(x, z, corner_coords):
     """
     Bilinear interpolation to find Y coordinate at given X,Z from 4 corner points.
@@ -0,0 +1,219 @@
+"""
+Array-producing parsers for trajectory files.
+
+Dense surveys can hold hundreds of thousands of stations, and building a
+Python dict per row dominated per-well build time. These parsers read CSV
+and LAS data blocks with numpy in one pass and return float64 column
+arrays; JSON is decoded with orjson when it is installed (falling back to
+the standard library) and its point lists are converted to columns in a
+single array construction.
+"""
+
+import io
+import json
+import warnings
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+COORDINATE_FIELDS = ("x", "y", "z")
+SURVEY_FIELDS = ("tvd", "azimuth", "inclination")
+
+# LAS readers use values at or below this as nulls (-999.25, -9999, ...)
+LAS_NULL_THRESHOLD = -999
+
+
+def load_json(content) -> Any:
+    """Decode JSON text or bytes, using orjson when available."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def points_to_columns(points: List[Dict[str, Any]], fields: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of point dicts to float column arrays.
+
+    Raises:
+        KeyError, TypeError: If a point is not a dict with every field
+        ValueError: If a value is not numeric
+    """
+    if not points:
+        return {field: np.empty(0) for field in fields}
+    table = np.array(list(map(itemgetter(*fields), points)), dtype=float).reshape(len(points), len(fields))
+    return {field: table[:, i].copy() for i, field in enumerate(fields)}
+
+
+def columns_to_points(columns: Dict[str, np.ndarray], fields: Tuple[str, ...]) -> List[Dict[str, float]]:
+    """Convert column arrays back to a list of point dicts (plain floats)."""
+    rows = np.column_stack([columns[field] for field in fields]).tolist()
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def trajectory_points(result: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Point dicts of a trajectory parse result, built on demand.
+
+    Parsers return numeric trajectories as columns only, so the per-point
+    dicts the coordinate transforms take are built here by the callers
+    that need them. Results without columns carry their points directly.
+    """
+    key = "survey_data" if result.get("data_type") == "survey" else "coordinates"
+    if result.get(key):
+        return result[key]
+    columns = result.get("columns")
+    if not columns:
+        return None
+    if key == "coordinates":
+        return columns_to_points(columns, COORDINATE_FIELDS)
+    return columns_to_points(columns, tuple(f for f in SURVEY_FIELDS + ("measured_depth",) if f in columns))
+
+
+def csv_headers(content: str) -> List[str]:
+    """Lowercased, stripped header names of CSV text."""
+    header_line = content.lstrip('\ufeff').split('\n', 1)[0]
+    return [h.strip().strip('"').lower() for h in header_line.rstrip('\r').split(',')]
+
+
+def parse_csv_columns(content: str, wanted: Dict[str, Tuple[str, ...]]) -> Dict[str, np.ndarray]:
+    """
+    Read selected CSV columns as float arrays in one numpy pass.
+
+    Args:
+        content: CSV text with a header row
+        wanted: Output column name -> accepted header names (lowercase).
+            Columns with no matching header are omitted from the result.
+
+    Returns:
+        Dict of output name -> float64 array
+
+    Raises:
+        ValueError: If a selected cell is not numeric or a row is short
+    """
+    headers = csv_headers(content)
+    selected = {}
+    for name, aliases in wanted.items():
+        for alias in aliases:
+            if alias in headers:
+                selected[name] = headers.index(alias)
+                break
+
+    body = content.split('\n', 1)[1] if '\n' in content else ''
+    if not selected or not body.strip():
+        return {name: np.empty(0) for name in selected}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # "input contained no data"
+        table = np.loadtxt(
+            io.StringIO(body), delimiter=',', quotechar='"', usecols=list(selected.values()),
+            dtype=float, ndmin=2, comments=None
+        )
+    return {name: table[:, i].copy() for i, name in enumerate(selected)}
+
+
+def parse_las_columns(content: str) -> Dict[str, Any]:
+    """
+    Parse a LAS file into header information and a 2-D data array.
+
+    Header sections are scanned line by line; the ~A block is read with a
+    single numpy call. Files with malformed data rows fall back to a row
+    filter that skips lines with the wrong value count or non-numeric
+    values, matching the previous line-by-line parser.
+
+    Returns:
+        Dictionary with curve_names, curve_units, well_info, has_data
+        (whether the ~A block has any content) and data (float64 array of
+        shape (rows, curves))
+    """
+    curve_names = []
+    curve_units = []
+    well_info = {}
+    current_section = None
+    data_text = ""
+
+    position = 0
+    length = len(content)
+    while position < length:
+        end = content.find('\n', position)
+        if end < 0:
+            end = length
+        line = content[position:end].strip()
+        position = end + 1
+
+        if not line or line.startswith('#'):
+            continue
+
+        if line.startswith('~'):
+            current_section = line[1:].split()[0].upper() if len(line) > 1 else ''
+            if current_section in ('A', 'ASCII'):
+                data_text = content[position:]
+                break
+            continue
+
+        if current_section == 'WELL':
+            if '.' in line and ':' in line:
+                parts = line.split('.')
+                if len(parts) >= 2:
+                    mnemonic = parts[0].strip()
+                    rest = parts[1].split(':')
+                    if len(rest) >= 2:
+                        well_info[mnemonic] = rest[0].strip()
+
+        elif current_section in ('CURVE', 'CURVES'):
+            if '.' in line:
+                parts = line.split('.')
+                if len(parts) >= 2:
+                    rest = parts[1].split()
+                    curve_names.append(parts[0].strip())
+                    curve_units.append(rest[0] if rest else '')
+
+    return {
+        "curve_names": curve_names,
+        "curve_units": curve_units,
+        "well_info": well_info,
+        "has_data": bool(data_text.strip()),
+        "data": _read_las_data(data_text, len(curve_names))
+    }
+
+
+def _read_las_data(data_text: str, column_count: int) -> np.ndarray:
+    """Read an ~A block into a (rows, column_count) float array."""
+    if column_count == 0 or not data_text.strip():
+        return np.empty((0, column_count))
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            table = np.loadtxt(io.StringIO(data_text), dtype=float, ndmin=2, comments='#')
+        if table.shape[1] == column_count:
+            return table
+    except ValueError:
+        pass
+
+    rows = []
+    for line in data_text.split('\n'):
+        values = line.split()
+        if len(values) != column_count or values[0].startswith('#'):
+            continue
+        try:
+            rows.append([float(v) for v in values])
+        except ValueError:
+            continue
+    if not rows:
+        return np.empty((0, column_count))
+    return np.array(rows, dtype=float)
+
+
+def valid_rows(*columns: np.ndarray) -> np.ndarray:
+    """Mask of rows where every column is above the LAS null threshold."""
+    mask = np.ones(len(columns[0]), dtype=bool)
+    for column in columns:
+        mask &= column > LAS_NULL_THRESHOLD
+    return mask
@@ -7,7 +7,9 @@ import json
 from strands import tool
 from .osdu_client import search_wellbores_live, get_trajectory_coordinates_live
 from .trajectory_tools import calculate_trajectory_coordinates, build_wellbore_in_minecraft, build_wellbore_in_minecraft_enhanced
-from .horizon_tools import search_horizons_live, download_horizon_data, convert_horizon_to_minecraft, parse_horizon_file
+from .horizon_tools import search_horizons_live, download_horizon_data, convert_horizon_to_minecraft
+from .horizon_tools import parse_horizon_points, horizon_points_to_json, horizon_heightmap_to_json
+from .horizon_cache import get_horizon_cache
 from .surface_tools import build_horizon_surface
 from .rcon_tool import execute_rcon_command
 from .clear_environment_tool import ClearEnvironmentTool
@@ -431,6 +433,12 @@ def build_horizon_surface_complete(horizon_name: str = None) -> str:
                 # Use first available horizon
                 horizon_id = available_horizons[0]["id"]
                 print(f"[WORKFLOW] Using first available horizon: {horizon_id[:60]}...")
+            
+            # Record version keys the local horizon cache (unknown versions bypass it)
+            horizon_version = next(
+                (h.get("version") for h in available_horizons if h.get("id") == horizon_id),
+                None
+            )
                 
         except json.JSONDecodeError as e:
             return CloudscapeResponseBuilder.error_response(
@@ -444,53 +452,83 @@ def build_horizon_surface_complete(horizon_name: str = None) -> str:
                 ]
             )
         
-        # Step 2: Download horizon data
-        print(f"[WORKFLOW] Step 2/5: Downloading horizon data...")
-        horizon_data = download_horizon_data(horizon_id)
-        
-        if "error" in horizon_data.lower():
-            return CloudscapeResponseBuilder.error_response(
-                "Download Horizon Data",
-                f"Failed to download horizon data: {horizon_data}",
-                [
-                    "Check if horizon has associated dataset files",
-                    "Verify file download permissions",
-                    "Try a different horizon",
-                    "Contact data administrator"
-                ]
-            )
-        
-        # Step 3: Parse horizon file
-        print(f"[WORKFLOW] Step 3/5: Parsing horizon file...")
-        parsed_data = parse_horizon_file(horizon_data)
+        horizon_cache = get_horizon_cache() if horizon_version is not None else None
+        cached_points = horizon_cache.get_points(horizon_id, horizon_version) if horizon_cache else None
         
-        if "error" in parsed_data.lower():
-            return CloudscapeResponseBuilder.error_response(
-                "Parse Horizon File",
-                f"Failed to parse horizon file: {parsed_data}",
-                [
-                    "Check horizon file format is supported",
-                    "Verify file contains coordinate data",
-                    "Try a different horizon",
-                    "Check file format documentation"
-                ]
-            )
+        if cached_points is not None:
+            # Steps 2-3 served from the local horizon cache
+            print(f"[WORKFLOW] Steps 2-3/5: Loaded {len(cached_points)} horizon points from local cache")
+            parsed_data = horizon_points_to_json(cached_points)
+        else:
+            # Step 2: Download horizon data
+            print(f"[WORKFLOW] Step 2/5: Downloading horizon data...")
+            horizon_data = download_horizon_data(horizon_id)
+            
+            if "error" in horizon_data.lower():
+                return CloudscapeResponseBuilder.error_response(
+                    "Download Horizon Data",
+                    f"Failed to download horizon data: {horizon_data}",
+                    [
+                        "Check if horizon has associated dataset files",
+                        "Verify file download permissions",
+                        "Try a different horizon",
+                        "Contact data administrator"
+                    ]
+                )
+            
+            # Step 3: Parse horizon file
+            print(f"[WORKFLOW] Step 3/5: Parsing horizon file...")
+            horizon_points = parse_horizon_points(horizon_data)
+            parsed_data = horizon_points_to_json(horizon_points)
+            
+            if "error" in parsed_data.lower():
+                return CloudscapeResponseBuilder.error_response(
+                    "Parse Horizon File",
+                    f"Failed to parse horizon file: {parsed_data}",
+                    [
+                        "Check horizon file format is supported",
+                        "Verify file contains coordinate data",
+                        "Try a different horizon",
+                        "Check file format documentation"
+                    ]
+                )
+            
+            if horizon_cache:
+                try:
+                    horizon_cache.put_points(horizon_id, horizon_version, horizon_points)
+                except OSError as e:
+                    print(f"[WORKFLOW] Could not cache horizon points: {str(e)}")
         
         # Step 4: Convert to Minecraft coordinates
-        print(f"[WORKFLOW] Step 4/5: Converting to Minecraft coordinates...")
-        minecraft_coords = convert_horizon_to_minecraft(parsed_data)
+        transform = {"sample_rate": 10, "base_x": 0, "base_y": 100, "base_z": 0}
+        cached_heightmap = horizon_cache.get_heightmap(horizon_id, horizon_version, transform) if horizon_cache else None
         
-        if "error" in minecraft_coords.lower():
-            return CloudscapeResponseBuilder.error_response(
-                "Convert Coordinates",
-                f"Failed to convert coordinates: {minecraft_coords}",
-                [
-                    "Check coordinate values are valid",
-                    "Verify coordinate system is supported",
-                    "Try adjusting sample rate",
-                    "Check transformation parameters"
-                ]
-            )
+        if cached_heightmap is not None:
+            print(f"[WORKFLOW] Step 4/5: Loaded Minecraft heightmap from local cache")
+            minecraft_coords = horizon_heightmap_to_json(cached_heightmap)
+        else:
+            print(f"[WORKFLOW] Step 4/5: Converting to Minecraft coordinates...")
+            minecraft_coords = convert_horizon_to_minecraft(parsed_data, **transform)
+            
+            if "error" in minecraft_coords.lower():
+                return CloudscapeResponseBuilder.error_response(
+                    "Convert Coordinates",
+                    f"Failed to convert coordinates: {minecraft_coords}",
+                    [
+                        "Check coordinate values are valid",
+                        "Verify coordinate system is supported",
+                        "Try adjusting sample rate",
+                        "Check transformation parameters"
+                    ]
+                )
+            
+            if horizon_cache:
+                try:
+                    points = json.loads(minecraft_coords).get("minecraft_coordinates", [])
+                    heightmap = [[p["x"], p["y"], p["z"], p["original_x"], p["original_y"], p["original_z"]] for p in points]
+                    horizon_cache.put_heightmap(horizon_id, horizon_version, transform, heightmap)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"[WORKFLOW] Could not cache horizon heightmap: {str(e)}")
         
         # Parse minecraft coordinates to get point count and coordinates
         try:
@@ -619,6 +657,10 @@ def clear_minecraft_environment(area: str = "all", preserve_terrain: bool = True
             preserve_terrain=preserve_terrain
         )
         
+        # Wells recorded as built are gone now; don't let a re-run skip them
+        from .build_journal import clear_build_journals
+        clear_build_journals()
+        
         return result
         
     except Exception as e:
@@ -1114,14 +1156,18 @@ def build_drilling_rig(
 def visualize_collection_wells(
     collection_id: str,
     batch_size: int = 5,
-    spacing: int = 50
+    spacing: int = 50,
+    bounds: str = None,
+    resume: bool = True,
+    refresh: bool = False
 ) -> str:
     """Visualize all wellbores from a collection in Minecraft.
     
     This is a HIGH-LEVEL tool that executes batch visualization of multiple wells:
     1. Queries collection service for well list
     2. Fetches trajectory data from S3 for each well
-    3. Processes wells in batches with progress updates
+    3. Processes wells in a concurrent batch pipeline (S3 fetch, geometry,
+       rate-limited RCON build) with progress updates
     4. Arranges wellheads in grid pattern with spacing
     5. Builds wellbores and drilling rigs for each well
     6. Provides summary with success/failure counts
@@ -1134,16 +1180,31 @@ def visualize_collection_wells(
     
     Args:
         collection_id: Collection identifier
-        batch_size: Number of wells to process simultaneously (default: 5)
+        batch_size: Number of wells fetched from S3 simultaneously (default: 5)
         spacing: Distance between wellheads in blocks (default: 50)
+        bounds: Optional area "x_min,y_min,x_max,y_max" in source coordinates;
+            only wells whose trajectory bounding box overlaps it are built
+        resume: If True (default), continue an interrupted build of the same
+            collection and layout, skipping wells already built; if False,
+            rebuild every well
+        refresh: If True, check the collection in S3 for added, replaced or
+            removed wells before building (otherwise the collection manifest
+            is checked once it is older than its TTL)
     
     Returns:
         Cloudscape-formatted response with batch visualization summary
     """
     from .response_templates import CloudscapeResponseBuilder
     from .s3_data_access import S3WellDataAccess
+    from .trajectory_parsers import trajectory_points
     from .name_utils import simplify_well_name
+    from .trajectory_tools import transform_coordinates_to_minecraft
+    from .collection_pipeline import CollectionBuildPipeline, WellBuildError
+    from .collection_manifest import parse_bounds, bbox_intersects
+    from .build_journal import build_key, open_build_journal
+    from .rcon_tool import rcon_checkpoint
     import math
+    import os
     
     try:
         print(f"[COLLECTION_VIZ] Starting collection visualization: {collection_id}")
@@ -1182,7 +1243,7 @@ def visualize_collection_wells(
         collection_prefix = f"collections/{collection_id}/"
         
         try:
-            wells_result = s3_access.list_collection_wells(collection_prefix)
+            wells_result = s3_access.list_collection_wells(collection_prefix, refresh=refresh)
             
             if not wells_result['success']:
                 return CloudscapeResponseBuilder.error_response(
@@ -1198,6 +1259,7 @@ def visualize_collection_wells(
             
             wells = wells_result['wells']
             total_wells = wells_result['total_wells']
+            manifest_current = wells_result.get('source') == "manifest"
             
             if total_wells == 0:
                 return CloudscapeResponseBuilder.warning_response(
@@ -1206,8 +1268,43 @@ def visualize_collection_wells(
                     "Add trajectory files to the collection in S3 before visualizing."
                 )
             
-            print(f"[COLLECTION_VIZ] Found {total_wells} wells in collection")
+            print(f"[COLLECTION_VIZ] Found {total_wells} wells in collection (from {wells_result.get('source', 'listing')})")
+            
+            # Spatial prefilter on manifest bounding boxes
+            area = parse_bounds(bounds)
+            if area:
+                if not manifest_current:
+                    print(f"[COLLECTION_VIZ] Building collection manifest for spatial filter...")
+                    manifest_result = s3_access.update_collection_manifest(collection_prefix, max_concurrency=batch_size)
+                    if not manifest_result['success']:
+                        return CloudscapeResponseBuilder.error_response(
+                            "Filter Collection Wells",
+                            f"Could not build collection manifest: {manifest_result['error']}",
+                            [
+                                "Check S3 write permissions for the collection prefix",
+                                "Retry without bounds to build all wells"
+                            ]
+                        )
+                    wells = manifest_result['manifest']['wells']
+                    manifest_current = True
+                
+                wells = [well for well in wells if bbox_intersects(well.get('bbox'), area)]
+                print(f"[COLLECTION_VIZ] {len(wells)} of {total_wells} wells inside bounds {area}")
+                total_wells = len(wells)
+                
+                if total_wells == 0:
+                    return CloudscapeResponseBuilder.warning_response(
+                        "No Wells In Area",
+                        f"No wells in collection '{collection_id}' overlap bounds {bounds}.",
+                        "Widen the bounds or omit them to build the whole collection."
+                    )
             
+        except ValueError as e:
+            return CloudscapeResponseBuilder.error_response(
+                "Filter Collection Wells",
+                f"Invalid bounds '{bounds}': {str(e)}",
+                ["Use the format x_min,y_min,x_max,y_max, e.g. 500000,6200000,510000,6210000"]
+            )
         except Exception as e:
             return CloudscapeResponseBuilder.error_response(
                 "Fetch Collection Wells",
@@ -1231,178 +1328,217 @@ def visualize_collection_wells(
         
         print(f"[COLLECTION_VIZ] Grid: {grid_size}x{grid_size}, Starting at ({start_x}, {start_z})")
         
-        # Step 4: Process wells in batches
-        print(f"[COLLECTION_VIZ] Step 4: Processing wells in batches...")
-        
-        successful_builds = []
-        failed_builds = []
-        current_position = 0
-        
-        for batch_start in range(0, total_wells, batch_size):
-            batch_end = min(batch_start + batch_size, total_wells)
-            batch_wells = wells[batch_start:batch_end]
+        # Open the build journal so an interrupted build resumes where it stopped
+        journal = open_build_journal(
+            collection_id, build_key(collection_id, {"spacing": spacing, "bounds": bounds}, wells)
+        )
+        if journal and not resume and journal.resumed:
+            journal.discard()
+            journal = open_build_journal(
+                collection_id, build_key(collection_id, {"spacing": spacing, "bounds": bounds}, wells)
+            )
+        if journal and journal.resumed:
+            print(f"[COLLECTION_VIZ] Resuming interrupted build: {journal.get_stats()}")
+        
+        # Step 4: Process wells through the staged build pipeline
+        geometry_workers = min(4, os.cpu_count() or 1)
+        print(f"[COLLECTION_VIZ] Step 4: Processing wells through build pipeline "
+              f"(fetch: {batch_size}, geometry: {geometry_workers}, build: 1 workers)...")
+        
+        fetch_failures = []
+        
+        def fetch_stage(job):
+            """Fetch and parse trajectory data from S3."""
+            if journal:
+                # Placed wells need no data; computed wells reuse their geometry
+                if journal.is_done(job['s3_key'], "placed"):
+                    return
+                geometry = journal.load_geometry(job['s3_key'])
+                if geometry:
+                    job['minecraft_coords'] = geometry
+                    return
+            
+            trajectory_result = s3_access.get_trajectory_data(job['s3_key'])
+            if not trajectory_result['success']:
+                fetch_failures.append(job['s3_key'])
+                raise WellBuildError(f"Data fetch failed: {trajectory_result.get('error', 'Unknown error')}")
+            points = trajectory_points(trajectory_result)
+            if not points:
+                raise WellBuildError("No trajectory data in file")
+            job['trajectory'] = (trajectory_result['data_type'], points)
+            if journal:
+                journal.mark(job['s3_key'], "fetched")
+        
+        def geometry_stage(job):
+            """Convert trajectory to Minecraft coordinates at the well's grid position."""
+            if 'trajectory' not in job:
+                return  # resumed: already computed or placed
+            data_type, points = job.pop('trajectory')
             
-            print(f"[COLLECTION_VIZ] Processing batch {batch_start//batch_size + 1}: wells {batch_start+1}-{batch_end}")
+            if data_type == "coordinates":
+                minecraft_coords = transform_coordinates_to_minecraft(json.dumps(points))
+                coords_data = json.loads(minecraft_coords)
+                if not coords_data.get("success", False):
+                    raise WellBuildError(f"Coordinate transformation failed: {coords_data.get('error', 'Unknown')}")
+            elif data_type == "survey":
+                minecraft_coords = calculate_trajectory_coordinates(json.dumps(points))
+                if "error" in minecraft_coords.lower():
+                    raise WellBuildError(f"Survey calculation failed: {minecraft_coords}")
+                coords_data = json.loads(minecraft_coords)
+            else:
+                raise WellBuildError(f"Unknown data type: {data_type}")
             
-            # Process each well in the batch
-            for well_idx, well_info in enumerate(batch_wells):
-                global_idx = batch_start + well_idx
-                well_name = well_info['well_name']
-                s3_key = well_info['s3_key']
+            # Offset coordinates to grid position
+            for point in coords_data.get("minecraft_coordinates", []):
+                point['x'] += job['wellhead_x']
+                point['z'] += job['wellhead_z']
+            
+            coords_data['wellhead_x'] = job['wellhead_x']
+            coords_data['wellhead_z'] = job['wellhead_z']
+            job['minecraft_coords'] = json.dumps(coords_data)
+            if journal:
+                journal.save_geometry(job['s3_key'], job['minecraft_coords'])
+        
+        def build_stage(job):
+            """Build wellbore and drilling rig over RCON."""
+            s3_key = job['s3_key']
+            minecraft_coords = job.pop('minecraft_coords', None)
+            
+            if not (journal and journal.is_done(s3_key, "placed")):
+                # Resume a half-built wellbore after its last applied command
+                skip_until = journal.command_watermark(s3_key) if journal else 0
+                on_progress = (lambda watermark: journal.record_commands(s3_key, watermark)) if journal else None
+                with rcon_checkpoint(skip_until, on_progress) as checkpoint:
+                    build_result = build_wellbore_in_minecraft_enhanced(
+                        minecraft_coords,
+                        well_name=job['display_name'],
+                        color_scheme="default"
+                    )
+                if journal:
+                    journal.record_commands(s3_key, checkpoint.watermark, force=True)
                 
-                # Send progress update
-                progress_msg = CloudscapeResponseBuilder.batch_progress(
-                    current=global_idx + 1,
-                    total=total_wells,
-                    well_name=well_name,
-                    status="building"
+                if checkpoint.error:
+                    raise WellBuildError(
+                        f"RCON failed after {checkpoint.watermark} of {checkpoint.issued} commands: {checkpoint.error}"
+                    )
+                if "error" in build_result.lower():
+                    raise WellBuildError(f"Wellbore build failed: {build_result}")
+                if journal:
+                    journal.mark(s3_key, "placed")
+            
+            if journal and journal.is_done(s3_key, "labelled"):
+                return
+            
+            # Build drilling rig at wellhead
+            try:
+                rig_result = build_drilling_rig(
+                    x=job['wellhead_x'],
+                    y=job['wellhead_y'],
+                    z=job['wellhead_z'],
+                    well_name=job['display_name'],
+                    rig_style="standard"
                 )
-                print(f"[COLLECTION_VIZ] {progress_msg}")
                 
-                try:
+                if CloudscapeResponseBuilder.SUCCESS_ICON not in rig_result:
+                    print(f"[COLLECTION_VIZ] Rig build failed (non-critical): {rig_result}")
+                elif journal:
+                    journal.mark(s3_key, "labelled")
+            except Exception as e:
+                print(f"[COLLECTION_VIZ] Rig build error (non-critical): {str(e)}")
+        
+        successful_builds = []
+        failed_builds = []
+        resumed_wells = 0
+        
+        def on_complete(job):
+            """Record the outcome of a finished well and report progress."""
+            if 'error' in job:
+                print(f"[COLLECTION_VIZ] Well {job['well_name']} failed in {job['failed_stage']} stage: {job['error']}")
+                failed_builds.append({
+                    'well_name': job['well_name'],
+                    'reason': job['error']
+                })
+            else:
+                successful_builds.append({
+                    'well_name': job['well_name'],
+                    'display_name': job['display_name'],
+                    'coordinates': (job['wellhead_x'], job['wellhead_y'], job['wellhead_z'])
+                })
+            
+            progress_msg = CloudscapeResponseBuilder.batch_progress(
+                current=len(successful_builds) + len(failed_builds),
+                total=total_wells,
+                well_name=job['well_name'],
+                status="failed" if 'error' in job else "built"
+            )
+            print(f"[COLLECTION_VIZ] {progress_msg}")
+        
+        def well_jobs():
+            """Yield one job per well with its wellhead grid position."""
+            nonlocal resumed_wells
+            for batch_start in range(0, total_wells, batch_size):
+                batch_end = min(batch_start + batch_size, total_wells)
+                print(f"[COLLECTION_VIZ] Queueing batch {batch_start//batch_size + 1}: wells {batch_start+1}-{batch_end}")
+                
+                for global_idx in range(batch_start, batch_end):
+                    well_info = wells[global_idx]
+                    
                     # Calculate wellhead position in grid
                     grid_row = global_idx // grid_size
                     grid_col = global_idx % grid_size
                     wellhead_x = start_x + (grid_col * spacing)
                     wellhead_z = start_z + (grid_row * spacing)
-                    wellhead_y = 100  # Ground level
-                    
-                    print(f"[COLLECTION_VIZ] Well {global_idx+1}/{total_wells}: {well_name} at ({wellhead_x}, {wellhead_y}, {wellhead_z})")
-                    
-                    # Fetch trajectory data from S3
-                    print(f"[COLLECTION_VIZ] Fetching trajectory data: {s3_key}")
-                    trajectory_result = s3_access.get_trajectory_data(s3_key)
-                    
-                    if not trajectory_result['success']:
-                        error_msg = trajectory_result.get('error', 'Unknown error')
-                        print(f"[COLLECTION_VIZ] Failed to fetch trajectory: {error_msg}")
-                        failed_builds.append({
-                            'well_name': well_name,
-                            'reason': f"Data fetch failed: {error_msg}"
-                        })
-                        continue
-                    
-                    # Get coordinates or survey data
-                    data_type = trajectory_result['data_type']
-                    coordinates = trajectory_result.get('coordinates')
-                    survey_data = trajectory_result.get('survey_data')
-                    
-                    if not coordinates and not survey_data:
-                        print(f"[COLLECTION_VIZ] No trajectory data found")
-                        failed_builds.append({
-                            'well_name': well_name,
-                            'reason': "No trajectory data in file"
-                        })
-                        continue
-                    
-                    # Convert to Minecraft coordinates
-                    print(f"[COLLECTION_VIZ] Converting to Minecraft coordinates (type: {data_type})...")
                     
-                    if data_type == "coordinates":
-                        # Direct coordinate transformation
-                        from .trajectory_tools import transform_coordinates_to_minecraft
-                        coordinates_json = json.dumps(coordinates)
-                        minecraft_coords = transform_coordinates_to_minecraft(coordinates_json)
-                        
-                        # Adjust coordinates to grid position
-                        coords_data = json.loads(minecraft_coords)
-                        if not coords_data.get("success", False):
-                            failed_builds.append({
-                                'well_name': well_name,
-                                'reason': f"Coordinate transformation failed: {coords_data.get('error', 'Unknown')}"
-                            })
-                            continue
-                        
-                        # Offset coordinates to grid position
-                        minecraft_points = coords_data.get("coordinates", [])
-                        for point in minecraft_points:
-                            point['x'] += wellhead_x
-                            point['z'] += wellhead_z
-                        
-                        coords_data['wellhead_x'] = wellhead_x
-                        coords_data['wellhead_z'] = wellhead_z
-                        minecraft_coords = json.dumps(coords_data)
-                        
-                    elif data_type == "survey":
-                        # Calculate from survey data
-                        from .trajectory_tools import calculate_trajectory_coordinates
-                        survey_json = json.dumps(survey_data)
-                        minecraft_coords = calculate_trajectory_coordinates(survey_json)
-                        
-                        if "error" in minecraft_coords.lower():
-                            failed_builds.append({
-                                'well_name': well_name,
-                                'reason': f"Survey calculation failed: {minecraft_coords}"
-                            })
-                            continue
-                        
-                        # Offset coordinates to grid position
-                        coords_data = json.loads(minecraft_coords)
-                        minecraft_points = coords_data.get("coordinates", [])
-                        for point in minecraft_points:
-                            point['x'] += wellhead_x
-                            point['z'] += wellhead_z
-                        
-                        coords_data['wellhead_x'] = wellhead_x
-                        coords_data['wellhead_z'] = wellhead_z
-                        minecraft_coords = json.dumps(coords_data)
-                    
-                    else:
-                        failed_builds.append({
-                            'well_name': well_name,
-                            'reason': f"Unknown data type: {data_type}"
+                    # Wells completed by an interrupted run are not rebuilt
+                    if journal and journal.is_complete([well_info['s3_key']]):
+                        resumed_wells += 1
+                        successful_builds.append({
+                            'well_name': well_info['well_name'],
+                            'display_name': simplify_well_name(well_info['well_name']),
+                            'coordinates': (wellhead_x, 100, wellhead_z)
                         })
                         continue
                     
-                    # Build wellbore in Minecraft
-                    print(f"[COLLECTION_VIZ] Building wellbore...")
-                    display_name = simplify_well_name(well_name)
-                    
-                    build_result = build_wellbore_in_minecraft_enhanced(
-                        minecraft_coords,
-                        well_name=display_name,
-                        color_scheme="default"
-                    )
-                    
-                    if "error" in build_result.lower():
-                        failed_builds.append({
-                            'well_name': well_name,
-                            'reason': f"Wellbore build failed: {build_result}"
-                        })
-                        continue
-                    
-                    # Build drilling rig at wellhead
-                    print(f"[COLLECTION_VIZ] Building drilling rig...")
-                    try:
-                        rig_result = build_drilling_rig(
-                            x=wellhead_x,
-                            y=wellhead_y,
-                            z=wellhead_z,
-                            well_name=display_name,
-                            rig_style="standard"
-                        )
-                        
-                        if CloudscapeResponseBuilder.SUCCESS_ICON not in rig_result:
-                            print(f"[COLLECTION_VIZ] Rig build failed (non-critical): {rig_result}")
-                    except Exception as e:
-                        print(f"[COLLECTION_VIZ] Rig build error (non-critical): {str(e)}")
-                    
-                    # Record success
-                    successful_builds.append({
-                        'well_name': well_name,
-                        'display_name': display_name,
-                        'coordinates': (wellhead_x, wellhead_y, wellhead_z)
-                    })
-                    
-                    print(f"[COLLECTION_VIZ] Well {well_name} built successfully")
-                    
-                except Exception as e:
-                    print(f"[COLLECTION_VIZ] Error building well {well_name}: {str(e)}")
-                    failed_builds.append({
-                        'well_name': well_name,
-                        'reason': f"Unexpected error: {str(e)}"
-                    })
-                    continue
+                    yield {
+                        'well_name': well_info['well_name'],
+                        'display_name': simplify_well_name(well_info['well_name']),
+                        's3_key': well_info['s3_key'],
+                        'wellhead_x': wellhead_x,
+                        'wellhead_y': 100,  # Ground level
+                        'wellhead_z': wellhead_z
+                    }
+        
+        pipeline = CollectionBuildPipeline(
+            fetch=fetch_stage,
+            geometry=geometry_stage,
+            build=build_stage,
+            fetch_workers=batch_size,
+            geometry_workers=geometry_workers,
+            build_workers=1,
+            on_complete=on_complete
+        )
+        pipeline.run(well_jobs())
+        pipeline_stats = pipeline.get_stats()
+        
+        print(f"[COLLECTION_VIZ] Pipeline finished in {pipeline.wall_time:.1f}s")
+        for stage_stats in pipeline_stats:
+            print(f"[COLLECTION_VIZ] Stage {stage_stats['stage']}: {stage_stats}")
+        
+        # A finished build needs no journal; an incomplete one is kept for the re-run
+        if journal:
+            if journal.is_complete([well['s3_key'] for well in wells]):
+                journal.discard()
+            else:
+                print(f"[COLLECTION_VIZ] Build incomplete, journal kept for resume: {journal.get_stats()}")
+        
+        # Record the collection manifest so the next visit reads one object
+        # (the wells were just fetched, so summarizing them hits the cache);
+        # a listed well that could not be fetched may have been removed, so
+        # the manifest is checked against S3 then too
+        if not manifest_current or fetch_failures:
+            manifest_result = s3_access.update_collection_manifest(collection_prefix, max_concurrency=batch_size)
+            if not manifest_result['success']:
+                print(f"[COLLECTION_VIZ] Collection manifest not written (non-critical): {manifest_result['error']}")
         
         # Step 5: Generate summary response
         print(f"[COLLECTION_VIZ] Batch processing complete")
@@ -1418,7 +1554,9 @@ def visualize_collection_wells(
             wells_built=len(successful_builds),
             wells_failed=len(failed_builds),
             total_wells=total_wells,
-            failed_wells=failed_well_names
+            failed_wells=failed_well_names,
+            pipeline_stats=pipeline_stats,
+            resumed_wells=resumed_wells
         )
         
     except Exception as e:
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Convert LAS files in S3 to columnar binary sidecars.
+
+Each "<prefix>/<well>.las" is parsed once and written back as
+"<prefix>-sidecars/<well>.las.col" (see las_sidecar.py in the petrophysics
+calculator Lambda), together with its summary index entry
+"<prefix>-summaries/<well>.las.summary.json" (see well_summary.py). The sidecar records the ETag of the LAS file it was
+built from, so the Lambda and the MCP well-data server only use it while
+the LAS file is unchanged. Sidecars that are already current are skipped.
+
+Usage:
+    python3 scripts/convert-las-sidecars.py --bucket BUCKET [--prefix global/well-data/] [--force] [--dry-run]
+"""
+import os
+import sys
+import time
+import argparse
+
+import boto3
+
+# The format and the LAS parser live with the petrophysics calculator Lambda
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+
+from las_reader import parse_las
+from las_sidecar import S3RangeSource, encode_sidecar, read_header, sidecar_key, sidecar_prefix
+from well_summary import build_summary, write_summary
+
+DEFAULT_PREFIX = "global/well-data/"
+
+
+def list_keys(s3_client, bucket: str, prefix: str):
+    """Every object under a prefix."""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        yield from page.get('Contents', [])
+
+
+def list_las_objects(s3_client, bucket: str, prefix: str):
+    """All LAS objects under the prefix, and the keys of existing sidecars."""
+    las_objects = [obj for obj in list_keys(s3_client, bucket, prefix) if obj['Key'].endswith('.las')]
+    sidecars = {obj['Key'] for obj in list_keys(s3_client, bucket, sidecar_prefix(prefix))}
+    return las_objects, sidecars
+
+
+def sidecar_is_current(s3_client, bucket: str, las_obj: dict) -> bool:
+    try:
+        header = read_header(S3RangeSource(s3_client, bucket, sidecar_key(las_obj['Key'])))
+    except Exception:
+        return False
+    return header.get('source_etag') == las_obj['ETag']
+
+
+def convert_object(s3_client, bucket: str, las_key: str) -> dict:
+    """Parse one LAS object and upload its sidecar and summary. Returns conversion details."""
+    start = time.perf_counter()
+    response = s3_client.get_object(Bucket=bucket, Key=las_key)
+    content = response['Body'].read().decode('utf-8')
+    las_data = parse_las(content)
+    body = encode_sidecar(las_data, las_key, response['ETag'])
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=sidecar_key(las_key),
+        Body=body,
+        ContentType='application/octet-stream',
+        Metadata={'source-etag': response['ETag'].strip('"')}
+    )
+    summary_written = write_summary(s3_client, bucket, las_key, build_summary(las_data, las_key, response['ETag']))
+    return {
+        'rows': las_data['array'].shape[0],
+        'curves': len(las_data['curves']),
+        'las_bytes': len(content),
+        'sidecar_bytes': len(body),
+        'summary': summary_written,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def convert_bucket(s3_client, bucket: str, prefix: str = DEFAULT_PREFIX, force: bool = False, dry_run: bool = False) -> dict:
+    """
+    Write sidecars for every LAS object under a prefix.
+
+    Returns:
+        Counts of converted, skipped (already current) and failed files
+    """
+    las_objects, sidecars = list_las_objects(s3_client, bucket, prefix)
+    print(f"Found {len(las_objects)} LAS files and {len(sidecars)} sidecars under s3://{bucket}/{prefix}")
+
+    summary = {'converted': 0, 'skipped': 0, 'failed': 0}
+    for las_obj in las_objects:
+        key = las_obj['Key']
+        if not force and sidecar_key(key) in sidecars and sidecar_is_current(s3_client, bucket, las_obj):
+            summary['skipped'] += 1
+            continue
+        if dry_run:
+            print(f"  would convert {key}")
+            summary['converted'] += 1
+            continue
+        try:
+            details = convert_object(s3_client, bucket, key)
+            summary['converted'] += 1
+            print(f"✓ {key}: {details['rows']} rows x {details['curves']} curves, "
+                  f"{details['las_bytes'] / 1e6:.1f} MB text -> {details['sidecar_bytes'] / 1e6:.1f} MB "
+                  f"({details['seconds']:.2f}s)")
+        except Exception as e:
+            summary['failed'] += 1
+            print(f"✗ {key}: {e}")
+
+    print(f"Converted {summary['converted']}, skipped {summary['skipped']} current, failed {summary['failed']}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write columnar binary sidecars for LAS files in S3")
+    parser.add_argument('--bucket', default=os.environ.get('STORAGE_BUCKET'), help="S3 bucket (default: $STORAGE_BUCKET)")
+    parser.add_argument('--prefix', default=DEFAULT_PREFIX, help=f"Key prefix (default: {DEFAULT_PREFIX})")
+    parser.add_argument('--force', action='store_true', help="Rewrite sidecars that are already current")
+    parser.add_argument('--dry-run', action='store_true', help="List the files that would be converted")
+    args = parser.parse_args()
+
+    if not args.bucket:
+        parser.error("--bucket or STORAGE_BUCKET is required")
+
+    summary = convert_bucket(boto3.client('s3'), args.bucket, args.prefix, args.force, args.dry_run)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
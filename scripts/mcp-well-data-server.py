@@ -7,8 +7,15 @@ Connects to S3 bucket for .las file storage
 """
 import json
 import os
+import sys
 import math
+import asyncio
+import hashlib
+import threading
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from typing import List, Dict, Any, Optional
 from mcp.server import Server
 from mcp.types import Tool, TextContent
@@ -16,7 +23,9 @@ import numpy as np
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 import io
+from dataclasses import asdict
 from petrophysics_calculators import (
+    CalculationResult,
     PorosityCalculator, 
     ShaleVolumeCalculator, 
     SaturationCalculator,
@@ -26,12 +35,37 @@ from petrophysics_calculators import (
 )
 from data_quality_assessment import DataQualityAssessment
 
+# LAS parsing, curve statistics, downsampling, derived curves, sidecars and
+# summaries are shared with the petrophysics calculator Lambda; its directory
+# (cdk/lambda-functions/petrophysics-calculator) is required to run the server
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator'))
+from curve_stats import StreamingStats, order_statistics
+from downsample import downsample_indices, validate_downsampling
+from derived_curves import DerivedCurveStore, parameter_hash
+from las_reader import read_ascii
+from las_sidecar import SIDECAR_SUFFIX, load_current_sidecar, sidecar_key, sidecar_prefix
+from well_summary import SUMMARY_SUFFIX, build_summary, read_summary, summary_key, summary_prefix, write_summary
+
 # Simple LAS file parser
 class LASParser:
+    """
+    A parsed LAS file.
+    
+    The ~ASCII rows are held in one contiguous (samples, curves) array of
+    CURVE_DTYPE, nulls kept as the file's -999.25 values; data maps each
+    curve name to a column view of it, so tools slice and mask curves
+    without copying them into Python lists.
+    """
+    # S3 object the well was loaded from (None for local files)
+    source_key = None
+    source_etag = None
+    
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.well_info = {}
         self.curves = {}
+        self.units = {}
+        self.array = None
         self.data = None
         self._parse_file()
     
@@ -42,10 +76,67 @@ class LASParser:
         instance.filepath = filename
         instance.well_info = {}
         instance.curves = {}
+        instance.units = {}
+        instance.array = None
         instance.data = None
         instance._parse_content(content.splitlines())
         return instance
     
+    @classmethod
+    def from_sidecar(cls, las_data: Dict[str, Any], filename: str):
+        """Create LASParser from a columnar sidecar read (nulls restored to the file's NULL value)"""
+        instance = cls.__new__(cls)
+        instance.filepath = filename
+        instance.well_info = dict(las_data['well_info'])
+        instance.curves = {}
+        instance.units = dict(las_data.get('units', {}))
+        array = np.where(np.isnan(las_data['array']), las_data['null_value'], las_data['array'])
+        instance._set_array(list(las_data['data']), array)
+        return instance
+    
+    @classmethod
+    def from_array_cache(cls, path: str, filename: str):
+        """
+        Create LASParser from a local array cache file written by save_array_cache()
+        
+        The curve array is memory-mapped read-only, so its pages are read
+        on use and shared with the OS page cache.
+        """
+        with open(path + '.json', 'r') as f:
+            header = json.load(f)
+        instance = cls.__new__(cls)
+        instance.filepath = filename
+        instance.well_info = header['well_info']
+        instance.curves = {}
+        instance.units = header.get('units', {})
+        instance.source_key = header['source_key']
+        instance.source_etag = header['source_etag']
+        instance._set_array(header['curves'], np.load(path + '.npy', mmap_mode='r'))
+        return instance
+    
+    def save_array_cache(self, path: str):
+        """Write the curve array and header for from_array_cache() (the header is written last)"""
+        if self.data is None:
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, self.array)
+        os.replace(tmp, path + '.npy')
+        with open(tmp, 'w') as f:
+            json.dump({'well_info': self.well_info, 'curves': list(self.data), 'units': self.units,
+                       'source_key': self.source_key, 'source_etag': self.source_etag}, f)
+        os.replace(tmp, path + '.json')
+    
+    def _set_array(self, curve_names: List[str], array: np.ndarray):
+        """Store the (samples, curves) array and expose its columns as data"""
+        self.array = None
+        self.data = None
+        if array.shape[0]:
+            if not isinstance(array, np.memmap):
+                array = np.asfortranarray(array, dtype=CURVE_DTYPE)
+            self.array = array
+            self.data = {name: array[:, i] for i, name in enumerate(curve_names)}
+    
     def _parse_file(self):
         with open(self.filepath, 'r') as f:
             lines = f.readlines()
@@ -54,6 +145,7 @@ class LASParser:
     def _parse_content(self, lines):
         section = None
         curve_names = []
+        data_lines = []
         
         for line in lines:
             if isinstance(line, bytes):
@@ -77,18 +169,196 @@ class LASParser:
                     if len(parts) == 2:
                         curve_name = parts[0].split('.')[0].strip()
                         curve_names.append(curve_name)
+                        unit = parts[0].split('.', 1)[1].split()
+                        self.units[curve_name] = unit[0] if unit else ''
+
             
             elif section == 'ASCII':
-                if line and not line.startswith('#'):
-                    try:
-                        values = [float(x) for x in line.split()]
-                        if len(values) == len(curve_names):
-                            if self.data is None:
-                                self.data = {name: [] for name in curve_names}
-                            for i, name in enumerate(curve_names):
-                                self.data[name].append(values[i])
-                    except ValueError:
-                        continue
+                data_lines.append(line)
+        
+        # One vectorized read; rows with the wrong value count or non-numeric values are skipped
+        self._set_array(curve_names, read_ascii("\n".join(data_lines), len(curve_names), False))
+    
+    def depth_mask(self, depth_start: Optional[float], depth_end: Optional[float]) -> np.ndarray:
+        """Samples with depth_start <= DEPT <= depth_end (either bound optional; none without DEPT)"""
+        if 'DEPT' not in self.data:
+            return np.zeros(len(self.array), dtype=bool)
+        depths = self.data['DEPT']
+        mask = np.ones(len(depths), dtype=bool)
+        if depth_start is not None:
+            mask &= depths >= depth_start
+        if depth_end is not None:
+            mask &= depths <= depth_end
+        return mask
+    
+    def curve_values(self, name: str, default=None) -> Optional[List[float]]:
+        """A curve as a Python list, for the list-based calculators"""
+        if not self.data or name not in self.data:
+            return default
+        return self.data[name].tolist()
+    
+    def summary(self) -> Dict[str, Any]:
+        """Summary index entry of this well (-999.25 values count as nulls)"""
+        curves = list(self.data) if self.data else []
+        array = np.empty((0, len(curves))) if self.array is None else np.where(self.array == -999.25, np.nan, self.array)
+        return build_summary({'well_info': self.well_info, 'curves': curves, 'units': self.units,
+                              'null_value': -999.25, 'array': array}, self.source_key, self.source_etag)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the curve array (memory-mapped arrays count as if resident)"""
+        if self.array is None:
+            return 0
+        return self.array.nbytes
+
+class WellLRU(MutableMapping):
+    """
+    Parsed wells by name, bounded by their data bytes.
+    
+    Reading a well marks it as recently used; storing one evicts the least
+    recently used wells until the total fits max_bytes (the well just
+    stored is always kept). Evicted wells are loaded again on their next
+    use. Thread-safe.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.evictions = 0
+        self._wells = OrderedDict()  # name -> (LASParser, nbytes)
+        self._versions = {}  # name -> version of the resident well, new on every store
+        self._last_version = 0
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str) -> LASParser:
+        with self._lock:
+            well, _ = self._wells[name]
+            self._wells.move_to_end(name)
+            return well
+    
+    def __setitem__(self, name: str, well: LASParser):
+        nbytes = well.nbytes
+        with self._lock:
+            previous = self._wells.pop(name, None)
+            if previous:
+                self.nbytes -= previous[1]
+            self._wells[name] = (well, nbytes)
+            self._last_version += 1
+            self._versions[name] = self._last_version
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes and len(self._wells) > 1:
+                evicted, (_, evicted_bytes) = self._wells.popitem(last=False)
+                self._versions.pop(evicted, None)
+                self.nbytes -= evicted_bytes
+                self.evictions += 1
+                print(f"Evicted well {evicted} from memory ({evicted_bytes} bytes)")
+    
+    def __delitem__(self, name: str):
+        with self._lock:
+            _, nbytes = self._wells.pop(name)
+            self._versions.pop(name, None)
+            self.nbytes -= nbytes
+    
+    def __contains__(self, name) -> bool:
+        with self._lock:
+            return name in self._wells
+    
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._wells))
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._wells)
+    
+    def version(self, name: str) -> Optional[int]:
+        """Version of the resident well (a reloaded well gets a new one), or None"""
+        with self._lock:
+            return self._versions.get(name)
+
+class ToolResultCache:
+    """
+    Responses of deterministic tools, keyed by tool name, canonical
+    arguments, well name and well version.
+    
+    Bounded by entry count and response bytes; the least recently used
+    responses are dropped first. A reloaded well has a new version, so its
+    old responses are never returned, and invalidate() frees them.
+    Thread-safe.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # (tool, well, version, args hash) -> response text
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(tool: str, arguments: Dict[str, Any], well_name: str, version: int) -> tuple:
+        return (tool, well_name, version, parameter_hash(arguments))
+    
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+    
+    def put(self, key: tuple, text: str):
+        if self.max_entries <= 0 or len(text) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+            self._entries[key] = text
+            self.nbytes += len(text)
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self.nbytes -= len(dropped)
+                self.evictions += 1
+    
+    def invalidate(self, well_name: str) -> int:
+        """Drop every response computed from a well; returns the number dropped"""
+        with self._lock:
+            stale = [key for key in self._entries if key[1] == well_name]
+            for key in stale:
+                self.nbytes -= len(self._entries.pop(key))
+            self.invalidations += len(stale)
+            return len(stale)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, bytes used, hit rate and counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
 
 # MCP Server
 server = Server("well-data-server")
@@ -98,8 +368,25 @@ S3_BUCKET = "amplify-d1eeg2gu6ddc3z-ma-workshopstoragebucketd9b-lzf4vwokty7m"
 S3_PREFIX = "global/well-data/"
 AWS_REGION = "us-east-1"
 
-# Load well data
-WELL_DATA = {}
+# Concurrent well loads (S3 reads and parsing run on a thread pool, off the event loop)
+LOAD_CONCURRENCY = int(os.environ.get('MCP_LOAD_CONCURRENCY', 8))
+# Seconds between incremental refreshes of the S3 catalog (0: refresh only through the refresh_wells tool)
+REFRESH_INTERVAL = float(os.environ.get('MCP_REFRESH_INTERVAL', 0))
+# Memory budget for parsed wells; least recently used wells are evicted beyond it
+WELL_CACHE_MAX_BYTES = int(os.environ.get('MCP_WELL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+# Memoized responses of deterministic well tools (entry count and response bytes)
+RESULT_CACHE_ENTRIES = int(os.environ.get('MCP_RESULT_CACHE_ENTRIES', 256))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('MCP_RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Curve storage: float64 keeps values exactly as parsed; float32 halves memory at ~7 significant digits
+CURVE_DTYPE = np.dtype(os.environ.get('MCP_CURVE_DTYPE', 'float64'))
+# Local directory of memory-mapped curve arrays for S3 wells (unset: wells are parsed on every load)
+ARRAY_CACHE_DIR = os.environ.get('MCP_ARRAY_CACHE_DIR')
+
+# Wells found in S3: name -> {"key", "etag", "size", "last_modified", "sidecar", "summary"}
+WELL_CATALOG = {}
+# Summary index (curves, units, depth range, curve statistics) by well name, for S3 wells
+# by the version they were built from; kept when a well's samples are evicted
+WELL_SUMMARIES = {}
 
 # Initialize AWS S3 client
 s3_client = None
@@ -110,6 +397,17 @@ shale_volume_calc = ShaleVolumeCalculator()
 saturation_calc = SaturationCalculator()
 quality_assessment = DataQualityAssessment()
 
+# Computed porosity / shale volume / saturation results, stored next to the source log
+derived_store = DerivedCurveStore()
+
+# Tools whose response depends only on their arguments and one well's data
+MEMOIZED_TOOLS = frozenset({
+    "get_curve_data", "calculate_statistics", "calculate_porosity", "calculate_shale_volume",
+    "calculate_saturation", "assess_curve_quality", "calculate_data_completeness",
+    "validate_environmental_corrections", "assess_well_data_quality"
+})
+tool_results = ToolResultCache(RESULT_CACHE_ENTRIES, RESULT_CACHE_MAX_BYTES)
+
 def initialize_s3_client():
     """Initialize S3 client with proper credentials"""
     global s3_client
@@ -153,50 +451,255 @@ def initialize_s3_client():
         print(f"✗ Unexpected error initializing S3: {e}")
         return False
 
-def load_well_data():
-    """Load all .las files from S3"""
+def array_cache_path(s3_key: str, etag: Optional[str]) -> Optional[str]:
+    """Local array cache path (without extension) of one version of an S3 object, or None"""
+    if not ARRAY_CACHE_DIR or not etag:
+        return None
+    digest = hashlib.sha256(f"{s3_key}\n{etag}".encode('utf-8')).hexdigest()[:32]
+    return os.path.join(ARRAY_CACHE_DIR, digest)
+
+def cache_well_array(well: LASParser) -> LASParser:
+    """Write an S3 well to the local array cache and return it memory-mapped (best effort)"""
+    path = array_cache_path(well.source_key, well.source_etag)
+    if path is None or well.data is None:
+        return well
+    try:
+        os.makedirs(ARRAY_CACHE_DIR, exist_ok=True)
+        well.save_array_cache(path)
+        return LASParser.from_array_cache(path, well.filepath)
+    except Exception as e:
+        print(f"Array cache not written for {well.filepath}: {e}")
+        return well
+
+def index_well(well_name: str, well: LASParser) -> Dict[str, Any]:
+    """
+    The summary index entry of a loaded well, built unless the index already
+    has one for this version; S3 wells get it stored under the summary prefix
+    """
+    summary = WELL_SUMMARIES.get(well_name)
+    if well.source_etag and summary and summary.get('source_etag') == well.source_etag:
+        return summary
+    summary = well.summary()
+    if well.source_etag:
+        WELL_SUMMARIES[well_name] = summary
+        if s3_client is not None:
+            write_summary(s3_client, S3_BUCKET, well.source_key, summary)
+    return summary
+
+def current_summary(well_name: str) -> Optional[Dict[str, Any]]:
+    """The indexed summary of a catalog well if it matches the listed version"""
+    entry = WELL_CATALOG.get(well_name)
+    summary = WELL_SUMMARIES.get(well_name)
+    if entry and summary and summary.get('source_etag') == entry['etag']:
+        return summary
+    return None
+
+def fetch_summary(well_name: str) -> Optional[Dict[str, Any]]:
+    """The summary of a catalog well from the index or, when current, from S3 (no samples are read)"""
+    summary = current_summary(well_name)
+    entry = WELL_CATALOG.get(well_name)
+    if summary is None and entry and entry.get('summary') and s3_client is not None:
+        summary = read_summary(s3_client, S3_BUCKET, entry['key'], entry['etag'])
+        if summary:
+            WELL_SUMMARIES[well_name] = summary
+    return summary
+
+def store_well(well_name: str, well: LASParser):
+    """Put a loaded well in WELL_DATA and the summary index (memoized responses of an older load are dropped)"""
+    WELL_DATA[well_name] = well
+    tool_results.invalidate(well_name)
+    index_well(well_name, well)
+
+def load_well_object(las_obj: Dict[str, Any], sidecars=frozenset()):
+    """Load one LAS object from S3 into WELL_DATA (runs on the loader pool)"""
+    s3_key = las_obj['Key']
+    filename = os.path.basename(s3_key)
+    well_name = filename.replace('.las', '')
+    
+    try:
+        well, source = None, "S3"
+        
+        # A local array cache of this version of the file needs no S3 read
+        cache_path = array_cache_path(s3_key, las_obj.get('ETag'))
+        if cache_path and os.path.exists(cache_path + '.json'):
+            try:
+                well, source = LASParser.from_array_cache(cache_path, filename), "local array cache"
+            except Exception as e:
+                print(f"Array cache unreadable for {well_name}: {e}")
+        
+        # Prefer a columnar sidecar built from this version of the file
+        if well is None and sidecars and sidecar_key(s3_key) in sidecars:
+            loaded = load_current_sidecar(s3_client, S3_BUCKET, s3_key, source_etag=las_obj.get('ETag'))
+            if loaded:
+                well, source = LASParser.from_sidecar(loaded[1], filename), "S3 sidecar"
+                well.source_key, well.source_etag = s3_key, loaded[0]
+                well = cache_well_array(well)
+        
+        if well is None:
+            # Download file content from S3
+            response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
+            file_content = response['Body'].read().decode('utf-8')
+            
+            # Parse LAS content
+            well = LASParser.from_string(file_content, filename)
+            well.source_key, well.source_etag = s3_key, response.get('ETag')
+            well = cache_well_array(well)
+        
+        # A refresh may have replaced or deleted this version of the file while it loaded
+        entry = WELL_CATALOG.get(well_name)
+        if entry is None or entry.get('etag') != las_obj.get('ETag'):
+            print(f"Discarded outdated load of {well_name}")
+            return
+        store_well(well_name, well)
+        print(f"✓ Loaded well from {source}: {well_name}")
+        
+    except Exception as e:
+        print(f"✗ Error loading {filename} from S3: {e}")
+
+def list_las_objects(prefix: str = S3_PREFIX) -> List[Dict[str, Any]]:
+    """Every object under a prefix (S3_PREFIX by default), following list_objects_v2 continuation tokens"""
+    objects = []
+    kwargs = {'Bucket': S3_BUCKET, 'Prefix': prefix}
+    while True:
+        response = s3_client.list_objects_v2(**kwargs)
+        objects.extend(response.get('Contents', []))
+        if not response.get('IsTruncated') or not response.get('NextContinuationToken'):
+            return objects
+        kwargs['ContinuationToken'] = response['NextContinuationToken']
+
+def list_catalog_objects() -> List[Dict[str, Any]]:
+    """The LAS files under S3_PREFIX and the files built from them, kept in sibling prefixes"""
+    return (list_las_objects() + list_las_objects(sidecar_prefix(S3_PREFIX))
+            + list_las_objects(summary_prefix(S3_PREFIX)))
+
+def catalog_entries(objects: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """WELL_CATALOG entries of the .las files in an S3 listing"""
+    sidecars = {obj['Key'] for obj in objects if obj['Key'].endswith('.las' + SIDECAR_SUFFIX)}
+    summaries = {obj['Key'] for obj in objects if obj['Key'].endswith('.las' + SUMMARY_SUFFIX)}
+    
+    catalog = {}
+    for las_obj in objects:
+        if not las_obj['Key'].endswith('.las'):
+            continue
+        well_name = os.path.basename(las_obj['Key']).replace('.las', '')
+        catalog[well_name] = {
+            'key': las_obj['Key'],
+            'etag': las_obj.get('ETag'),
+            'size': las_obj.get('Size'),
+            'last_modified': las_obj.get('LastModified'),
+            'sidecar': sidecar_key(las_obj['Key']) in sidecars,
+            'summary': summary_key(las_obj['Key']) in summaries
+        }
+    return catalog
+
+def load_well_catalog() -> List[str]:
+    """
+    List the .las files in S3 into WELL_CATALOG (no well is downloaded)
+    
+    Returns:
+        Names of the wells found
+    """
     global s3_client
     
-    print(f"Attempting to load well data from S3 bucket: {S3_BUCKET}")
+    print(f"Attempting to list well data in S3 bucket: {S3_BUCKET}")
     
     if not initialize_s3_client():
         print("Failed to initialize S3 client. Using local fallback if available.")
         load_local_well_data()
-        return
+        return list(WELL_DATA)
     
     try:
-        # List all .las files in the S3 bucket
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET,
-            Prefix=S3_PREFIX
-        )
-        
-        if 'Contents' not in response:
+        objects = list_catalog_objects()
+        if not objects:
             print(f"No files found in S3 bucket {S3_BUCKET} with prefix {S3_PREFIX}")
-            return
-        
-        las_files = [obj['Key'] for obj in response['Contents'] if obj['Key'].endswith('.las')]
-        print(f"Found {len(las_files)} .las files in S3")
+            return []
         
-        for s3_key in las_files:
-            filename = os.path.basename(s3_key)
-            well_name = filename.replace('.las', '')
-            
-            try:
-                # Download file content from S3
-                response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-                file_content = response['Body'].read().decode('utf-8')
-                
-                # Parse LAS content
-                WELL_DATA[well_name] = LASParser.from_string(file_content, filename)
-                print(f"✓ Loaded well from S3: {well_name}")
-                
-            except Exception as e:
-                print(f"✗ Error loading {filename} from S3: {e}")
+        catalog = catalog_entries(objects)
+        print(f"Found {len(catalog)} .las files in S3")
+        WELL_CATALOG.update(catalog)
+        return list(catalog)
                 
     except Exception as e:
         print(f"✗ Error listing S3 objects: {e}")
         load_local_well_data()
+        return list(WELL_DATA)
+
+def request_well(well_name: str) -> Optional[Future]:
+    """
+    Start loading a catalog well that is not in memory
+    
+    Returns:
+        The Future of its load (shared by concurrent requests), or None
+        when the well is already in memory or not in the catalog
+    """
+    with _load_lock:
+        # A well in memory is used while a refresh reloads it
+        entry = WELL_CATALOG.get(well_name)
+        if entry is None or well_name in WELL_DATA:
+            return None
+        future = _well_futures.get(well_name)
+        if future is not None and not future.done():
+            return future
+        las_obj = {'Key': entry['key'], 'ETag': entry['etag']}
+        sidecars = {sidecar_key(entry['key'])} if entry.get('sidecar') else frozenset()
+        future = _well_futures[well_name] = _load_executor.submit(load_well_object, las_obj, sidecars)
+        return future
+
+def refresh_well_catalog() -> Dict[str, List[str]]:
+    """
+    List S3 again and apply the differences to the loaded wells
+    
+    New wells are added to the catalog (and load on first use). Wells whose
+    ETag or LastModified changed are reloaded in the background if they are
+    in memory or loading; requests keep using the previous version until the
+    new one is stored. Deleted wells are dropped. Unchanged wells are kept.
+    
+    Returns:
+        Names of the "added", "changed", "removed" and "reloading" wells
+    """
+    global WELL_CATALOG
+    
+    if not initialize_s3_client():
+        raise RuntimeError("S3 client not available")
+    catalog = catalog_entries(list_catalog_objects())
+    
+    with _load_lock:
+        previous = WELL_CATALOG
+        added = [name for name in catalog if name not in previous]
+        changed = [name for name in catalog if name in previous and (
+            catalog[name]['etag'] != previous[name]['etag']
+            or catalog[name]['last_modified'] != previous[name]['last_modified'])]
+        removed = [name for name in previous if name not in catalog]
+        
+        # Replaced, not updated in place, so readers iterating the catalog are unaffected
+        WELL_CATALOG = catalog
+        
+        reloading = []
+        for name in changed + removed:
+            WELL_SUMMARIES.pop(name, None)
+            tool_results.invalidate(name)
+            future = _well_futures.pop(name, None)
+            loading = future is not None and not future.done()
+            if name in removed:
+                WELL_DATA.pop(name, None)
+            elif loading or WELL_DATA.version(name) is not None:
+                entry = catalog[name]
+                las_obj = {'Key': entry['key'], 'ETag': entry['etag']}
+                sidecars = {sidecar_key(entry['key'])} if entry.get('sidecar') else frozenset()
+                _well_futures[name] = _load_executor.submit(load_well_object, las_obj, sidecars)
+                reloading.append(name)
+    
+    print(f"Refreshed well catalog: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+    return {"added": added, "changed": changed, "removed": removed, "reloading": reloading}
+
+def load_well_data():
+    """
+    Load all .las files from S3 (blocks until every well is loaded; wells are read concurrently)
+    
+    Wells beyond WELL_CACHE_MAX_BYTES are evicted again and reloaded on use.
+    """
+    futures = [request_well(name) for name in load_well_catalog()]
+    wait([future for future in futures if future is not None])
 
 def load_local_well_data():
     """Fallback to load local .las files"""
@@ -213,16 +716,40 @@ def load_local_well_data():
             well_name = filename.replace('.las', '')
             try:
                 WELL_DATA[well_name] = LASParser(filepath)
+                tool_results.invalidate(well_name)
                 print(f"✓ Loaded local well: {well_name}")
             except Exception as e:
                 print(f"✗ Error loading local {filename}: {e}")
 
+def derived_result(well: LASParser, method: str, parameters: Dict[str, Any], compute) -> CalculationResult:
+    """
+    A calculation result, reused from the derived-curve store while the well's
+    LAS object is unchanged (local wells are always computed)
+    """
+    if s3_client is None or not well.source_etag:
+        return compute()
+    stored = derived_store.fetch(s3_client, S3_BUCKET, well.source_key, well.source_etag,
+                                 method, parameters, lambda: asdict(compute()))
+    return CalculationResult(**{
+        name: value.tolist() if isinstance(value, np.ndarray) else value for name, value in stored.items()
+    })
+
 @server.list_tools()
 async def list_tools() -> List[Tool]:
     return [
         Tool(
             name="list_wells",
             description="List all available wells",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "include_summary": {"type": "boolean", "description": "Add curves, depth range and sample count of each indexed well"}
+                },
+            }
+        ),
+        Tool(
+            name="refresh_wells",
+            description="Pick up new, changed and deleted LAS files in S3 without reloading unchanged wells",
             inputSchema={
                 "type": "object",
                 "properties": {},
@@ -230,7 +757,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="get_well_info",
-            description="Get well header information",
+            description="Get well header information, curve units, depth range and curve statistics",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -248,7 +775,9 @@ async def list_tools() -> List[Tool]:
                     "well_name": {"type": "string", "description": "Name of the well"},
                     "curves": {"type": "array", "items": {"type": "string"}, "description": "Curve names (e.g., GR, RHOB, NPHI)"},
                     "depth_start": {"type": "number", "description": "Start depth (optional)"},
-                    "depth_end": {"type": "number", "description": "End depth (optional)"}
+                    "depth_end": {"type": "number", "description": "End depth (optional)"},
+                    "max_points": {"type": "integer", "description": "Downsample to at most this many samples, keeping spikes and end points (optional)"},
+                    "downsample_method": {"type": "string", "enum": ["lttb", "minmax"], "description": "Downsampling method (default lttb)"}
                 },
                 "required": ["well_name", "curves"]
             }
@@ -418,22 +947,68 @@ async def list_tools() -> List[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    # Ensure data is loaded before processing any request
-    ensure_data_loaded()
+    # Wait (without blocking the event loop) for the catalog, or for the one well the tool needs
+    # (get_well_info is answered from the summary index and loads the well only without one)
+    if name in ("list_wells", "get_well_info", "refresh_wells"):
+        await wait_for_catalog()
+    elif arguments.get("well_name"):
+        await wait_for_well(arguments["well_name"])
+    
+    # Repeated calls of a deterministic tool on the same version of a well are answered from memory
+    key = None
+    if name in MEMOIZED_TOOLS and arguments.get("well_name"):
+        version = WELL_DATA.version(arguments["well_name"])
+        if version is not None:
+            key = tool_results.key(name, arguments, arguments["well_name"], version)
+            cached = tool_results.get(key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
     
+    content = await run_tool(name, arguments)
+    if key is not None and content and len(content) == 1 and not content[0].text.startswith('{"error"'):
+        tool_results.put(key, content[0].text)
+    return content
+
+async def run_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     if name == "list_wells":
-        wells = list(WELL_DATA.keys())
-        return [TextContent(type="text", text=json.dumps({"wells": wells}))]
+        wells = list(dict.fromkeys([*WELL_CATALOG, *WELL_DATA]))
+        response = {"wells": wells}
+        if arguments.get("include_summary"):
+            loop = asyncio.get_running_loop()
+            summaries = await asyncio.gather(*(loop.run_in_executor(None, fetch_summary, well) for well in wells))
+            response["summaries"] = {
+                well: {"curves": summary["curves"], "depth": summary["depth"], "samples": summary["samples"]}
+                for well, summary in zip(wells, summaries) if summary
+            }
+        return [TextContent(type="text", text=json.dumps(response))]
+    
+    elif name == "refresh_wells":
+        if _data_loaded:
+            return [TextContent(type="text", text=json.dumps({"error": "Wells were not loaded from S3"}))]
+        try:
+            changes = await asyncio.get_running_loop().run_in_executor(None, refresh_well_catalog)
+        except Exception as e:
+            return [TextContent(type="text", text=json.dumps({"error": f"Refresh failed: {str(e)}"}))]
+        return [TextContent(type="text", text=json.dumps(changes))]
     
     elif name == "get_well_info":
         well_name = arguments["well_name"]
-        if well_name not in WELL_DATA:
-            return [TextContent(type="text", text=json.dumps({"error": f"Well {well_name} not found"}))]
+        summary = current_summary(well_name)
+        if summary is None and WELL_CATALOG.get(well_name, {}).get('summary'):
+            summary = await asyncio.get_running_loop().run_in_executor(None, fetch_summary, well_name)
+        if summary is None:
+            await wait_for_well(well_name)
+            if well_name not in WELL_DATA:
+                return [TextContent(type="text", text=json.dumps({"error": f"Well {well_name} not found"}))]
+            summary = index_well(well_name, WELL_DATA[well_name])
         
-        well = WELL_DATA[well_name]
         return [TextContent(type="text", text=json.dumps({
-            "well_info": well.well_info,
-            "available_curves": list(well.data.keys()) if well.data else []
+            "well_info": summary["well_info"],
+            "available_curves": summary["curves"],
+            "units": summary["units"],
+            "samples": summary["samples"],
+            "depth": summary["depth"],
+            "statistics": summary["statistics"]
         }))]
     
     elif name == "get_curve_data":
@@ -449,27 +1024,39 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         if not well.data:
             return [TextContent(type="text", text=json.dumps({"error": "No data available"}))]
         
-        # Filter by depth if specified
-        depths = well.data.get('DEPT', [])
-        result = {"depths": depths}
+        # Filter by depth if specified (one mask shared by every curve)
+        depths = well.data.get('DEPT', np.empty(0))
+        mask = None
+        if depth_start is not None or depth_end is not None:
+            mask = well.depth_mask(depth_start, depth_end)
         
+        result = {"depths": depths}
         for curve in curves:
             if curve in well.data:
-                curve_data = well.data[curve]
-                if depth_start is not None or depth_end is not None:
-                    filtered_data = []
-                    filtered_depths = []
-                    for i, depth in enumerate(depths):
-                        if (depth_start is None or depth >= depth_start) and \
-                           (depth_end is None or depth <= depth_end):
-                            filtered_data.append(curve_data[i])
-                            filtered_depths.append(depth)
-                    result[curve] = filtered_data
-                    if curve == curves[0]:  # Update depths for first curve
-                        result["depths"] = filtered_depths
-                else:
-                    result[curve] = curve_data
+                result[curve] = well.data[curve] if mask is None else well.data[curve][mask]
+                if mask is not None and curve == curves[0]:  # Update depths for first curve
+                    result["depths"] = depths[mask[:len(depths)]]
+        
+        # Optional shape-preserving downsampling (one index set for all curves)
+        max_points = arguments.get("max_points")
+        if max_points is not None:
+            returned = [c for c in curves if c in result and c != "depths"]
+            total_points = len(result["depths"])
+            try:
+                validate_downsampling(int(max_points), arguments.get("downsample_method", "lttb"))
+                if returned and total_points > int(max_points):
+                    values = [np.where(result[c] == -999.25, np.nan, result[c]) for c in returned]
+                    keep = downsample_indices(result["depths"], values, int(max_points),
+                                              arguments.get("downsample_method", "lttb"))
+                    result["depths"] = result["depths"][keep]
+                    for c in returned:
+                        result[c] = result[c][keep]
+            except (TypeError, ValueError) as e:
+                return [TextContent(type="text", text=json.dumps({"error": f"Invalid downsampling parameters: {e}"}))]
+            result["total_points"] = total_points
+            result["decimation_ratio"] = total_points / len(result["depths"]) if len(result["depths"]) else 1.0
         
+        result = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in result.items()}
         return [TextContent(type="text", text=json.dumps(result))]
     
     elif name == "calculate_statistics":
@@ -486,28 +1073,23 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             return [TextContent(type="text", text=json.dumps({"error": f"Curve {curve} not found"}))]
         
         # Filter data by depth range
-        depths = well.data.get('DEPT', [])
         curve_data = well.data[curve]
         
         if depth_start is not None or depth_end is not None:
-            filtered_data = []
-            for i, depth in enumerate(depths):
-                if (depth_start is None or depth >= depth_start) and \
-                   (depth_end is None or depth <= depth_end):
-                    filtered_data.append(curve_data[i])
-            curve_data = filtered_data
+            curve_data = curve_data[well.depth_mask(depth_start, depth_end)]
         
         # Calculate statistics
-        valid_data = [x for x in curve_data if x != -999.25]  # Remove null values
-        if not valid_data:
+        valid_data = curve_data[curve_data != -999.25]  # Remove null values
+        if not len(valid_data):
             return [TextContent(type="text", text=json.dumps({"error": "No valid data points"}))]
         
+        summary = StreamingStats.of(valid_data)
         stats = {
-            "count": len(valid_data),
-            "min": min(valid_data),
-            "max": max(valid_data),
-            "mean": sum(valid_data) / len(valid_data),
-            "median": sorted(valid_data)[len(valid_data)//2]
+            "count": summary.count,
+            "min": summary.min,
+            "max": summary.max,
+            "mean": summary.mean,
+            "median": order_statistics(valid_data, [len(valid_data) // 2])[0]
         }
         
         return [TextContent(type="text", text=json.dumps(stats))]
@@ -553,7 +1135,10 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 depth_range = (depth_start, depth_end)
             
             # Calculate porosity
-            result = porosity_calc.calculate_porosity(method, input_data, parameters, depth_range)
+            result = derived_result(
+                well, f"porosity_{method}", {'parameters': parameters, 'depth_range': depth_range},
+                lambda: porosity_calc.calculate_porosity(method, input_data, parameters, depth_range)
+            )
             
             # Include raw curve data for visualization
             curve_data = {
@@ -563,11 +1148,11 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             
             # Add input curves if available
             if 'rhob' in input_data:
-                curve_data["RHOB"] = input_data['rhob'][:len(result.depths)]
+                curve_data["RHOB"] = input_data['rhob'][:len(result.depths)].tolist()
             if 'nphi' in input_data:
-                curve_data["NPHI"] = input_data['nphi'][:len(result.depths)]
+                curve_data["NPHI"] = input_data['nphi'][:len(result.depths)].tolist()
             if 'GR' in well.data:
-                curve_data["GR"] = well.data['GR'][:len(result.depths)]
+                curve_data["GR"] = well.data['GR'][:len(result.depths)].tolist()
             
             # Convert NaN values to None for JSON serialization
             def clean_nan(obj):
@@ -618,14 +1203,14 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             
             # Get depth data
             if 'DEPT' in well.data:
-                input_data['depth'] = well.data['DEPT']
+                input_data['depth'] = well.curve_values('DEPT')
             else:
                 return [TextContent(type="text", text=json.dumps({"error": "DEPT curve not found"}))]
             
             # Get GR curve
             if 'GR' not in well.data:
                 return [TextContent(type="text", text=json.dumps({"error": "GR curve required for shale volume calculation"}))]
-            input_data['gr'] = well.data['GR']
+            input_data['gr'] = well.curve_values('GR')
             
             # Set depth range if specified
             depth_range = None
@@ -633,7 +1218,10 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 depth_range = (depth_start, depth_end)
             
             # Calculate shale volume
-            result = shale_volume_calc.calculate_shale_volume(method, input_data, parameters, depth_range)
+            result = derived_result(
+                well, f"shale_volume_{method}", {'parameters': parameters, 'depth_range': depth_range},
+                lambda: shale_volume_calc.calculate_shale_volume(method, input_data, parameters, depth_range)
+            )
             
             # Convert result to JSON-serializable format
             response = {
@@ -674,14 +1262,14 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             
             # Get depth data
             if 'DEPT' in well.data:
-                input_data['depth'] = well.data['DEPT']
+                input_data['depth'] = well.curve_values('DEPT')
             else:
                 return [TextContent(type="text", text=json.dumps({"error": "DEPT curve not found"}))]
             
             # Get RT curve
             if 'RT' not in well.data:
                 return [TextContent(type="text", text=json.dumps({"error": "RT curve required for saturation calculation"}))]
-            input_data['rt'] = well.data['RT']
+            input_data['rt'] = well.curve_values('RT')
             
             # Calculate porosity first
             porosity_input = {'depth': input_data['depth']}
@@ -703,14 +1291,21 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             
             # Calculate porosity
             porosity_params = {k: v for k, v in parameters.items() if k in ['matrix_density', 'fluid_density']}
-            porosity_result = porosity_calc.calculate_porosity(porosity_method, porosity_input, porosity_params, depth_range)
+            porosity_result = derived_result(
+                well, f"porosity_{porosity_method}", {'parameters': porosity_params, 'depth_range': depth_range},
+                lambda: porosity_calc.calculate_porosity(porosity_method, porosity_input, porosity_params, depth_range)
+            )
             
             # Use calculated porosity for saturation calculation
             input_data['porosity'] = porosity_result.values
             
             # Calculate saturation
             saturation_params = {k: v for k, v in parameters.items() if k in ['rw', 'a', 'm', 'n']}
-            result = saturation_calc.calculate_saturation(method, input_data, saturation_params, depth_range)
+            result = derived_result(
+                well, f"water_saturation_{method}",
+                {'porosity_method': porosity_method, 'parameters': parameters, 'depth_range': depth_range},
+                lambda: saturation_calc.calculate_saturation(method, input_data, saturation_params, depth_range)
+            )
             
             # Convert result to JSON-serializable format
             response = {
@@ -747,8 +1342,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         
         try:
             # Get curve data and depths
-            curve_data = well.data[curve_name]
-            depths = well.data.get('DEPT', list(range(len(curve_data))))
+            curve_data = well.curve_values(curve_name)
+            depths = well.curve_values('DEPT', list(range(len(curve_data))))
             
             # Apply depth range filter if specified
             if depth_start is not None and depth_end is not None:
@@ -793,8 +1388,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         
         try:
             # Get curve data and depths
-            curve_data = well.data[curve_name]
-            depths = well.data.get('DEPT', list(range(len(curve_data))))
+            curve_data = well.curve_values(curve_name)
+            depths = well.curve_values('DEPT', list(range(len(curve_data))))
             
             # Apply depth range filter if specified
             if depth_start is not None and depth_end is not None:
@@ -838,8 +1433,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         
         try:
             # Get curve data and depths
-            curve_data = well.data[curve_name]
-            depths = well.data.get('DEPT', list(range(len(curve_data))))
+            curve_data = well.curve_values(curve_name)
+            depths = well.curve_values('DEPT', list(range(len(curve_data))))
             
             # Apply depth range filter if specified
             if depth_start is not None and depth_end is not None:
@@ -893,13 +1488,13 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 curves = [curve for curve in well.data.keys() if curve != 'DEPT']
             
             # Get depths
-            depths = well.data.get('DEPT', list(range(len(next(iter(well.data.values()))))))
+            depths = well.curve_values('DEPT', list(range(len(well.array))))
             
             # Assess quality for each curve
             quality_results = []
             for curve_name in curves:
                 if curve_name in well.data:
-                    curve_data = well.data[curve_name]
+                    curve_data = well.curve_values(curve_name)
                     
                     # Apply depth range filter if specified
                     if depth_start is not None and depth_end is not None:
@@ -960,24 +1555,60 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         except Exception as e:
             return [TextContent(type="text", text=json.dumps({"error": f"Well data quality assessment failed: {str(e)}"}))]
 
-# Initialize with empty data - load lazily when first tool is called
-WELL_DATA = {}
+# Parsed wells, loaded on first use and bounded by WELL_CACHE_MAX_BYTES
+WELL_DATA = WellLRU(WELL_CACHE_MAX_BYTES)
+# Set when WELL_DATA was filled another way (the S3 catalog is not listed)
 _data_loaded = False
 
+_load_executor = ThreadPoolExecutor(max_workers=LOAD_CONCURRENCY, thread_name_prefix="well-loader")
+_load_lock = threading.Lock()
+_catalog_future = None  # Future of load_well_catalog()
+_well_futures = {}  # well name -> Future of its latest load
+
 def ensure_data_loaded():
-    """Ensure well data is loaded before processing requests"""
-    global _data_loaded
+    """List the wells in S3 in the background (once); returns the Future of the listing"""
+    global _catalog_future
+    with _load_lock:
+        if _catalog_future is None:
+            print("Listing well data on first request...")
+            _catalog_future = _load_executor.submit(load_well_catalog)
+        return _catalog_future
+
+async def wait_for_catalog():
+    """Wait until the wells in S3 are listed (no well is loaded)"""
     if not _data_loaded:
-        print("Loading well data on first request...")
-        load_well_data()
-        _data_loaded = True
+        await asyncio.wrap_future(ensure_data_loaded())
+
+async def wait_for_well(well_name: str):
+    """Load one well on first use (or after eviction) without blocking the event loop"""
+    await wait_for_catalog()
+    future = request_well(well_name)
+    if future is not None:
+        await asyncio.wrap_future(future)
+        # A refresh may have replaced that load with one of a newer version of the file
+        newer = _well_futures.get(well_name)
+        if newer is not None and newer is not future:
+            await asyncio.wrap_future(newer)
+
+async def refresh_periodically(interval: float):
+    """Apply S3 changes every interval seconds once the catalog has been listed"""
+    while True:
+        await asyncio.sleep(interval)
+        if _data_loaded or _catalog_future is None or not _catalog_future.done():
+            continue
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, refresh_well_catalog)
+        except Exception as e:
+            print(f"✗ Periodic refresh failed: {e}")
 
 if __name__ == "__main__":
-    import asyncio
     from mcp.server.stdio import stdio_server
     
     async def main():
+        refresher = asyncio.create_task(refresh_periodically(REFRESH_INTERVAL)) if REFRESH_INTERVAL > 0 else None
         async with stdio_server() as (read_stream, write_stream):
             await server.run(read_stream, write_stream, server.create_initialization_options())
+        if refresher is not None:
+            refresher.cancel()
     
     asyncio.run(main())
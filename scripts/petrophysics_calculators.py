@@ -54,6 +54,9 @@ class PorosityCalculator:
     """
     Porosity Calculator Class
     Implements industry-standard porosity calculation methods
+    
+    Curves are processed as numpy arrays (lists are accepted); nulls,
+    out-of-range inputs and results outside 0-1 become -999.25.
     """
     
     def __init__(self):
@@ -68,84 +71,60 @@ class PorosityCalculator:
         Standard formula: φD = (2.65 - RHOB) / (2.65 - 1.0)
         """
         params = {**self.default_parameters, **(parameters or {})}
+        return self._density_porosity(rhob_data, params).tolist()
+    
+    def _density_porosity(self, rhob_data, params: Dict) -> np.ndarray:
+        rhob = np.asarray(rhob_data, dtype=float)
         matrix_density = params['matrix_density']
         fluid_density = params['fluid_density']
         
-        result = []
-        for rhob in rhob_data:
-            # Handle null values
-            if rhob == -999.25 or math.isnan(rhob) or not math.isfinite(rhob):
-                result.append(-999.25)
-                continue
-            
-            # Validate input range (typical bulk density range: 1.5 - 3.0 g/cc)
-            if rhob < 1.0 or rhob > 4.0:
-                result.append(-999.25)
-                continue
-            
-            # Calculate density porosity: φD = (ρma - ρb) / (ρma - ρf)
+        # Calculate density porosity: φD = (ρma - ρb) / (ρma - ρf)
+        with np.errstate(divide='ignore', invalid='ignore'):
             porosity = (matrix_density - rhob) / (matrix_density - fluid_density)
-            
-            # Validate result (porosity should be between 0 and 1)
-            if porosity < 0 or porosity > 1:
-                result.append(-999.25)
-                continue
-            
-            result.append(porosity)
         
-        return result
+        # Handle null values, validate input range (typical bulk density range: 1.5 - 3.0 g/cc)
+        # and result (porosity should be between 0 and 1)
+        valid = (np.isfinite(rhob) & (rhob != -999.25) & (rhob >= 1.0) & (rhob <= 4.0)
+                 & (porosity >= 0) & (porosity <= 1))
+        return np.where(valid, porosity, -999.25)
     
     def calculate_neutron_porosity(self, nphi_data: List[float], parameters: Optional[Dict] = None) -> List[float]:
         """
         Calculate neutron porosity using formula: φN = NPHI / 100
         Converts neutron porosity from percentage to decimal
         """
-        result = []
-        for nphi in nphi_data:
-            # Handle null values
-            if nphi == -999.25 or math.isnan(nphi) or not math.isfinite(nphi):
-                result.append(-999.25)
-                continue
-            
-            # Validate input range (typical neutron porosity range: 0 - 100%)
-            if nphi < 0 or nphi > 100:
-                result.append(-999.25)
-                continue
-            
-            # Convert from percentage to decimal: φN = NPHI / 100
-            porosity = nphi / 100
-            result.append(porosity)
+        return self._neutron_porosity(nphi_data).tolist()
+    
+    def _neutron_porosity(self, nphi_data) -> np.ndarray:
+        nphi = np.asarray(nphi_data, dtype=float)
         
-        return result
+        # Handle null values and validate input range (typical neutron porosity range: 0 - 100%)
+        valid = np.isfinite(nphi) & (nphi != -999.25) & (nphi >= 0) & (nphi <= 100)
+        
+        # Convert from percentage to decimal: φN = NPHI / 100
+        return np.where(valid, nphi / 100, -999.25)
     
     def calculate_effective_porosity(self, density_porosity: List[float], neutron_porosity: List[float]) -> List[float]:
         """
         Calculate effective porosity as average of density and neutron porosity
         Formula: φE = (φD + φN) / 2
         """
-        if len(density_porosity) != len(neutron_porosity):
+        return self._effective_porosity(density_porosity, neutron_porosity).tolist()
+    
+    def _effective_porosity(self, density_porosity, neutron_porosity) -> np.ndarray:
+        phi_d = np.asarray(density_porosity, dtype=float)
+        phi_n = np.asarray(neutron_porosity, dtype=float)
+        if len(phi_d) != len(phi_n):
             raise ValueError('Density and neutron porosity arrays must have the same length')
         
-        result = []
-        for phi_d, phi_n in zip(density_porosity, neutron_porosity):
-            # Handle null values
-            if (phi_d == -999.25 or phi_n == -999.25 or 
-                math.isnan(phi_d) or math.isnan(phi_n) or 
-                not math.isfinite(phi_d) or not math.isfinite(phi_n)):
-                result.append(-999.25)
-                continue
-            
-            # Calculate effective porosity: φE = (φD + φN) / 2
+        # Calculate effective porosity: φE = (φD + φN) / 2
+        with np.errstate(invalid='ignore'):
             effective_porosity = (phi_d + phi_n) / 2
-            
-            # Validate result
-            if effective_porosity < 0 or effective_porosity > 1:
-                result.append(-999.25)
-                continue
-            
-            result.append(effective_porosity)
         
-        return result
+        # Handle null values and validate result
+        valid = (np.isfinite(phi_d) & np.isfinite(phi_n) & (phi_d != -999.25) & (phi_n != -999.25)
+                 & (effective_porosity >= 0) & (effective_porosity <= 1))
+        return np.where(valid, effective_porosity, -999.25)
     
     def calculate_porosity(self, method: str, input_data: Dict[str, List[float]], 
                           parameters: Optional[Dict] = None, depth_range: Optional[Tuple[float, float]] = None) -> CalculationResult:
@@ -158,43 +137,42 @@ class PorosityCalculator:
             if method == PorosityMethod.DENSITY.value:
                 if 'rhob' not in input_data:
                     raise ValueError('RHOB curve is required for density porosity calculation')
-                values = self.calculate_density_porosity(input_data['rhob'], params)
+                values = self._density_porosity(input_data['rhob'], params)
                 methodology = f"Density Porosity: φD = ({params['matrix_density']} - RHOB) / ({params['matrix_density']} - {params['fluid_density']})"
                 
             elif method == PorosityMethod.NEUTRON.value:
                 if 'nphi' not in input_data:
                     raise ValueError('NPHI curve is required for neutron porosity calculation')
-                values = self.calculate_neutron_porosity(input_data['nphi'], params)
+                values = self._neutron_porosity(input_data['nphi'])
                 methodology = "Neutron Porosity: φN = NPHI / 100"
                 
             elif method == PorosityMethod.EFFECTIVE.value:
                 if 'rhob' not in input_data or 'nphi' not in input_data:
                     raise ValueError('Both RHOB and NPHI curves are required for effective porosity calculation')
-                density_phi = self.calculate_density_porosity(input_data['rhob'], params)
-                neutron_phi = self.calculate_neutron_porosity(input_data['nphi'], params)
-                values = self.calculate_effective_porosity(density_phi, neutron_phi)
+                density_phi = self._density_porosity(input_data['rhob'], params)
+                neutron_phi = self._neutron_porosity(input_data['nphi'])
+                values = self._effective_porosity(density_phi, neutron_phi)
                 methodology = f"Effective Porosity: φE = (φD + φN) / 2, where φD = ({params['matrix_density']} - RHOB) / ({params['matrix_density']} - {params['fluid_density']}) and φN = NPHI / 100"
                 
             elif method == PorosityMethod.TOTAL.value:
                 if 'nphi' not in input_data:
                     raise ValueError('NPHI curve is required for total porosity calculation')
-                values = self.calculate_neutron_porosity(input_data['nphi'], params)
+                values = self._neutron_porosity(input_data['nphi'])
                 methodology = "Total Porosity: φT = NPHI / 100 (neutron porosity represents total porosity)"
                 
             else:
                 raise ValueError(f"Unsupported porosity method: {method}")
             
             # Apply depth range filter if specified
-            depths = input_data.get('depth', list(range(len(values))))
+            depths = np.asarray(input_data['depth']) if 'depth' in input_data else np.arange(len(values))
             if depth_range:
-                filtered_indices = [i for i, depth in enumerate(depths) 
-                                  if depth_range[0] <= depth <= depth_range[1]]
-                depths = [depths[i] for i in filtered_indices]
-                values = [values[i] for i in filtered_indices]
+                in_range = (depths >= depth_range[0]) & (depths <= depth_range[1])
+                depths = depths[in_range]
+                values = values[in_range]
             
             # Calculate uncertainty (±2% for density, ±3% for neutron)
             base_uncertainty = 0.02 if method == PorosityMethod.DENSITY.value else 0.03
-            uncertainty = [abs(val * base_uncertainty) if val != -999.25 else -999.25 for val in values]
+            uncertainty = np.where(values != -999.25, np.abs(values * base_uncertainty), -999.25)
             
             # Calculate statistics
             statistics = self._calculate_statistics(values)
@@ -203,9 +181,9 @@ class PorosityCalculator:
             quality_metrics = self._calculate_quality_metrics(values, method)
             
             return CalculationResult(
-                values=values,
-                depths=depths,
-                uncertainty=uncertainty,
+                values=values.tolist(),
+                depths=depths.tolist(),
+                uncertainty=uncertainty.tolist(),
                 methodology=methodology,
                 parameters=params,
                 statistics=statistics,
@@ -217,9 +195,10 @@ class PorosityCalculator:
     
     def _calculate_statistics(self, data: List[float]) -> Dict[str, float]:
         """Calculate statistical summary for porosity data"""
-        valid_data = [val for val in data if val != -999.25 and not math.isnan(val) and math.isfinite(val)]
+        data = np.asarray(data, dtype=float)
+        valid_data = data[np.isfinite(data) & (data != -999.25)]
         
-        if not valid_data:
+        if not len(valid_data):
             return {
                 'mean': float('nan'),
                 'median': float('nan'),
@@ -230,25 +209,26 @@ class PorosityCalculator:
                 'valid_count': 0
             }
         
-        valid_data.sort()
-        mean = sum(valid_data) / len(valid_data)
-        variance = sum((val - mean) ** 2 for val in valid_data) / len(valid_data)
+        valid_data = np.sort(valid_data)
+        mean = float(valid_data.sum() / len(valid_data))
+        variance = float(((valid_data - mean) ** 2).sum() / len(valid_data))
         std_dev = math.sqrt(variance)
         
         return {
             'mean': mean,
-            'median': valid_data[len(valid_data) // 2],
+            'median': float(valid_data[len(valid_data) // 2]),
             'std_dev': std_dev,
-            'min': valid_data[0],
-            'max': valid_data[-1],
+            'min': float(valid_data[0]),
+            'max': float(valid_data[-1]),
             'count': len(data),
             'valid_count': len(valid_data)
         }
     
     def _calculate_quality_metrics(self, values: List[float], method: str) -> Dict[str, Any]:
         """Calculate quality metrics for porosity calculations"""
-        valid_count = sum(1 for val in values if val != -999.25 and not math.isnan(val) and math.isfinite(val))
-        data_completeness = valid_count / len(values) if values else 0
+        values = np.asarray(values, dtype=float)
+        valid_count = int(np.count_nonzero(np.isfinite(values) & (values != -999.25)))
+        data_completeness = valid_count / len(values) if len(values) else 0
         
         uncertainty_ranges = {
             PorosityMethod.DENSITY.value: [0.02, 0.03],
@@ -0,0 +1,213 @@
+"""
+Shared fixtures for the petrophysics Lambda and MCP well-data server tests.
+
+FakeS3 stands in for the boto3 S3 client and make_las / format_las build
+LAS 2.0 text, so every test exercises the same S3 behaviour: content ETags,
+conditional and ranged GETs, and paginated listings.
+"""
+
+import io
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+NULL_VALUE = -999.25
+
+# Mnemonic -> (unit, description, uniform range of generated values)
+CURVE_SPECS = {
+    'DEPT': ('M', 'Depth', None),
+    'GR': ('API', 'Gamma ray', (15, 170)),
+    'RHOB': ('G/CC', 'Bulk density', (1.9, 2.8)),
+    'NPHI': ('V/V', 'Neutron porosity', (0.05, 0.45)),
+    'RT': ('OHMM', 'Deep resistivity', (0.5, 200)),
+}
+
+
+def format_las(depth, curves, well='W', decimals=4):
+    """LAS 2.0 text with one row per depth sample.
+
+    Args:
+        depth: Depth values
+        curves: Curve name -> values aligned with depth (NULL_VALUE for nulls)
+        well: Well name written to the ~Well section
+        decimals: Decimal places of every value
+    """
+    curve_lines = ""
+    for name in ['DEPT'] + list(curves):
+        unit, description, _ = CURVE_SPECS.get(name, ('', name, None))
+        curve_lines += f" {name}.{unit} : {description}\n"
+    header = (
+        "~Version Information\n VERS. 2.0 : LAS 2.0\n WRAP. NO : One line per depth step\n"
+        f"~Well Information\n WELL. {well} : {well}\n NULL. {NULL_VALUE} : Null value\n"
+        "~Curve Information\n" + curve_lines + "~ASCII\n"
+    )
+    table = np.column_stack([depth] + [curves[name] for name in curves])
+    return header + "\n".join(" ".join(f"{v:.{decimals}f}" for v in row) for row in table) + "\n"
+
+
+def make_las(samples=2000, curves=('GR', 'RHOB'), seed=0, well='W', step=0.5,
+             offset=0.0, null_every=0, ranges=None):
+    """LAS 2.0 text with uniformly distributed curve values from 1000 m down.
+
+    Args:
+        samples: Number of depth samples
+        curves: Curve mnemonics after DEPT
+        seed: Random seed; the same arguments always give the same text
+        well: Well name
+        step: Depth step in metres
+        offset: Added to every GR value
+        null_every: When set, every nth RHOB sample (the first included) is null
+        ranges: Curve name -> (low, high) overriding CURVE_SPECS
+    """
+    rng = np.random.default_rng(seed)
+    ranges = {**{name: spec[2] for name, spec in CURVE_SPECS.items()}, **(ranges or {})}
+    values = {}
+    for name in curves:
+        low, high = ranges[name]
+        values[name] = rng.uniform(low, high, samples)
+    if 'GR' in values:
+        values['GR'] += offset
+    if null_every and 'RHOB' in values:
+        values['RHOB'][::null_every] = NULL_VALUE
+    return format_las(1000 + np.arange(samples) * step, values, well=well)
+
+
+class FakeS3:
+    """S3 client double with content ETags, conditional and ranged GETs and paged listings.
+
+    Objects are kept as key -> (body, LastModified); every put advances a fake
+    clock by a minute. Each request is appended to ``calls`` as
+    (operation, key or prefix, Range), ``reads`` counts the bodies returned
+    per key, and ``active`` / ``peak`` gauge concurrent GETs.
+    """
+
+    class exceptions:
+        class NoSuchKey(ClientError):
+            def __init__(self, key):
+                super().__init__({'Error': {'Code': 'NoSuchKey', 'Message': key},
+                                  'ResponseMetadata': {'HTTPStatusCode': 404}}, 'GetObject')
+
+    def __init__(self, objects=None, latency=0.0, page_size=1000):
+        self.objects = {}
+        self.latency = latency
+        self.page_size = page_size
+        self.calls = []
+        self.reads = {}
+        self.not_modified = 0
+        self.bytes_read = 0
+        self.active = 0
+        self.peak = 0
+        self.clock = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.lock = threading.Lock()
+        for key, body in (objects or {}).items():
+            self.put(key, body)
+
+    # Test setup (not recorded)
+
+    def put(self, key, body):
+        self.clock += timedelta(minutes=1)
+        self.objects[key] = (body if isinstance(body, bytes) else body.encode('utf-8'), self.clock)
+
+    def touch(self, key):
+        """Advance LastModified without changing the content (or the ETag)."""
+        self.clock += timedelta(minutes=1)
+        self.objects[key] = (self.objects[key][0], self.clock)
+
+    @property
+    def listed(self):
+        """Prefix of each list request, in order."""
+        return [key for operation, key, _ in self.calls if operation == 'list_objects_v2']
+
+    def keys(self, prefix=''):
+        return sorted(k for k in self.objects if k.startswith(prefix))
+
+    def read_count(self, prefix='', suffix=''):
+        """Bodies returned for matching keys (not counting 304s and missing keys)."""
+        return sum(n for k, n in self.reads.items() if k.startswith(prefix) and k.endswith(suffix))
+
+    def get_requests(self, prefix='', suffix=''):
+        """GET requests for matching keys, whatever their outcome."""
+        return sum(1 for operation, key, _ in self.calls
+                   if operation == 'get_object' and key.startswith(prefix) and key.endswith(suffix))
+
+    def _etag(self, key):
+        return '"' + hashlib.md5(self.objects[key][0]).hexdigest() + '"'
+
+    def _record(self, operation, key, byte_range=None):
+        with self.lock:
+            self.calls.append((operation, key, byte_range))
+
+    # Client API
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._record('put_object', Key)
+        self.put(Key, Body)
+        return {'ETag': self._etag(Key)}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._record('head_object', Key)
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        body, modified = self.objects[Key]
+        return {'ETag': self._etag(Key), 'ContentLength': len(body), 'LastModified': modified}
+
+    def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None, **kwargs):
+        self._record('get_object', Key, Range)
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        body, modified = self.objects[Key]
+        etag = self._etag(Key)
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self.lock:
+                self.active -= 1
+        if IfNoneMatch == etag:
+            with self.lock:
+                self.not_modified += 1
+            raise ClientError({'Error': {'Code': '304', 'Message': 'Not Modified'},
+                               'ResponseMetadata': {'HTTPStatusCode': 304}}, 'GetObject')
+        if Range:
+            first, last = (int(v) for v in Range[len("bytes="):].split('-'))
+            body = body[first:last + 1]
+        with self.lock:
+            self.reads[Key] = self.reads.get(Key, 0) + 1
+            self.bytes_read += len(body)
+        return {'Body': io.BytesIO(body), 'ETag': etag, 'ContentLength': len(body), 'LastModified': modified}
+
+    def list_objects_v2(self, Bucket, Prefix='', MaxKeys=None, ContinuationToken=None, StartAfter=None, **kwargs):
+        self._record('list_objects_v2', Prefix)
+        keys = [k for k in self.keys(Prefix) if StartAfter is None or k > StartAfter]
+        start = int(ContinuationToken or 0)
+        size = min(MaxKeys or self.page_size, self.page_size)
+        page = keys[start:start + size]
+        response = {
+            'Contents': [{'Key': k, 'ETag': self._etag(k), 'Size': len(self.objects[k][0]),
+                          'LastModified': self.objects[k][1]} for k in page],
+            'KeyCount': len(page),
+            'IsTruncated': start + size < len(keys),
+        }
+        if response['IsTruncated']:
+            response['NextContinuationToken'] = str(start + size)
+        return response
+
+    def get_paginator(self, operation):
+        client = self
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                token = None
+                while True:
+                    page = client.list_objects_v2(**kwargs, **({'ContinuationToken': token} if token else {}))
+                    yield page
+                    if not page['IsTruncated']:
+                        return
+                    token = page['NextContinuationToken']
+        return Paginator()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test the resumable collection build journal.
+
+Verifies that the journal persists per-well stages and the RCON command
+watermark, that rcon_checkpoint skips already-applied commands, and that
+re-running visualize_collection_wells after an RCON outage only sends the
+commands and fetches that the first run did not complete.
+"""
+
+import sys
+import os
+import tempfile
+from unittest.mock import patch, MagicMock
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.build_journal import BuildJournal, build_key
+from tools import rcon_tool
+
+
+class FakeRcon:
+    """Stands in for the RCON connection; goes down after a set number of commands."""
+
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.fail_after = fail_after
+
+    def __call__(self, command):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            return "RCON Error: [Errno 111] Connection refused"
+        self.sent.append(command)
+        return f"Command executed: {command}\nResponse: ok"
+
+
+def test_journal_persistence():
+    """Stages, watermark batches and geometry survive reopening the journal."""
+    print("=" * 60)
+    print("TEST 1: Journal persistence")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        key = build_key("demo", {"spacing": 50}, [{"well_name": "W1", "s3_key": "k1"}])
+        journal = BuildJournal("demo", key, journal_dir=journal_dir, command_batch=10)
+        journal.mark("k1", "fetched")
+        journal.save_geometry("k1", '{"minecraft_coordinates": []}')
+        for watermark in range(1, 26):
+            journal.record_commands("k1", watermark)
+
+        reopened = BuildJournal("demo", key, journal_dir=journal_dir)
+        print(f"Stats: {reopened.get_stats()}")
+        if not reopened.resumed or not reopened.is_done("k1", "computed"):
+            print("❌ Stages not persisted")
+            return False
+        if reopened.command_watermark("k1") != 20:
+            print(f"❌ Expected last persisted batch (20), got {reopened.command_watermark('k1')}")
+            return False
+        if reopened.load_geometry("k1") != '{"minecraft_coordinates": []}':
+            print("❌ Geometry not kept")
+            return False
+
+        reopened.mark("k1", "placed")
+        if reopened.load_geometry("k1") is not None and os.listdir(reopened.geometry_dir):
+            print("❌ Geometry not dropped after placement")
+            return False
+
+        other = BuildJournal("demo", build_key("demo", {"spacing": 60}, []), journal_dir=journal_dir)
+        if other.resumed:
+            print("❌ Journal resumed for a different layout")
+            return False
+
+    print("✅ Journal reopened with stages, batched watermark and geometry")
+    return True
+
+
+def test_rcon_checkpoint():
+    """Commands below the watermark are skipped; sending stops after an RCON error."""
+    print("\n" + "=" * 60)
+    print("TEST 2: RCON command checkpoint")
+    print("=" * 60)
+
+    rcon = FakeRcon(fail_after=3)
+    progress = []
+    with patch.object(rcon_tool, '_send_rcon_command', rcon):
+        with rcon_tool.rcon_checkpoint(0, progress.append) as first:
+            for i in range(6):
+                rcon_tool.execute_rcon_command(f"setblock {i} 0 0 stone")
+        print(f"First run: watermark={first.watermark} issued={first.issued} error={first.error}")
+        if first.watermark != 3 or progress != [1, 2, 3] or len(rcon.sent) != 3 or not first.error:
+            print("❌ Watermark or failure handling wrong")
+            return False
+
+        rcon.fail_after = None
+        with rcon_tool.rcon_checkpoint(first.watermark) as second:
+            for i in range(6):
+                rcon_tool.execute_rcon_command(f"setblock {i} 0 0 stone")
+        if rcon.sent[3:] != [f"setblock {i} 0 0 stone" for i in range(3, 6)] or second.watermark != 6:
+            print(f"❌ Resume resent or skipped the wrong commands: {rcon.sent}")
+            return False
+
+    # Outside a checkpoint nothing is counted
+    with patch.object(rcon_tool, '_send_rcon_command', rcon):
+        if "Command executed" not in rcon_tool.execute_rcon_command("say hi"):
+            print("❌ Plain command not sent")
+            return False
+
+    print("✅ Resume sent only the commands after the watermark")
+    return True
+
+
+def run_collection(workflow_tools, s3_access, rcon):
+    with patch('tools.s3_data_access.S3WellDataAccess', return_value=s3_access), \
+            patch.object(rcon_tool, '_send_rcon_command', rcon):
+        return workflow_tools.visualize_collection_wells("demo", batch_size=2, spacing=50)
+
+
+def test_resume_after_rcon_outage():
+    """A re-run after an outage only sends the remaining commands and fetches."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Resume collection build after RCON outage")
+    print("=" * 60)
+
+    from tools import workflow_tools
+
+    wells = [{'well_name': f"WELL-{i:03d}", 's3_key': f"collections/demo/WELL-{i:03d}.json", 'etag': f'"e{i}"'}
+             for i in range(1, 7)]
+    s3_access = MagicMock()
+    s3_access.validate_s3_access.return_value = {'success': True}
+    s3_access.list_collection_wells.return_value = {'success': True, 'wells': wells, 'total_wells': len(wells)}
+    s3_access.update_collection_manifest.return_value = {'success': True}
+    s3_access.get_trajectory_data.side_effect = lambda key: {
+        'success': True,
+        'data_type': 'coordinates',
+        'coordinates': [{'x': 0.0, 'y': 0.0, 'z': float(-d)} for d in range(0, 400, 10)]
+    }
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        with patch.dict(os.environ, {'EDICRAFT_BUILD_JOURNAL_DIR': journal_dir, 'EDICRAFT_BUILD_JOURNAL': 'true'}):
+            # Reference: commands for an uninterrupted build
+            clean = FakeRcon()
+            run_collection(workflow_tools, s3_access, clean)
+            if os.listdir(journal_dir):
+                print("❌ Journal not removed after a complete build")
+                return False
+            fetches_clean = s3_access.get_trajectory_data.call_count
+
+            # RCON goes down part-way through the third well
+            s3_access.get_trajectory_data.reset_mock()
+            outage = FakeRcon(fail_after=len(clean.sent) * 2 // 5)
+            first = run_collection(workflow_tools, s3_access, outage)
+            print(f"First run: {len(outage.sent)} commands before outage")
+            if "**Failed:** 0" in first:
+                print("❌ Outage not reported as failed wells")
+                return False
+
+            # Re-run with RCON back
+            s3_access.get_trajectory_data.reset_mock()
+            recovered = FakeRcon()
+            second = run_collection(workflow_tools, s3_access, recovered)
+            replayed = len(outage.sent) + len(recovered.sent) - len(clean.sent)
+            print(f"Second run: {len(recovered.sent)} commands, {replayed} replayed, "
+                  f"{s3_access.get_trajectory_data.call_count} fetches (clean build: {fetches_clean})")
+
+            if "**Successfully Built:** 6" not in second or "**Resumed:** 2" not in second:
+                print(f"❌ Re-run did not complete the collection:\n{second}")
+                return False
+            if not 0 <= replayed <= 25:
+                print("❌ Re-run repeated more than one command batch")
+                return False
+            if s3_access.get_trajectory_data.call_count != 0:
+                print("❌ Re-run fetched wells whose geometry was already computed")
+                return False
+            if os.listdir(journal_dir):
+                print("❌ Journal not removed after the resumed build completed")
+                return False
+
+    print("✅ Re-run sent only the remaining commands and fetched nothing again")
+    return True
+
+
+def main():
+    tests = [
+        test_journal_persistence,
+        test_rcon_checkpoint,
+        test_resume_after_rcon_outage,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Test the collection manifest index.
+
+Verifies that the manifest records size, ETag, format, surface location and
+bounding box per well, that listing a collection with a manifest is a single
+object read, that updates only fetch new or changed wells, that
+visualize_collection_wells can prefilter wells by area, and that wells
+added, replaced or removed after the manifest exists are picked up on an
+explicit refresh, once the manifest expires, or after a failed fetch.
+"""
+
+import sys
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from botocore.exceptions import ClientError
+
+from tools.s3_data_access import S3WellDataAccess
+from tools.collection_manifest import MANIFEST_FILE_NAME
+
+PREFIX = "collections/demo/"
+
+
+class FakeBody:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self):
+        return self._data
+
+
+class FakeS3:
+    """In-memory S3 client recording list/get/put calls."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = {"list": 0, "get": [], "put": []}
+
+    def _etag(self, key):
+        return '"' + hashlib.md5(self.objects[key]).hexdigest() + '"'
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                fake.calls["list"] += 1
+                contents = [
+                    {"Key": key, "Size": len(body), "ETag": fake._etag(key),
+                     "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc)}
+                    for key, body in sorted(fake.objects.items()) if key.startswith(Prefix)
+                ]
+                return [{"Contents": contents}]
+
+        return Paginator()
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.calls["get"].append(Key)
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "GetObject")
+        return {"Body": FakeBody(self.objects[Key]), "ETag": self._etag(Key)}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls["put"].append(Key)
+        self.objects[Key] = Body
+
+
+def well_body(x0: float, y0: float) -> bytes:
+    points = [{"x": x0 + d * 0.5, "y": y0 - d * 0.25, "z": -float(d)} for d in range(0, 100, 10)]
+    return json.dumps({"coordinates": points}).encode('utf-8')
+
+
+def make_client(well_count: int = 6):
+    s3 = FakeS3()
+    for i in range(well_count):
+        s3.objects[f"{PREFIX}WELL-{i:03d}/trajectory.json"] = well_body(1000.0 * i, 5000.0)
+    client = S3WellDataAccess(bucket_name="test-bucket", disk_cache=False)
+    client.s3_client = s3
+    return client, s3
+
+
+def test_manifest_contents_and_listing():
+    """The manifest records well metadata and replaces the prefix walk."""
+    print("=" * 60)
+    print("TEST 1: Manifest contents and single-read listing")
+    print("=" * 60)
+
+    client, s3 = make_client()
+    result = client.update_collection_manifest(PREFIX)
+    if not result["success"] or result["added"] != 6:
+        print(f"❌ Manifest build failed: {result}")
+        return False
+
+    entry = result["manifest"]["wells"][2]
+    print(f"Entry: {entry}")
+    expected = {"well_name": "WELL-002", "file_format": "json", "data_type": "coordinates", "total_points": 10}
+    if any(entry.get(k) != v for k, v in expected.items()) or not entry["etag"] or not entry["file_size"]:
+        print("❌ Manifest entry missing metadata")
+        return False
+    if entry["surface_location"] != {"x": 2000.0, "y": 5000.0, "z": 0.0} or entry["bbox"]["x_max"] != 2045.0:
+        print("❌ Surface location or bounding box wrong")
+        return False
+
+    # A new session lists the collection with one object read
+    fresh = S3WellDataAccess(bucket_name="test-bucket", disk_cache=False)
+    fresh.s3_client = s3
+    list_calls, get_calls = s3.calls["list"], len(s3.calls["get"])
+    listing = fresh.list_collection_wells(PREFIX)
+    if listing["source"] != "manifest" or listing["total_wells"] != 6:
+        print(f"❌ Listing did not use manifest: {listing.get('source')}")
+        return False
+    if s3.calls["list"] != list_calls or s3.calls["get"][get_calls:] != [PREFIX + MANIFEST_FILE_NAME]:
+        print("❌ Listing walked the prefix or fetched wells")
+        return False
+    if listing["wells"][2] != entry:
+        print("❌ Manifest metadata not returned with the listing")
+        return False
+    if fresh.list_collection_wells(PREFIX, use_manifest=False)["source"] != "listing":
+        print("❌ use_manifest=False should walk the prefix")
+        return False
+    if any(w["s3_key"].endswith(MANIFEST_FILE_NAME) for w in fresh._list_collection_objects(PREFIX)):
+        print("❌ Manifest listed as a well")
+        return False
+
+    print("✅ Manifest holds well metadata; listing is a single read")
+    return True
+
+
+def test_incremental_update():
+    """Updates fetch only new or changed wells and drop deleted ones."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Incremental update")
+    print("=" * 60)
+
+    client, s3 = make_client()
+    client.update_collection_manifest(PREFIX)
+
+    s3.objects[f"{PREFIX}WELL-001/trajectory.json"] = well_body(-500.0, 100.0)   # changed
+    s3.objects[f"{PREFIX}WELL-009/trajectory.json"] = well_body(9000.0, 5000.0)  # added
+    del s3.objects[f"{PREFIX}WELL-004/trajectory.json"]                          # removed
+
+    fresh = S3WellDataAccess(bucket_name="test-bucket", disk_cache=False)
+    fresh.s3_client = s3
+    before = len(s3.calls["get"])
+    result = fresh.update_collection_manifest(PREFIX)
+    fetched = [k for k in s3.calls["get"][before:] if not k.endswith(MANIFEST_FILE_NAME)]
+
+    print(f"Result counts: added={result['added']} updated={result['updated']} "
+          f"removed={result['removed']} unchanged={result['unchanged']}")
+    print(f"Fetched: {fetched}")
+    if (result["added"], result["updated"], result["removed"], result["unchanged"]) != (1, 1, 1, 4):
+        print("❌ Wrong change counts")
+        return False
+    if sorted(fetched) != [f"{PREFIX}WELL-001/trajectory.json", f"{PREFIX}WELL-009/trajectory.json"]:
+        print("❌ Unchanged wells were fetched again")
+        return False
+    names = [w["well_name"] for w in result["manifest"]["wells"]]
+    if "WELL-004" in names or "WELL-009" not in names:
+        print("❌ Manifest not updated")
+        return False
+
+    # Nothing changed: no fetches and no write
+    puts = len(s3.calls["put"])
+    again = fresh.update_collection_manifest(PREFIX)
+    if again["unchanged"] != 6 or len(s3.calls["put"]) != puts:
+        print("❌ Unchanged collection rewrote the manifest")
+        return False
+
+    print("✅ Only changed wells fetched; unchanged collection not rewritten")
+    return True
+
+
+def test_visualize_spatial_prefilter():
+    """visualize_collection_wells builds only wells inside the bounds."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Spatial prefilter in visualize_collection_wells")
+    print("=" * 60)
+
+    from tools import workflow_tools
+    from tools.name_utils import simplify_well_name
+
+    client, s3 = make_client()
+    client.validate_s3_access = lambda: {"success": True}
+    client.update_collection_manifest(PREFIX)
+
+    built = []
+
+    def fake_build(minecraft_coords, well_name, color_scheme):
+        built.append(well_name)
+        return f"Enhanced wellbore '{well_name}' built successfully"
+
+    with patch('tools.s3_data_access.S3WellDataAccess', return_value=client), \
+            patch.object(workflow_tools, 'build_wellbore_in_minecraft_enhanced', side_effect=fake_build), \
+            patch.object(workflow_tools, 'build_drilling_rig', return_value="✅ rig"), \
+            patch.dict(os.environ, {'EDICRAFT_BUILD_JOURNAL': 'false'}):
+        response = workflow_tools.visualize_collection_wells("demo", bounds="1500,4000,3500,6000")
+        invalid = workflow_tools.visualize_collection_wells("demo", bounds="1,2,3")
+
+    print(f"Built: {built}")
+    if sorted(built) != sorted(simplify_well_name(n) for n in ["WELL-002", "WELL-003"]) or "**Total Wells:** 2" not in response:
+        print("❌ Bounds did not limit the build to overlapping wells")
+        return False
+    if "Invalid bounds" not in invalid:
+        print("❌ Malformed bounds not reported")
+        return False
+
+    print("✅ Only wells overlapping the bounds were built")
+    return True
+
+
+def age_manifest(s3, seconds: float):
+    """Move the stored manifest's last check back by seconds."""
+    key = PREFIX + MANIFEST_FILE_NAME
+    manifest = json.loads(s3.objects[key])
+    generated_at = datetime.fromisoformat(manifest["generated_at"]) - timedelta(seconds=seconds)
+    manifest["generated_at"] = generated_at.isoformat()
+    s3.objects[key] = json.dumps(manifest).encode('utf-8')
+
+
+def test_manifest_reconciled_with_s3():
+    """Wells changed after the manifest exists are picked up on refresh, expiry or a failed fetch."""
+    print("\n" + "=" * 60)
+    print("TEST 4: Manifest reconciled with S3")
+    print("=" * 60)
+
+    from tools import workflow_tools
+
+    client, s3 = make_client(4)
+    client.validate_s3_access = lambda: {"success": True}
+    client.update_collection_manifest(PREFIX)
+    client.get_trajectory_data(f"{PREFIX}WELL-001/trajectory.json")
+
+    s3.objects[f"{PREFIX}WELL-007/trajectory.json"] = well_body(7000.0, 5000.0)  # added
+    s3.objects[f"{PREFIX}WELL-001/trajectory.json"] = well_body(-500.0, 100.0)   # replaced
+    del s3.objects[f"{PREFIX}WELL-002/trajectory.json"]                          # removed
+    expected = ["WELL-000", "WELL-001", "WELL-003", "WELL-007"]
+
+    # Within the TTL the manifest is served without a walk
+    list_calls = s3.calls["list"]
+    cached = client.list_collection_wells(PREFIX)
+    if cached["source"] != "manifest" or s3.calls["list"] != list_calls or cached["total_wells"] != 4:
+        print("❌ Fresh manifest not served as a single read")
+        return False
+
+    # Explicit refresh: one walk, only changed wells fetched, manifest rewritten
+    refreshed = client.list_collection_wells(PREFIX, refresh=True)
+    names = [w["well_name"] for w in refreshed["wells"]]
+    print(f"Refreshed: {names} ({refreshed['source']})")
+    if names != expected or s3.calls["list"] != list_calls + 1:
+        print("❌ Refresh did not pick up added and removed wells")
+        return False
+    if refreshed["wells"][1]["surface_location"]["x"] != -500.0 or \
+            client.get_trajectory_data(f"{PREFIX}WELL-001/trajectory.json")["columns"]["x"][0] != -500.0:
+        print("❌ Replaced well summarized or served from the old file")
+        return False
+    if client.list_collection_wells(PREFIX)["total_wells"] != 4 or s3.calls["list"] != list_calls + 1:
+        print("❌ Rewritten manifest not served as a single read")
+        return False
+
+    # Expired manifest: checked on the next listing, and rewritten with a new check time
+    del s3.objects[f"{PREFIX}WELL-007/trajectory.json"]
+    age_manifest(s3, client.manifest_ttl_seconds + 1)
+    puts = len(s3.calls["put"])
+    expired = client.list_collection_wells(PREFIX)
+    if [w["well_name"] for w in expired["wells"]] != expected[:3] or len(s3.calls["put"]) != puts + 1:
+        print("❌ Expired manifest not reconciled")
+        return False
+    age_manifest(s3, client.manifest_ttl_seconds + 1)
+    client.list_collection_wells(PREFIX)
+    if len(s3.calls["put"]) != puts + 2 or client.list_collection_wells(PREFIX)["source"] != "manifest":
+        print("❌ Unchanged expired manifest not renewed")
+        return False
+
+    # A listed well that fails to fetch triggers a check after the build
+    del s3.objects[f"{PREFIX}WELL-003/trajectory.json"]
+    client.clear_cache()
+    built = []
+
+    def fake_build(minecraft_coords, well_name, color_scheme):
+        built.append(well_name)
+        return f"Enhanced wellbore '{well_name}' built successfully"
+
+    with patch('tools.s3_data_access.S3WellDataAccess', return_value=client), \
+            patch.object(workflow_tools, 'build_wellbore_in_minecraft_enhanced', side_effect=fake_build), \
+            patch.object(workflow_tools, 'build_drilling_rig', return_value="✅ rig"), \
+            patch.dict(os.environ, {'EDICRAFT_BUILD_JOURNAL': 'false'}):
+        workflow_tools.visualize_collection_wells("demo", resume=False)
+    after = client.list_collection_wells(PREFIX)
+    print(f"Built: {built}; manifest now {[w['well_name'] for w in after['wells']]}")
+    if len(built) != 2 or [w["well_name"] for w in after["wells"]] != expected[:2]:
+        print("❌ Removed well kept in the manifest after a failed fetch")
+        return False
+
+    # The same for a preload
+    del s3.objects[f"{PREFIX}WELL-001/trajectory.json"]
+    client.clear_cache()
+    preload = client.preload_collection_cache(PREFIX)
+    if preload["failed_count"] != 1 or client.list_collection_wells(PREFIX)["total_wells"] != 1:
+        print("❌ Removed well kept in the manifest after a failed preload")
+        return False
+
+    print("✅ Manifest served as one read; reconciled on refresh, expiry and failed fetches")
+    return True
+
+
+def main():
+    tests = [
+        test_manifest_contents_and_listing,
+        test_incremental_update,
+        test_visualize_spatial_prefilter,
+        test_manifest_reconciled_with_s3,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Test the staged collection build pipeline.
+
+Verifies that fetch and geometry stages run concurrently while the build
+stage stays serialized, that failures skip later stages with a reason, that
+per-stage statistics are reported, and that visualize_collection_wells runs
+end to end on the pipeline (S3 and RCON stubbed out).
+"""
+
+import sys
+import os
+import time
+import threading
+from unittest.mock import patch, MagicMock
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.collection_pipeline import CollectionBuildPipeline, WellBuildError
+from tools.rcon_tool import CommandRateLimiter
+
+
+def test_stages_overlap():
+    """Slow fetches run in parallel; builds never overlap."""
+    print("=" * 60)
+    print("TEST 1: Concurrent fetch, serialized build")
+    print("=" * 60)
+
+    active_builds = []
+    max_active_builds = [0]
+    lock = threading.Lock()
+
+    def fetch(job):
+        time.sleep(0.05)  # S3 latency
+        job['fetched'] = True
+
+    def geometry(job):
+        job['points'] = job['index'] * 2
+
+    def build(job):
+        with lock:
+            active_builds.append(job['index'])
+            max_active_builds[0] = max(max_active_builds[0], len(active_builds))
+        time.sleep(0.005)
+        with lock:
+            active_builds.remove(job['index'])
+
+    pipeline = CollectionBuildPipeline(fetch, geometry, build, fetch_workers=10, geometry_workers=2)
+    results = pipeline.run({'index': i} for i in range(40))
+
+    print(f"Wall time: {pipeline.wall_time:.2f}s (sequential fetch alone would take 2.0s)")
+    if len(results) != 40 or any('error' in job for job in results):
+        print("❌ Not every job completed successfully")
+        return False
+    if pipeline.wall_time >= 1.0:
+        print("❌ Fetch stage did not run concurrently")
+        return False
+    if max_active_builds[0] != 1:
+        print(f"❌ Build stage ran {max_active_builds[0]} builds at once")
+        return False
+
+    print("✅ Fetches overlapped, builds serialized")
+    return True
+
+
+def test_failures_and_stats():
+    """A failing stage records its reason and later stages are skipped."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Failure handling and stage statistics")
+    print("=" * 60)
+
+    built = []
+
+    def fetch(job):
+        if job['index'] % 5 == 0:
+            raise WellBuildError("Data fetch failed: missing object")
+
+    def geometry(job):
+        if job['index'] % 7 == 0:
+            raise ValueError("bad survey")
+
+    def build(job):
+        built.append(job['index'])
+
+    pipeline = CollectionBuildPipeline(fetch, geometry, build, fetch_workers=3, geometry_workers=2)
+    results = pipeline.run({'index': i} for i in range(1, 36))
+    failed = {job['index']: job for job in results if 'error' in job}
+
+    expected_failed = {i for i in range(1, 36) if i % 5 == 0 or i % 7 == 0}
+    if set(failed) != expected_failed or set(built) & expected_failed:
+        print("❌ Failed jobs were built or not reported")
+        return False
+    if failed[5]['failed_stage'] != "fetch" or failed[5]['error'] != "Data fetch failed: missing object":
+        print(f"❌ Unexpected fetch failure record: {failed[5]}")
+        return False
+    if failed[7]['failed_stage'] != "geometry" or failed[7]['error'] != "Unexpected error: bad survey":
+        print(f"❌ Unexpected geometry failure record: {failed[7]}")
+        return False
+
+    stats = {s['stage']: s for s in pipeline.get_stats()}
+    for stage in stats.values():
+        print(f"  {stage}")
+    if stats['fetch']['failed'] != 7 or stats['geometry']['failed'] != 4 or stats['build']['processed'] != 24:
+        print("❌ Stage counters are wrong")
+        return False
+    if stats['fetch']['max_queue_depth'] < 1 or 'throughput_per_second' not in stats['build']:
+        print("❌ Queue depth or throughput missing")
+        return False
+
+    print("✅ Failures reported per stage with correct counters")
+    return True
+
+
+def test_rate_limiter():
+    """The RCON rate limiter spaces commands to the configured rate."""
+    print("\n" + "=" * 60)
+    print("TEST 3: RCON command rate limiter")
+    print("=" * 60)
+
+    limiter = CommandRateLimiter(100, burst=1)
+    start = time.perf_counter()
+    for _ in range(21):
+        limiter.acquire()
+    elapsed = time.perf_counter() - start
+
+    print(f"21 commands at 100/s took {elapsed * 1000:.0f} ms")
+    if elapsed < 0.18:
+        print("❌ Rate limit not enforced")
+        return False
+
+    print("✅ Commands limited to configured rate")
+    return True
+
+
+def test_visualize_collection_end_to_end():
+    """visualize_collection_wells builds every well through the pipeline."""
+    print("\n" + "=" * 60)
+    print("TEST 4: visualize_collection_wells end to end")
+    print("=" * 60)
+
+    from tools import workflow_tools
+
+    wells = [{'well_name': f"WELL-{i:03d}", 's3_key': f"collections/demo/WELL-{i:03d}.json"} for i in range(1, 13)]
+
+    s3_access = MagicMock()
+    s3_access.validate_s3_access.return_value = {'success': True}
+    s3_access.list_collection_wells.return_value = {'success': True, 'wells': wells, 'total_wells': len(wells)}
+
+    def get_trajectory_data(s3_key):
+        if s3_key.endswith("WELL-004.json"):
+            return {'success': False, 'error': "Access denied"}
+        return {
+            'success': True,
+            'data_type': 'coordinates',
+            'coordinates': [{'x': 0.0, 'y': 0.0, 'z': float(-d)} for d in range(0, 300, 30)]
+        }
+
+    s3_access.get_trajectory_data.side_effect = get_trajectory_data
+
+    built_coords = []
+
+    def fake_build(minecraft_coords, well_name, color_scheme):
+        import json
+        built_coords.append(json.loads(minecraft_coords))
+        return f"Enhanced wellbore '{well_name}' built successfully"
+
+    with patch('tools.s3_data_access.S3WellDataAccess', return_value=s3_access), \
+            patch.object(workflow_tools, 'build_wellbore_in_minecraft_enhanced', side_effect=fake_build), \
+            patch.object(workflow_tools, 'build_drilling_rig', return_value="✅ rig"), \
+            patch.dict(os.environ, {'EDICRAFT_BUILD_JOURNAL': 'false'}):
+        response = workflow_tools.visualize_collection_wells("demo", batch_size=4, spacing=50)
+
+    print(response)
+    if "**Successfully Built:** 11" not in response or "WELL-004 (Data fetch failed: Access denied)" not in response:
+        print("❌ Summary does not reflect the pipeline outcome")
+        return False
+    if "**Pipeline Stages:**" not in response:
+        print("❌ Stage statistics missing from summary")
+        return False
+
+    # Wellheads must be offset to distinct grid positions (4x4 grid, spacing 50)
+    wellheads = {(c['wellhead_x'], c['wellhead_z']) for c in built_coords}
+    first_points = {(c['minecraft_coordinates'][0]['x'], c['minecraft_coordinates'][0]['z']) for c in built_coords}
+    if len(wellheads) != 11 or len(first_points) != 11:
+        print("❌ Wells were not offset to distinct grid positions")
+        return False
+
+    print("✅ Collection built through pipeline with grid offsets applied")
+    return True
+
+
+def main():
+    tests = [
+        test_stages_overlap,
+        test_failures_and_stats,
+        test_rate_limiter,
+        test_visualize_collection_end_to_end,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
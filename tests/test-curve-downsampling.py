@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test shape-preserving downsampling of get_curve_data.
+
+Verifies that LTTB and min/max decimation return at most max_points
+samples, keep the first and last samples and isolated spikes, keep every
+curve aligned with DEPT; that the Lambda and the MCP server report the
+total point count and decimation ratio; and that a long log's payload
+shrinks to the requested size.
+"""
+
+import sys
+import os
+import json
+import asyncio
+import importlib.util
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from downsample import downsample_indices
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, format_las
+
+
+def make_curves(samples, seed=1):
+    rng = np.random.default_rng(seed)
+    depth = 1000 + np.arange(samples) * 0.5
+    gr = 60 + np.cumsum(rng.normal(0, 0.5, samples))
+    rhob = 2.4 + 0.05 * np.sin(np.arange(samples) / 200.0)
+    # Single-sample spikes that plain striding would miss
+    spikes = {'GR': int(samples * 0.3) + 7, 'RHOB': int(samples * 0.7) + 3}
+    gr[spikes['GR']] += 400
+    rhob[spikes['RHOB']] -= 1.5
+    return depth, {'GR': gr, 'RHOB': rhob}, spikes
+
+
+def make_spiky_las(samples):
+    depth, curves, _ = make_curves(samples)
+    return format_las(depth, curves, well="W1")
+
+
+def test_indices_keep_shape():
+    """Both methods respect max_points and keep the ends and spikes of every curve."""
+    print("=" * 60)
+    print("TEST 1: Downsampling keeps extremes")
+    print("=" * 60)
+
+    depth, curves, spikes = make_curves(50000)
+    for method in ('lttb', 'minmax'):
+        for max_points in (3, 10, 200, 1000):
+            keep = downsample_indices(depth, [curves['GR'], curves['RHOB']], max_points, method)
+            if len(keep) > max_points or keep[0] != 0 or keep[-1] != len(depth) - 1:
+                print(f"❌ {method}/{max_points}: {len(keep)} points or ends dropped")
+                return False
+            if np.any(np.diff(keep) <= 0):
+                print(f"❌ {method}/{max_points}: indices not strictly increasing")
+                return False
+            if max_points >= 200 and not all(spikes[name] in keep for name in spikes):
+                print(f"❌ {method}/{max_points}: spike lost")
+                return False
+
+    # Nulls do not break either method; an all-null stretch stays visible
+    gr = curves['GR'].copy()
+    gr[10000:20000] = np.nan
+    for method in ('lttb', 'minmax'):
+        keep = downsample_indices(depth, [gr], 500, method)
+        if len(keep) > 500 or not np.any((keep >= 10000) & (keep < 20000)):
+            print(f"❌ {method}: null stretch handled incorrectly")
+            return False
+
+    short = downsample_indices(depth[:50], [curves['GR'][:50]], 200)
+    if list(short) != list(range(50)):
+        print("❌ Short curve was not returned unchanged")
+        return False
+
+    print("✅ At most max_points, ends and spikes kept for lttb and minmax")
+    return True
+
+
+def test_lambda_get_curve_data():
+    """The Lambda returns aligned, decimated curves and reports the ratio."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Lambda get_curve_data with max_points")
+    print("=" * 60)
+
+    handler.s3_client = FakeS3({"global/well-data/W1.las": make_spiky_las(20000)})
+    handler.well_cache = WellCache(max_bytes=0, tmp_max_bytes=0)
+
+    def call(**parameters):
+        return handler.handler({'tool': 'get_curve_data',
+                                'parameters': {'well_name': 'W1', 'curves': ['GR', 'RHOB'], **parameters}}, None)
+
+    full = call()
+    reduced = call(max_points=500)
+    ranged = call(max_points=500, downsample_method='minmax', depth_start=2000, depth_end=6000)
+    if not (full['success'] and reduced['success'] and ranged['success']):
+        print("❌ get_curve_data failed")
+        return False
+
+    full_curves = full['artifacts'][0]['results']['curves']
+    results = reduced['artifacts'][0]['results']
+    curves = results['curves']
+    position = {d: i for i, d in enumerate(full_curves['DEPT'])}
+    for i, d in enumerate(curves['DEPT']):
+        j = position[d]
+        if curves['GR'][i] != full_curves['GR'][j] or curves['RHOB'][i] != full_curves['RHOB'][j]:
+            print("❌ Curves not aligned with DEPT")
+            return False
+    if results['point_count'] > 500 or results['total_points'] != 20000 \
+            or results['decimation_ratio'] != 20000 / results['point_count']:
+        print(f"❌ Wrong point counts: {results['point_count']}, {results['total_points']}")
+        return False
+    if max(curves['GR']) != max(full_curves['GR']) or min(curves['RHOB']) != min(full_curves['RHOB']):
+        print("❌ Spikes lost")
+        return False
+
+    if 'total_points' in full['artifacts'][0]['results']:
+        print("❌ Response changed without max_points")
+        return False
+    untouched = call(max_points=50000)['artifacts'][0]['results']
+    if untouched['curves'] != full_curves or untouched['downsampling']['method'] != 'none':
+        print("❌ Short request was altered")
+        return False
+    for bad in ({'max_points': 2}, {'max_points': 'many'}, {'max_points': 100, 'downsample_method': 'stride'}):
+        if call(**bad)['success']:
+            print(f"❌ Invalid parameters accepted: {bad}")
+            return False
+
+    full_size = len(json.dumps(full))
+    reduced_size = len(json.dumps(reduced))
+    print(f"Payload: {full_size} -> {reduced_size} bytes, ratio {results['decimation_ratio']:.1f}")
+    if reduced_size * 20 > full_size:
+        print("❌ Payload not reduced")
+        return False
+
+    print("✅ Aligned decimated curves, extremes kept, invalid parameters rejected")
+    return True
+
+
+def test_mcp_get_curve_data():
+    """The MCP server downsamples get_curve_data the same way."""
+    print("\n" + "=" * 60)
+    print("TEST 3: MCP server get_curve_data with max_points")
+    print("=" * 60)
+
+    spec = importlib.util.spec_from_file_location("mcp_well_data_server_downsampling",
+                                                  os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server._data_loaded = True
+    server.WELL_DATA['W1'] = server.LASParser.from_string(make_spiky_las(20000), "W1.las")
+
+    def call(**arguments):
+        content = asyncio.run(server.call_tool("get_curve_data", {"well_name": "W1", "curves": ["GR", "RHOB"],
+                                                                  **arguments}))
+        return json.loads(content[0].text)
+
+    full = call()
+    reduced = call(max_points=400, downsample_method='minmax')
+    if len(reduced['depths']) > 400 or len(reduced['GR']) != len(reduced['depths']) \
+            or reduced['total_points'] != 20000:
+        print(f"❌ Wrong point counts: {len(reduced['depths'])}")
+        return False
+    position = {d: i for i, d in enumerate(full['depths'])}
+    if any(reduced['RHOB'][i] != full['RHOB'][position[d]] for i, d in enumerate(reduced['depths'])):
+        print("❌ Curves not aligned with depths")
+        return False
+    if max(reduced['GR']) != max(full['GR']) or min(reduced['RHOB']) != min(full['RHOB']):
+        print("❌ Spikes lost")
+        return False
+    if 'error' not in call(max_points=1):
+        print("❌ Invalid max_points accepted")
+        return False
+
+    print(f"✅ {reduced['total_points']} samples -> {len(reduced['depths'])}, "
+          f"ratio {reduced['decimation_ratio']:.1f}")
+    return True
+
+
+def main():
+    tests = [
+        test_indices_keep_shape,
+        test_lambda_get_curve_data,
+        test_mcp_get_curve_data,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test the shared single-pass curve statistics.
+
+Verifies that StreamingStats gives the same count, mean, variance,
+skewness and extremes as numpy/scipy whether values arrive at once, in
+depth chunks or merged across wells; that partition-based quantiles equal
+the sorted-list results the tools used before; that the KLL sketch stays
+within its rank-error bound when merged across wells; and that curve
+statistics on a long log are faster than the sort-based version.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+from scipy import stats as scipy_stats
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from curve_stats import StreamingStats, QuantileSketch, order_statistics, median
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, format_las
+
+
+def close(a, b, rel=1e-9):
+    return abs(a - b) <= rel * max(1.0, abs(a), abs(b))
+
+
+def test_streaming_moments():
+    """One-pass moments match numpy/scipy, in chunks and merged."""
+    print("=" * 60)
+    print("TEST 1: Streaming moments")
+    print("=" * 60)
+
+    rng = np.random.default_rng(42)
+    for trial in range(50):
+        values = rng.gamma(2.0, 30.0, int(rng.integers(1, 5000))) + rng.uniform(-1e3, 1e3)
+        expected = (len(values), values.mean(), values.var(), scipy_stats.skew(values) if len(values) > 1 else 0.0,
+                    values.min(), values.max())
+
+        whole = StreamingStats.of(values)
+        chunked = StreamingStats()
+        for chunk in np.array_split(values, int(rng.integers(1, 20))):
+            chunked.update(chunk)
+        parts = np.array_split(values, 3)
+        merged = StreamingStats.of(parts[0]).merge(StreamingStats.of(parts[1]).merge(StreamingStats.of(parts[2])))
+
+        for label, acc in (("whole", whole), ("chunked", chunked), ("merged", merged)):
+            got = (acc.count, acc.mean, acc.variance, acc.skewness, acc.min, acc.max)
+            if got[0] != expected[0] or not all(close(g, e, 1e-7) for g, e in zip(got[1:], expected[1:])):
+                print(f"❌ {label} moments differ (trial {trial}): {got} vs {expected}")
+                return False
+
+    with_nan = StreamingStats.of([1.0, np.nan, 3.0])
+    if with_nan.count != 2 or with_nan.mean != 2.0 or StreamingStats().to_dict() != {'count': 0}:
+        print("❌ NaN or empty input handled incorrectly")
+        return False
+    if StreamingStats.of([5.0] * 10).skewness != 0.0:
+        print("❌ Constant data skewness not 0")
+        return False
+
+    print("✅ Whole, chunked and merged accumulators agree with numpy/scipy")
+    return True
+
+
+def test_exact_quantiles_match_sorting():
+    """Partition-based median and quartiles equal the sorted-list versions."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Exact quantiles")
+    print("=" * 60)
+
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        values = np.round(rng.normal(80, 25, int(rng.integers(1, 400))), 1)  # ties included
+        ordered = sorted(values.tolist())
+        n = len(ordered)
+        expected_median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+        if median(values) != expected_median:
+            print("❌ Median differs from the sorted list")
+            return False
+        if order_statistics(values, [n // 4, 3 * n // 4]) != [ordered[n // 4], ordered[3 * n // 4]]:
+            print("❌ Quartiles differ from the sorted list")
+            return False
+
+    # The quality assessment still flags the same outliers
+    values = np.concatenate([rng.normal(60, 10, 3000), [400.0, -200.0, 250.0], np.full(30, np.nan)])
+    result = handler.assess_curve_quality_impl('GR', values, np.arange(len(values)))
+    valid = sorted(v for v in values.tolist() if v == v)
+    q1, q3 = valid[len(valid) // 4], valid[3 * len(valid) // 4]
+    legacy_outliers = sum(1 for v in valid if v < q1 - 1.5 * (q3 - q1) or v > q3 + 1.5 * (q3 - q1)) / len(valid)
+    if result['outlier_percentage'] != legacy_outliers or result['statistics']['count'] != len(valid):
+        print(f"❌ Outlier percentage {result['outlier_percentage']} != {legacy_outliers}")
+        return False
+
+    print("✅ Median, quartiles and outlier counts identical to the sort-based code")
+    return True
+
+
+def test_sketch_merges_across_wells():
+    """Merged sketches stay within the rank-error bound; multi-well stats combine exactly."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Mergeable quantile sketch")
+    print("=" * 60)
+
+    rng = np.random.default_rng(3)
+    wells = [rng.lognormal(rng.uniform(1, 4), 0.6, int(rng.integers(20000, 80000))) for _ in range(20)]
+    merged = QuantileSketch()
+    for values in wells:
+        merged.merge(QuantileSketch(seed=None).update(values))
+    everything = np.sort(np.concatenate(wells))
+    qs = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    errors = [abs(np.searchsorted(everything, v) / len(everything) - q) for q, v in zip(qs, merged.quantiles(qs))]
+    stored = sum(len(level) for level in merged.levels)
+    print(f"{len(everything)} values in {stored} sketch items; max rank error {max(errors):.4f}")
+    if merged.count != len(everything) or max(errors) > 0.01 or stored > 2000:
+        print("❌ Sketch error or size out of bounds")
+        return False
+
+    # Multi-well calculate_statistics reports field-wide combined statistics
+    names = [f"W{i}" for i in range(6)]
+    curves = [rng.normal(70 + 10 * i, 15, 3000) for i in range(6)]
+    objects = {f"global/well-data/{name}.las": format_las(1000 + np.arange(len(gr)) * 0.5, {'GR': gr}, decimals=6)
+               for name, gr in zip(names, curves)}
+    handler.s3_client = FakeS3(objects)
+    handler.well_cache = WellCache(max_bytes=0, tmp_max_bytes=0)
+    response = handler.handler({'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'}, 'wells': names}, None)
+    combined = response['artifacts'][0]['results']['combined']
+    field = np.round(np.concatenate(curves), 6)
+    if combined['count'] != len(field) or not close(combined['mean'], field.mean(), 1e-12) \
+            or not close(combined['std_dev'], field.std(), 1e-9):
+        print(f"❌ Combined statistics differ: {combined}")
+        return False
+    if abs(np.searchsorted(np.sort(field), combined['p50']) / len(field) - 0.5) > 0.01:
+        print("❌ Combined median outside the sketch bound")
+        return False
+
+    print(f"✅ Rank error within 1%; field mean {combined['mean']:.3f} over {combined['count']} samples")
+    return True
+
+
+def test_benchmark_long_curve():
+    """Statistics on a long curve are faster than the multi-pass, sort-based version."""
+    print("\n" + "=" * 60)
+    print("TEST 4: Benchmark (1M samples)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(11)
+    curve = rng.normal(75, 20, 1000000)
+    curve[::50] = np.nan
+
+    start = time.perf_counter()
+    valid = curve[~np.isnan(curve)]
+    summary = StreamingStats.of(valid)
+    streaming_median = median(valid)
+    streaming = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = [v for v in curve.tolist() if v == v]
+    mean_val = sum(data) / len(data)
+    ordered = sorted(data)
+    legacy_median = (ordered[len(ordered) // 2 - 1] + ordered[len(ordered) // 2]) / 2
+    variance = sum((x - mean_val) ** 2 for x in data) / len(data)
+    min(data), max(data)
+    legacy = time.perf_counter() - start
+
+    print(f"  Streaming + partition: {streaming * 1000:.1f} ms")
+    print(f"  Passes + sorted():     {legacy * 1000:.0f} ms")
+    if streaming_median != legacy_median or not close(summary.variance, variance) or streaming * 10 > legacy:
+        print("❌ Results differ or not clearly faster")
+        return False
+
+    print(f"✅ {legacy / streaming:.0f}x faster with the same median")
+    return True
+
+
+def main():
+    tests = [
+        test_streaming_moments,
+        test_exact_quantiles_match_sorting,
+        test_sketch_merges_across_wells,
+        test_benchmark_long_curve,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
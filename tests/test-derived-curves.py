@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Test persisted derived curves.
+
+Verifies that derived-curve objects round-trip exactly and are keyed by
+well, method and a canonical parameter hash next to the source log; that
+the petrophysics Lambda reuses porosity, shale volume and saturation curves
+in a warm container without S3 traffic; that only results slower than the
+cost threshold are stored and later read instead of recomputed; that a
+changed LAS object or parameter set is recomputed; that the memory tier
+stays within its byte budget; and that the MCP server stores and reuses its
+results, including with the default settings.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import importlib.util
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from derived_curves import DerivedCurveStore, decode_derived, derived_key, encode_derived, parameter_hash
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, make_las
+
+DERIVED_PREFIX = 'global/well-data-derived/'
+LAS_CURVES = ('GR', 'RHOB', 'NPHI', 'RT')
+
+LAS_KEY = "global/well-data/W1.las"
+
+
+def test_format_and_keys():
+    """Derived objects round-trip exactly; keys depend on canonical parameters."""
+    print("=" * 60)
+    print("TEST 1: Derived curve format and keys")
+    print("=" * 60)
+
+    values = np.array([0.1, np.nan, 0.2500000000000001, 0.0, 1.0])
+    result = {'values': values, 'depths': [1000, 1000.5, 1001, 1001.5, 1002],
+              'methodology': 'phi = f(RHOB)', 'statistics': {'mean': float('nan'), 'count': 4}}
+    raw = encode_derived(result, LAS_KEY, '"abc"', 'porosity_density', {'matrix_density': 2.65})
+    header, decoded = decode_derived(raw)
+    if not np.array_equal(decoded['values'], values, equal_nan=True) or decoded['depths'].tolist() != result['depths']:
+        print("❌ Curves changed in the round trip")
+        return False
+    if decoded['methodology'] != result['methodology'] or decoded['statistics']['count'] != 4 \
+            or header['source_etag'] != '"abc"' or header['source_key'] != LAS_KEY:
+        print("❌ Header or scalar results changed in the round trip")
+        return False
+
+    key = derived_key(LAS_KEY, 'porosity_density', {'matrix_density': 2.65, 'fluid_density': 1})
+    if not key.startswith("global/well-data-derived/W1.las/porosity_density-") \
+            or key != derived_key(LAS_KEY, 'porosity_density', {'fluid_density': 1.0, 'matrix_density': 2.65}) \
+            or parameter_hash({'rw': 0.1}) == parameter_hash({'rw': 0.11}):
+        print(f"❌ Unexpected key or parameter hash: {key}")
+        return False
+    try:
+        decode_derived(b"not a derived curve at all")
+        print("❌ Invalid bytes accepted")
+        return False
+    except ValueError:
+        pass
+
+    print(f"✅ Exact round trip; key {key.split('/')[-1]}")
+    return True
+
+
+ANALYSIS = [
+    {'tool': 'calculate_porosity', 'parameters': {'method': 'density', 'matrix_density': 2.71}},
+    {'tool': 'calculate_shale_volume', 'parameters': {'method': 'larionov_tertiary'}},
+    {'tool': 'calculate_saturation', 'parameters': {'rw': 0.05}},
+]
+
+
+def derived_calls(s3):
+    return [key for _, key, _ in s3.calls if key.startswith(DERIVED_PREFIX)]
+
+
+def test_lambda_memory_tier():
+    """The shipped Lambda store reuses curves in a warm container and never sends them to S3."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Lambda keeps derived curves in memory")
+    print("=" * 60)
+
+    s3 = FakeS3()
+    s3.put_object(Bucket="b", Key=LAS_KEY, Body=make_las(3000, curves=LAS_CURVES, seed=44))
+    event = {'operations': ANALYSIS, 'parameters': {'well_name': 'W1'}}
+    handler.s3_client = s3
+    handler.well_cache = WellCache(max_bytes=0, tmp_max_bytes=0)
+    store = handler.derived_store
+    store.clear()
+    before = store.get_stats()
+
+    first = handler.handler(event, None)
+    with patch.object(handler, 'density_porosity', side_effect=AssertionError("recomputed")), \
+            patch.object(handler, 'archie_saturation', side_effect=AssertionError("recomputed")), \
+            patch.object(handler, 'shale_volume', side_effect=AssertionError("recomputed")):
+        repeat = handler.handler(event, None)
+    stats = store.get_stats()
+    print(f"Warm rerun: {stats}")
+    # Porosity for the porosity tool, shale volume, and porosity + Sw for saturation
+    if not first['success'] or repeat != first or stats['computed'] - before['computed'] != 4 \
+            or stats['memory_hits'] - before['memory_hits'] != 4:
+        print("❌ Warm rerun did not reuse the computed curves")
+        return False
+    if derived_calls(s3) or store.persist:
+        print(f"❌ Derived curves went through S3: {derived_calls(s3)}")
+        return False
+
+    # A new version of the log, or other parameters, are computed again
+    s3.put_object(Bucket="b", Key=LAS_KEY, Body=make_las(3000, curves=LAS_CURVES, seed=45))
+    third = handler.handler(event, None)
+    handler.handler({'tool': 'calculate_porosity', 'parameters': {'well_name': 'W1', 'matrix_density': 2.6}}, None)
+    if third == first or store.get_stats()['computed'] - stats['computed'] != 5 or derived_calls(s3):
+        print(f"❌ Changed log or parameters not recomputed: {store.get_stats()}")
+        return False
+
+    print("✅ Curves reused in the warm container; no derived-curve S3 traffic")
+    return True
+
+
+def test_store_threshold_and_memory_bound():
+    """With default settings only slow results are stored and reused; memory is bounded by bytes."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Stored results, cost threshold and memory bound")
+    print("=" * 60)
+
+    s3 = FakeS3()
+    store = DerivedCurveStore()
+    values = np.linspace(0.0, 0.3, 500)
+
+    def slow():
+        time.sleep(store.min_compute_seconds)
+        return {'values': values}
+
+    def fast():
+        return {'values': values}
+
+    def recompute():
+        raise AssertionError("recomputed")
+
+    store.fetch(s3, "b", LAS_KEY, '"e1"', "slow_method", {'i': 0}, slow)
+    store.fetch(s3, "b", LAS_KEY, '"e1"', "fast_method", {'i': 0}, fast)
+    store.fetch(s3, "b", LAS_KEY, '"e1"', "fast_method", {'i': 1}, fast)
+    store.flush()
+    gets = s3.get_requests()
+    print(f"Default store: {store.get_stats()}, {gets} derived GETs")
+    # The fast method is read once, until it is measured cheap, and never written
+    if s3.keys(DERIVED_PREFIX) != [derived_key(LAS_KEY, "slow_method", {'i': 0})] or gets != 2:
+        print(f"❌ Wrong results stored: {s3.keys(DERIVED_PREFIX)}")
+        return False
+
+    cold = DerivedCurveStore()
+    stored = cold.fetch(s3, "b", LAS_KEY, '"e1"', "slow_method", {'i': 0}, recompute)
+    if cold.stored_hits != 1 or not np.array_equal(stored['values'], values):
+        print("❌ Stored result not reused by a cold store")
+        return False
+    if cold.fetch(s3, "b", LAS_KEY, '"e2"', "slow_method", {'i': 0}, slow) is None or cold.stale != 1:
+        print("❌ Result of another log version reused")
+        return False
+
+    # Read-only bucket: results are still computed
+    writes = store.writes
+    with patch.object(s3, 'put_object', side_effect=PermissionError("AccessDenied")):
+        denied = store.fetch(s3, "b", LAS_KEY, '"e1"', "slow_method", {'i': 2}, slow)
+        store.flush()
+    if not np.array_equal(denied['values'], values) or store.writes != writes:
+        print("❌ Failed write broke the fetch")
+        return False
+
+    samples = 1_000_000
+    store = DerivedCurveStore(max_bytes=3 * samples * 8, persist=False)
+    for i in range(6):
+        store.fetch(s3, "b", LAS_KEY, '"e"', "porosity_density", {'i': i}, lambda: {'values': np.zeros(samples)})
+    stats = store.get_stats()
+    print(f"1M-sample curves: {stats}")
+    if stats['entries'] != 3 or stats['bytes'] > stats['max_bytes'] or stats['evictions'] != 3:
+        print("❌ Memory tier exceeded its byte budget")
+        return False
+    store.fetch(s3, "b", LAS_KEY, '"e"', "porosity_density", {'i': 9}, lambda: {'values': np.zeros(4 * samples)})
+    if store.get_stats()['entries'] != 3:
+        print("❌ Result larger than the budget was kept")
+        return False
+
+    print("✅ Only slow results stored and reused; memory bounded by bytes")
+    return True
+
+
+def test_mcp_server_reuses_stored_results():
+    """The MCP server stores calculation results and reuses them while the log is unchanged."""
+    print("\n" + "=" * 60)
+    print("TEST 4: MCP server derived curves")
+    print("=" * 60)
+
+    spec = importlib.util.spec_from_file_location("mcp_well_data_server_derived",
+                                                  os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    s3 = FakeS3()
+    s3.put_object(Bucket="b", Key=server.S3_PREFIX + "W1.las", Body=make_las(1500, curves=LAS_CURVES, seed=44))
+    server.s3_client = s3
+    server._data_loaded = True
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        server.load_well_data()
+
+    calls = [
+        ("calculate_porosity", {"well_name": "W1", "method": "effective", "depth_start": 1100, "depth_end": 1500}),
+        ("calculate_shale_volume", {"well_name": "W1", "method": "clavier"}),
+        ("calculate_saturation", {"well_name": "W1", "method": "archie", "parameters": {"rw": 0.04}}),
+    ]
+
+    def run():
+        return [json.loads(asyncio.run(server.call_tool(name, args))[0].text) for name, args in calls]
+
+    server.derived_store = DerivedCurveStore(min_compute_seconds=0)
+    first = run()
+    server.derived_store.flush()
+    if any('error' in r for r in first) or len(s3.keys(DERIVED_PREFIX)) != 4:
+        print(f"❌ Results not stored: {s3.keys(DERIVED_PREFIX)}")
+        return False
+
+    server.derived_store = DerivedCurveStore(min_compute_seconds=0)
+    server.tool_results.clear()
+    with patch.object(server.porosity_calc, 'calculate_porosity', side_effect=AssertionError("recomputed")), \
+            patch.object(server.saturation_calc, 'calculate_saturation', side_effect=AssertionError("recomputed")):
+        second = run()
+    if second != first or server.derived_store.stored_hits != 4:
+        print(f"❌ Stored results not reused: {server.derived_store.get_stats()}")
+        return False
+
+    # Local wells have no ETag: always computed, never stored
+    local = server.LASParser.from_string(make_las(200, curves=LAS_CURVES, seed=44), "LOCAL.las")
+    server.WELL_DATA['LOCAL'] = local
+    asyncio.run(server.call_tool("calculate_shale_volume", {"well_name": "LOCAL", "method": "linear"}))
+    server.derived_store.flush()
+    if len(s3.keys(DERIVED_PREFIX)) != 4:
+        print("❌ Local well result was stored")
+        return False
+
+    print(f"✅ {len(first)} MCP results reused from storage: {server.derived_store.get_stats()}")
+    return True
+
+
+def test_mcp_server_default_store():
+    """With the shipped settings the MCP server stores its slow calculations on long logs."""
+    print("\n" + "=" * 60)
+    print("TEST 5: MCP server default store")
+    print("=" * 60)
+
+    spec = importlib.util.spec_from_file_location("mcp_well_data_server_derived_default",
+                                                  os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    s3 = FakeS3()
+    s3.put_object(Bucket="b", Key=server.S3_PREFIX + "W1.las", Body=make_las(100_000, curves=LAS_CURVES, seed=44))
+    server.s3_client = s3
+    server._data_loaded = True
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        server.load_well_data()
+
+    calls = [
+        ("calculate_shale_volume", {"well_name": "W1", "method": "clavier"}),
+        ("calculate_saturation", {"well_name": "W1", "method": "archie", "parameters": {"rw": 0.04}}),
+    ]
+
+    def run():
+        return [json.loads(asyncio.run(server.call_tool(name, args))[0].text) for name, args in calls]
+
+    first = run()
+    server.derived_store.flush()
+    stats = server.derived_store.get_stats()
+    print(f"First run: {stats}")
+    if any('error' in r for r in first) or stats['writes'] == 0 or len(s3.keys(DERIVED_PREFIX)) != stats['writes']:
+        print(f"❌ Slow results not stored: {s3.keys(DERIVED_PREFIX)}")
+        return False
+
+    # A restarted server reads them back
+    server.derived_store = DerivedCurveStore()
+    server.tool_results.clear()
+    second = run()
+    print(f"Restarted: {server.derived_store.get_stats()}")
+    if second != first or server.derived_store.stored_hits == 0:
+        print("❌ Stored results not reused after a restart")
+        return False
+
+    print(f"✅ {stats['writes']} slow MCP results stored with the default threshold")
+    return True
+
+
+def main():
+    tests = [
+        test_format_and_keys,
+        test_lambda_memory_tier,
+        test_store_threshold_and_memory_bound,
+        test_mcp_server_reuses_stored_results,
+        test_mcp_server_default_store,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test the local binary horizon cache.
+
+Verifies that cached horizon points round-trip exactly and reproduce the
+parse_horizon_file output, that arrays are memory-mapped on reuse, that
+heightmaps are keyed per transform, and that the cache stays under its byte
+budget with least-recently-used eviction.
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+import numpy as np
+
+from tools.horizon_cache import HorizonCache
+from tools.horizon_tools import (
+    parse_horizon_file,
+    parse_horizon_points,
+    horizon_points_to_json,
+    convert_horizon_to_minecraft,
+    horizon_heightmap_to_json,
+)
+
+HORIZON_ID = "osdu:work-product-component--SeismicHorizon:test-horizon"
+
+
+def synthetic_horizon_file(rows: int) -> str:
+    """Horizon file in the OSDU CSV layout: header comments then id,line,x,y,z."""
+    lines = ["# Synthetic horizon", "# point_id,line_number,x,y,z"]
+    for i in range(rows):
+        x = 500000.0 + (i % 300) * 12.5
+        y = 6200000.0 + (i // 300) * 12.5
+        z = -2000.0 + 15.0 * np.sin(i / 37.0)
+        lines.append(f"{i},{i // 300},{x:.2f},{y:.2f},{z:.4f}")
+    return "\n".join(lines)
+
+
+def test_points_round_trip():
+    """Cached points reproduce parse_horizon_file output exactly."""
+    print("=" * 60)
+    print("TEST 1: Points round trip")
+    print("=" * 60)
+
+    content = synthetic_horizon_file(2500)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HorizonCache(cache_dir=cache_dir)
+        points = parse_horizon_points(content)
+        cache.put_points(HORIZON_ID, 1, points)
+
+        cached = cache.get_points(HORIZON_ID, 1)
+        if cached is None or not isinstance(cached, np.memmap):
+            print("❌ Cached points were not memory-mapped")
+            return False
+        if not np.array_equal(cached, points):
+            print("❌ Cached points differ from parsed points")
+            return False
+        if horizon_points_to_json(cached) != parse_horizon_file(content):
+            print("❌ Cached JSON differs from parse_horizon_file output")
+            return False
+        if cache.get_points(HORIZON_ID, 2) is not None:
+            print("❌ A different version should miss")
+            return False
+
+        stats = cache.get_stats()
+        print(f"Stats: {stats}")
+        if stats["hits"] != 1 or stats["misses"] != 1 or stats["horizons"] != 1:
+            print("❌ Unexpected cache statistics")
+            return False
+
+    print("✅ Points round-trip and match parse_horizon_file")
+    return True
+
+
+def test_heightmap_per_transform():
+    """Heightmaps are stored per transform and rebuild the conversion output."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Heightmap per transform")
+    print("=" * 60)
+
+    parsed = parse_horizon_file(synthetic_horizon_file(600))
+    transform = {"sample_rate": 10, "base_x": 0, "base_y": 100, "base_z": 0}
+    converted = convert_horizon_to_minecraft(parsed, **transform)
+    coords = json.loads(converted)["minecraft_coordinates"]
+    heightmap = [[p["x"], p["y"], p["z"], p["original_x"], p["original_y"], p["original_z"]] for p in coords]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HorizonCache(cache_dir=cache_dir)
+        cache.put_heightmap(HORIZON_ID, 1, transform, heightmap)
+
+        cached = cache.get_heightmap(HORIZON_ID, 1, transform)
+        if cached is None or json.loads(horizon_heightmap_to_json(cached)) != json.loads(converted):
+            print("❌ Cached heightmap does not reproduce convert_horizon_to_minecraft output")
+            return False
+        if cache.get_heightmap(HORIZON_ID, 1, dict(transform, sample_rate=5)) is not None:
+            print("❌ A different transform should miss")
+            return False
+
+    print(f"✅ Heightmap with {len(coords)} points reproduced from cache")
+    return True
+
+
+def test_lru_eviction():
+    """The cache directory stays under max_bytes, evicting least recently used first."""
+    print("\n" + "=" * 60)
+    print("TEST 3: LRU eviction under byte budget")
+    print("=" * 60)
+
+    points = np.random.default_rng(0).random((1000, 5))  # ~40 KB per entry
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HorizonCache(cache_dir=cache_dir, max_bytes=100_000)
+        cache.put_points("horizon-a", 1, points)
+        cache.put_points("horizon-b", 1, points)
+
+        # Make A the most recently used entry before adding C
+        os.utime(cache._points_path("horizon-a", 1), (time.time() - 100, time.time() - 100))
+        os.utime(cache._points_path("horizon-b", 1), (time.time() - 200, time.time() - 200))
+        cache.get_points("horizon-a", 1)
+        cache.put_points("horizon-c", 1, points)
+
+        stats = cache.get_stats()
+        print(f"Stats: {stats}")
+        if stats["total_bytes"] > cache.max_bytes:
+            print("❌ Cache exceeds its byte budget")
+            return False
+        if cache.get_points("horizon-b", 1) is not None:
+            print("❌ Least recently used entry was not evicted")
+            return False
+        if os.path.exists(cache._meta_path("horizon-b", 1)):
+            print("❌ Evicted entry left its sidecar behind")
+            return False
+        if cache.get_points("horizon-a", 1) is None or cache.get_points("horizon-c", 1) is None:
+            print("❌ Recently used entries were evicted")
+            return False
+
+    print("✅ Least recently used horizon evicted, budget respected")
+    return True
+
+
+def test_reload_speed():
+    """Reloading a cached horizon is far cheaper than re-parsing it."""
+    print("\n" + "=" * 60)
+    print("TEST 4: Cached reload speed")
+    print("=" * 60)
+
+    content = synthetic_horizon_file(200_000)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HorizonCache(cache_dir=cache_dir)
+
+        start = time.perf_counter()
+        points = parse_horizon_points(content)
+        parse_time = time.perf_counter() - start
+        cache.put_points(HORIZON_ID, 1, points)
+
+        start = time.perf_counter()
+        cached = cache.get_points(HORIZON_ID, 1)
+        load_time = time.perf_counter() - start
+
+        print(f"Parse: {parse_time * 1000:.1f} ms, cached load: {load_time * 1000:.2f} ms")
+        if cached is None or cached.shape != points.shape or load_time >= parse_time:
+            print("❌ Cached load is not faster than parsing")
+            return False
+
+    print("✅ Cached horizon reloads faster than parsing")
+    return True
+
+
+def main():
+    tests = [
+        test_points_round_trip,
+        test_heightmap_per_transform,
+        test_lru_eviction,
+        test_reload_speed,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test vectorized horizon surface generation.
+
+Verifies that build_horizon_surface produces the same commands as the original
+per-cell loop, that large grids build quickly, and that the scattered (griddata)
+interpolation modes work.
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.surface_tools import build_horizon_surface, interpolate_surface_height
+
+
+def reference_surface_commands(corner_points: str, block_type: str = "sandstone") -> str:
+    """Original cell-by-cell implementation, used as the expected output."""
+    points = json.loads(corner_points)
+    coords = [(p["x"], p["y"], p["z"]) for p in points]
+    min_x = min(c[0] for c in coords)
+    max_x = max(c[0] for c in coords)
+    min_z = min(c[2] for c in coords)
+    max_z = max(c[2] for c in coords)
+
+    surface_points = []
+    for x in range(min_x, max_x + 1):
+        for z in range(min_z, max_z + 1):
+            y = interpolate_surface_height(x, z, coords)
+            surface_points.append((x, round(y), z))
+
+    layers = {}
+    for x, y, z in surface_points:
+        layers.setdefault(y, []).append((x, z))
+
+    commands = [f"# Building horizon surface with {len(surface_points)} blocks using {block_type}"]
+    commands.append(f"fill {min_x} {min(layers)} {min_z} {max_x} {max(layers)} {max_z} air")
+    for y in sorted(layers):
+        layer_points = layers[y]
+        x_coords = [p[0] for p in layer_points]
+        z_coords = [p[1] for p in layer_points]
+        if len(layer_points) > 1:
+            commands.append(f"fill {min(x_coords)} {y} {min(z_coords)} {max(x_coords)} {y} {max(z_coords)} {block_type}")
+        else:
+            x, z = layer_points[0]
+            commands.append(f"setblock {x} {y} {z} {block_type}")
+    commands.append("say Horizon surface completed!")
+    return "\n".join(commands)
+
+
+def corners(x0, x1, z0, z1, ys):
+    return json.dumps([
+        {"x": x0, "y": ys[0], "z": z0},
+        {"x": x1, "y": ys[1], "z": z0},
+        {"x": x0, "y": ys[2], "z": z1},
+        {"x": x1, "y": ys[3], "z": z1},
+    ])
+
+
+def test_matches_reference():
+    """Vectorized output must match the original loop exactly."""
+    print("=" * 60)
+    print("TEST 1: Output matches original implementation")
+    print("=" * 60)
+
+    cases = [
+        corners(0, 40, 0, 30, [30, 45, 38, 60]),
+        corners(-20, 20, 5, 17, [100, 100, 100, 100]),
+        corners(3, 3, 0, 10, [10, 20, 30, 40]),      # degenerate X
+        corners(0, 1, 0, 1, [10, 11, 12, 13]),       # tiny grid with single-block layers
+        corners(-15, 33, -8, 41, [64, 71.5, 58.25, 90]),
+    ]
+
+    for i, case in enumerate(cases):
+        expected = reference_surface_commands(case)
+        actual = build_horizon_surface(case)
+        if actual != expected:
+            print(f"❌ Case {i + 1} differs from reference")
+            return False
+        print(f"✅ Case {i + 1}: {len(actual.splitlines())} commands match")
+
+    return True
+
+
+def test_large_grid_performance():
+    """A large survey grid should build well under a second."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Large grid performance")
+    print("=" * 60)
+
+    case = corners(0, 1499, 0, 1499, [20, 80, 55, 140])
+    start = time.perf_counter()
+    result = build_horizon_surface(case)
+    elapsed = time.perf_counter() - start
+
+    print(f"Built 1500x1500 grid ({len(result.splitlines())} commands) in {elapsed * 1000:.0f} ms")
+    if result.startswith("Error") or elapsed >= 1.0:
+        print("❌ Large grid too slow or failed")
+        return False
+    print("✅ Large grid processed in under a second")
+    return True
+
+
+def test_scattered_interpolation():
+    """Scattered mode accepts arbitrary point sets and fills the bounding box."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Scattered interpolation (griddata)")
+    print("=" * 60)
+
+    try:
+        import scipy  # noqa: F401
+    except ImportError:
+        print("⚠️ scipy not installed - skipping")
+        return True
+
+    points = json.dumps([
+        {"x": 0, "y": 40, "z": 0},
+        {"x": 50, "y": 60, "z": 5},
+        {"x": 10, "y": 45, "z": 40},
+        {"x": 45, "y": 70, "z": 35},
+        {"x": 25, "y": 52, "z": 20},
+    ])
+
+    for method in ("linear", "nearest", "cubic"):
+        result = build_horizon_surface(points, method=method)
+        if result.startswith("Error"):
+            print(f"❌ {method}: {result}")
+            return False
+        header = result.splitlines()[0]
+        if "2091 blocks" not in header:  # 51 x 41 grid
+            print(f"❌ {method}: unexpected header {header}")
+            return False
+        print(f"✅ {method}: {len(result.splitlines())} commands")
+
+    bilinear = build_horizon_surface(points)
+    if bilinear != "Error: Exactly 4 corner points required":
+        print(f"❌ Bilinear mode should still require 4 corners: {bilinear}")
+        return False
+    print("✅ Bilinear mode still requires exactly 4 corners")
+    return True
+
+
+def main():
+    tests = [
+        test_matches_reference,
+        test_large_grid_performance,
+        test_scattered_interpolation,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
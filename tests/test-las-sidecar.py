@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test the columnar binary LAS sidecar.
+
+Verifies that a sidecar round-trips a parsed LAS file, that readers fetch
+only the byte ranges of the requested curves and depth range, that the
+petrophysics Lambda and the MCP well-data server prefer a sidecar whose
+source ETag matches and fall back to the text parse otherwise, and that
+the converter skips sidecars that are already current.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import importlib.util
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the Lambda and scripts directories to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_reader import parse_las
+from las_sidecar import FileSource, encode_sidecar, read_sidecar
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, make_las
+
+CURVES = ["DEPT", "GR", "RHOB", "NPHI", "RT"]
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def well_las(offset=0.0):
+    return make_las(5000, curves=CURVES[1:], seed=5, offset=offset, null_every=40)
+
+
+def las_text_reads(s3, key):
+    """Whole-object GETs of the LAS text (ranged sidecar reads excluded)."""
+    return sum(1 for call in s3.calls if call == ('get_object', key, None))
+
+
+def test_round_trip_and_selective_reads():
+    """The sidecar holds the parsed arrays; selective reads touch only the needed bytes."""
+    print("=" * 60)
+    print("TEST 1: Round trip and selective reads")
+    print("=" * 60)
+
+    las = parse_las(well_las())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "W1.las.col")
+        with open(path, 'wb') as f:
+            f.write(encode_sidecar(las, "global/well-data/W1.las", '"abc"'))
+
+        full = read_sidecar(FileSource(path))
+        if not np.array_equal(full['array'], las['array'], equal_nan=True) or full['partial']:
+            print("❌ Sidecar arrays differ from the parsed LAS")
+            return False
+        if full['well_info'] != las['well_info'] or full['units'] != las['units'] or full['source_etag'] != '"abc"':
+            print("❌ Header metadata not preserved")
+            return False
+
+        source = FileSource(path)
+        subset = read_sidecar(source, curves=['RHOB'], depth_range=(1500, 1600))
+        depths = las['data']['DEPT']
+        mask = (depths >= 1500) & (depths <= 1600)
+        if list(subset['data']) != ['DEPT', 'RHOB'] or not subset['partial']:
+            print(f"❌ Wrong curves loaded: {list(subset['data'])}")
+            return False
+        if not np.array_equal(subset['data']['RHOB'], las['data']['RHOB'][mask], equal_nan=True):
+            print("❌ Depth-range read differs from filtering the full curve")
+            return False
+        print(f"Selective read: {source.requests} reads for {mask.sum()} of {len(depths)} rows")
+
+        # The sparse depth index gives the same bounds as filtering, at and between samples
+        for start, end in [(999, 1000), (1000.25, 1000.75), (1234.5, 1234.5), (3400, 5000), (600, 900), (None, 1001)]:
+            rows = read_sidecar(FileSource(path), curves=['GR'], depth_range=(start, end))['data']['GR']
+            keep = ((depths >= start) if start is not None else True) & (depths <= end)
+            if not np.array_equal(rows, las['data']['GR'][keep]):
+                print(f"❌ Depth range ({start}, {end}) returned {len(rows)} rows, expected {keep.sum()}")
+                return False
+
+    print("✅ Round trip exact; selective read returns the same samples")
+    return True
+
+
+def test_lambda_prefers_current_sidecar():
+    """The Lambda reads a current sidecar instead of the LAS text and ignores a stale one."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Lambda prefers a current sidecar")
+    print("=" * 60)
+
+    converter = load_script("convert_las_sidecars", "convert-las-sidecars.py")
+    key = "global/well-data/W1.las"
+    s3 = FakeS3()
+    s3.put_object(Bucket="b", Key=key, Body=well_las())
+    handler.s3_client = s3
+
+    # Reference answers from the text parse
+    handler.well_cache = WellCache(max_bytes=0)
+    params = {'well_name': 'W1', 'curves': ['GR'], 'depth_start': 1100, 'depth_end': 1120}
+    text_curves = handler.handler({'tool': 'get_curve_data', 'parameters': params}, None)
+    text_stats = handler.handler({'tool': 'calculate_statistics', 'parameters': {'well_name': 'W1', 'curve': 'RHOB'}}, None)
+
+    with patch.object(converter, 'print', lambda *a, **k: None, create=True):
+        summary = converter.convert_bucket(s3, handler.S3_BUCKET, "global/well-data/")
+    if summary['converted'] != 1 or "global/well-data-sidecars/W1.las.col" not in s3.objects:
+        print(f"❌ Converter did not write the sidecar to its own prefix: {summary}")
+        return False
+    if [k for k in s3.objects if k.startswith("global/well-data/")] != [key]:
+        print("❌ Files other than the LAS file written under the LAS prefix")
+        return False
+
+    s3.calls.clear()
+    s3.bytes_read = 0
+    handler.well_cache = WellCache(max_bytes=1 << 24, revalidate_seconds=60, tmp_max_bytes=0)
+    side_curves = handler.handler({'tool': 'get_curve_data', 'parameters': params}, None)
+    selective_bytes = s3.bytes_read
+    side_stats = handler.handler({'tool': 'calculate_statistics', 'parameters': {'well_name': 'W1', 'curve': 'RHOB'}}, None)
+    print(f"Selective get_curve_data read {selective_bytes} bytes "
+          f"(LAS text is {len(s3.objects[key][0])} bytes); stats: {handler.well_cache.get_stats()}")
+
+    if side_curves != text_curves or side_stats != text_stats:
+        print("❌ Sidecar results differ from the text parse")
+        return False
+    if las_text_reads(s3, key) != 0 or handler.well_cache.get_stats()['sidecar_loads'] != 2:
+        print("❌ LAS text downloaded although the sidecar is current")
+        return False
+    if selective_bytes * 10 > len(s3.objects[key][0]):
+        print("❌ Selective read fetched too much data")
+        return False
+
+    # LAS updated: the sidecar is stale and ignored
+    s3.put_object(Bucket="b", Key=key, Body=well_las(offset=3.0))
+    handler.well_cache = WellCache(max_bytes=0)
+    s3.calls.clear()
+    stale = handler.handler({'tool': 'calculate_statistics', 'parameters': {'well_name': 'W1', 'curve': 'GR'}}, None)
+    if not stale['success'] or las_text_reads(s3, key) != 1:
+        print("❌ Stale sidecar used instead of the updated LAS")
+        return False
+
+    with patch.object(converter, 'print', lambda *a, **k: None, create=True):
+        again = converter.convert_bucket(s3, handler.S3_BUCKET, "global/well-data/")
+        current = converter.convert_bucket(s3, handler.S3_BUCKET, "global/well-data/")
+    if again['converted'] != 1 or current != {'converted': 0, 'skipped': 1, 'failed': 0}:
+        print(f"❌ Converter did not refresh stale / skip current sidecars: {again} {current}")
+        return False
+
+    print("✅ Sidecar used while current, text parse after the LAS changed")
+    return True
+
+
+def test_mcp_server_loads_sidecar():
+    """The MCP server loads wells from current sidecars with the same tool results."""
+    print("\n" + "=" * 60)
+    print("TEST 3: MCP server sidecar loading")
+    print("=" * 60)
+
+    server = load_script("mcp_well_data_server_sidecar", "mcp-well-data-server.py")
+    s3 = FakeS3()
+    key = server.S3_PREFIX + "W1.las"
+    s3.put_object(Bucket="b", Key=key, Body=well_las())
+    server.s3_client = s3
+    server._data_loaded = True
+
+    def load():
+        server.WELL_DATA.clear()
+        with patch.object(server, 'initialize_s3_client', return_value=True):
+            server.load_well_data()
+        return server.WELL_DATA['W1']
+
+    text_well = load()
+    text_stats = asyncio.run(server.call_tool("calculate_statistics", {"well_name": "W1", "curve": "RHOB"}))
+
+    converter = load_script("convert_las_sidecars_mcp", "convert-las-sidecars.py")
+    with patch.object(converter, 'print', lambda *a, **k: None, create=True):
+        converter.convert_bucket(s3, server.S3_BUCKET, server.S3_PREFIX)
+
+    s3.calls.clear()
+    side_well = load()
+    side_stats = asyncio.run(server.call_tool("calculate_statistics", {"well_name": "W1", "curve": "RHOB"}))
+
+    if las_text_reads(s3, key) != 0:
+        print("❌ MCP server downloaded the LAS text")
+        return False
+    if list(side_well.data) != list(text_well.data) or not np.array_equal(side_well.array, text_well.array) \
+            or side_well.well_info != text_well.well_info:
+        print("❌ Sidecar well differs from the text-parsed well")
+        return False
+    if json.loads(side_stats[0].text) != json.loads(text_stats[0].text):
+        print("❌ Tool results differ")
+        return False
+
+    print("✅ MCP server loaded the well from its sidecar with identical results")
+    return True
+
+
+def main():
+    tests = [
+        test_round_trip_and_selective_reads,
+        test_lambda_prefers_current_sidecar,
+        test_mcp_server_loads_sidecar,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
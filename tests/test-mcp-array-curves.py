@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Test array-backed curve storage in the MCP well-data server.
+
+Verifies that a parsed well holds its curves as column views of one
+contiguous array (several times smaller than per-curve Python lists),
+with malformed rows skipped as before; that get_curve_data,
+calculate_statistics and calculate_porosity return the same results as
+the list-based implementation, faster; and that S3 wells can be written
+to a local array cache and memory-mapped from it on their next load.
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import asyncio
+import tempfile
+import importlib.util
+from unittest.mock import patch
+
+import numpy as np
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_fixtures import FakeS3, make_las
+
+
+def make_array_las(samples):
+    """Out-of-range densities and porosities, nulls, and two malformed rows at the end."""
+    return make_las(samples, curves=('GR', 'RHOB', 'NPHI'), seed=47, null_every=97,
+                    ranges={'RHOB': (0.9, 3.1), 'NPHI': (-5, 60)}) + "not a row\n1000 2 3\n"
+
+
+def load_server(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server._data_loaded = True
+    return server
+
+
+def call(server, name, **arguments):
+    return json.loads(asyncio.run(server.call_tool(name, arguments))[0].text)
+
+
+def reference_density_porosity(rhob, matrix_density=2.65, fluid_density=1.0):
+    """The per-sample rules of the list-based calculator."""
+    result = []
+    for value in rhob:
+        if value == -999.25 or math.isnan(value) or not math.isfinite(value) or value < 1.0 or value > 4.0:
+            result.append(-999.25)
+            continue
+        porosity = (matrix_density - value) / (matrix_density - fluid_density)
+        result.append(-999.25 if porosity < 0 or porosity > 1 else porosity)
+    return result
+
+
+def test_contiguous_storage():
+    """Curves are views of one array, several times smaller than lists."""
+    print("=" * 60)
+    print("TEST 1: Contiguous curve storage")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_arrays_1")
+    well = server.LASParser.from_string(make_array_las(20000), "W1.las")
+    if list(well.data) != ['DEPT', 'GR', 'RHOB', 'NPHI'] or len(well.data['GR']) != 20000:
+        print("❌ Wrong curves or malformed rows kept")
+        return False
+    if not all(np.shares_memory(values, well.array) and values.flags['C_CONTIGUOUS'] for values in well.data.values()):
+        print("❌ Curves are not contiguous views of the well array")
+        return False
+    if well.data['RHOB'][0] != -999.25 or well.curve_values('GR') != well.data['GR'].tolist():
+        print("❌ Null values or list conversion changed")
+        return False
+
+    list_bytes = sum(sys.getsizeof(values.tolist()) + 24 * len(values) for values in well.data.values())
+    print(f"Curve memory: {list_bytes} bytes as lists, {well.nbytes} as float64 array")
+    if list_bytes < 3 * well.nbytes:
+        print("❌ Array storage not several times smaller")
+        return False
+
+    with patch.object(server, 'CURVE_DTYPE', np.dtype('float32')):
+        small = server.LASParser.from_string(make_array_las(20000), "W1.las")
+    if small.nbytes * 2 != well.nbytes or small.data['RHOB'][0] != -999.25:
+        print("❌ float32 storage not half the size or nulls lost")
+        return False
+
+    print("✅ One contiguous array per well; float32 halves it again")
+    return True
+
+
+def test_tools_match_list_results():
+    """Vectorized tools return the list-based results."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Vectorized tools")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_arrays_2")
+    server.WELL_DATA['W1'] = server.LASParser.from_string(make_array_las(200000), "W1.las")
+    lists = {name: values.tolist() for name, values in server.WELL_DATA['W1'].data.items()}
+    inside = [i for i, d in enumerate(lists['DEPT']) if 30000 <= d <= 80000]
+
+    curves = call(server, "get_curve_data", well_name="W1", curves=["RHOB", "NPHI"], depth_start=30000, depth_end=80000)
+    if curves['depths'] != [lists['DEPT'][i] for i in inside] \
+            or curves['NPHI'] != [lists['NPHI'][i] for i in inside]:
+        print("❌ get_curve_data depth filter differs")
+        return False
+    if call(server, "get_curve_data", well_name="W1", curves=["GR"])['GR'] != lists['GR']:
+        print("❌ get_curve_data full curve differs")
+        return False
+
+    stats = call(server, "calculate_statistics", well_name="W1", curve="RHOB", depth_start=30000, depth_end=80000)
+    valid = sorted(lists['RHOB'][i] for i in inside if lists['RHOB'][i] != -999.25)
+    if stats['count'] != len(valid) or stats['min'] != valid[0] or stats['max'] != valid[-1] \
+            or stats['median'] != valid[len(valid) // 2] or abs(stats['mean'] - sum(valid) / len(valid)) > 1e-12:
+        print(f"❌ calculate_statistics differs: {stats}")
+        return False
+
+    porosity = call(server, "calculate_porosity", well_name="W1", method="density")
+    expected = reference_density_porosity(lists['RHOB'])
+    if porosity['values'] != expected or porosity['depths'] != lists['DEPT'] \
+            or porosity['statistics']['valid_count'] != sum(v != -999.25 for v in expected):
+        print("❌ calculate_porosity differs from the list-based rules")
+        return False
+
+    well = server.WELL_DATA['W1']
+    start = time.perf_counter()
+    server.porosity_calc.calculate_porosity('density', {'rhob': well.data['RHOB'], 'depth': well.data['DEPT']})
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    values = reference_density_porosity(lists['RHOB'])
+    [abs(v * 0.02) if v != -999.25 else -999.25 for v in values]
+    valid = sorted(v for v in values if v != -999.25)
+    mean = sum(valid) / len(valid)
+    sum((v - mean) ** 2 for v in valid)
+    reference = time.perf_counter() - start
+    print(f"Density porosity of 200000 samples: {vectorized * 1000:.1f} ms vectorized, "
+          f"{reference * 1000:.1f} ms with lists")
+    if vectorized > reference:
+        print("❌ Vectorized calculation slower than the list loop")
+        return False
+    ranged = call(server, "calculate_porosity", well_name="W1", method="effective", depth_start=30000, depth_end=80000)
+    if ranged['depths'] != curves['depths'] or len(ranged['curve_data']['RHOB']) != len(inside):
+        print("❌ Porosity depth range differs")
+        return False
+
+    print("✅ Same curves, statistics and porosity as the list-based tools")
+    return True
+
+
+def test_memory_mapped_cache():
+    """S3 wells are memory-mapped from the local array cache on their next load."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Local memory-mapped array cache")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def start(name, las):
+            server = load_server(name)
+            server.ARRAY_CACHE_DIR = cache_dir
+            server._data_loaded = False
+            server.s3_client = FakeS3({server.S3_PREFIX + "W1.las": las})
+            return server
+
+        first = start("mcp_well_data_server_arrays_3a", make_array_las(5000))
+        with patch.object(first, 'initialize_s3_client', return_value=True):
+            before = call(first, "calculate_statistics", well_name="W1", curve="GR")
+        if not isinstance(first.WELL_DATA['W1'].array, np.memmap) or first.s3_client.read_count() != 1:
+            print("❌ Loaded well not written to the cache and mapped")
+            return False
+
+        second = start("mcp_well_data_server_arrays_3b", make_array_las(5000))
+        with patch.object(second, 'initialize_s3_client', return_value=True):
+            after = call(second, "calculate_statistics", well_name="W1", curve="GR")
+        well = second.WELL_DATA['W1']
+        if second.s3_client.read_count() != 0 or after != before or well.source_etag != first.WELL_DATA['W1'].source_etag:
+            print("❌ Restarted server did not load the well from the cache")
+            return False
+
+        changed = start("mcp_well_data_server_arrays_3c", make_array_las(5001))
+        with patch.object(changed, 'initialize_s3_client', return_value=True):
+            info = call(changed, "calculate_statistics", well_name="W1", curve="GR")
+        if changed.s3_client.read_count() != 1 or info['count'] != 5001:
+            print("❌ Changed S3 object served from a stale cache entry")
+            return False
+        print(f"Cache files: {sorted(os.listdir(cache_dir))}")
+
+    print("✅ Restart reads the mapped array; a new ETag is parsed again")
+    return True
+
+
+def main():
+    tests = [
+        test_contiguous_storage,
+        test_tools_match_list_results,
+        test_memory_mapped_cache,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
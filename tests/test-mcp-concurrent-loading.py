@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test non-blocking, concurrent well loading in the MCP well-data server.
+
+Verifies that wells are read from S3 on a bounded thread pool, that a
+tool call needing one well waits for that well only, that list_tools and
+list_wells answer while wells are still loading, and that the
+blocking load_well_data() still loads every well.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_fixtures import FakeS3, make_las
+
+WELLS = [f"WELL-{i:03d}" for i in range(16)]
+LATENCY = 0.1
+
+
+def load_server(name, concurrency=4):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server._load_executor = ThreadPoolExecutor(max_workers=concurrency)
+    server.s3_client = FakeS3({f"{server.S3_PREFIX}{name}.las": make_las(300, seed=i) for i, name in enumerate(WELLS)},
+                              latency=LATENCY)
+    return server
+
+
+def test_single_well_waits_for_that_well():
+    """A tool call returns once its well is loaded, while other wells still load."""
+    print("=" * 60)
+    print("TEST 1: Single-well tool calls wait for one well")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_concurrent_1")
+
+    async def scenario():
+        start = time.perf_counter()
+        calls = [asyncio.create_task(server.call_tool("get_well_info", {"well_name": name})) for name in WELLS]
+        content = await calls[0]
+        elapsed = time.perf_counter() - start
+        loaded_then = len(server.WELL_DATA)
+        await asyncio.gather(*calls)
+        return content, elapsed, loaded_then
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        content, elapsed, loaded_then = asyncio.run(scenario())
+        info = json.loads(content[0].text)
+
+    full_load = len(WELLS) * LATENCY / 4
+    print(f"First well in {elapsed:.2f}s with {loaded_then}/{len(WELLS)} wells loaded "
+          f"(full load {full_load:.1f}s); peak concurrent reads {server.s3_client.peak}")
+    if info.get('available_curves') != ['DEPT', 'GR', 'RHOB']:
+        print(f"❌ Wrong well info: {info}")
+        return False
+    if elapsed > full_load * 0.75 or loaded_then == len(WELLS):
+        print("❌ Tool call waited for the whole bulk load")
+        return False
+    if server.s3_client.peak > 4 or server.s3_client.peak < 2 or len(server.WELL_DATA) != len(WELLS):
+        print("❌ Loads not concurrent, not bounded, or incomplete")
+        return False
+
+    print("✅ One-well call answered early; reads bounded by the loader pool")
+    return True
+
+
+def test_event_loop_stays_responsive():
+    """list_tools and list_wells answer while wells are still loading."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Event loop stays responsive during loading")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_concurrent_2")
+
+    async def scenario():
+        started = time.perf_counter()
+        loading = asyncio.gather(*(server.call_tool("get_well_info", {"well_name": name}) for name in WELLS))
+        await asyncio.sleep(0.01)
+        tools = await server.list_tools()
+        tools_at = time.perf_counter() - started
+        wells = json.loads((await server.call_tool("list_wells", {}))[0].text)['wells']
+        wells_at = time.perf_counter() - started
+        loaded_then = len(server.WELL_DATA)
+        await loading
+        return tools, tools_at, wells, wells_at, loaded_then, time.perf_counter() - started
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        tools, tools_at, wells, wells_at, loaded_then, done_at = asyncio.run(scenario())
+
+    print(f"list_tools at {tools_at:.3f}s, list_wells at {wells_at:.3f}s ({loaded_then} wells loaded), "
+          f"last well at {done_at:.2f}s")
+    if not tools or tools_at > 0.05 or wells_at > 0.1:
+        print("❌ Requests blocked by loading")
+        return False
+    if sorted(wells) != WELLS or loaded_then == len(WELLS):
+        print("❌ list_wells did not answer from the catalog during loading")
+        return False
+
+    print("✅ list_tools and list_wells answered while loading continued")
+    return True
+
+
+def test_blocking_load_still_complete():
+    """load_well_data() still returns with every well loaded."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Blocking load")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_concurrent_3", concurrency=8)
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        start = time.perf_counter()
+        server.load_well_data()
+        elapsed = time.perf_counter() - start
+    print(f"{len(server.WELL_DATA)} wells in {elapsed:.2f}s (sequential {len(WELLS) * LATENCY:.1f}s)")
+    if sorted(server.WELL_DATA) != WELLS or elapsed > len(WELLS) * LATENCY / 2:
+        print("❌ Load incomplete or sequential")
+        return False
+    if server.WELL_CATALOG[WELLS[0]]['key'] != f"{server.S3_PREFIX}{WELLS[0]}.las":
+        print("❌ Catalog not recorded")
+        return False
+
+    print("✅ Every well loaded concurrently")
+    return True
+
+
+def main():
+    tests = [
+        test_single_well_waits_for_that_well,
+        test_event_loop_stays_responsive,
+        test_blocking_load_still_complete,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test incremental refresh of the MCP well-data server.
+
+Verifies that refresh_wells lists S3 once and loads only new or changed
+wells (by ETag or LastModified), dropping deleted ones and their cached
+results; that requests keep being answered from the previous version
+while a changed well reloads; and that a request whose load was
+superseded by a refresh returns the new version.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import importlib.util
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_fixtures import FakeS3, make_las
+
+
+def load_server(name, wells, latency=0.0):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server.s3_client = FakeS3(latency=latency)
+    for i, well in enumerate(wells):
+        server.s3_client.put(f"{server.S3_PREFIX}{well}.las", make_las(400, seed=i))
+    return server
+
+
+def call(server, name, **arguments):
+    return json.loads(asyncio.run(server.call_tool(name, arguments))[0].text)
+
+
+def test_refresh_loads_only_changes():
+    """New, changed and deleted wells are applied; unchanged wells are not read again."""
+    print("=" * 60)
+    print("TEST 1: Only new, changed and deleted wells")
+    print("=" * 60)
+
+    wells = [f"W{i}" for i in range(20)]
+    server = load_server("mcp_well_data_server_refresh_1", wells)
+    s3, prefix = server.s3_client, server.S3_PREFIX
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        before = {name: call(server, "calculate_statistics", well_name=name, curve="GR") for name in ["W0", "W1", "W2"]}
+
+        s3.put(prefix + "W1.las", make_las(400, seed=101))   # resident, changed
+        s3.put(prefix + "W5.las", make_las(400, seed=105))   # not loaded, changed
+        s3.touch(prefix + "W6.las")                          # re-uploaded: same ETag, new LastModified
+        del s3.objects[prefix + "W2.las"]                    # resident, deleted
+        del s3.objects[prefix + "W7.las"]                    # not loaded, deleted
+        s3.put(prefix + "W20.las", make_las(400, seed=120))  # new
+
+        changes = call(server, "refresh_wells")
+        print(f"Changes: {changes}")
+        server._well_futures["W1"].result()
+        if changes != {"added": ["W20"], "changed": ["W1", "W5", "W6"], "removed": ["W2", "W7"], "reloading": ["W1"]}:
+            print("❌ Wrong changes detected")
+            return False
+        if s3.listed.count(prefix) != 2 or s3.reads != {prefix + "W0.las": 1, prefix + "W1.las": 2, prefix + "W2.las": 1}:
+            print(f"❌ Unchanged or unused wells read: {s3.reads}")
+            return False
+
+        hits = server.tool_results.get_stats()['hits']
+        unchanged = call(server, "calculate_statistics", well_name="W0", curve="GR")
+        changed = call(server, "calculate_statistics", well_name="W1", curve="GR")
+        if unchanged != before["W0"] or server.tool_results.get_stats()['hits'] != hits + 1 or changed == before["W1"]:
+            print("❌ Unchanged result not kept or changed well not reloaded")
+            return False
+        if 'error' not in call(server, "calculate_statistics", well_name="W2", curve="GR") or "W2" in server.WELL_DATA:
+            print("❌ Deleted well still served")
+            return False
+        listed = call(server, "list_wells")['wells']
+        if "W20" not in listed or "W7" in listed or call(server, "get_well_info", well_name="W20")['samples'] != 400:
+            print("❌ Catalog not updated")
+            return False
+
+        again = call(server, "refresh_wells")
+        if any(again.values()) or s3.listed.count(prefix) != 3:
+            print(f"❌ Unchanged listing reported changes: {again}")
+            return False
+
+    print("✅ One listing; only the changed resident well was read again")
+    return True
+
+
+def test_requests_not_blocked():
+    """Requests are answered from the previous version while a changed well reloads."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Requests during a reload")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_refresh_2", ["A", "B"], latency=0.3)
+    s3, prefix = server.s3_client, server.S3_PREFIX
+
+    async def scenario():
+        old = json.loads((await server.call_tool("calculate_statistics", {"well_name": "A", "curve": "GR"}))[0].text)
+        s3.put(prefix + "A.las", make_las(400, seed=200))
+        await server.call_tool("refresh_wells", {})
+        start = time.perf_counter()
+        during = json.loads((await server.call_tool("get_curve_data", {"well_name": "A", "curves": ["GR"]}))[0].text)
+        elapsed = time.perf_counter() - start
+        await asyncio.wrap_future(server._well_futures["A"])
+        new = json.loads((await server.call_tool("calculate_statistics", {"well_name": "A", "curve": "GR"}))[0].text)
+        return old, during, elapsed, new
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        old, during, elapsed, new = asyncio.run(scenario())
+    print(f"Request during the reload answered in {elapsed * 1000:.1f} ms (S3 latency 300 ms)")
+    if elapsed > 0.15 or len(during['GR']) != 400:
+        print("❌ Request waited for the reload")
+        return False
+    if new == old or s3.reads[prefix + "A.las"] != 2:
+        print("❌ New version not served after the reload")
+        return False
+
+    print("✅ Previous version served until the new one was stored")
+    return True
+
+
+def test_superseded_load():
+    """A request whose load is superseded by a refresh gets the new version."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Load superseded by a refresh")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_refresh_3", ["A", "B"], latency=0.3)
+    s3, prefix = server.s3_client, server.S3_PREFIX
+    expected = server.LASParser.from_string(make_las(400, seed=300), "A.las").data['GR']
+
+    async def scenario():
+        await server.call_tool("list_wells", {})
+        request = asyncio.create_task(server.call_tool("get_curve_data", {"well_name": "A", "curves": ["GR"]}))
+        await asyncio.sleep(0.05)  # the load of the old version is in flight
+        s3.put(prefix + "A.las", make_las(400, seed=300))
+        changes = json.loads((await server.call_tool("refresh_wells", {}))[0].text)
+        return changes, json.loads((await request)[0].text)
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        changes, result = asyncio.run(scenario())
+        time.sleep(0.4)
+    print(f"Changes: {changes}; downloads: {s3.reads}")
+    if changes['reloading'] != ["A"] or result.get('GR') != expected.tolist():
+        print("❌ Request returned the superseded version")
+        return False
+    if server.WELL_DATA['A'].source_etag != server.WELL_CATALOG['A']['etag']:
+        print("❌ Outdated load stored after the refresh")
+        return False
+
+    print("✅ Superseded load discarded; the request waited for the new version")
+    return True
+
+
+def main():
+    tests = [
+        test_refresh_loads_only_changes,
+        test_requests_not_blocked,
+        test_superseded_load,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test lazy per-well loading in the MCP well-data server.
+
+Verifies that the first request only lists the bucket (following
+continuation tokens), that a well is downloaded on first use and once
+for concurrent requests, that parsed wells stay within the byte budget
+by evicting the least recently used well, and that evicted wells are
+loaded again on their next use with the same results.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import importlib.util
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_fixtures import FakeS3, make_las
+
+
+def load_server(name, wells, latency=0.0):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server.s3_client = FakeS3({f"{server.S3_PREFIX}{w}.las": make_las(400, seed=i) for i, w in enumerate(wells)},
+                              latency, page_size=100)
+    return server
+
+
+def call(server, name, **arguments):
+    return json.loads(asyncio.run(server.call_tool(name, arguments))[0].text)
+
+
+def test_catalog_only_at_start():
+    """The first request lists every page of the bucket and downloads no well."""
+    print("=" * 60)
+    print("TEST 1: Catalog-only start")
+    print("=" * 60)
+
+    wells = [f"W{i:03d}" for i in range(250)]
+    server = load_server("mcp_well_data_server_lazy_1", wells)
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        start = time.perf_counter()
+        listed = call(server, "list_wells")['wells']
+        elapsed = time.perf_counter() - start
+        s3 = server.s3_client
+        print(f"list_wells: {len(listed)} wells in {elapsed * 1000:.1f} ms, "
+              f"{s3.listed.count(server.S3_PREFIX)} list calls, {sum(s3.reads.values())} downloads")
+        if sorted(listed) != wells or s3.listed.count(server.S3_PREFIX) != 3 or s3.reads or len(server.WELL_DATA):
+            print("❌ Start was not catalog-only or missed listing pages")
+            return False
+
+        info = call(server, "get_well_info", well_name="W123")
+        if info['available_curves'] != ['DEPT', 'GR', 'RHOB'] or list(server.WELL_DATA) != ["W123"] \
+                or sum(s3.reads.values()) != 1:
+            print("❌ First use did not load exactly that well")
+            return False
+        call(server, "calculate_statistics", well_name="W123", curve="GR")
+        if sum(s3.reads.values()) != 1:
+            print("❌ Loaded well downloaded again")
+            return False
+        if 'error' not in call(server, "get_well_info", well_name="MISSING"):
+            print("❌ Unknown well did not report an error")
+            return False
+
+    print("✅ 250 wells listed without downloads; one well loaded on first use")
+    return True
+
+
+def test_concurrent_requests_share_one_load():
+    """Simultaneous requests for one well download it once."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Concurrent first use")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_lazy_2", ["A", "B"], latency=0.1)
+
+    async def scenario():
+        return await asyncio.gather(*[server.call_tool("calculate_statistics", {"well_name": "A", "curve": "GR"})
+                                      for _ in range(8)])
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        results = asyncio.run(scenario())
+    reads = server.s3_client.reads
+    print(f"8 concurrent requests, downloads: {reads}")
+    if len({r[0].text for r in results}) != 1 or reads != {server.S3_PREFIX + "A.las": 1}:
+        print("❌ Concurrent requests loaded the well more than once")
+        return False
+
+    print("✅ One download served all concurrent requests")
+    return True
+
+
+def test_byte_bounded_lru():
+    """Parsed wells stay within the budget; least recently used wells are evicted and reloaded."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Byte-bounded LRU")
+    print("=" * 60)
+
+    wells = [f"W{i}" for i in range(6)]
+    server = load_server("mcp_well_data_server_lazy_3", wells)
+    one_well = server.LASParser.from_string(make_las(400, seed=0), "W0.las").nbytes
+    server.WELL_DATA = server.WellLRU(int(one_well * 2.5))
+
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        before = call(server, "calculate_statistics", well_name="W0", curve="RHOB")
+        call(server, "get_curve_data", curves=["GR"], well_name="W1")
+        call(server, "get_curve_data", curves=["GR"], well_name="W0")  # W1 is now least recently used
+        call(server, "get_curve_data", curves=["GR"], well_name="W2")
+        resident = sorted(server.WELL_DATA)
+        print(f"Budget {server.WELL_DATA.max_bytes} bytes ({one_well} per well): resident {resident}")
+        if resident != ["W0", "W2"] or server.WELL_DATA.nbytes > server.WELL_DATA.max_bytes:
+            print("❌ Wrong well evicted or budget exceeded")
+            return False
+
+        for name in wells:
+            call(server, "get_curve_data", curves=["GR"], well_name=name)
+            if server.WELL_DATA.nbytes > server.WELL_DATA.max_bytes:
+                print("❌ Budget exceeded")
+                return False
+        after = call(server, "calculate_statistics", well_name="W0", curve="RHOB")
+        reads = server.s3_client.reads[server.S3_PREFIX + "W0.las"]
+    if after != before or reads != 2:
+        print(f"❌ Evicted well not reloaded correctly ({reads} downloads)")
+        return False
+
+    print(f"✅ {server.WELL_DATA.evictions} evictions, never over budget; evicted wells reload on use")
+    return True
+
+
+def main():
+    tests = [
+        test_catalog_only_at_start,
+        test_concurrent_requests_share_one_load,
+        test_byte_bounded_lru,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
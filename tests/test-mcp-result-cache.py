@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test memoized tool results in the MCP well-data server.
+
+Verifies that a repeated deterministic tool call is answered from the
+result cache without recomputing, for equivalent arguments too; that
+errors are not cached; that the cache stays within its entry and byte
+bounds; and that reloading a well invalidates its results.
+"""
+
+import sys
+import os
+import json
+import asyncio
+import importlib.util
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_fixtures import make_las
+
+LAS_CURVES = ('GR', 'RHOB', 'NPHI')
+
+
+def load_server(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, "mcp-well-data-server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server._data_loaded = True
+    server.WELL_DATA['W1'] = server.LASParser.from_string(make_las(curves=LAS_CURVES, seed=49), "W1.las")
+    return server
+
+
+def call(server, name, **arguments):
+    return json.loads(asyncio.run(server.call_tool(name, arguments))[0].text)
+
+
+def test_repeated_calls_hit():
+    """Repeated and equivalent calls are answered without recomputing."""
+    print("=" * 60)
+    print("TEST 1: Repeated calls answered from the cache")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_results_1")
+    first = call(server, "calculate_porosity", well_name="W1", method="density", depth_start=1100, depth_end=1600)
+    stats = call(server, "calculate_statistics", well_name="W1", curve="GR")
+
+    with patch.object(server.porosity_calc, 'calculate_porosity', side_effect=AssertionError("recomputed")), \
+            patch.object(server, 'order_statistics', side_effect=AssertionError("recomputed")):
+        again = call(server, "calculate_porosity", well_name="W1", method="density", depth_start=1100, depth_end=1600)
+        # Same arguments in another order and with integral floats
+        equivalent = call(server, "calculate_porosity", depth_end=1600.0, depth_start=1100.0, method="density",
+                          well_name="W1")
+        stats_again = call(server, "calculate_statistics", well_name="W1", curve="GR")
+    cache = server.tool_results.get_stats()
+    print(f"Cache: {cache}")
+    if again != first or equivalent != first or stats_again != stats:
+        print("❌ Cached result differs")
+        return False
+    if cache['hits'] != 3 or cache['misses'] != 2 or cache['entries'] != 2 or cache['hit_rate'] != 0.6:
+        print("❌ Wrong hit and miss counts")
+        return False
+
+    # A different argument or a missing curve is computed; errors are not cached
+    if call(server, "calculate_statistics", well_name="W1", curve="NPHI") == stats:
+        print("❌ Different arguments answered from another entry")
+        return False
+    call(server, "calculate_statistics", well_name="W1", curve="XX")
+    if 'error' not in call(server, "calculate_statistics", well_name="W1", curve="XX") \
+            or server.tool_results.get_stats()['entries'] != 3:
+        print("❌ Error response cached")
+        return False
+
+    print("✅ Repeated and equivalent calls reuse the first response")
+    return True
+
+
+def test_bounds():
+    """The cache keeps at most its entry count and response bytes."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Bounded cache")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_results_2")
+    server.tool_results = server.ToolResultCache(max_entries=4, max_bytes=10 ** 9)
+    for start in range(1000, 1010):
+        call(server, "calculate_statistics", well_name="W1", curve="GR", depth_start=start)
+    call(server, "calculate_statistics", well_name="W1", curve="GR", depth_start=1009)
+    call(server, "calculate_statistics", well_name="W1", curve="GR", depth_start=1000)
+    cache = server.tool_results.get_stats()
+    print(f"Entry-bounded: {cache}")
+    if cache['entries'] != 4 or cache['evictions'] != 7 or cache['hits'] != 1:
+        print("❌ Entry bound not kept or recent entry evicted")
+        return False
+
+    curve = call(server, "get_curve_data", well_name="W1", curves=["GR"])
+    size = len(json.dumps(curve))
+    server.tool_results = server.ToolResultCache(max_entries=100, max_bytes=int(size * 2.5))
+    for curves in (["GR"], ["RHOB"], ["NPHI"]):
+        call(server, "get_curve_data", well_name="W1", curves=curves)
+    cache = server.tool_results.get_stats()
+    print(f"Byte-bounded ({size} bytes per response): {cache}")
+    if cache['entries'] != 2 or cache['bytes'] > cache['max_bytes']:
+        print("❌ Byte bound not kept")
+        return False
+
+    server.tool_results = server.ToolResultCache(max_entries=100, max_bytes=size // 2)
+    call(server, "get_curve_data", well_name="W1", curves=["GR"])
+    if server.tool_results.get_stats()['entries'] != 0:
+        print("❌ Response larger than the cache was stored")
+        return False
+
+    print("✅ Least recently used responses evicted within both bounds")
+    return True
+
+
+def test_reload_invalidates():
+    """A reloaded well is computed again; its old responses are dropped."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Invalidation on reload")
+    print("=" * 60)
+
+    server = load_server("mcp_well_data_server_results_3")
+    server.WELL_DATA['W2'] = server.LASParser.from_string(make_las(curves=LAS_CURVES, seed=1), "W2.las")
+    before = call(server, "calculate_statistics", well_name="W1", curve="GR")
+    other = call(server, "calculate_statistics", well_name="W2", curve="GR")
+
+    # Reloaded without invalidation: the new version never matches the old entry
+    server.WELL_DATA['W1'] = server.LASParser.from_string(make_las(curves=LAS_CURVES, seed=2), "W1.las")
+    if call(server, "calculate_statistics", well_name="W1", curve="GR") == before:
+        print("❌ Result of the previous load returned")
+        return False
+
+    server.store_well('W1', server.LASParser.from_string(make_las(curves=LAS_CURVES, seed=3), "W1.las"))
+    cache = server.tool_results.get_stats()
+    print(f"After store_well: {cache}")
+    if cache['invalidations'] != 2 or cache['entries'] != 1:
+        print("❌ Responses of the reloaded well not dropped")
+        return False
+    reloaded = call(server, "calculate_statistics", well_name="W1", curve="GR")
+    if reloaded == before or call(server, "calculate_statistics", well_name="W2", curve="GR") != other \
+            or server.tool_results.get_stats()['hits'] != 1:
+        print("❌ Reload affected another well or was not recomputed")
+        return False
+
+    print("✅ Reloading a well recomputes its results only")
+    return True
+
+
+def main():
+    tests = [
+        test_repeated_calls_hit,
+        test_bounds,
+        test_reload_invalidates,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
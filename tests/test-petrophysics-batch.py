@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test batch invocation of the petrophysics-calculator Lambda.
+
+Verifies that a batch event returns, in operation order, the same results
+as separate invocations of each tool, that the well's LAS file is fetched
+and parsed once per batch, and that failing operations report their own
+errors without affecting the rest of the batch.
+"""
+
+import sys
+import os
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, make_las
+
+# A typical single-well analysis
+ANALYSIS = [
+    {'tool': 'get_curve_data', 'parameters': {'curves': ['GR', 'RHOB'], 'depth_start': 1100, 'depth_end': 1200}},
+    {'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'}},
+    {'tool': 'calculate_porosity', 'parameters': {'method': 'density'}},
+    {'tool': 'calculate_shale_volume', 'parameters': {'method': 'larionov_tertiary'}},
+    {'tool': 'calculate_saturation', 'parameters': {}},
+    {'tool': 'assess_well_data_quality', 'parameters': {}},
+]
+
+
+def setup():
+    handler.s3_client = FakeS3({"global/well-data/W1.las": make_las(curves=('GR', 'RHOB', 'RT'), seed=40, well="W1")})
+    # No warm cache: every invocation behaves like a fresh container
+    handler.well_cache = WellCache(max_bytes=0, tmp_max_bytes=0)
+    return handler.s3_client
+
+
+def test_batch_matches_single_calls():
+    """Each batch result equals the separate invocation of that tool."""
+    print("=" * 60)
+    print("TEST 1: Batch results match single invocations")
+    print("=" * 60)
+
+    s3 = setup()
+    singles = []
+    for operation in ANALYSIS:
+        event = {'tool': operation['tool'], 'parameters': {'well_name': 'W1', **operation['parameters']}}
+        singles.append(handler.handler(event, None))
+    single_reads = s3.get_requests(suffix='.las')
+
+    s3 = setup()
+    batch = handler.handler({'operations': ANALYSIS, 'parameters': {'well_name': 'W1'}}, None)
+    batch_reads = s3.get_requests(suffix='.las')
+
+    if not batch['success'] or len(batch['results']) != len(ANALYSIS):
+        print(f"❌ Batch failed: {batch.get('message')}")
+        return False
+    for operation, single, result in zip(ANALYSIS, singles, batch['results']):
+        if result['tool'] != operation['tool'] or {k: v for k, v in result.items() if k != 'tool'} != single:
+            print(f"❌ {operation['tool']} differs from its single invocation")
+            return False
+    if batch['artifacts'] != [a for single in singles for a in single['artifacts']]:
+        print("❌ Combined artifacts differ")
+        return False
+
+    print(f"Invocations: {len(ANALYSIS)} -> 1, LAS reads: {single_reads} -> {batch_reads}")
+    if batch_reads != 1 or single_reads != len(ANALYSIS):
+        print("❌ LAS not loaded exactly once for the batch")
+        return False
+
+    print("✅ Identical results from one invocation and one LAS read")
+    return True
+
+
+def test_per_operation_errors():
+    """Failing operations report their own errors; the others still succeed."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Per-operation errors")
+    print("=" * 60)
+
+    s3 = setup()
+    batch = handler.handler({
+        'operations': [
+            {'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'}},
+            {'tool': 'calculate_statistics', 'parameters': {'curve': 'NPHI'}},
+            {'tool': 'no_such_tool'},
+            {'tool': 'get_well_info', 'parameters': {'well_name': 'MISSING'}},
+            {'tool': 'calculate_porosity', 'parameters': {'method': 'neutron'}},
+            {'tool': 'calculate_shale_volume', 'parameters': {'gr_clean': 50, 'gr_shale': 50}},
+            {'tool': 'get_well_info'},
+        ],
+        'parameters': {'well_name': 'W1'}
+    }, None)
+
+    outcome = [r['success'] for r in batch['results']]
+    print(f"Outcome: {outcome}; {batch['message']}")
+    if outcome != [True, False, False, False, False, False, True] or batch['success']:
+        print("❌ Wrong per-operation outcome")
+        return False
+    if "not found" not in batch['results'][3]['error'] or "Unknown tool" not in batch['results'][2]['error']:
+        print("❌ Errors not reported per operation")
+        return False
+    las_reads = s3.get_requests(suffix='.las')
+    if las_reads != 2 or batch['wells_loaded'] != 2:  # W1 once, the missing well once
+        print(f"❌ Unexpected reads: {las_reads}, wells loaded {batch['wells_loaded']}")
+        return False
+
+    too_many = handler.handler({'operations': [{'tool': 'get_well_info'}] * (handler.MAX_BATCH_OPERATIONS + 1),
+                                'parameters': {'well_name': 'W1'}}, None)
+    empty = handler.handler({'operations': [], 'parameters': {'well_name': 'W1'}}, None)
+    if too_many['success'] or empty['success']:
+        print("❌ Oversized or empty batch accepted")
+        return False
+
+    print("✅ Errors isolated per operation; batch limits enforced")
+    return True
+
+
+def main():
+    tests = [
+        test_batch_matches_single_calls,
+        test_per_operation_errors,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
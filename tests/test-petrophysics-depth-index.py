@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test the shared depth-range index of the petrophysics-calculator Lambda.
+
+Verifies that DepthIndex resolves depth ranges with a binary search to the
+same samples as the previous per-sample loops, returns views for
+increasing depth curves and a filtered copy otherwise, that the handler
+tools agree on the samples of a depth range, and that range queries on a
+long log are much faster than the loops.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from depth_index import DepthIndex
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, format_las
+
+
+def legacy_bounds(depths, depth_start, depth_end):
+    """The enumerate() loops the tools used before."""
+    start_idx, end_idx = 0, len(depths)
+    if depth_start is not None:
+        for i, d in enumerate(depths):
+            if d >= depth_start:
+                start_idx = i
+                break
+    if depth_end is not None:
+        for i, d in enumerate(depths):
+            if d > depth_end:
+                end_idx = i
+                break
+    return start_idx, end_idx
+
+
+def test_bounds_match_filtering():
+    """Binary-search bounds select exactly the samples inside the range."""
+    print("=" * 60)
+    print("TEST 1: Bounds match depth filtering")
+    print("=" * 60)
+
+    rng = np.random.default_rng(1)
+    depths = np.round(np.cumsum(rng.choice([0.0, 0.1524, 0.3048], size=3000)) + 500, 4)  # repeated depths included
+    index = DepthIndex(depths)
+    values = rng.normal(size=len(depths))
+
+    for _ in range(500):
+        start, end = sorted(rng.uniform(depths[0] - 20, depths[-1] + 20, size=2))
+        start = None if rng.random() < 0.1 else start
+        end = None if rng.random() < 0.1 else end
+        mask = np.ones(len(depths), bool)
+        if start is not None:
+            mask &= depths >= start
+        if end is not None:
+            mask &= depths <= end
+        if not np.array_equal(index.select(values, start, end), values[mask]):
+            print(f"❌ Range ({start}, {end}) selected the wrong samples")
+            return False
+        # Inside the log the previous loops gave the same slice
+        if start is not None and end is not None and depths[0] <= start <= end <= depths[-1] and mask.any():
+            if index.bounds(start, end) != legacy_bounds(depths.tolist(), start, end):
+                print(f"❌ Bounds differ from the previous loops for ({start}, {end})")
+                return False
+
+    if not np.shares_memory(index.select(values, 600, 700), values):
+        print("❌ Increasing depths did not return a view")
+        return False
+
+    shuffled = depths.copy()
+    shuffled[[10, 20]] = shuffled[[20, 10]]
+    fallback = DepthIndex(shuffled)
+    mask = (shuffled >= 501) & (shuffled <= 503)
+    if fallback.monotonic or not np.array_equal(fallback.select(values, 501, 503), values[mask]):
+        print("❌ Non-increasing depths not filtered with a mask")
+        return False
+
+    print("✅ Bounds match filtering; views for increasing depths, mask otherwise")
+    return True
+
+
+def test_tools_agree_on_range():
+    """Every depth-aware tool uses the same samples for a range."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Handler tools share the depth range")
+    print("=" * 60)
+
+    i = np.arange(2000)
+    content = format_las(1000 + i * 0.5, {'GR': 50 + i % 60, 'RHOB': 2.2 + (i % 9) * 0.04}, well="W1")
+    handler.s3_client = FakeS3({"global/well-data/W1.las": content})
+    handler.well_cache = WellCache(max_bytes=1 << 20, revalidate_seconds=60, tmp_max_bytes=0)
+
+    def call(tool, **params):
+        return handler.handler({'tool': tool, 'parameters': {'well_name': 'W1', **params}}, None)['artifacts'][0]['results']
+
+    span = {'depth_start': 1100.2, 'depth_end': 1250}
+    curves = call('get_curve_data', curves=['GR'], **span)
+    stats = call('calculate_statistics', curve='GR', **span)['statistics']
+    completeness = call('calculate_data_completeness', curve_name='GR', **span)['completeness_metrics']
+    quality = call('assess_curve_quality', curve_name='GR', **span)['statistics']
+    well_quality = call('assess_well_data_quality', **span)['curves'][0]['statistics']
+
+    expected = sum(1 for i in range(2000) if 1100.2 <= 1000 + i * 0.5 <= 1250)
+    counts = [curves['point_count'], stats['total_points'], completeness['total_points'], quality['count'], well_quality['count']]
+    print(f"Samples in range per tool: {counts} (expected {expected})")
+    if any(count != expected for count in counts):
+        print("❌ Tools disagree on the depth range")
+        return False
+    if curves['depth_range'] != {'start': 1100.5, 'end': 1250.0}:
+        print(f"❌ Wrong depth range: {curves['depth_range']}")
+        return False
+
+    outside = call('get_curve_data', curves=['GR'], depth_start=5000, depth_end=6000)
+    if outside['point_count'] != 0:
+        print("❌ Range below the log returned samples")
+        return False
+    if 'depth_index' not in handler.well_cache._entries[(handler.S3_BUCKET, "global/well-data/W1.las")]['las_data']:
+        print("❌ Depth index not kept with the cached well")
+        return False
+
+    print("✅ All tools select the same samples; ranges outside the log are empty")
+    return True
+
+
+def test_benchmark_range_queries():
+    """Range queries on a long log are much faster than per-sample loops."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Benchmark (1M samples, 200 queries)")
+    print("=" * 60)
+
+    depths = 1000 + np.arange(1000000) * 0.1524
+    values = np.sin(depths)
+    depth_list = depths.tolist()
+    queries = [(1000 + q * 700, 1000 + q * 700 + 50) for q in range(200)]
+
+    start = time.perf_counter()
+    index = DepthIndex(depths)
+    for depth_start, depth_end in queries:
+        index.select(values, depth_start, depth_end)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for depth_start, depth_end in queries[:10]:
+        i, j = legacy_bounds(depth_list, depth_start, depth_end)
+        values[i:j]
+    looped = (time.perf_counter() - start) * len(queries) / 10
+
+    print(f"  DepthIndex: {indexed * 1000:.1f} ms (including the monotonic check)")
+    print(f"  Loops:      {looped * 1000:.0f} ms (extrapolated from 10 queries)")
+    if indexed * 20 > looped:
+        print("❌ DepthIndex not clearly faster")
+        return False
+
+    print(f"✅ {looped / indexed:.0f}x faster")
+    return True
+
+
+def main():
+    tests = [
+        test_bounds_match_filtering,
+        test_tools_agree_on_range,
+        test_benchmark_range_queries,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
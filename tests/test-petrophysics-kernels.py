@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized petrophysics kernels of the petrophysics-calculator Lambda.
+
+Verifies on randomized curves (nulls, NaN, out-of-range values, extreme
+and degenerate parameters) that density porosity, every shale volume
+method and Archie saturation give bit-for-bit the results of the previous
+per-sample loops with exact=True and agree within POW_TOLERANCE by
+default, that the handler tools report the same numbers, and that long
+logs are processed in milliseconds.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_reader import is_null, as_list
+from las_cache import WellCache
+from petro_kernels import POW_TOLERANCE, SHALE_METHODS, density_porosity, shale_volume, archie_saturation
+import handler
+from las_fixtures import NULL_VALUE, FakeS3, format_las
+
+SEED = 39
+
+
+# The per-sample implementations the kernels replace
+def legacy_porosity(rhob_data, matrix_density=2.65, fluid_density=1.0):
+    porosity = []
+    for rhob in as_list(rhob_data):
+        if not is_null(rhob):
+            phi = (matrix_density - rhob) / (matrix_density - fluid_density)
+            porosity.append(max(0.0, min(1.0, phi)))
+        else:
+            porosity.append(None)
+    return porosity
+
+
+def legacy_shale_volume(gr_data, gr_clean=25, gr_shale=150, method='linear'):
+    vsh = []
+    for gr in as_list(gr_data):
+        if not is_null(gr):
+            igr = (gr - gr_clean) / (gr_shale - gr_clean)
+            igr = max(0.0, min(1.0, igr))
+            if method == 'linear':
+                vsh_value = igr
+            elif method == 'larionov_tertiary':
+                vsh_value = 0.083 * (2 ** (3.7 * igr) - 1)
+            elif method == 'larionov_pre_tertiary':
+                vsh_value = 0.33 * (2 ** (2 * igr) - 1)
+            elif method == 'clavier':
+                vsh_value = 1.7 - (3.38 - (igr + 0.7) ** 2) ** 0.5
+            else:
+                vsh_value = igr
+            vsh.append(max(0.0, min(1.0, vsh_value)))
+        else:
+            vsh.append(None)
+    return vsh
+
+
+def legacy_saturation(porosity, rt_data, rw=0.1, a=1.0, m=2.0, n=2.0):
+    sw = []
+    for phi, rt in zip(porosity, as_list(rt_data)):
+        if phi and phi > 0 and not is_null(rt) and rt:
+            sw_value = ((a * rw) / (phi ** m * rt)) ** (1 / n)
+            sw.append(max(0.0, min(1.0, sw_value)))
+        else:
+            sw.append(None)
+    return sw
+
+
+def same(kernel_result, legacy_result):
+    """Bit-for-bit equality: same None positions, identical float bits elsewhere."""
+    if len(kernel_result) != len(legacy_result):
+        return False
+    for k, v in zip(kernel_result.tolist(), legacy_result):
+        if v is None:
+            if k == k:
+                return False
+        elif k != k or np.float64(k).tobytes() != np.float64(v).tobytes():
+            return False
+    return True
+
+
+def close(kernel_result, legacy_result):
+    """Same None positions; other values within POW_TOLERANCE."""
+    if len(kernel_result) != len(legacy_result):
+        return False
+    expected = np.array([np.nan if v is None else v for v in legacy_result], dtype=float)
+    actual = np.array([np.nan if v is None else v for v in np.asarray(kernel_result, dtype=object).tolist()], dtype=float)
+    return bool(np.array_equal(np.isnan(actual), np.isnan(expected))
+                and np.all(np.abs(np.nan_to_num(actual - expected)) <= POW_TOLERANCE))
+
+
+def random_curve(rng, low, high, size):
+    """Curve with in-range and out-of-range values, nulls, NaN and exact boundary values."""
+    span = abs(high - low)
+    values = rng.uniform(min(low, high) - span * 0.3, max(low, high) + span * 0.3, size)
+    kinds = rng.random(size)
+    values[kinds < 0.05] = -999.25
+    values[(kinds >= 0.05) & (kinds < 0.07)] = -9999.0
+    values[(kinds >= 0.07) & (kinds < 0.09)] = np.nan
+    values[(kinds >= 0.09) & (kinds < 0.10)] = low
+    values[(kinds >= 0.10) & (kinds < 0.11)] = high
+    return values
+
+
+def test_porosity_and_shale_match_loops():
+    """Density porosity and all shale methods equal the loops on random curves."""
+    print("=" * 60)
+    print("TEST 1: Porosity and shale volume match the loops")
+    print("=" * 60)
+
+    rng = np.random.default_rng(SEED)
+    cases = 0
+    for _ in range(150):
+        size = int(rng.integers(0, 400))
+        matrix, fluid = rng.uniform(2.0, 3.0), rng.uniform(0.5, 1.5)
+        rhob = random_curve(rng, fluid, matrix, size)
+        for curve in (rhob, rhob.tolist()):
+            if not same(density_porosity(curve, matrix, fluid), legacy_porosity(curve, matrix, fluid)):
+                print(f"❌ Porosity differs (matrix={matrix}, fluid={fluid}, {size} samples)")
+                return False
+
+        gr_clean = rng.uniform(0, 60)
+        gr_shale = gr_clean + rng.choice([rng.uniform(1, 200), 1e-9, -50.0])
+        gr = random_curve(rng, gr_clean, gr_shale, size)
+        for method in SHALE_METHODS + ('unknown',):
+            expected = legacy_shale_volume(gr, gr_clean, gr_shale, method)
+            if not same(shale_volume(gr, gr_clean, gr_shale, method, exact=True), expected) \
+                    or not close(shale_volume(gr, gr_clean, gr_shale, method), expected):
+                print(f"❌ {method} differs (gr_clean={gr_clean}, gr_shale={gr_shale})")
+                return False
+            cases += 1
+
+    # Integer parameters and Python lists with None, as in JSON requests
+    gr = [None, 10, 25, 80, 150, 151, 400, -999.25]
+    for method in SHALE_METHODS:
+        expected = legacy_shale_volume([-999.25 if v is None else v for v in gr], 25, 150, method)
+        if not same(shale_volume(gr, 25, 150, method, exact=True), expected) or not close(shale_volume(gr, 25, 150, method), expected):
+            print(f"❌ {method} differs for integer inputs")
+            return False
+
+    print(f"✅ {cases} random shale cases and 300 porosity curves match the loops")
+    return True
+
+
+def test_archie_matches_loop():
+    """Archie saturation equals the loop, including zero/null resistivity and uneven lengths."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Archie saturation matches the loop")
+    print("=" * 60)
+
+    rng = np.random.default_rng(SEED + 1)
+    for _ in range(200):
+        size = int(rng.integers(0, 400))
+        phi = legacy_porosity(random_curve(rng, 1.0, 2.65, size))
+        rt = np.abs(random_curve(rng, 0.2, 2000, size + int(rng.integers(-5, 5))))
+        rt[rng.random(len(rt)) < 0.03] = 0.0
+        rt[rt == 999.25] = -999.25
+        params = dict(rw=rng.uniform(0.01, 0.5), a=rng.choice([1.0, 0.62, 0.81, 1]),
+                      m=rng.choice([2.0, 2.15, 1.8, 2]), n=rng.choice([2.0, 2.3, 1.0, 3]))
+        expected = legacy_saturation(phi, rt, **params)
+        if not same(archie_saturation(phi, rt, exact=True, **params), expected) \
+                or not close(archie_saturation(phi, rt, **params), expected):
+            print(f"❌ Archie differs for {params}")
+            return False
+        if not same(archie_saturation(density_porosity(rt[:0]), rt[:0], **params), []):
+            print("❌ Empty curves not handled")
+            return False
+
+    # Negative resistivity has no real saturation: None instead of a complex value
+    result = archie_saturation([0.2, 0.2], [-5.0, 5.0])
+    if not (np.isnan(result[0]) and result[1] == legacy_saturation([0.2], [5.0])[0]):
+        print(f"❌ Negative resistivity not undefined: {result}")
+        return False
+
+    print("✅ 200 random parameter sets match the loop")
+    return True
+
+
+def test_handler_results_unchanged():
+    """The handler tools report the same curves and statistics as the loops produce."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Handler tool results")
+    print("=" * 60)
+
+    rng = np.random.default_rng(SEED + 2)
+    curves = {'GR': rng.uniform(10, 180, 3000), 'RHOB': rng.uniform(1.9, 2.8, 3000), 'RT': rng.uniform(0.5, 300, 3000)}
+    curves['GR'][::37] = NULL_VALUE
+    curves['RHOB'][::53] = NULL_VALUE
+    curves['RT'][::41] = NULL_VALUE
+    content = format_las(1000 + np.arange(3000) * 0.5, curves, well="W1")
+    handler.s3_client = FakeS3({"global/well-data/W1.las": content})
+    handler.well_cache = WellCache(max_bytes=1 << 22, revalidate_seconds=60, tmp_max_bytes=0)
+
+    def call(tool, **params):
+        return handler.handler({'tool': tool, 'parameters': {'well_name': 'W1', **params}}, None)['artifacts'][0]['results']
+
+    las = handler.parse_las_file(content)
+    porosity = legacy_porosity(las['data']['RHOB'])
+    expected = {
+        ('calculate_porosity', 'porosity'): porosity,
+        ('calculate_shale_volume', 'shale_volume'): legacy_shale_volume(las['data']['GR'], method='clavier'),
+        ('calculate_saturation', 'water_saturation'): legacy_saturation(porosity, las['data']['RT'], m=2.15, n=2.3),
+    }
+    params = {'calculate_shale_volume': {'method': 'clavier'}, 'calculate_saturation': {'m': 2.15, 'n': 2.3}}
+
+    for (tool, key), curve in expected.items():
+        results = call(tool, **params.get(tool, {}))
+        valid = [v for v in curve if v is not None]
+        if not close(results['curveData'][key], curve[:100]):
+            print(f"❌ {tool} curve data differs")
+            return False
+        stats = results['statistics']
+        if stats['count'] != len(valid) or not close([stats['mean'], stats['min'], stats['max']],
+                                                     [sum(valid) / len(valid), min(valid), max(valid)]):
+            print(f"❌ {tool} statistics differ: {stats}")
+            return False
+        if results['dataQuality']['totalPoints'] != len(curve):
+            print(f"❌ {tool} total points differ")
+            return False
+        print(f"  {tool}: mean {stats['mean']:.6f} over {stats['count']} samples")
+
+    print("✅ Tool results match within POW_TOLERANCE")
+    return True
+
+
+def test_benchmark_long_log():
+    """Long logs and multi-method comparisons run in milliseconds."""
+    print("\n" + "=" * 60)
+    print("TEST 4: Benchmark (200k samples)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(SEED + 3)
+    size = 200000
+    gr = random_curve(rng, 20, 160, size)
+    rhob = random_curve(rng, 1.9, 2.8, size)
+    rt = np.abs(random_curve(rng, 0.5, 300, size))
+
+    start = time.perf_counter()
+    phi = density_porosity(rhob)
+    shale_volume(gr)
+    vectorized_linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for method in SHALE_METHODS:
+        shale_volume(gr, method=method, exact=True)
+    archie_saturation(phi, rt, exact=True)
+    exact = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_vsh = [shale_volume(gr, method=method) for method in SHALE_METHODS]
+    fast_sw = archie_saturation(phi, rt)
+    fast = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_porosity(rhob)
+    legacy_shale_volume(gr)
+    looped_linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_phi = legacy_porosity(rhob)
+    legacy_vsh = [legacy_shale_volume(gr, method=method) for method in SHALE_METHODS]
+    legacy_sw = legacy_saturation(legacy_phi, rt)
+    looped = time.perf_counter() - start
+
+    print(f"  Porosity + linear Vsh:  {vectorized_linear * 1000:.1f} ms vectorized, {looped_linear * 1000:.0f} ms loops")
+    print(f"  4 Vsh methods + Archie: {fast * 1000:.1f} ms vectorized, {exact * 1000:.1f} ms exact=True, "
+          f"{looped * 1000:.0f} ms loops")
+
+    if vectorized_linear * 10 > looped_linear or exact * 2 > looped or fast * 20 > looped or fast * 3 > exact:
+        print("❌ Kernels not clearly faster than the loops")
+        return False
+    if not close(fast_sw, legacy_sw) or not all(close(v, e) for v, e in zip(fast_vsh, legacy_vsh)):
+        print("❌ Vectorized results not within POW_TOLERANCE of the loops")
+        return False
+
+    print(f"✅ {looped_linear / vectorized_linear:.0f}x faster for porosity/linear, "
+          f"{looped / fast:.0f}x (vectorized) / {looped / exact:.1f}x (exact=True) for the method comparison")
+    return True
+
+
+def main():
+    tests = [
+        test_porosity_and_shale_match_loops,
+        test_archie_matches_loop,
+        test_handler_results_unchanged,
+        test_benchmark_long_log,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test the warm-container LAS cache of the petrophysics-calculator Lambda.
+
+Verifies that repeated handler calls for one well reuse the parsed arrays,
+that entries are revalidated with a conditional GET and reparsed when the
+ETag changes, that the memory tier stays within its byte budget, and that
+evicted wells are spilled to and restored from the /tmp directory.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, make_las
+
+LAS_CURVES = ('GR', 'RHOB', 'RT')
+
+
+def call(tool, well='W1', **parameters):
+    return handler.handler({'tool': tool, 'parameters': {'well_name': well, **parameters}}, None)
+
+
+def test_repeated_calls_hit_memory():
+    """A session of tool calls on one well downloads and parses it once."""
+    print("=" * 60)
+    print("TEST 1: Repeated tool calls reuse the parsed well")
+    print("=" * 60)
+
+    s3 = FakeS3()
+    s3.put("global/well-data/W1.las", make_las(curves=LAS_CURVES, well="W1"))
+    handler.s3_client = s3
+    handler.well_cache = WellCache(max_bytes=1 << 20, revalidate_seconds=60, tmp_max_bytes=0)
+
+    results = [call('calculate_porosity'), call('calculate_shale_volume'),
+               call('calculate_statistics', curve='GR'), call('get_curve_data', curves=['RT'])]
+    stats = handler.well_cache.get_stats()
+    print(f"S3 gets: {s3.read_count()}, cache: {stats}")
+
+    if not all(r['success'] for r in results):
+        print("❌ A tool call failed")
+        return False
+    if s3.read_count() != 1 or stats['hits'] != 3:
+        print("❌ Well fetched more than once")
+        return False
+    if handler.well_cache._entries[(handler.S3_BUCKET, "global/well-data/W1.las")]['las_data']['array'].flags.writeable:
+        print("❌ Cached arrays are writable")
+        return False
+
+    missing = call('calculate_porosity', well='NOPE')
+    if missing['success'] or "not found" not in missing['error']:
+        print(f"❌ Missing well not reported: {missing}")
+        return False
+
+    print("✅ One download and parse served four tool calls")
+    return True
+
+
+def test_revalidation_and_etag_change():
+    """Stale entries are revalidated with a 304; a new ETag is reparsed."""
+    print("\n" + "=" * 60)
+    print("TEST 2: ETag revalidation")
+    print("=" * 60)
+
+    s3 = FakeS3()
+    s3.put("global/well-data/W1.las", make_las(curves=LAS_CURVES, well="W1"))
+    handler.s3_client = s3
+    handler.well_cache = WellCache(max_bytes=1 << 20, revalidate_seconds=0, tmp_max_bytes=0)
+
+    first = call('calculate_statistics', curve='GR')
+    second = call('calculate_statistics', curve='GR')
+    if s3.read_count() != 1 or s3.not_modified != 1 or first != second:
+        print(f"❌ Expected one GET and one 304, got {s3.read_count()} / {s3.not_modified}")
+        return False
+
+    s3.put("global/well-data/W1.las", make_las(curves=LAS_CURVES, well="W1", offset=5.0))
+    third = call('calculate_statistics', curve='GR')
+    mean_shift = (third['artifacts'][0]['results']['statistics']['mean']
+                  - first['artifacts'][0]['results']['statistics']['mean'])
+    if s3.read_count() != 2 or abs(mean_shift - 5.0) > 1e-9:
+        print(f"❌ Changed object not reloaded (mean shift {mean_shift})")
+        return False
+
+    print("✅ Unchanged well revalidated without a body; changed well reparsed")
+    return True
+
+
+def test_byte_budget_and_tmp_spill():
+    """The memory tier stays within budget and evicted wells come back from /tmp."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Byte budget and /tmp spill")
+    print("=" * 60)
+
+    s3 = FakeS3()
+    for i in range(4):
+        s3.put(f"global/well-data/W{i}.las", make_las(1000, curves=LAS_CURVES, seed=i, well=f"W{i}"))
+    handler.s3_client = s3
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        well_bytes = 1000 * 4 * 8
+        handler.well_cache = WellCache(max_bytes=2 * well_bytes, revalidate_seconds=60,
+                                       tmp_dir=tmp_dir, tmp_max_bytes=3 * well_bytes)
+        reference = {i: call('get_curve_data', well=f"W{i}", curves=['GR']) for i in range(4)}
+        stats = handler.well_cache.get_stats()
+        spilled = sorted(os.listdir(tmp_dir))
+        print(f"Memory: {stats['entries']} wells, {stats['bytes']} bytes; spilled files: {len(spilled)}")
+
+        if stats['bytes'] > 2 * well_bytes or stats['entries'] != 2:
+            print("❌ Memory tier exceeded its budget")
+            return False
+        if len(spilled) != 2:
+            print(f"❌ Evicted wells not spilled: {spilled}")
+            return False
+
+        # Memory tier lost (e.g. cleared); the spill answers after a 304
+        handler.well_cache.clear()
+        gets_before = s3.read_count()
+        again = call('get_curve_data', well="W0", curves=['GR'])
+        if s3.read_count() != gets_before or handler.well_cache.spill_hits != 1 or again != reference[0]:
+            print("❌ Spilled well not restored from /tmp")
+            return False
+
+        # Spill directory respects its own budget
+        handler.well_cache.tmp_max_bytes = well_bytes * 3 // 2
+        handler.well_cache._trim_spill()
+        if len(os.listdir(tmp_dir)) != 1:
+            print("❌ Spill directory not trimmed")
+            return False
+
+    print("✅ Budget respected; evicted well restored from /tmp without a download")
+    return True
+
+
+def main():
+    tests = [
+        test_repeated_calls_hit_memory,
+        test_revalidation_and_etag_change,
+        test_byte_budget_and_tmp_spill,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
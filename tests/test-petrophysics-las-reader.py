@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized LAS reader of the petrophysics-calculator Lambda.
+
+Verifies that parse_las reads the ~A section into a 2-D array with nulls
+as NaN and curves as column views, handles "~A" headers, wrapped files
+and custom NULL values, that the handler tools give the same results as
+before, and that parsing a 100k-sample log is faster and smaller than
+the previous per-curve list parser.
+"""
+
+import sys
+import os
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_reader import parse_las
+import handler
+from las_fixtures import FakeS3
+
+CURVES = ["DEPT", "GR", "RHOB", "NPHI", "RT", "DT", "CALI", "SP"]
+
+
+def legacy_parse(content):
+    """The per-curve list parser the Lambda used before."""
+    section, names, data = None, [], {}
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith('~'):
+            section = line[1:].split()[0].upper()
+            continue
+        if section == 'CURVE' and '.' in line and ':' in line:
+            names.append(line.split(':', 1)[0].split('.')[0].strip())
+        elif section == 'ASCII' and line and not line.startswith('#'):
+            try:
+                values = [float(x) for x in line.split()]
+                if len(values) == len(names):
+                    for i, name in enumerate(names):
+                        data.setdefault(name, []).append(values[i])
+            except ValueError:
+                continue
+    return {'curves': names, 'data': data}
+
+
+def synthetic_las(samples, ascii_header="~ASCII Log Data", null="-999.25", wrap=False):
+    rng = np.random.default_rng(3)
+    table = np.column_stack([
+        1000 + np.arange(samples) * 0.1524,
+        rng.uniform(20, 160, samples),
+        rng.uniform(2.0, 2.7, samples),
+        rng.uniform(0.05, 0.4, samples),
+        rng.uniform(0.5, 200, samples),
+        rng.uniform(50, 140, samples),
+        rng.uniform(6, 12, samples),
+        rng.uniform(-80, 20, samples),
+    ])
+    table[::50, 2] = float(null)
+    table[::70, 4] = float(null)
+    header = (
+        f"~Version Information\n VERS. 2.0 : LAS 2.0\n WRAP. {'YES' if wrap else 'NO'} : wrap mode\n"
+        f"~Well Information\n WELL. SYN-1 : SYNTHETIC WELL\n NULL. {null} : Null value\n"
+        "~Curve Information\n" + "".join(f" {c}.U : {c} curve\n" for c in CURVES) + ascii_header + "\n"
+    )
+    if wrap:
+        body = "\n".join(f"{row[0]:.4f}\n" + " ".join(f"{v:.4f}" for v in row[1:5]) + "\n" +
+                         " ".join(f"{v:.4f}" for v in row[5:]) for row in table)
+    else:
+        body = "\n".join(" ".join(f"{v:.4f}" for v in row) for row in table)
+    return header + body + "\n"
+
+
+def test_parse_matches_legacy():
+    """Arrays hold the legacy values, with nulls as NaN and columns as views."""
+    print("=" * 60)
+    print("TEST 1: Parsed arrays match the previous parser")
+    print("=" * 60)
+
+    content = synthetic_las(500)
+    las = parse_las(content)
+    legacy = legacy_parse(content)
+
+    if las['curves'] != CURVES or las['array'].shape != (500, len(CURVES)):
+        print(f"❌ Wrong curves or shape: {las['curves']} {las['array'].shape}")
+        return False
+    for name in CURVES:
+        expected = np.array(legacy['data'][name])
+        expected[np.isin(expected, [-999.25, -9999])] = np.nan
+        if not np.array_equal(las['data'][name], expected, equal_nan=True):
+            print(f"❌ Curve {name} differs from the previous parser")
+            return False
+    if not np.shares_memory(las['data']['GR'], las['array']) or np.isnan(las['data']['RHOB']).sum() != 10:
+        print("❌ Columns are not views or nulls not masked")
+        return False
+    if las['well_info']['WELL'] != "SYNTHETIC WELL" or las['units']['GR'] != "U":
+        print(f"❌ Header parsed wrong: {las['well_info']}")
+        return False
+
+    print("✅ Same values as before; nulls are NaN; curves are views of one array")
+    return True
+
+
+def test_header_variants():
+    """'~A' headers, wrapped data and custom NULL values are handled."""
+    print("\n" + "=" * 60)
+    print("TEST 2: ~A header, wrapped LAS, custom NULL")
+    print("=" * 60)
+
+    reference = parse_las(synthetic_las(200))['array']
+
+    short = parse_las(synthetic_las(200, ascii_header="~A  DEPT GR RHOB"))
+    wrapped = parse_las(synthetic_las(200, wrap=True))
+    custom = parse_las(synthetic_las(200, null="-1234.5"))
+
+    if not np.array_equal(short['array'], reference, equal_nan=True):
+        print("❌ '~A' section not read")
+        return False
+    if not wrapped['wrapped'] or not np.array_equal(wrapped['array'], reference, equal_nan=True):
+        print(f"❌ Wrapped LAS not reassembled: {wrapped['array'].shape}")
+        return False
+    if custom['null_value'] != -1234.5 or np.isnan(custom['data']['RT']).sum() != 3:
+        print("❌ Header NULL value not masked")
+        return False
+
+    # Malformed rows are skipped like before
+    messy = synthetic_las(50).replace("~ASCII Log Data\n", "~ASCII Log Data\n1 2 3\nbad row\n")
+    if parse_las(messy)['array'].shape != (50, len(CURVES)):
+        print("❌ Malformed rows not skipped")
+        return False
+
+    print("✅ ~A, wrapped and custom-NULL files parsed")
+    return True
+
+
+def test_handler_results():
+    """Handler tools run on the arrays and return JSON-safe results."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Handler tools on array data")
+    print("=" * 60)
+
+    content = synthetic_las(400)
+    legacy = legacy_parse(content)['data']
+    handler.s3_client = FakeS3({"global/well-data/SYN-1.las": content})
+
+    porosity = handler.handler({'tool': 'calculate_porosity', 'parameters': {'well_name': 'SYN-1'}}, None)
+    expected = [None if r in (-999.25, -9999) else max(0.0, min(1.0, (2.65 - r) / 1.65)) for r in legacy['RHOB']]
+    if porosity['artifacts'][0]['results']['curveData']['porosity'] != expected[:100]:
+        print("❌ Porosity differs from the list-based calculation")
+        return False
+
+    curves = handler.handler({'tool': 'get_curve_data', 'parameters': {
+        'well_name': 'SYN-1', 'curves': ['RHOB'], 'depth_start': 1005, 'depth_end': 1010}}, None)
+    results = curves['artifacts'][0]['results']
+    start = next(i for i, d in enumerate(legacy['DEPT']) if d >= 1005)
+    end = next(i for i, d in enumerate(legacy['DEPT']) if d > 1010)
+    if results['curves']['RHOB'] != legacy['RHOB'][start:end] or results['point_count'] != end - start:
+        print("❌ get_curve_data slice differs")
+        return False
+    json.dumps(curves, allow_nan=False)
+
+    stats = handler.handler({'tool': 'calculate_statistics', 'parameters': {'well_name': 'SYN-1', 'curve': 'RT'}}, None)
+    valid = [v for v in legacy['RT'] if v != -999.25]
+    if abs(stats['artifacts'][0]['results']['statistics']['mean'] - sum(valid) / len(valid)) > 1e-9:
+        print("❌ Statistics differ")
+        return False
+
+    quality = handler.handler({'tool': 'assess_well_data_quality', 'parameters': {'well_name': 'SYN-1'}}, None)
+    if not quality['success'] or quality['artifacts'][0]['results']['summary']['total_curves'] != 7:
+        print(f"❌ Quality assessment failed: {quality.get('error')}")
+        return False
+    json.dumps(quality, allow_nan=False)
+
+    print("✅ Porosity, curve data, statistics and quality match and serialize")
+    return True
+
+
+def test_benchmark_100k():
+    """A 100k-sample log parses faster and into far less memory."""
+    print("\n" + "=" * 60)
+    print("TEST 4: Benchmark (100k samples x 8 curves)")
+    print("=" * 60)
+
+    content = synthetic_las(100000)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    legacy = legacy_parse(content)
+    legacy_seconds = time.perf_counter() - start
+    legacy_bytes = tracemalloc.get_traced_memory()[0]
+    del legacy
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    las = parse_las(content)
+    new_seconds = time.perf_counter() - start
+    new_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"  {len(content) / 1e6:.1f} MB file")
+    print(f"  Previous parser: {legacy_seconds:.3f}s, {legacy_bytes / 1e6:.1f} MB held")
+    print(f"  numpy parser:    {new_seconds:.3f}s, {new_bytes / 1e6:.1f} MB held ({las['array'].nbytes / 1e6:.1f} MB array)")
+
+    if new_seconds >= legacy_seconds or new_bytes * 3 >= legacy_bytes:
+        print("❌ numpy parser not faster and smaller")
+        return False
+
+    print(f"✅ {legacy_seconds / new_seconds:.1f}x faster, {legacy_bytes / new_bytes:.1f}x less memory")
+    return True
+
+
+def main():
+    tests = [
+        test_parse_matches_legacy,
+        test_header_variants,
+        test_handler_results,
+        test_benchmark_100k,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test the paginated well catalog and multi-well mode of the petrophysics-calculator Lambda.
+
+Verifies that list_wells follows list_objects_v2 pagination past 1000
+keys and pages with next_token, that a multi-well event returns a summary
+row per well matching the single-well results, that concurrent S3 reads
+stay within the configured bound, and that wells still running at the
+invocation deadline are reported instead of failing the call.
+"""
+
+import sys
+import os
+import time
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_cache import WellCache
+import handler
+from las_fixtures import FakeS3, make_las
+
+PREFIX = "global/well-data/"
+
+
+def setup(objects, latency=0.0):
+    handler.s3_client = FakeS3(objects, latency)
+    handler.well_cache = WellCache(max_bytes=0, tmp_max_bytes=0)
+    return handler.s3_client
+
+
+def test_catalog_pagination():
+    """list_wells returns wells beyond the first 1000 keys and pages with next_token."""
+    print("=" * 60)
+    print("TEST 1: Paginated well catalog")
+    print("=" * 60)
+
+    objects = {f"{PREFIX}WELL-{i:04d}.las": "x" for i in range(1500)}
+    objects.update({f"{PREFIX}WELL-{i:04d}.las.col": "x" for i in range(0, 1500, 3)})
+    setup(objects)
+
+    first_page_only = len([o for o in handler.s3_client.list_objects_v2(Bucket="b", Prefix=PREFIX)['Contents']
+                           if o['Key'].endswith('.las')])
+    everything = handler.handler({'tool': 'list_wells', 'parameters': {}}, None)['artifacts'][0]['results']
+    print(f"Single list call sees {first_page_only} wells; catalog returns {everything['count']}")
+    if everything['count'] != 1500 or everything['next_token'] is not None:
+        print("❌ Catalog truncated")
+        return False
+
+    paged, token = [], None
+    while True:
+        page = handler.handler({'tool': 'list_wells', 'parameters': {'page_size': 400, 'next_token': token}}, None)
+        results = page['artifacts'][0]['results']
+        paged.extend(results['wells'])
+        token = results['next_token']
+        if not token:
+            break
+    if paged != everything['wells'] or len(set(paged)) != 1500:
+        print(f"❌ Pages do not cover the catalog exactly once ({len(paged)} wells)")
+        return False
+
+    print("✅ 1500 wells listed; 400-well pages cover the catalog exactly once")
+    return True
+
+
+def test_multi_well_summary():
+    """One multi-well call gives a summary row per well matching single-well results."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Multi-well summary table")
+    print("=" * 60)
+
+    names = [f"W{i}" for i in range(12)]
+    objects = {f"{PREFIX}{name}.las": make_las(500, seed=i) for i, name in enumerate(names)}
+    setup(objects)
+
+    singles = {name: handler.handler({'tool': 'calculate_porosity', 'parameters': {'well_name': name}}, None)
+               for name in names}
+    event = {'tool': 'calculate_porosity', 'parameters': {'method': 'density'}, 'wells': names + ['MISSING', 'W3']}
+    response = handler.handler(event, None)
+    table = response['artifacts'][0]['results']
+    print(response['message'])
+
+    if [row['well_name'] for row in table['summary']] != names + ['MISSING']:
+        print("❌ Rows not in request order / duplicates not removed")
+        return False
+    for row in table['summary'][:-1]:
+        expected = singles[row['well_name']]['artifacts'][0]['results']['statistics']
+        if not row['success'] or any(row[k] != expected[k] for k in ('mean', 'min', 'max', 'count')):
+            print(f"❌ Row for {row['well_name']} differs from the single-well result")
+            return False
+    if table['summary'][-1]['success'] or 'not found' not in table['summary'][-1]['error']:
+        print("❌ Missing well not reported in its row")
+        return False
+
+    every = handler.handler({'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'}, 'wells': 'all'}, None)
+    if every['artifacts'][0]['results']['succeeded'] != len(names):
+        print("❌ wells='all' did not cover the catalog")
+        return False
+
+    print(f"✅ {table['succeeded']} rows match single-well results; missing well isolated")
+    return True
+
+
+class FakeContext:
+    def __init__(self, seconds):
+        self.deadline = time.monotonic() + seconds
+
+    def get_remaining_time_in_millis(self):
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+def test_bounded_concurrency_and_deadline():
+    """S3 reads are concurrent but bounded; slow wells time out at the deadline."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Bounded concurrency and deadline")
+    print("=" * 60)
+
+    names = [f"W{i}" for i in range(24)]
+    s3 = setup({f"{PREFIX}{name}.las": make_las(50, seed=i) for i, name in enumerate(names)}, latency=0.05)
+
+    start = time.perf_counter()
+    response = handler.handler({'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'},
+                                'wells': names, 'max_concurrency': 4}, None)
+    elapsed = time.perf_counter() - start
+    results = response['artifacts'][0]['results']
+    print(f"24 wells, 50 ms per read, concurrency 4: {elapsed:.2f}s, peak concurrent reads {s3.peak}")
+    if results['succeeded'] != 24 or s3.peak > 4 or s3.peak < 2:
+        print("❌ Concurrency not bounded as requested")
+        return False
+    if elapsed > 24 * 0.05 / 2:
+        print("❌ Wells not loaded concurrently")
+        return False
+
+    setup({f"{PREFIX}{name}.las": make_las(50, seed=i) for i, name in enumerate(names)}, latency=0.5)
+    start = time.perf_counter()
+    response = handler.handler({'tool': 'calculate_statistics', 'parameters': {'curve': 'GR'}, 'wells': names},
+                               FakeContext(handler.FAN_OUT_RESERVE_SECONDS + 0.7))
+    elapsed = time.perf_counter() - start
+    results = response['artifacts'][0]['results']
+    timed_out = [row for row in results['summary'] if 'Timed out' in row.get('error', '')]
+    print(f"Deadline run: {elapsed:.2f}s, {results['succeeded']} done, {len(timed_out)} timed out")
+    if not timed_out or results['succeeded'] == 0 or elapsed > 1.5:
+        print("❌ Deadline not enforced")
+        return False
+
+    print("✅ Reads bounded by max_concurrency; unfinished wells reported at the deadline")
+    return True
+
+
+def main():
+    tests = [
+        test_catalog_pagination,
+        test_multi_well_summary,
+        test_bounded_concurrency_and_deadline,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
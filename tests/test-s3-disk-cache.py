@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test the ETag-revalidated disk cache tier of S3WellDataAccess.
+
+Runs a real boto3 client against a local S3 stand-in (a small HTTP server
+that implements GetObject with ETag / If-None-Match) and verifies that a
+restarted client revalidates instead of re-downloading, picks up changed
+objects, and serves the cached copy when S3 is unreachable.
+"""
+
+import sys
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+# Dummy credentials and no retries for the local stand-in
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['AWS_MAX_ATTEMPTS'] = '1'
+
+from tools.s3_data_access import S3WellDataAccess
+
+BUCKET = "test-bucket"
+
+
+class LocalS3StandIn:
+    """Minimal path-style S3 GetObject server with ETag revalidation."""
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                key = self.path.split('?')[0].lstrip('/').split('/', 1)[1]
+                body = stand_in.objects.get(key)
+                if body is None:
+                    stand_in.requests.append((key, 404))
+                    payload = b"<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>"
+                    self.send_response(404)
+                    self.send_header('Content-Type', 'application/xml')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    stand_in.requests.append((key, 304))
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                stand_in.requests.append((key, 200))
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', formatdate(usegmt=True))
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.endpoint_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def transferred(self):
+        return sum(1 for _, status in self.requests if status == 200)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def trajectory_body(depth: int) -> bytes:
+    return json.dumps({"coordinates": [{"x": 1.0, "y": 2.0, "z": -float(d)} for d in range(depth)]}).encode('utf-8')
+
+
+def test_restart_revalidates():
+    """A fresh client (cold memory cache) revalidates instead of downloading."""
+    print("=" * 60)
+    print("TEST 1: Restart revalidates with If-None-Match")
+    print("=" * 60)
+
+    s3 = LocalS3StandIn()
+    keys = [f"collections/demo/WELL-{i:03d}.json" for i in range(1, 9)]
+    for key in keys:
+        s3.objects[key] = trajectory_body(50)
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = S3WellDataAccess(BUCKET, endpoint_url=s3.endpoint_url, disk_cache_dir=cache_dir)
+            for key in keys:
+                if not first.get_trajectory_data(key)['success']:
+                    print("❌ Initial fetch failed")
+                    return False
+            downloaded = s3.transferred()
+
+            # Simulate an agent restart: new client, empty memory cache
+            second = S3WellDataAccess(BUCKET, endpoint_url=s3.endpoint_url, disk_cache_dir=cache_dir)
+            results = [second.get_trajectory_data(key) for key in keys]
+            stats = second.get_disk_cache_stats()
+
+            print(f"Downloads: first run {downloaded}, after restart {s3.transferred() - downloaded}")
+            print(f"Disk stats: {stats}")
+            if not all(r['success'] and r['metadata']['total_points'] == 50 for r in results):
+                print("❌ Cached data not returned after restart")
+                return False
+            if s3.transferred() != downloaded or stats['revalidated'] != len(keys):
+                print("❌ Restart re-downloaded unchanged objects")
+                return False
+    finally:
+        s3.stop()
+
+    print("✅ Restart served every well from disk after 304 revalidation")
+    return True
+
+
+def test_changed_object_refreshed():
+    """A changed object (new ETag) is downloaded again and replaces the cached copy."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Changed object is refreshed")
+    print("=" * 60)
+
+    s3 = LocalS3StandIn()
+    key = "collections/demo/WELL-001.json"
+    s3.objects[key] = trajectory_body(10)
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            S3WellDataAccess(BUCKET, endpoint_url=s3.endpoint_url, disk_cache_dir=cache_dir).get_trajectory_data(key)
+            s3.objects[key] = trajectory_body(25)
+
+            client = S3WellDataAccess(BUCKET, endpoint_url=s3.endpoint_url, disk_cache_dir=cache_dir)
+            result = client.get_trajectory_data(key)
+            if result['metadata']['total_points'] != 25 or client.get_disk_cache_stats()['downloads'] != 1:
+                print("❌ Changed object not refreshed")
+                return False
+
+            # And the refreshed copy is what the next restart revalidates against
+            again = S3WellDataAccess(BUCKET, endpoint_url=s3.endpoint_url, disk_cache_dir=cache_dir)
+            if again.get_trajectory_data(key)['metadata']['total_points'] != 25 or \
+                    again.get_disk_cache_stats()['revalidated'] != 1:
+                print("❌ Refreshed copy not stored")
+                return False
+    finally:
+        s3.stop()
+
+    print("✅ Changed object downloaded once and re-cached")
+    return True
+
+
+def test_offline_fallback():
+    """When S3 is unreachable, the cached copy is served."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Offline fallback")
+    print("=" * 60)
+
+    s3 = LocalS3StandIn()
+    key = "collections/demo/WELL-001.json"
+    s3.objects[key] = trajectory_body(12)
+    endpoint_url = s3.endpoint_url
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        S3WellDataAccess(BUCKET, endpoint_url=endpoint_url, disk_cache_dir=cache_dir).get_trajectory_data(key)
+        s3.stop()
+
+        client = S3WellDataAccess(BUCKET, endpoint_url=endpoint_url, disk_cache_dir=cache_dir)
+        cached = client.get_trajectory_data(key)
+        missing = client.get_trajectory_data("collections/demo/WELL-404.json")
+
+        print(f"Disk stats: {client.get_disk_cache_stats()}")
+        if not cached['success'] or cached['metadata']['total_points'] != 12:
+            print("❌ Cached copy not served while offline")
+            return False
+        if missing['success'] or client.get_disk_cache_stats()['stale_served'] != 1:
+            print("❌ Uncached object should fail while offline")
+            return False
+
+    print("✅ Cached copy served while S3 unreachable")
+    return True
+
+
+def main():
+    tests = [
+        test_restart_revalidates,
+        test_changed_object_refreshed,
+        test_offline_fallback,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
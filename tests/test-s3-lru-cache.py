@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test the byte-bounded LRU cache used by S3WellDataAccess.
+
+Verifies LRU eviction under a byte budget, TTL expiry, counters, thread
+safety, and that a long sequence of trajectory fetches stays within the
+configured memory envelope.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.lru_cache import ByteLRUCache, deep_sizeof
+from tools.s3_data_access import S3WellDataAccess
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted to stay under max_bytes."""
+    print("=" * 60)
+    print("TEST 1: LRU eviction by bytes")
+    print("=" * 60)
+
+    cache = ByteLRUCache(max_bytes=300)
+    cache.put("a", "A", size=100)
+    cache.put("b", "B", size=100)
+    cache.put("c", "C", size=100)
+    cache.get("a")                      # a becomes most recently used
+    cache.put("d", "D", size=150)       # must evict b, then c
+
+    stats = cache.get_stats()
+    print(f"Stats: {stats}")
+    if cache.keys() != ["a", "d"] or stats["total_bytes"] != 250 or stats["evictions"] != 2:
+        print(f"❌ Unexpected cache contents: {cache.keys()}")
+        return False
+    if cache.put("huge", "X", size=301) or "huge" in cache:
+        print("❌ Oversized entry should be rejected")
+        return False
+    cache.put("a", "A2", size=50)       # replacing re-accounts the size
+    if cache.total_bytes != 200 or cache.get("a") != "A2":
+        print("❌ Replacement not re-accounted")
+        return False
+
+    print("✅ Evicts least recently used entries and tracks bytes exactly")
+    return True
+
+
+def test_ttl_and_counters():
+    """Expired entries count as misses and are dropped."""
+    print("\n" + "=" * 60)
+    print("TEST 2: TTL expiry and counters")
+    print("=" * 60)
+
+    cache = ByteLRUCache(max_bytes=1000, ttl_seconds=0.05)
+    cache.put("k", {"v": 1})
+    first = cache.get("k")
+    time.sleep(0.08)
+    second = cache.get("k")
+
+    stats = cache.get_stats()
+    print(f"Stats: {stats}")
+    if first != {"v": 1} or second is not None:
+        print("❌ TTL not applied")
+        return False
+    if stats["hits"] != 1 or stats["misses"] != 1 or stats["expirations"] != 1 or stats["entries"] != 0:
+        print("❌ Counters wrong after expiry")
+        return False
+
+    print("✅ Entries expire after TTL with correct counters")
+    return True
+
+
+def test_thread_safety():
+    """Concurrent puts and gets keep the byte accounting consistent."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Thread safety")
+    print("=" * 60)
+
+    cache = ByteLRUCache(max_bytes=5000)
+
+    def worker(offset):
+        for i in range(2000):
+            key = (offset + i) % 300
+            if cache.get(key) is None:
+                cache.put(key, key, size=37)
+
+    threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    print(f"Stats: {stats}")
+    if stats["total_bytes"] != 37 * stats["entries"] or stats["total_bytes"] > 5000:
+        print("❌ Byte accounting inconsistent under concurrency")
+        return False
+    if stats["hits"] + stats["misses"] != 8 * 2000:
+        print("❌ Lost counter updates")
+        return False
+
+    print("✅ Accounting consistent across 8 threads")
+    return True
+
+
+def test_s3_access_memory_envelope():
+    """Browsing many wells keeps S3WellDataAccess within its cache budget."""
+    print("\n" + "=" * 60)
+    print("TEST 4: S3WellDataAccess memory envelope")
+    print("=" * 60)
+
+    budget = 2 * 1024 * 1024
+    client = S3WellDataAccess(bucket_name="test-bucket", cache_max_bytes=budget, disk_cache=False)
+
+    def get_object(Bucket, Key):
+        points = [{"x": float(i), "y": float(i) * 0.5, "z": -float(i)} for i in range(500)]
+        body = json.dumps({"coordinates": points}).encode('utf-8')
+        return {"Body": io.BytesIO(body)}
+
+    client.s3_client = MagicMock()
+    client.s3_client.get_object.side_effect = get_object
+
+    for i in range(200):
+        result = client.get_trajectory_data(f"collections/c{i // 20}/WELL-{i:03d}.json")
+        if not result["success"]:
+            print(f"❌ Fetch failed: {result['error']}")
+            return False
+
+    # Sizes recorded at insertion match a fresh measurement
+    recorded = client._trajectory_cache.total_bytes
+    measured = sum(deep_sizeof(client._trajectory_cache.get(k)) for k in client._trajectory_cache.keys())
+
+    # Most recently used well is still cached
+    cached = client.get_trajectory_data("collections/c9/WELL-199.json")
+
+    stats = client.get_cache_stats()
+    print({k: v for k, v in stats.items() if k != "cache_keys"})
+    if stats["total_size_bytes"] > budget or stats["evictions"] == 0:
+        print("❌ Cache exceeded its budget")
+        return False
+    if not cached["metadata"]["cached"]:
+        print("❌ Recent well not served from cache")
+        return False
+    if measured != recorded:
+        print(f"❌ Recorded sizes ({recorded}) differ from measured sizes ({measured})")
+        return False
+
+    print(f"✅ {stats['total_entries']} wells cached in {stats['total_size_mb']} MB (budget {budget // (1024 * 1024)} MB)")
+    return True
+
+
+def main():
+    tests = [
+        test_lru_eviction,
+        test_ttl_and_counters,
+        test_thread_safety,
+        test_s3_access_memory_envelope,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test concurrent collection cache preloading.
+
+Verifies that preload_collection_cache fetches wells in parallel, starts
+with the wells built first, streams progress and can be cancelled.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.s3_data_access import S3WellDataAccess
+
+OBJECT_LATENCY = 0.1
+
+
+def make_client(well_count: int = 24):
+    """S3WellDataAccess with a stubbed S3 client that takes OBJECT_LATENCY per object."""
+    client = S3WellDataAccess(bucket_name="test-bucket", disk_cache=False)
+    wells = [
+        {"well_name": f"WELL-{i:03d}", "s3_key": f"collections/demo/WELL-{i:03d}.json"}
+        for i in range(1, well_count + 1)
+    ]
+    client.list_collection_wells = MagicMock(return_value={
+        "success": True, "wells": wells, "total_wells": len(wells)
+    })
+
+    fetch_order = []
+    lock = threading.Lock()
+
+    def get_object(Bucket, Key):
+        with lock:
+            fetch_order.append(Key)
+        time.sleep(OBJECT_LATENCY)
+        if Key.endswith("WELL-013.json"):
+            body = b"not a trajectory"
+        else:
+            body = json.dumps({"coordinates": [{"x": 0, "y": 0, "z": -d} for d in range(10)]}).encode('utf-8')
+        return {"Body": io.BytesIO(body)}
+
+    client.s3_client = MagicMock()
+    client.s3_client.get_object.side_effect = get_object
+    return client, wells, fetch_order
+
+
+def test_parallel_preload():
+    """Warming 24 wells takes about as long as a few objects, not all of them."""
+    print("=" * 60)
+    print("TEST 1: Parallel preload")
+    print("=" * 60)
+
+    client, wells, _ = make_client()
+    progress = []
+    result = client.preload_collection_cache("collections/demo/", max_concurrency=8, progress_callback=progress.append)
+
+    print(f"Result: {result}")
+    sequential = OBJECT_LATENCY * len(wells)
+    if result["elapsed_seconds"] >= sequential / 3:
+        print(f"❌ Preload took {result['elapsed_seconds']}s (sequential: {sequential:.1f}s)")
+        return False
+    if result["loaded_count"] != 23 or result["failed_count"] != 1 or len(client._trajectory_cache) != 23:
+        print("❌ Unexpected load counts")
+        return False
+    if [p["completed"] for p in progress] != list(range(1, 25)) or progress[-1]["total"] != 24:
+        print("❌ Progress was not streamed for every well")
+        return False
+
+    # A second preload is served entirely from cache
+    again = client.preload_collection_cache("collections/demo/")
+    if again["loaded_count"] != 23 or client.s3_client.get_object.call_count != 24 + 1:
+        print("❌ Cached wells were fetched again")
+        return False
+
+    print(f"✅ 24 wells warmed in {result['elapsed_seconds']}s (sequential: {sequential:.1f}s)")
+    return True
+
+
+def test_build_order_priority():
+    """Wells named in build_order are fetched first, in that order."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Build-order priority")
+    print("=" * 60)
+
+    client, wells, fetch_order = make_client(well_count=10)
+    build_order = ["WELL-007", "collections/demo/WELL-002.json", "WELL-009"]
+    client.preload_collection_cache("collections/demo/", max_concurrency=1, build_order=build_order)
+
+    expected_first = [
+        "collections/demo/WELL-007.json",
+        "collections/demo/WELL-002.json",
+        "collections/demo/WELL-009.json",
+        "collections/demo/WELL-001.json",
+    ]
+    print(f"Fetch order: {[k.split('/')[-1] for k in fetch_order]}")
+    if fetch_order[:4] != expected_first:
+        print("❌ Priority wells were not fetched first")
+        return False
+
+    print("✅ Wells fetched in build order")
+    return True
+
+
+def test_cancellation():
+    """Setting the cancel event skips wells that have not started."""
+    print("\n" + "=" * 60)
+    print("TEST 3: Cancellation")
+    print("=" * 60)
+
+    client, wells, fetch_order = make_client()
+    cancel = threading.Event()
+
+    def on_progress(update):
+        if update["completed"] >= 2:
+            cancel.set()
+
+    result = client.preload_collection_cache(
+        "collections/demo/", max_concurrency=2, progress_callback=on_progress, cancel_event=cancel
+    )
+
+    print(f"Result: {result}")
+    if not result["cancelled"] or result["skipped_count"] == 0 or len(fetch_order) > 6:
+        print("❌ Preload was not cancelled")
+        return False
+    if result["loaded_count"] + result["failed_count"] + result["skipped_count"] != 24:
+        print("❌ Wells unaccounted for after cancellation")
+        return False
+
+    print(f"✅ Cancelled after {len(fetch_order)} fetches, {result['skipped_count']} wells skipped")
+    return True
+
+
+def main():
+    tests = [
+        test_parallel_preload,
+        test_build_order_priority,
+        test_cancellation,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
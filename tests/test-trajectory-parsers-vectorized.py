@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Test and benchmark the array-producing trajectory parsers.
+
+Verifies that the numpy CSV/LAS parsers and the JSON column conversion in
+S3WellDataAccess produce the same points as the previous row-by-row
+parsers, return column arrays only (point dicts are built on demand by
+trajectory_points), keep the previous error handling, and are faster on
+synthetic multi-megabyte files.
+"""
+
+import sys
+import os
+import io
+import csv
+import json
+import time
+
+import numpy as np
+
+# Add edicraft-agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'edicraft-agent'))
+
+from tools.s3_data_access import S3WellDataAccess
+from tools import trajectory_parsers
+from tools.trajectory_parsers import trajectory_points
+
+DENSE_POINTS = 200000
+
+
+def legacy_csv_coordinates(content):
+    """Row-by-row CSV parse as done before the numpy parser."""
+    rows = list(csv.DictReader(io.StringIO(content)))
+    return [{"x": float(r['x']), "y": float(r['y']), "z": float(r['z'])} for r in rows]
+
+
+def legacy_las_survey(content):
+    """Line-by-line LAS ~A parse as done before the numpy parser."""
+    names, data_lines, section = [], [], None
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('~'):
+            section = line[1:].split()[0].upper()
+            continue
+        if section in ('CURVE', 'CURVES') and '.' in line:
+            names.append(line.split('.')[0].strip())
+        elif section in ('A', 'ASCII'):
+            data_lines.append(line)
+    survey = []
+    for line in data_lines:
+        values = line.split()
+        if len(values) != len(names):
+            continue
+        try:
+            row = dict(zip(names, (float(v) for v in values)))
+        except ValueError:
+            continue
+        if row['TVD'] > -999 and row['AZIM'] > -999 and row['INCL'] > -999:
+            survey.append({"tvd": row['TVD'], "azimuth": row['AZIM'],
+                           "inclination": row['INCL'], "measured_depth": row['DEPT']})
+    return survey
+
+
+def dense_csv(points):
+    rng = np.random.default_rng(7)
+    xyz = np.cumsum(rng.normal(size=(points, 3)), axis=0)
+    lines = ["well,x,y,z"] + [f"W1,{x:.4f},{y:.4f},{z:.4f}" for x, y, z in xyz]
+    return "\n".join(lines) + "\n"
+
+
+def dense_las(points):
+    rng = np.random.default_rng(11)
+    header = (
+        "~Version Information\n VERS. 2.0 :\n WRAP. NO :\n"
+        "~Well Information\n WELL. DENSE-1 : Well name\n NULL. -999.25 : Null\n"
+        "~Curve Information\n DEPT.M : Measured depth\n TVD.M : Vertical depth\n"
+        " AZIM.DEG : Azimuth\n INCL.DEG : Inclination\n"
+        "~ASCII\n"
+    )
+    md = np.arange(points, dtype=float) * 0.5
+    table = np.column_stack([md, md * 0.98, rng.uniform(0, 360, points), rng.uniform(0, 60, points)])
+    table[::97, 2] = -999.25
+    body = "\n".join(" ".join(f"{v:.4f}" for v in row) for row in table)
+    return header + body + "\n"
+
+
+def make_client():
+    return S3WellDataAccess(bucket_name="test-bucket", disk_cache=False)
+
+
+def test_csv_equivalence_and_columns():
+    """CSV coordinates and surveys match the row-by-row parse and expose columns."""
+    print("=" * 60)
+    print("TEST 1: CSV parser equivalence")
+    print("=" * 60)
+
+    client = make_client()
+    content = dense_csv(1000)
+    result = client._parse_csv_trajectory(content, "wells/W1.csv")
+    if not result['success'] or trajectory_points(result) != legacy_csv_coordinates(content):
+        print("❌ CSV coordinates differ from row-by-row parse")
+        return False
+    if not isinstance(result['columns']['x'], np.ndarray) or len(result['columns']['z']) != 1000 \
+            or result['coordinates'] is not None:
+        print("❌ CSV result not returned as column arrays only")
+        return False
+
+    survey = client._parse_csv_trajectory(
+        "TVD,Azimuth,Inclination\n10,90,1.5\n20,91,2.5\n", "wells/S.csv"
+    )
+    expected = [
+        {"tvd": 10.0, "azimuth": 90.0, "inclination": 1.5, "measured_depth": 0.0},
+        {"tvd": 20.0, "azimuth": 91.0, "inclination": 2.5, "measured_depth": 0.0},
+    ]
+    if trajectory_points(survey) != expected:
+        print(f"❌ Survey rows wrong: {trajectory_points(survey)}")
+        return False
+
+    empty = client._parse_csv_trajectory("x,y,z\n", "wells/E.csv")
+    bad = client._parse_csv_trajectory("x,y,z\n1,2,3\n1,abc,3\n", "wells/B.csv")
+    if empty['error'] != "CSV file is empty" or bad['success'] or "Invalid coordinate values" not in bad['error']:
+        print(f"❌ Error handling changed: {empty['error']} / {bad['error']}")
+        return False
+
+    print("✅ CSV results match the previous parser; columns are numpy arrays")
+    return True
+
+
+def test_las_equivalence_and_fallback():
+    """LAS surveys match the line-by-line parse, including nulls and bad rows."""
+    print("\n" + "=" * 60)
+    print("TEST 2: LAS parser equivalence")
+    print("=" * 60)
+
+    client = make_client()
+    content = dense_las(2000)
+    result = client.parse_las_file("wells/D.las", content=content)
+    if not result['success'] or trajectory_points(result) != legacy_las_survey(content):
+        print("❌ LAS survey differs from line-by-line parse")
+        return False
+    if result['metadata']['total_points'] != len(result['columns']['tvd']) or result['survey_data'] is not None:
+        print("❌ LAS columns and point count disagree")
+        return False
+
+    # Malformed rows are skipped, as before
+    messy = content.replace("~ASCII\n", "~A\n0 0\nbad row here now\n", 1)
+    messy_result = client.parse_las_file("wells/M.las", content=messy)
+    if trajectory_points(messy_result) != legacy_las_survey(messy):
+        print("❌ Malformed rows not skipped like the previous parser")
+        return False
+
+    no_data = client.parse_las_file("wells/N.las", content=content.split("~ASCII")[0])
+    if no_data['error'] != "No curve data found in LAS file":
+        print(f"❌ Missing data block reported as: {no_data['error']}")
+        return False
+
+    print("✅ LAS results match the previous parser, with and without malformed rows")
+    return True
+
+
+def test_json_columns_and_validation():
+    """JSON point lists gain columns; columnar JSON is accepted; bad points are reported."""
+    print("\n" + "=" * 60)
+    print("TEST 3: JSON columns and validation")
+    print("=" * 60)
+
+    client = make_client()
+    points = [{"x": i, "y": -i, "z": i * 2.5} for i in range(50)]
+    result = client._parse_json_trajectory(json.dumps({"coordinates": points}), "w.json")
+    if trajectory_points(result) != points or not np.array_equal(result['columns']['z'], [p['z'] for p in points]):
+        print("❌ JSON coordinates or columns wrong")
+        return False
+
+    columnar = {"survey_data": {"tvd": [1.0, 2.0], "azimuth": [10.0, 11.0], "inclination": [0.5, 0.6]}}
+    survey = client._parse_json_trajectory(json.dumps(columnar), "s.json")
+    if trajectory_points(survey) != [{"tvd": 1.0, "azimuth": 10.0, "inclination": 0.5},
+                                     {"tvd": 2.0, "azimuth": 11.0, "inclination": 0.6}]:
+        print(f"❌ Columnar JSON survey not expanded: {trajectory_points(survey)}")
+        return False
+
+    broken = client._parse_json_trajectory(json.dumps({"coordinates": points[:3] + [{"x": 1}]}), "b.json")
+    if broken['error'] != "Coordinate at index 3 missing required fields (x, y, z)":
+        print(f"❌ Missing field not reported: {broken['error']}")
+        return False
+
+    print(f"✅ JSON columns built (orjson {'enabled' if trajectory_parsers.orjson else 'not installed'})")
+    return True
+
+
+def benchmark(label, parse, legacy, content):
+    start = time.perf_counter()
+    parse(content)
+    new_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    legacy(content)
+    legacy_seconds = time.perf_counter() - start
+    size_mb = len(content) / (1024 * 1024)
+    print(f"  {label}: {size_mb:.1f} MB, vectorized {new_seconds:.3f}s, "
+          f"row-by-row {legacy_seconds:.3f}s ({legacy_seconds / new_seconds:.1f}x)")
+    return new_seconds, legacy_seconds
+
+
+def test_benchmark_dense_files():
+    """Column parsing of multi-megabyte CSV and LAS files beats the row-by-row parse."""
+    print("\n" + "=" * 60)
+    print(f"TEST 4: Benchmark ({DENSE_POINTS} points)")
+    print("=" * 60)
+
+    csv_content = dense_csv(DENSE_POINTS)
+    las_content = dense_las(DENSE_POINTS)
+    json_content = json.dumps({"coordinates": legacy_csv_coordinates(csv_content)})
+
+    csv_new, csv_old = benchmark(
+        "CSV", lambda c: trajectory_parsers.parse_csv_columns(c, {k: (k,) for k in "xyz"}),
+        legacy_csv_coordinates, csv_content
+    )
+    las_new, las_old = benchmark(
+        "LAS", trajectory_parsers.parse_las_columns, legacy_las_survey, las_content
+    )
+    benchmark(
+        "JSON", lambda c: trajectory_parsers.points_to_columns(
+            trajectory_parsers.load_json(c)['coordinates'], trajectory_parsers.COORDINATE_FIELDS),
+        lambda c: [(float(p['x']), float(p['y']), float(p['z'])) for p in json.loads(c)['coordinates']],
+        json_content
+    )
+
+    if csv_new >= csv_old or las_new >= las_old:
+        print("❌ Vectorized parsers were not faster")
+        return False
+
+    print("✅ Vectorized parsers faster on dense files")
+    return True
+
+
+def main():
+    tests = [
+        test_csv_equivalence_and_columns,
+        test_las_equivalence_and_fallback,
+        test_json_columns_and_validation,
+        test_benchmark_dense_files,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
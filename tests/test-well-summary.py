@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test the per-well summary index.
+
+Verifies that a summary holds curve units, depth range and step, null
+fractions and per-curve statistics that match the samples and survives
+the JSON round trip; that the sidecar converter writes summaries at
+ingest; that the MCP server answers get_well_info and list_wells from
+stored summaries without downloading the LAS file; and that a summary of
+an older version of the file is ignored and rebuilt.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import importlib.util
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the Lambda directory to path
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'cdk', 'lambda-functions', 'petrophysics-calculator')
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from las_reader import parse_las
+from well_summary import build_summary, decode_summary, encode_summary, read_summary, summary_key
+from las_fixtures import FakeS3, make_las
+
+PREFIX = "global/well-data/"
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def call(server, name, **arguments):
+    return json.loads(asyncio.run(server.call_tool(name, arguments))[0].text)
+
+
+def test_summary_contents():
+    """Summaries match the samples and round-trip through JSON."""
+    print("=" * 60)
+    print("TEST 1: Summary contents")
+    print("=" * 60)
+
+    las = parse_las(make_las(seed=48, step=0.25, null_every=4))
+    summary = decode_summary(encode_summary(build_summary(las, PREFIX + "W.las", '"v1"')))
+    rhob = las['data']['RHOB'][~np.isnan(las['data']['RHOB'])]
+    stats = summary['statistics']['RHOB']
+    print(f"RHOB: {stats}")
+    if summary['curves'] != ['DEPT', 'GR', 'RHOB'] or summary['units'] != {'DEPT': 'M', 'GR': 'API', 'RHOB': 'G/CC'}:
+        print("❌ Wrong curves or units")
+        return False
+    if summary['depth'] != {'curve': 'DEPT', 'start': 1000.0, 'stop': 1499.75, 'step': 0.25} or summary['samples'] != 2000:
+        print(f"❌ Wrong depth range: {summary['depth']}")
+        return False
+    if stats['count'] != len(rhob) or stats['null_fraction'] != 0.25 or stats['min'] != rhob.min() \
+            or stats['max'] != rhob.max() or abs(stats['mean'] - rhob.mean()) > 1e-12 \
+            or abs(stats['p50'] - np.median(rhob)) > 0.01 or not stats['p10'] < stats['p50'] < stats['p90']:
+        print("❌ Curve statistics do not match the samples")
+        return False
+
+    empty = build_summary({**las, 'array': np.full((3, 3), np.nan)}, None, None)
+    if empty['statistics']['GR']['mean'] is not None or empty['statistics']['GR']['null_fraction'] != 1.0:
+        print("❌ All-null curve not reported as such")
+        return False
+    json.dumps(empty)
+    try:
+        decode_summary(b"{\"version\": 99}")
+        print("❌ Unsupported version accepted")
+        return False
+    except ValueError:
+        pass
+
+    print("✅ Units, depth range, step, null fractions and statistics match")
+    return True
+
+
+def test_converter_writes_summaries():
+    """The sidecar converter stores a current summary next to each LAS file."""
+    print("\n" + "=" * 60)
+    print("TEST 2: Summaries written at ingest")
+    print("=" * 60)
+
+    converter = load_script("convert_las_sidecars_summary", "convert-las-sidecars.py")
+    s3 = FakeS3()
+    s3.put_object(Bucket="b", Key=PREFIX + "W1.las", Body=make_las(seed=48, step=0.25, null_every=4))
+    with patch.object(converter, 'print', lambda *a, **k: None, create=True):
+        converter.convert_bucket(s3, "b", PREFIX)
+
+    etag = s3.head_object(Bucket="b", Key=PREFIX + "W1.las")['ETag']
+    summary = read_summary(s3, "b", PREFIX + "W1.las", etag)
+    if summary is None or summary['samples'] != 2000 or summary['source_key'] != PREFIX + "W1.las":
+        print("❌ Converter did not write a current summary")
+        return False
+    if summary_key(PREFIX + "W1.las") != "global/well-data-summaries/W1.las.summary.json" \
+            or [k for k in s3.objects if k.startswith(PREFIX)] != [PREFIX + "W1.las"]:
+        print("❌ Summary not written to its own prefix")
+        return False
+    s3.put_object(Bucket="b", Key=PREFIX + "W1.las", Body=make_las(seed=49, step=0.25, null_every=4))
+    new_etag = s3.head_object(Bucket="b", Key=PREFIX + "W1.las")['ETag']
+    if read_summary(s3, "b", PREFIX + "W1.las", new_etag) is not None:
+        print("❌ Summary of the previous version accepted")
+        return False
+
+    print(f"✅ {summary_key(PREFIX + 'W1.las')} written and invalidated by ETag")
+    return True
+
+
+def test_mcp_answers_from_index():
+    """get_well_info and list_wells read summaries, not samples."""
+    print("\n" + "=" * 60)
+    print("TEST 3: MCP server overview queries from the index")
+    print("=" * 60)
+
+    wells = [f"W{i:03d}" for i in range(200)]
+    s3 = FakeS3()
+    for i, name in enumerate(wells):
+        las = make_las(500, seed=i, step=0.25, null_every=4)
+        s3.put_object(Bucket="b", Key=PREFIX + name + ".las", Body=las)
+        etag = s3.head_object(Bucket="b", Key=PREFIX + name + ".las")['ETag']
+        if i < 150:
+            s3.put_object(Bucket="b", Key=summary_key(PREFIX + name + ".las"),
+                          Body=encode_summary(build_summary(parse_las(las), PREFIX + name + ".las", etag)))
+
+    server = load_script("mcp_well_data_server_summary", "mcp-well-data-server.py")
+    server.s3_client = s3
+    with patch.object(server, 'initialize_s3_client', return_value=True):
+        start = time.perf_counter()
+        listed = call(server, "list_wells", include_summary=True)
+        elapsed = time.perf_counter() - start
+        print(f"list_wells with summaries: {len(listed['summaries'])} of {len(listed['wells'])} wells "
+              f"in {elapsed * 1000:.0f} ms, {s3.read_count(suffix='.las')} LAS downloads")
+        if len(listed['wells']) != 200 or len(listed['summaries']) != 150 or s3.read_count(suffix='.las') \
+                or listed['summaries']['W007']['depth']['stop'] != 1000 + 499 * 0.25:
+            print("❌ list_wells not answered from the summaries")
+            return False
+
+        info = call(server, "get_well_info", well_name="W010")
+        if s3.read_count(suffix='.las') or len(server.WELL_DATA) or info['available_curves'] != ['DEPT', 'GR', 'RHOB'] \
+                or info['units']['RHOB'] != 'G/CC' or info['statistics']['RHOB']['null_fraction'] != 0.25:
+            print("❌ get_well_info loaded the well although a summary exists")
+            return False
+
+        # Without a stored summary the well is loaded once and its summary stored
+        unindexed = call(server, "get_well_info", well_name="W180")
+        key = PREFIX + "W180.las"
+        if s3.reads.get(key) != 1 or summary_key(key) not in s3.objects or unindexed['samples'] != 500:
+            print("❌ Unindexed well not loaded and indexed")
+            return False
+
+        # A changed LAS file makes its summary stale: the well is loaded again
+        s3.put_object(Bucket="b", Key=PREFIX + "W010.las", Body=make_las(600, seed=500, step=0.25, null_every=4))
+        server.WELL_CATALOG["W010"]['etag'] = s3.head_object(Bucket="b", Key=PREFIX + "W010.las")['ETag']
+        changed = call(server, "get_well_info", well_name="W010")
+        if changed['samples'] != 600 or s3.reads.get(PREFIX + "W010.las") != 1:
+            print("❌ Stale summary used")
+            return False
+
+    restarted = load_script("mcp_well_data_server_summary_2", "mcp-well-data-server.py")
+    restarted.s3_client = s3
+    with patch.object(restarted, 'initialize_s3_client', return_value=True):
+        before = s3.read_count(suffix='.las')
+        again = call(restarted, "get_well_info", well_name="W180")
+    if s3.read_count(suffix='.las') != before or again != unindexed:
+        print("❌ Summary written by the server not reused after a restart")
+        return False
+
+    print("✅ Overview queries answered from summaries; stale or missing summaries rebuilt")
+    return True
+
+
+def main():
+    tests = [
+        test_summary_contents,
+        test_converter_writes_summaries,
+        test_mcp_answers_from_index,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"\n❌ Test failed with exception: {str(e)}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("\n✅ ALL TESTS PASSED!")
+        return 0
+    print(f"\n❌ {total - passed} TEST(S) FAILED")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())